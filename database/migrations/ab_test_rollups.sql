@@ -0,0 +1,118 @@
+-- ============================================================
+-- A/B TEST ROLLUPS (per minute / per hour)
+-- ============================================================
+-- Purpose: Pre-aggregated A/B test samples for time series and long
+--          aggregate windows (src/api/ab_testing.py)
+--
+-- One row per variant and bucket with counts, sums and a log-spaced
+-- latency histogram. Every flush of the write-behind buffer adds its
+-- batch to both tables in the same transaction as the COPY into
+-- ab_test_metrics.
+--
+-- ABTestManager still creates the tables if they are missing, but it
+-- never backfills them: rolling up the existing ab_test_metrics rows
+-- is a full-table aggregate and belongs here, not in the first A/B
+-- request after a deploy.
+--
+-- The backfill skips buckets that already have a rollup row, so it is
+-- safe to re-run. A bucket that already received flushed batches before
+-- this script ran keeps only those (its older raw samples are not added).
+--
+-- Usage:
+--   psql -U nexus_superuser -d nexus_memory -f ab_test_rollups.sql
+-- ============================================================
+
+\echo 'Creating tables: ab_test_rollup_minute, ab_test_rollup_hour...'
+
+CREATE TABLE IF NOT EXISTS ab_test_metrics (
+    id SERIAL PRIMARY KEY,
+    variant VARCHAR(20) NOT NULL,
+    retrieval_time_ms FLOAT NOT NULL,
+    cache_hit BOOLEAN NOT NULL,
+    num_results INTEGER NOT NULL,
+    context_coherence FLOAT,
+    primed_count INTEGER DEFAULT 0,
+    query_id VARCHAR(255),
+    timestamp TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS ab_test_rollup_minute (
+    variant VARCHAR(20) NOT NULL,
+    bucket TIMESTAMP NOT NULL,
+    sample_count INTEGER NOT NULL,
+    latency_sum DOUBLE PRECISION NOT NULL,
+    latency_min DOUBLE PRECISION NOT NULL,
+    latency_max DOUBLE PRECISION NOT NULL,
+    cache_hits INTEGER NOT NULL,
+    coherence_sum DOUBLE PRECISION NOT NULL,
+    coherence_count INTEGER NOT NULL,
+    primed_sum BIGINT NOT NULL,
+    latency_histogram INTEGER[] NOT NULL,
+    PRIMARY KEY (variant, bucket)
+);
+
+CREATE TABLE IF NOT EXISTS ab_test_rollup_hour (
+    LIKE ab_test_rollup_minute INCLUDING ALL
+);
+
+\echo '✓ Rollup tables created'
+
+-- ============================================
+-- Backfill from the raw samples
+-- ============================================
+\echo 'Rolling up existing ab_test_metrics samples...'
+
+-- Histogram bounds: ab_testing.LATENCY_BOUNDS_MS (0.1 ms * 1.25^k, k = 0..60).
+-- width_bucket() returns slot 0 below the first bound and 61 above the last.
+DO $$
+DECLARE
+    v_unit RECORD;
+    v_bounds FLOAT8[] := ARRAY(
+        SELECT round((0.1 * 1.25 ^ k)::numeric, 6)::float8
+        FROM generate_series(0, 60) AS k
+        ORDER BY k
+    );
+BEGIN
+    FOR v_unit IN
+        SELECT * FROM (VALUES ('minute', 'ab_test_rollup_minute'),
+                              ('hour', 'ab_test_rollup_hour')) AS u(unit, table_name)
+    LOOP
+        EXECUTE format($sql$
+            WITH slots AS (
+                SELECT variant, date_trunc(%1$L, timestamp) AS bucket,
+                       width_bucket(retrieval_time_ms, $1) AS slot, COUNT(*) AS n
+                FROM ab_test_metrics
+                GROUP BY 1, 2, 3
+            ), histograms AS (
+                SELECT k.variant, k.bucket,
+                       array_agg(COALESCE(s.n, 0)::int ORDER BY g.slot) AS latency_histogram
+                FROM (SELECT DISTINCT variant, bucket FROM slots) AS k
+                CROSS JOIN generate_series(0, array_length($1, 1)) AS g(slot)
+                LEFT JOIN slots s ON s.variant = k.variant AND s.bucket = k.bucket AND s.slot = g.slot
+                GROUP BY k.variant, k.bucket
+            ), totals AS (
+                SELECT variant, date_trunc(%1$L, timestamp) AS bucket, COUNT(*) AS sample_count,
+                       SUM(retrieval_time_ms) AS latency_sum, MIN(retrieval_time_ms) AS latency_min,
+                       MAX(retrieval_time_ms) AS latency_max,
+                       COUNT(*) FILTER (WHERE cache_hit) AS cache_hits,
+                       COALESCE(SUM(context_coherence), 0) AS coherence_sum,
+                       COUNT(context_coherence) AS coherence_count,
+                       COALESCE(SUM(primed_count), 0) AS primed_sum
+                FROM ab_test_metrics
+                GROUP BY 1, 2
+            )
+            INSERT INTO %2$I (
+                variant, bucket, sample_count, latency_sum, latency_min, latency_max,
+                cache_hits, coherence_sum, coherence_count, primed_sum, latency_histogram
+            )
+            SELECT t.variant, t.bucket, t.sample_count, t.latency_sum, t.latency_min, t.latency_max,
+                   t.cache_hits, t.coherence_sum, t.coherence_count, t.primed_sum, h.latency_histogram
+            FROM totals t JOIN histograms h USING (variant, bucket)
+            ON CONFLICT (variant, bucket) DO NOTHING
+        $sql$, v_unit.unit, v_unit.table_name)
+        USING v_bounds;
+        RAISE NOTICE 'Backfilled %', v_unit.table_name;
+    END LOOP;
+END $$;
+
+\echo '✓ Existing samples rolled up'
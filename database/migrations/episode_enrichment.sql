@@ -0,0 +1,143 @@
+-- ============================================================
+-- INGEST-TIME ENRICHMENT (LAB_001 salience, LAB_004 novelty, facts)
+-- ============================================================
+-- Purpose: Compute the LAB scores once per episode, in the background,
+--          instead of on every read (src/workers/enrichment_worker.py)
+--
+-- Pipeline:
+--   INSERT episode -> embeddings_queue (06_create_triggers.sql)
+--   embeddings worker marks the row 'done'
+--     -> trigger enqueues the episode into enrichment_queue and
+--        NOTIFYs channel 'episode_enrichment' (the worker LISTENs,
+--        and polls as a fallback)
+--   enrichment worker writes novelty_score / salience_score columns,
+--   metadata (novelty_breakdown, salience_score, facts) and
+--   episode_facts in one transaction per batch
+--
+-- Novelty needs the embedding, which is why enrichment hangs off the
+-- embeddings queue rather than the episode INSERT.
+--
+-- The final section enqueues already embedded episodes that were never
+-- enriched, so search has precomputed scores for the existing corpus.
+--
+-- Usage:
+--   psql -U nexus_superuser -d nexus_memory -f episode_enrichment.sql
+-- ============================================================
+
+\echo 'Adding enrichment columns to zep_episodic_memory...'
+
+ALTER TABLE nexus_memory.zep_episodic_memory
+    ADD COLUMN IF NOT EXISTS novelty_score REAL,
+    ADD COLUMN IF NOT EXISTS salience_score REAL,
+    ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS enrichment_version VARCHAR(50);
+
+CREATE INDEX IF NOT EXISTS idx_episodic_novelty_score
+    ON nexus_memory.zep_episodic_memory (novelty_score DESC)
+    WHERE novelty_score IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_episodic_salience_score
+    ON nexus_memory.zep_episodic_memory (salience_score DESC)
+    WHERE salience_score IS NOT NULL;
+
+-- Online repartition in progress (episodic_partitioning.sql): the copy
+-- and the mirror trigger write these columns into the new table as well
+DO $$
+BEGIN
+    IF to_regclass('nexus_memory.zep_episodic_memory_partitioned') IS NOT NULL THEN
+        ALTER TABLE nexus_memory.zep_episodic_memory_partitioned
+            ADD COLUMN IF NOT EXISTS novelty_score REAL,
+            ADD COLUMN IF NOT EXISTS salience_score REAL,
+            ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMP WITH TIME ZONE,
+            ADD COLUMN IF NOT EXISTS enrichment_version VARCHAR(50);
+
+        CREATE INDEX IF NOT EXISTS idx_episodic_part_novelty_score
+            ON nexus_memory.zep_episodic_memory_partitioned (novelty_score DESC)
+            WHERE novelty_score IS NOT NULL;
+
+        CREATE INDEX IF NOT EXISTS idx_episodic_part_salience_score
+            ON nexus_memory.zep_episodic_memory_partitioned (salience_score DESC)
+            WHERE salience_score IS NOT NULL;
+    END IF;
+END $$;
+
+\echo '✓ Columns novelty_score, salience_score, enriched_at, enrichment_version added'
+
+-- ============================================
+-- Queue
+-- ============================================
+\echo 'Creating table: enrichment_queue...'
+
+CREATE TABLE IF NOT EXISTS memory_system.enrichment_queue (
+    episode_id UUID PRIMARY KEY,
+    state VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (state IN ('pending', 'processing', 'done', 'dead')),
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    enqueued_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    processed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_enrichment_queue_pending
+    ON memory_system.enrichment_queue (enqueued_at)
+    WHERE state = 'pending';
+
+\echo '✓ Table enrichment_queue created'
+
+-- ============================================
+-- Trigger: embedding done -> enqueue + notify
+-- ============================================
+\echo 'Creating trigger: enqueue_enrichment_on_embedding...'
+
+CREATE OR REPLACE FUNCTION memory_system.trigger_enqueue_enrichment()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO memory_system.enrichment_queue (episode_id, state)
+    VALUES (NEW.episode_id, 'pending')
+    ON CONFLICT (episode_id) DO UPDATE
+        SET state = 'pending',
+            retry_count = 0,
+            last_error = NULL,
+            enqueued_at = NOW();
+
+    -- Delivered on COMMIT; duplicates within a transaction are folded
+    PERFORM pg_notify('episode_enrichment', NEW.episode_id::TEXT);
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS enqueue_enrichment_on_embedding ON memory_system.embeddings_queue;
+
+CREATE TRIGGER enqueue_enrichment_on_embedding
+AFTER UPDATE OF state ON memory_system.embeddings_queue
+FOR EACH ROW
+WHEN (NEW.state = 'done' AND OLD.state IS DISTINCT FROM 'done')
+EXECUTE FUNCTION memory_system.trigger_enqueue_enrichment();
+
+\echo '✓ Trigger enqueue_enrichment_on_embedding created'
+
+-- ============================================
+-- Worker permissions
+-- ============================================
+\echo 'Granting enrichment permissions to nexus_worker...'
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON memory_system.enrichment_queue TO nexus_worker;
+GRANT SELECT, INSERT, DELETE ON nexus_memory.episode_facts TO nexus_worker;
+GRANT SELECT ON consciousness.emotional_states_log, consciousness.somatic_markers_log TO nexus_worker;
+
+\echo '✓ Permissions granted'
+
+-- ============================================
+-- Backfill: embedded but never enriched
+-- ============================================
+\echo 'Enqueueing embedded episodes without enrichment...'
+
+INSERT INTO memory_system.enrichment_queue (episode_id, state)
+SELECT episode_id, 'pending'
+FROM nexus_memory.zep_episodic_memory
+WHERE embedding IS NOT NULL
+    AND enriched_at IS NULL
+ON CONFLICT (episode_id) DO NOTHING;
+
+\echo '✓ Enrichment backlog enqueued'
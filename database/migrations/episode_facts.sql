@@ -0,0 +1,66 @@
+-- ============================================================
+-- HYBRID MEMORY - TYPED FACT STORE
+-- ============================================================
+-- Purpose: Narrow, indexed side table for /memory/facts
+--
+-- One row per (episode, fact_type). Numeric facts fill value_num as
+-- well as value_text so they can be compared / aggregated in SQL.
+-- The (fact_type, created_at DESC) index turns "latest nexus_version"
+-- into an index scan that stops after LIMIT rows, independent of how
+-- many episodes exist.
+--
+-- No FK to zep_episodic_memory: the episodic table may be range
+-- partitioned (PK includes created_at). Rows are removed explicitly by
+-- the pruning executor and rewritten by extraction / backfill.
+--
+-- The final section backfills the table from existing metadata->'facts'
+-- so the endpoint works immediately after the migration.
+--
+-- Usage:
+--   psql -U nexus_superuser -d nexus_memory -f episode_facts.sql
+-- ============================================================
+
+\echo 'Creating table: episode_facts...'
+
+CREATE TABLE IF NOT EXISTS nexus_memory.episode_facts (
+    episode_id UUID NOT NULL,
+    fact_type VARCHAR(64) NOT NULL,
+    value_text TEXT,
+    value_num DOUBLE PRECISION,
+    confidence FLOAT DEFAULT 0.8 CHECK (confidence BETWEEN 0 AND 1),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (episode_id, fact_type)
+);
+
+CREATE INDEX IF NOT EXISTS idx_episode_facts_type_created
+    ON nexus_memory.episode_facts(fact_type, created_at DESC);
+
+\echo '✓ Table episode_facts created'
+
+-- ============================================
+-- Backfill from metadata->'facts'
+-- ============================================
+\echo 'Backfilling episode_facts from episode metadata...'
+
+INSERT INTO nexus_memory.episode_facts
+    (episode_id, fact_type, value_text, value_num, confidence, created_at)
+SELECT
+    e.episode_id,
+    f.key,
+    CASE jsonb_typeof(f.value)
+        WHEN 'string' THEN f.value #>> '{}'
+        ELSE f.value::TEXT
+    END,
+    CASE jsonb_typeof(f.value)
+        WHEN 'number' THEN (f.value #>> '{}')::DOUBLE PRECISION
+    END,
+    LEAST(GREATEST(COALESCE((e.metadata->'facts'->>'extraction_confidence')::FLOAT, 0.8), 0), 1),
+    COALESCE(e.created_at, e.timestamp, NOW())
+FROM nexus_memory.zep_episodic_memory e
+CROSS JOIN LATERAL jsonb_each(e.metadata->'facts') f
+WHERE jsonb_typeof(e.metadata->'facts') = 'object'
+  AND f.key NOT IN ('extraction_method', 'extraction_confidence', 'last_updated')
+  AND jsonb_typeof(f.value) <> 'null'
+ON CONFLICT (episode_id, fact_type) DO NOTHING;
+
+\echo '✓ episode_facts backfilled'
@@ -0,0 +1,344 @@
+-- ============================================================
+-- EPISODIC MEMORY - TIME PARTITIONING (HOT / COLD TIERS)
+-- ============================================================
+-- Purpose: Range-partition zep_episodic_memory by created_at (monthly)
+--
+-- Layout:
+--   nexus_memory.zep_episodic_memory_partitioned   (parent, RANGE created_at)
+--     ├─ zep_episodic_memory_pYYYYMM               (one per month)
+--     └─ zep_episodic_memory_pdefault              (anything outside ranges)
+--
+-- Tiers:
+--   HOT  = the last hot_months partitions (incl. current month) -> HNSW index
+--   COLD = older partitions -> no vector index (exact scan of a bounded
+--          partition, only reached when hot tier has too few hits)
+--   B-Tree / GIN indexes (tags, FTS, timestamp) are declared on the
+--   parent, so every partition gets them automatically.
+--
+-- Constraints of declarative partitioning:
+--   - PRIMARY KEY must include created_at -> (episode_id, created_at)
+--   - Foreign keys can no longer point at episode_id alone. At cutover
+--     every FK referencing the table is read from pg_constraint, recorded
+--     in memory_system.episodic_fk_replacements and dropped; the
+--     cascade_episode_delete trigger then applies each one's ON DELETE
+--     action (CASCADE / SET NULL / SET DEFAULT / NO ACTION, RESTRICT).
+--     Insert-time checks on the referencing tables are not replaced.
+--   - Every user trigger on the old table is recreated on the new one
+--     (see cutover in partition_episodic_memory.py)
+--
+-- Enrichment columns (episode_enrichment.sql) are declared here too and
+-- added to the old heap if missing, so the copy and the mirror trigger
+-- carry them whichever of the two migrations ran first.
+--
+-- This script only creates the new structures; it does NOT move data.
+-- Online repartition (batched copy + mirror trigger + atomic rename):
+--   python partition_episodic_memory.py prepare|copy|cutover|maintain
+--
+-- Usage:
+--   psql -U nexus_superuser -d nexus_memory -f episodic_partitioning.sql
+-- ============================================================
+
+\echo 'Creating partitioned table: zep_episodic_memory_partitioned...'
+
+CREATE TABLE IF NOT EXISTS nexus_memory.zep_episodic_memory_partitioned (
+    episode_id UUID NOT NULL DEFAULT gen_random_uuid(),
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    content TEXT NOT NULL,
+    importance_score FLOAT DEFAULT 0.5 CHECK (importance_score BETWEEN 0 AND 1),
+    tags TEXT[],
+    embedding vector(384),
+    embedding_version VARCHAR(50),
+    project_id UUID REFERENCES nexus_memory.projects(project_id) ON DELETE SET NULL,
+    metadata JSONB,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    novelty_score REAL,
+    salience_score REAL,
+    enriched_at TIMESTAMP WITH TIME ZONE,
+    enrichment_version VARCHAR(50),
+    PRIMARY KEY (episode_id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Tables created before the enrichment columns were declared above
+ALTER TABLE nexus_memory.zep_episodic_memory_partitioned
+    ADD COLUMN IF NOT EXISTS novelty_score REAL,
+    ADD COLUMN IF NOT EXISTS salience_score REAL,
+    ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS enrichment_version VARCHAR(50);
+
+-- The copy and the mirror trigger read these from the old heap
+ALTER TABLE nexus_memory.zep_episodic_memory
+    ADD COLUMN IF NOT EXISTS novelty_score REAL,
+    ADD COLUMN IF NOT EXISTS salience_score REAL,
+    ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS enrichment_version VARCHAR(50);
+
+CREATE TABLE IF NOT EXISTS nexus_memory.zep_episodic_memory_pdefault
+    PARTITION OF nexus_memory.zep_episodic_memory_partitioned DEFAULT;
+
+\echo '✓ Partitioned table created'
+
+-- ============================================
+-- Parent-level indexes (propagate to every partition)
+-- ============================================
+\echo 'Creating parent-level indexes...'
+
+CREATE INDEX IF NOT EXISTS idx_episodic_part_episode_id
+    ON nexus_memory.zep_episodic_memory_partitioned(episode_id);
+
+CREATE INDEX IF NOT EXISTS idx_episodic_part_created_at
+    ON nexus_memory.zep_episodic_memory_partitioned(created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_episodic_part_timestamp
+    ON nexus_memory.zep_episodic_memory_partitioned(timestamp DESC);
+
+CREATE INDEX IF NOT EXISTS idx_episodic_part_tags
+    ON nexus_memory.zep_episodic_memory_partitioned USING gin(tags);
+
+CREATE INDEX IF NOT EXISTS idx_episodic_part_project
+    ON nexus_memory.zep_episodic_memory_partitioned(project_id)
+    WHERE project_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_episodic_part_content_fts
+    ON nexus_memory.zep_episodic_memory_partitioned
+    USING gin(to_tsvector('english', content));
+
+CREATE INDEX IF NOT EXISTS idx_episodic_part_novelty_score
+    ON nexus_memory.zep_episodic_memory_partitioned (novelty_score DESC)
+    WHERE novelty_score IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_episodic_part_salience_score
+    ON nexus_memory.zep_episodic_memory_partitioned (salience_score DESC)
+    WHERE salience_score IS NOT NULL;
+
+\echo '✓ Parent-level indexes created'
+
+-- ============================================
+-- FUNCTION: ensure_episodic_partition(month)
+-- ============================================
+\echo 'Creating function: ensure_episodic_partition()...'
+
+CREATE OR REPLACE FUNCTION nexus_memory.ensure_episodic_partition(
+    p_month DATE,
+    p_parent TEXT DEFAULT 'zep_episodic_memory_partitioned'
+)
+RETURNS TEXT AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::DATE;
+    v_end DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    v_name TEXT := 'zep_episodic_memory_p' || to_char(v_start, 'YYYYMM');
+BEGIN
+    IF to_regclass('nexus_memory.' || v_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE nexus_memory.%I PARTITION OF nexus_memory.%I
+             FOR VALUES FROM (%L) TO (%L)',
+            v_name, p_parent, v_start, v_end
+        );
+    END IF;
+    RETURN v_name;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION nexus_memory.ensure_episodic_partition IS
+'Create the monthly partition covering p_month if it does not exist. Returns partition name.';
+
+-- ============================================
+-- FUNCTION: apply_episodic_tiering(hot_months)
+-- ============================================
+\echo 'Creating function: apply_episodic_tiering()...'
+
+CREATE OR REPLACE FUNCTION nexus_memory.apply_episodic_tiering(
+    p_hot_months INTEGER DEFAULT 3,
+    p_parent TEXT DEFAULT 'zep_episodic_memory'
+)
+RETURNS TABLE (partition_name TEXT, tier TEXT, action TEXT) AS $$
+DECLARE
+    v_hot_cutoff DATE := (date_trunc('month', NOW())
+                          - make_interval(months => p_hot_months - 1))::DATE;
+    v_part RECORD;
+    v_index TEXT;
+BEGIN
+    FOR v_part IN
+        SELECT c.relname,
+               to_date(substring(c.relname FROM 'p(\d{6})$'), 'YYYYMM') AS month_start
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        JOIN pg_namespace n ON n.oid = p.relnamespace
+        WHERE n.nspname = 'nexus_memory'
+          AND p.relname = p_parent
+          AND c.relname ~ 'p\d{6}$'
+    LOOP
+        v_index := v_part.relname || '_embedding_hnsw';
+
+        IF v_part.month_start >= v_hot_cutoff THEN
+            IF to_regclass('nexus_memory.' || v_index) IS NULL THEN
+                EXECUTE format(
+                    'CREATE INDEX %I ON nexus_memory.%I
+                     USING hnsw (embedding vector_cosine_ops)
+                     WITH (m = 16, ef_construction = 64)',
+                    v_index, v_part.relname
+                );
+                partition_name := v_part.relname; tier := 'hot'; action := 'hnsw_created';
+                RETURN NEXT;
+            ELSE
+                partition_name := v_part.relname; tier := 'hot'; action := 'unchanged';
+                RETURN NEXT;
+            END IF;
+        ELSE
+            IF to_regclass('nexus_memory.' || v_index) IS NOT NULL THEN
+                EXECUTE format('DROP INDEX nexus_memory.%I', v_index);
+                partition_name := v_part.relname; tier := 'cold'; action := 'hnsw_dropped';
+                RETURN NEXT;
+            ELSE
+                partition_name := v_part.relname; tier := 'cold'; action := 'unchanged';
+                RETURN NEXT;
+            END IF;
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION nexus_memory.apply_episodic_tiering IS
+'HNSW on the newest p_hot_months monthly partitions, no vector index on older (cold) ones.';
+
+-- ============================================
+-- FUNCTION: maintain_episodic_partitions(hot_months, months_ahead)
+-- ============================================
+\echo 'Creating function: maintain_episodic_partitions()...'
+
+CREATE OR REPLACE FUNCTION nexus_memory.maintain_episodic_partitions(
+    p_hot_months INTEGER DEFAULT 3,
+    p_months_ahead INTEGER DEFAULT 2
+)
+RETURNS TABLE (partition_name TEXT, tier TEXT, action TEXT) AS $$
+DECLARE
+    i INTEGER;
+BEGIN
+    -- Pre-create upcoming months so inserts never land in the default partition
+    FOR i IN 0..p_months_ahead LOOP
+        PERFORM nexus_memory.ensure_episodic_partition(
+            (date_trunc('month', NOW()) + make_interval(months => i))::DATE,
+            'zep_episodic_memory'
+        );
+    END LOOP;
+
+    RETURN QUERY SELECT * FROM nexus_memory.apply_episodic_tiering(p_hot_months, 'zep_episodic_memory');
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION nexus_memory.maintain_episodic_partitions IS
+'Monthly maintenance: create upcoming partitions and roll the hot/cold HNSW window. Safe to run daily.';
+
+-- ============================================
+-- MIRROR TRIGGER (online repartition)
+-- ============================================
+-- While the batched copy runs, writes to the old heap are mirrored into
+-- the partitioned table so the cutover only has to rename tables.
+\echo 'Creating function: mirror_episodic_write()...'
+
+CREATE OR REPLACE FUNCTION nexus_memory.mirror_episodic_write()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        DELETE FROM nexus_memory.zep_episodic_memory_partitioned
+        WHERE episode_id = OLD.episode_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO nexus_memory.zep_episodic_memory_partitioned (
+            episode_id, timestamp, content, importance_score, tags, embedding,
+            embedding_version, project_id, metadata, created_at,
+            novelty_score, salience_score, enriched_at, enrichment_version
+        ) VALUES (
+            NEW.episode_id, NEW.timestamp, NEW.content, NEW.importance_score,
+            NEW.tags, NEW.embedding, NEW.embedding_version, NEW.project_id,
+            NEW.metadata, COALESCE(NEW.created_at, NOW()),
+            NEW.novelty_score, NEW.salience_score, NEW.enriched_at, NEW.enrichment_version
+        )
+        ON CONFLICT (episode_id, created_at) DO NOTHING;
+        RETURN NEW;
+    END IF;
+
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- CASCADE TRIGGER (replaces FKs to episode_id)
+-- ============================================
+\echo 'Creating table: episodic_fk_replacements...'
+
+-- Filled by the cutover from pg_constraint (one row per dropped FK)
+CREATE TABLE IF NOT EXISTS memory_system.episodic_fk_replacements (
+    table_name TEXT NOT NULL,          -- referencing table, schema-qualified and quoted
+    column_name TEXT NOT NULL,         -- referencing column
+    constraint_name TEXT NOT NULL,
+    constraint_def TEXT NOT NULL,      -- pg_get_constraintdef (to restore the FK)
+    on_delete CHAR(1) NOT NULL,        -- pg_constraint.confdeltype: a r c n d
+    replaced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (table_name, constraint_name)
+);
+
+\echo 'Creating function: cascade_episode_delete()...'
+
+CREATE OR REPLACE FUNCTION nexus_memory.cascade_episode_delete()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_fk RECORD;
+    v_referenced BOOLEAN;
+BEGIN
+    DELETE FROM memory_system.embeddings_queue WHERE episode_id = OLD.episode_id;
+
+    FOR v_fk IN
+        SELECT table_name, column_name, constraint_name, on_delete
+        FROM memory_system.episodic_fk_replacements
+    LOOP
+        IF v_fk.on_delete = 'c' THEN
+            EXECUTE format('DELETE FROM %s WHERE %I = $1', v_fk.table_name, v_fk.column_name)
+            USING OLD.episode_id;
+        ELSIF v_fk.on_delete = 'n' THEN
+            EXECUTE format('UPDATE %s SET %I = NULL WHERE %I = $1',
+                           v_fk.table_name, v_fk.column_name, v_fk.column_name)
+            USING OLD.episode_id;
+        ELSIF v_fk.on_delete = 'd' THEN
+            EXECUTE format('UPDATE %s SET %I = DEFAULT WHERE %I = $1',
+                           v_fk.table_name, v_fk.column_name, v_fk.column_name)
+            USING OLD.episode_id;
+        ELSE
+            -- NO ACTION / RESTRICT: refuse to delete a referenced episode
+            EXECUTE format('SELECT EXISTS (SELECT 1 FROM %s WHERE %I = $1)',
+                           v_fk.table_name, v_fk.column_name)
+            INTO v_referenced
+            USING OLD.episode_id;
+            IF v_referenced THEN
+                RAISE EXCEPTION 'episode % is still referenced from % (%)',
+                    OLD.episode_id, v_fk.table_name, v_fk.constraint_name
+                    USING ERRCODE = 'foreign_key_violation';
+            END IF;
+        END IF;
+    END LOOP;
+
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- REPARTITION CHECKPOINT
+-- ============================================
+\echo 'Creating table: episodic_repartition_state...'
+
+CREATE TABLE IF NOT EXISTS memory_system.episodic_repartition_state (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    phase VARCHAR(16) DEFAULT 'prepared'
+        CHECK (phase IN ('prepared', 'copying', 'copied', 'cutover')),
+    last_created_at TIMESTAMP WITH TIME ZONE,
+    last_episode_id UUID,
+    copied_count BIGINT DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+\echo ''
+\echo '============================================'
+\echo '✅ Episodic partitioning structures created'
+\echo '   Next: python partition_episodic_memory.py prepare'
+\echo '============================================'
@@ -0,0 +1,35 @@
+-- ============================================================
+-- HYBRID MEMORY - FACT BACKFILL CHECKPOINTS
+-- ============================================================
+-- Purpose: Resumable, parallel fact backfill (src/api/backfill_facts.py)
+--
+-- A backfill run splits zep_episodic_memory into keyset ranges on
+-- episode_id. Each range is processed by one worker process; after
+-- every batch the worker advances last_episode_id in the SAME
+-- transaction that writes the facts, so a rerun with the same run_name
+-- resumes every range exactly where it stopped.
+--
+-- Usage:
+--   psql -U nexus_superuser -d nexus_memory -f fact_backfill_checkpoints.sql
+-- ============================================================
+
+\echo 'Creating table: fact_backfill_ranges...'
+
+CREATE TABLE IF NOT EXISTS memory_system.fact_backfill_ranges (
+    run_name VARCHAR(100) NOT NULL,
+    range_no INTEGER NOT NULL,
+    lower_episode_id UUID NOT NULL,          -- inclusive
+    upper_episode_id UUID NOT NULL,          -- inclusive
+    last_episode_id UUID,                    -- checkpoint (exclusive lower bound)
+    total_count BIGINT DEFAULT 0,
+    processed_count BIGINT DEFAULT 0,
+    facts_written BIGINT DEFAULT 0,
+    status VARCHAR(16) DEFAULT 'pending'
+        CHECK (status IN ('pending', 'running', 'done', 'failed')),
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (run_name, range_no)
+);
+
+\echo '✓ Table fact_backfill_ranges created'
@@ -0,0 +1,50 @@
+-- ============================================================
+-- BACKGROUND JOBS
+-- ============================================================
+-- Purpose: Status, progress and results of long-running operations
+--          (LAB_003 consolidation, fact backfills, pruning runs,
+--          priming graph rebuilds) run by src/api/job_runner.py
+--
+-- One row per job. A multi-day consolidation is a parent job with one
+-- child per day (parent_job_id). Any API worker can answer
+-- GET /jobs/{id} or request cancellation (cancel_requested); the worker
+-- running the job sees the flag at its next checkpoint.
+--
+-- Per-type concurrency is enforced across workers: a job only moves
+-- from 'pending' to 'running' while fewer than the type's limit of
+-- jobs with a live heartbeat are running (serialized per type with an
+-- advisory lock).
+--
+-- Usage:
+--   psql -U nexus_superuser -d nexus_memory -f jobs.sql
+-- ============================================================
+
+\echo 'Creating table: jobs...'
+
+CREATE TABLE IF NOT EXISTS memory_system.jobs (
+    job_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_type VARCHAR(50) NOT NULL,
+    parent_job_id UUID REFERENCES memory_system.jobs(job_id) ON DELETE CASCADE,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'running', 'succeeded', 'failed', 'cancelled', 'interrupted')),
+    params JSONB NOT NULL DEFAULT '{}'::jsonb,
+    progress FLOAT NOT NULL DEFAULT 0,
+    progress_message TEXT,
+    result JSONB,
+    last_error TEXT,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_type_status
+    ON memory_system.jobs(job_type, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_parent
+    ON memory_system.jobs(parent_job_id)
+    WHERE parent_job_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_jobs_created
+    ON memory_system.jobs(created_at DESC);
+
+\echo '✓ Table jobs created'
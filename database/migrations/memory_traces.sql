@@ -0,0 +1,46 @@
+-- ============================================================
+-- LAB_003 - MEMORY TRACES
+-- ============================================================
+-- Purpose: Schema for the directed episode -> episode edges written by
+--          the consolidation engine (src/api/consolidation_engine.py)
+--
+-- The engine used to check information_schema and CREATE the table on
+-- the fly (in the public schema) on every run. It now only COPYs into
+-- nexus_memory.memory_traces, so the table has to exist beforehand.
+-- A table created by the old code path is moved into nexus_memory.
+--
+-- Usage:
+--   psql -U nexus_superuser -d nexus_memory -f memory_traces.sql
+-- ============================================================
+
+\echo 'Moving legacy public.memory_traces (if any)...'
+
+DO $$
+BEGIN
+    IF to_regclass('public.memory_traces') IS NOT NULL
+       AND to_regclass('nexus_memory.memory_traces') IS NULL THEN
+        ALTER TABLE public.memory_traces SET SCHEMA nexus_memory;
+        RAISE NOTICE 'public.memory_traces moved to nexus_memory';
+    END IF;
+END $$;
+
+\echo 'Creating table: memory_traces...'
+
+CREATE TABLE IF NOT EXISTS nexus_memory.memory_traces (
+    trace_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    source_episode_id UUID,
+    target_episode_id UUID,
+    trace_type VARCHAR(50),
+    strength FLOAT,
+    narrative_id VARCHAR(100),
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_memory_traces_source
+    ON nexus_memory.memory_traces(source_episode_id);
+CREATE INDEX IF NOT EXISTS idx_memory_traces_target
+    ON nexus_memory.memory_traces(target_episode_id);
+CREATE INDEX IF NOT EXISTS idx_memory_traces_narrative
+    ON nexus_memory.memory_traces(narrative_id);
+
+\echo '✓ Table memory_traces created'
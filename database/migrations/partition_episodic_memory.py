@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+NEXUS Episodic Memory - Online Repartition Tool
+================================================
+Moves nexus_memory.zep_episodic_memory (single heap, one global HNSW)
+into the monthly range-partitioned table created by
+episodic_partitioning.sql, without taking the API offline.
+
+Steps (each one is resumable / idempotent):
+
+    prepare   Create monthly partitions covering all existing data,
+              backfill NULL created_at, install the mirror trigger on the
+              old heap so new writes land in both tables
+    copy      Copy rows in keyset batches (created_at, episode_id) with a
+              checkpoint in memory_system.episodic_repartition_state
+    index     Build HNSW on hot partitions (before cutover, no search gap)
+    cutover   One short transaction: lock, verify counts, swap names,
+              carry every trigger over, replace the FKs that reference
+              the table with the cascade trigger
+    maintain  Create upcoming partitions and roll the hot/cold window
+              (run daily after cutover)
+    status    Show progress
+
+Usage:
+    psql -f episodic_partitioning.sql
+    python partition_episodic_memory.py prepare
+    python partition_episodic_memory.py copy --batch-size 2000
+    python partition_episodic_memory.py index --hot-months 3
+    python partition_episodic_memory.py cutover
+    python partition_episodic_memory.py maintain --hot-months 3
+
+Created: October 2025
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import psycopg
+
+# ============================================================
+# Configuration
+# ============================================================
+
+POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
+POSTGRES_PORT = int(os.getenv("POSTGRES_PORT", "5437"))
+POSTGRES_DB = os.getenv("POSTGRES_DB", "nexus_memory")
+POSTGRES_USER = os.getenv("POSTGRES_USER", "nexus_superuser")
+POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "")
+
+OLD_TABLE = "zep_episodic_memory"
+NEW_TABLE = "zep_episodic_memory_partitioned"
+LEGACY_TABLE = "zep_episodic_memory_legacy"
+
+COLUMNS = (
+    "episode_id, timestamp, content, importance_score, tags, embedding, "
+    "embedding_version, project_id, metadata, created_at, "
+    "novelty_score, salience_score, enriched_at, enrichment_version"
+)
+
+
+def get_connection():
+    conn_string = (
+        f"host={POSTGRES_HOST} port={POSTGRES_PORT} dbname={POSTGRES_DB} "
+        f"user={POSTGRES_USER} password={POSTGRES_PASSWORD}"
+    )
+    return psycopg.connect(conn_string)
+
+
+# Triggers of the repartition itself (not carried over at cutover)
+REPARTITION_TRIGGERS = ("mirror_episodic_write",)
+
+
+def is_partitioned(cur, table: str) -> bool:
+    cur.execute("""
+        SELECT c.relkind = 'p'
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'nexus_memory' AND c.relname = %s
+    """, (table,))
+    row = cur.fetchone()
+    return bool(row and row[0])
+
+
+# ============================================================
+# Steps
+# ============================================================
+
+def prepare(conn):
+    """Create partitions for existing data and start mirroring writes"""
+    with conn.cursor() as cur:
+        if is_partitioned(cur, OLD_TABLE):
+            print("✅ zep_episodic_memory is already partitioned - nothing to do")
+            return
+
+        if not is_partitioned(cur, NEW_TABLE):
+            sys.exit("❌ Run episodic_partitioning.sql first")
+
+        # Partition key must be NOT NULL
+        cur.execute(f"""
+            UPDATE nexus_memory.{OLD_TABLE}
+            SET created_at = COALESCE(timestamp, NOW())
+            WHERE created_at IS NULL
+        """)
+        print(f"📋 Backfilled created_at on {cur.rowcount} episodes")
+
+        cur.execute(f"""
+            SELECT generate_series(
+                date_trunc('month', COALESCE(MIN(created_at), NOW())),
+                date_trunc('month', NOW()) + INTERVAL '2 months',
+                INTERVAL '1 month'
+            )::DATE
+            FROM nexus_memory.{OLD_TABLE}
+        """)
+        months = [row[0] for row in cur.fetchall()]
+        for month in months:
+            cur.execute(
+                "SELECT nexus_memory.ensure_episodic_partition(%s, %s)",
+                (month, NEW_TABLE)
+            )
+        print(f"📋 Ensured {len(months)} monthly partitions")
+
+        cur.execute(f"""
+            DROP TRIGGER IF EXISTS mirror_episodic_write ON nexus_memory.{OLD_TABLE};
+            CREATE TRIGGER mirror_episodic_write
+            AFTER INSERT OR UPDATE OR DELETE ON nexus_memory.{OLD_TABLE}
+            FOR EACH ROW EXECUTE FUNCTION nexus_memory.mirror_episodic_write();
+        """)
+
+        cur.execute("""
+            INSERT INTO memory_system.episodic_repartition_state (id, phase)
+            VALUES (1, 'prepared')
+            ON CONFLICT (id) DO NOTHING
+        """)
+    conn.commit()
+    print("✅ Mirror trigger installed - new writes go to both tables")
+
+
+def copy(conn, batch_size: int, max_rows_per_second: float = None):
+    """Copy existing rows in keyset batches, checkpointing after each batch"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT phase, last_created_at, last_episode_id, copied_count
+            FROM memory_system.episodic_repartition_state WHERE id = 1
+        """)
+        state = cur.fetchone()
+        if state is None:
+            sys.exit("❌ Run 'prepare' first")
+
+        phase, last_created_at, last_episode_id, copied = state
+        if phase in ('copied', 'cutover'):
+            print(f"✅ Copy already finished ({copied} rows)")
+            return
+
+        cur.execute(f"SELECT COUNT(*) FROM nexus_memory.{OLD_TABLE}")
+        total = cur.fetchone()[0]
+
+    started = time.time()
+    copied_this_run = 0
+
+    while True:
+        batch_start = time.time()
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                WITH batch AS (
+                    SELECT {COLUMNS}
+                    FROM nexus_memory.{OLD_TABLE}
+                    WHERE %(last_created_at)s::TIMESTAMPTZ IS NULL
+                       OR (created_at, episode_id) > (%(last_created_at)s, %(last_episode_id)s::UUID)
+                    ORDER BY created_at, episode_id
+                    LIMIT %(batch_size)s
+                ),
+                inserted AS (
+                    INSERT INTO nexus_memory.{NEW_TABLE} ({COLUMNS})
+                    SELECT {COLUMNS} FROM batch
+                    ON CONFLICT (episode_id, created_at) DO NOTHING
+                )
+                SELECT COUNT(*), MAX(created_at),
+                       (ARRAY_AGG(episode_id ORDER BY created_at DESC, episode_id DESC))[1]
+                FROM batch
+            """, {
+                "last_created_at": last_created_at,
+                "last_episode_id": last_episode_id,
+                "batch_size": batch_size
+            })
+            rows, batch_last_created_at, batch_last_episode_id = cur.fetchone()
+
+            if rows == 0:
+                cur.execute("""
+                    UPDATE memory_system.episodic_repartition_state
+                    SET phase = 'copied', updated_at = NOW()
+                    WHERE id = 1
+                """)
+                conn.commit()
+                break
+
+            last_created_at, last_episode_id = batch_last_created_at, batch_last_episode_id
+            copied += rows
+            copied_this_run += rows
+
+            # Checkpoint in the same transaction as the batch
+            cur.execute("""
+                UPDATE memory_system.episodic_repartition_state
+                SET phase = 'copying',
+                    last_created_at = %s,
+                    last_episode_id = %s,
+                    copied_count = %s,
+                    updated_at = NOW()
+                WHERE id = 1
+            """, (last_created_at, last_episode_id, copied))
+        conn.commit()
+
+        elapsed = time.time() - started
+        rate = copied_this_run / elapsed if elapsed > 0 else 0.0
+        eta = (total - copied) / rate if rate > 0 else 0.0
+        print(f"  {copied}/{total} rows ({rate:.0f} rows/s, ETA {eta:.0f}s)")
+
+        if max_rows_per_second:
+            min_seconds = rows / max_rows_per_second
+            batch_seconds = time.time() - batch_start
+            if batch_seconds < min_seconds:
+                time.sleep(min_seconds - batch_seconds)
+
+    print(f"✅ Copy finished: {copied} rows")
+
+
+def build_indexes(conn, hot_months: int):
+    """Build HNSW on hot partitions of the new table (before cutover)"""
+    with conn.cursor() as cur:
+        parent = OLD_TABLE if is_partitioned(cur, OLD_TABLE) else NEW_TABLE
+        cur.execute(
+            "SELECT * FROM nexus_memory.apply_episodic_tiering(%s, %s)",
+            (hot_months, parent)
+        )
+        for partition_name, tier, action in cur.fetchall():
+            print(f"  {partition_name:40s} {tier:5s} {action}")
+    conn.commit()
+
+
+def cutover(conn):
+    """Swap the partitioned table in under a short exclusive lock"""
+    with conn.cursor() as cur:
+        if is_partitioned(cur, OLD_TABLE):
+            print("✅ Cutover already done")
+            return
+
+        cur.execute("SELECT phase FROM memory_system.episodic_repartition_state WHERE id = 1")
+        row = cur.fetchone()
+        if not row or row[0] != 'copied':
+            sys.exit("❌ Run 'copy' to completion first")
+
+        cur.execute("SET LOCAL lock_timeout = '5s'")
+        cur.execute(f"LOCK TABLE nexus_memory.{OLD_TABLE} IN ACCESS EXCLUSIVE MODE")
+
+        cur.execute(f"SELECT COUNT(*) FROM nexus_memory.{OLD_TABLE}")
+        old_count = cur.fetchone()[0]
+        cur.execute(f"SELECT COUNT(*) FROM nexus_memory.{NEW_TABLE}")
+        new_count = cur.fetchone()[0]
+        if old_count != new_count:
+            conn.rollback()
+            sys.exit(f"❌ Row count mismatch (old={old_count}, new={new_count}) - re-run copy")
+
+        replace_foreign_keys(cur)
+        triggers = user_triggers(cur, OLD_TABLE)
+
+        for name, _ in triggers:
+            cur.execute(f'DROP TRIGGER "{name}" ON nexus_memory.{OLD_TABLE}')
+        cur.execute(f"""
+            DROP TRIGGER IF EXISTS mirror_episodic_write ON nexus_memory.{OLD_TABLE};
+
+            ALTER TABLE nexus_memory.{OLD_TABLE} RENAME TO {LEGACY_TABLE};
+            ALTER TABLE nexus_memory.{NEW_TABLE} RENAME TO {OLD_TABLE};
+        """)
+
+        # The definitions name nexus_memory.zep_episodic_memory, which is now the partitioned table
+        for name, definition in triggers:
+            cur.execute(definition)
+            print(f"  recreated trigger {name}")
+
+        cur.execute(f"""
+            CREATE TRIGGER cascade_episode_delete
+            AFTER DELETE ON nexus_memory.{OLD_TABLE}
+            FOR EACH ROW
+            EXECUTE FUNCTION nexus_memory.cascade_episode_delete();
+
+            UPDATE memory_system.episodic_repartition_state
+            SET phase = 'cutover', updated_at = NOW()
+            WHERE id = 1;
+        """)
+    conn.commit()
+    print(f"✅ Cutover complete - old heap kept as nexus_memory.{LEGACY_TABLE}")
+
+
+def replace_foreign_keys(cur):
+    """
+    Drop every FK that references the old table, recording it for the
+    cascade trigger (FKs to episode_id alone cannot target a partitioned table)
+    """
+    cur.execute(f"""
+        SELECT format('%I.%I', n.nspname, r.relname),
+               c.conname,
+               pg_get_constraintdef(c.oid),
+               c.confdeltype,
+               array_length(c.conkey, 1),
+               a.attname,
+               fa.attname
+        FROM pg_constraint c
+        JOIN pg_class r ON r.oid = c.conrelid
+        JOIN pg_namespace n ON n.oid = r.relnamespace
+        JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+        JOIN pg_attribute fa ON fa.attrelid = c.confrelid AND fa.attnum = c.confkey[1]
+        WHERE c.contype = 'f'
+          AND c.confrelid = 'nexus_memory.{OLD_TABLE}'::regclass
+    """)
+    foreign_keys = cur.fetchall()
+
+    unsupported = [
+        f"{table}.{constraint}" for table, constraint, _, _, key_count, _, referenced in foreign_keys
+        if key_count != 1 or referenced != "episode_id"
+    ]
+    if unsupported:
+        sys.exit(f"❌ Only single-column FKs to episode_id can be replaced: {', '.join(unsupported)}")
+
+    for table, constraint, definition, on_delete, _, column, _ in foreign_keys:
+        cur.execute("""
+            INSERT INTO memory_system.episodic_fk_replacements
+                (table_name, column_name, constraint_name, constraint_def, on_delete)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (table_name, constraint_name) DO UPDATE
+            SET column_name = EXCLUDED.column_name,
+                constraint_def = EXCLUDED.constraint_def,
+                on_delete = EXCLUDED.on_delete,
+                replaced_at = NOW()
+        """, (table, column, constraint, definition, on_delete))
+        cur.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"')
+        print(f"  replaced FK {table}.{constraint} (ON DELETE {on_delete}) by cascade trigger")
+
+
+def user_triggers(cur, table: str):
+    """(name, CREATE TRIGGER statement) of the table's own triggers"""
+    cur.execute("""
+        SELECT t.tgname, pg_get_triggerdef(t.oid)
+        FROM pg_trigger t
+        WHERE t.tgrelid = ('nexus_memory.' || %s)::regclass
+          AND NOT t.tgisinternal
+          AND t.tgname <> ALL(%s)
+        ORDER BY t.tgname
+    """, (table, list(REPARTITION_TRIGGERS) + ["cascade_episode_delete"]))
+    return cur.fetchall()
+
+
+def maintain(conn, hot_months: int, months_ahead: int):
+    """Create upcoming partitions and roll the hot/cold HNSW window"""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT * FROM nexus_memory.maintain_episodic_partitions(%s, %s)",
+            (hot_months, months_ahead)
+        )
+        for partition_name, tier, action in cur.fetchall():
+            print(f"  {partition_name:40s} {tier:5s} {action}")
+    conn.commit()
+
+
+def status(conn):
+    """Print repartition progress and partition sizes"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT phase, copied_count, last_created_at, updated_at
+            FROM memory_system.episodic_repartition_state WHERE id = 1
+        """)
+        print(f"State: {cur.fetchone()}")
+
+        parent = OLD_TABLE if is_partitioned(cur, OLD_TABLE) else NEW_TABLE
+        cur.execute("""
+            SELECT c.relname,
+                   c.reltuples::BIGINT,
+                   to_regclass('nexus_memory.' || c.relname || '_embedding_hnsw') IS NOT NULL
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            JOIN pg_namespace n ON n.oid = p.relnamespace
+            WHERE n.nspname = 'nexus_memory' AND p.relname = %s
+            ORDER BY c.relname
+        """, (parent,))
+        for name, rows, has_hnsw in cur.fetchall():
+            print(f"  {name:40s} ~{rows:>10} rows  {'HNSW' if has_hnsw else '-'}")
+
+
+# ============================================================
+# Entry point
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Online repartition of episodic memory")
+    parser.add_argument("step", choices=["prepare", "copy", "index", "cutover", "maintain", "status"])
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--max-rows-per-second", type=float, default=None)
+    parser.add_argument("--hot-months", type=int, default=int(os.getenv("EPISODIC_HOT_MONTHS", "3")))
+    parser.add_argument("--months-ahead", type=int, default=2)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"NEXUS Episodic Repartition - {args.step} ({datetime.now().isoformat()})")
+    print("=" * 70)
+
+    with get_connection() as conn:
+        if args.step == "prepare":
+            prepare(conn)
+        elif args.step == "copy":
+            copy(conn, args.batch_size, args.max_rows_per_second)
+        elif args.step == "index":
+            build_indexes(conn, args.hot_months)
+        elif args.step == "cutover":
+            cutover(conn)
+        elif args.step == "maintain":
+            maintain(conn, args.hot_months, args.months_ahead)
+        else:
+            status(conn)
+
+
+if __name__ == "__main__":
+    main()
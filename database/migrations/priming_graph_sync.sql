@@ -0,0 +1,28 @@
+-- ============================================================
+-- LAB_005 - PRIMING GRAPH INCREMENTAL SYNC
+-- ============================================================
+-- Purpose: Cheap watermark scans for the priming graph store
+--          (src/api/priming_graph_store.py)
+--
+-- Every API worker periodically asks for episodes whose embedding was
+-- finished after its snapshot watermark:
+--   WHERE state = 'done' AND (processed_at, episode_id) > ($watermark, $last_id)
+--   ORDER BY processed_at, episode_id
+-- The partial index serves that keyset as a short range scan instead of a
+-- sequential scan over the whole queue. The episode_id tiebreak keeps
+-- rows sharing a processed_at from being skipped at page boundaries.
+--
+-- Usage:
+--   psql -U nexus_superuser -d nexus_memory -f priming_graph_sync.sql
+-- ============================================================
+
+\echo 'Creating index: idx_embeddings_queue_done_sync_keyset...'
+
+CREATE INDEX IF NOT EXISTS idx_embeddings_queue_done_sync_keyset
+    ON memory_system.embeddings_queue (processed_at, episode_id)
+    WHERE state = 'done';
+
+-- Superseded by the keyset index above
+DROP INDEX IF EXISTS memory_system.idx_embeddings_queue_done_processed_at;
+
+\echo '✓ Index idx_embeddings_queue_done_sync_keyset created'
@@ -0,0 +1,77 @@
+-- ============================================================
+-- INTELLIGENT DECAY - PRUNING ARCHIVE
+-- ============================================================
+-- Purpose: Archive table + run tracking for /memory/pruning/execute
+--
+-- Pruned episodes are MOVED (not lost) into
+-- nexus_memory.zep_episodic_memory_archive so the hot table and its
+-- HNSW / GIN indexes stay small. Embeddings are NOT archived: a
+-- restored episode is re-inserted with embedding NULL and the
+-- auto_generate_embedding trigger re-enqueues it.
+--
+-- memory_system.pruning_runs stores one row per pruning run with its
+-- parameters and progress. Every batch updates archived_count in the
+-- same transaction that moves the rows, so an interrupted run can be
+-- resumed exactly where it stopped.
+--
+-- Usage:
+--   psql -U nexus_superuser -d nexus_memory -f pruning_archive.sql
+-- ============================================================
+
+\echo 'Creating table: zep_episodic_memory_archive...'
+
+CREATE TABLE IF NOT EXISTS nexus_memory.zep_episodic_memory_archive (
+    episode_id UUID PRIMARY KEY,
+    timestamp TIMESTAMP WITH TIME ZONE,
+    content TEXT NOT NULL,
+    importance_score FLOAT,
+    tags TEXT[],
+    embedding_version VARCHAR(50),
+    project_id UUID,
+    metadata JSONB,
+    created_at TIMESTAMP WITH TIME ZONE,
+    -- Pruning provenance
+    decay_score FLOAT,
+    pruning_run_id UUID,
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_episodic_archive_run
+    ON nexus_memory.zep_episodic_memory_archive(pruning_run_id);
+
+CREATE INDEX IF NOT EXISTS idx_episodic_archive_archived_at
+    ON nexus_memory.zep_episodic_memory_archive(archived_at DESC);
+
+\echo '✓ Table zep_episodic_memory_archive created'
+
+\echo 'Creating table: pruning_runs...'
+
+CREATE TABLE IF NOT EXISTS memory_system.pruning_runs (
+    run_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    status VARCHAR(16) DEFAULT 'pending'
+        CHECK (status IN ('pending', 'running', 'completed', 'interrupted', 'failed')),
+    min_score_threshold FLOAT NOT NULL,
+    min_age_days INTEGER NOT NULL,
+    target_count INTEGER NOT NULL,
+    batch_size INTEGER NOT NULL,
+    max_rows_per_second FLOAT,
+    archived_count INTEGER DEFAULT 0,
+    neo4j_deleted_count INTEGER DEFAULT 0,
+    neo4j_pending_ids UUID[] NOT NULL DEFAULT '{}',  -- failed Neo4j deletes, retried next pass
+    batch_count INTEGER DEFAULT 0,
+    active_seconds FLOAT DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Runs created before failed Neo4j deletes were tracked
+ALTER TABLE memory_system.pruning_runs
+    ADD COLUMN IF NOT EXISTS neo4j_pending_ids UUID[] NOT NULL DEFAULT '{}';
+
+CREATE INDEX IF NOT EXISTS idx_pruning_runs_status
+    ON memory_system.pruning_runs(status)
+    WHERE status IN ('pending', 'running', 'interrupted');
+
+\echo '✓ Table pruning_runs created'
@@ -6,19 +6,205 @@ Tracks and compares metrics before/after spreading activation implementation:
 - Cache hit rate (%)
 - Context coherence (cosine similarity)
 - Number of primed episodes
+
+Recording is write-behind: record_retrieval only appends to an in-process
+buffer, which is flushed with one COPY when it reaches AB_TEST_FLUSH_BATCH
+samples or every AB_TEST_FLUSH_SECONDS (main.py). Aggregates are computed
+in PostgreSQL (avg, percentile_cont, count FILTER), so only one summary
+row per variant comes back regardless of the sample count.
+
+Rollups: the same flush transaction adds each batch to per-minute and
+per-hour rollup tables (counts, sums and a log-spaced latency histogram
+per variant and bucket). Time series are read from the rollups, so a
+24h dashboard reads at most 1,440 rows whatever the traffic. Raw samples
+are kept for AB_TEST_RAW_RETENTION_HOURS; longer aggregate windows use
+the hourly rollups, with percentiles taken from the histogram.
+Samples recorded before the rollups existed are rolled up by
+database/migrations/ab_test_rollups.sql, not by the manager.
 """
 
+import os
 import time
 import json
+import threading
+from bisect import bisect_right
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from collections import defaultdict
-import numpy as np
 import psycopg
 from enum import Enum
 
 
+AB_TEST_FLUSH_BATCH = int(os.getenv("AB_TEST_FLUSH_BATCH", "500"))
+AB_TEST_FLUSH_SECONDS = float(os.getenv("AB_TEST_FLUSH_SECONDS", "5"))
+AB_TEST_MAX_PENDING = int(os.getenv("AB_TEST_MAX_PENDING", "50000"))  # oldest dropped beyond this
+
+# Retention (hourly, from the flush loop): raw samples, then the rollups
+AB_TEST_RAW_RETENTION_HOURS = float(os.getenv("AB_TEST_RAW_RETENTION_HOURS", "48"))
+AB_TEST_MINUTE_RETENTION_DAYS = float(os.getenv("AB_TEST_MINUTE_RETENTION_DAYS", "7"))
+AB_TEST_HOUR_RETENTION_DAYS = float(os.getenv("AB_TEST_HOUR_RETENTION_DAYS", "180"))
+AB_TEST_RETENTION_INTERVAL_SECONDS = 3600
+
+# Latency histogram slot i counts samples with LATENCY_BOUNDS_MS[i-1] <= ms < LATENCY_BOUNDS_MS[i]
+# (25% wide slots from 0.1 ms to ~65 s; slot 0 below, last slot above)
+LATENCY_BOUNDS_MS = tuple(round(0.1 * 1.25 ** k, 6) for k in range(61))
+LATENCY_SLOTS = len(LATENCY_BOUNDS_MS) + 1
+
+# Rollup granularity -> table
+ROLLUP_TABLES = {"minute": "ab_test_rollup_minute", "hour": "ab_test_rollup_hour"}
+
+ROLLUP_COLUMNS = """
+    variant, bucket, sample_count, latency_sum, latency_min, latency_max,
+    cache_hits, coherence_sum, coherence_count, primed_sum, latency_histogram
+"""
+
+
+COPY_METRICS_QUERY = """
+    COPY ab_test_metrics (
+        variant, retrieval_time_ms, cache_hit, num_results,
+        context_coherence, primed_count, query_id, timestamp
+    ) FROM STDIN
+"""
+
+# percentile_cont interpolates linearly, like numpy.percentile's default
+AGGREGATE_METRICS_QUERY = """
+    SELECT
+        variant,
+        COUNT(*) AS sample_count,
+        AVG(retrieval_time_ms),
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY retrieval_time_ms),
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY retrieval_time_ms),
+        COUNT(*) FILTER (WHERE cache_hit)::float / COUNT(*),
+        COALESCE(AVG(context_coherence), 0.0),
+        AVG(primed_count),
+        COALESCE(EXTRACT(EPOCH FROM MAX(timestamp) - MIN(timestamp)), 0.0)
+    FROM ab_test_metrics
+    WHERE variant = ANY(%s) AND timestamp >= %s
+    GROUP BY variant
+"""
+
+# Additive upsert of one flush batch's per-bucket totals
+UPSERT_ROLLUP_QUERY = """
+    INSERT INTO {table} AS r ({columns})
+    SELECT v.variant, v.bucket, v.sample_count, v.latency_sum, v.latency_min, v.latency_max,
+           v.cache_hits, v.coherence_sum, v.coherence_count, v.primed_sum, v.latency_histogram::int[]
+    FROM unnest(
+        %s::varchar[], %s::timestamp[], %s::int[], %s::float8[], %s::float8[], %s::float8[],
+        %s::int[], %s::float8[], %s::int[], %s::bigint[], %s::text[]
+    ) AS v(variant, bucket, sample_count, latency_sum, latency_min, latency_max,
+           cache_hits, coherence_sum, coherence_count, primed_sum, latency_histogram)
+    ON CONFLICT (variant, bucket) DO UPDATE SET
+        sample_count = r.sample_count + EXCLUDED.sample_count,
+        latency_sum = r.latency_sum + EXCLUDED.latency_sum,
+        latency_min = LEAST(r.latency_min, EXCLUDED.latency_min),
+        latency_max = GREATEST(r.latency_max, EXCLUDED.latency_max),
+        cache_hits = r.cache_hits + EXCLUDED.cache_hits,
+        coherence_sum = r.coherence_sum + EXCLUDED.coherence_sum,
+        coherence_count = r.coherence_count + EXCLUDED.coherence_count,
+        primed_sum = r.primed_sum + EXCLUDED.primed_sum,
+        latency_histogram = ARRAY(
+            SELECT a + b
+            FROM unnest(r.latency_histogram, EXCLUDED.latency_histogram) WITH ORDINALITY AS h(a, b, i)
+            ORDER BY i
+        )
+"""
+
+# Time series re-bucketed from a rollup table (O(buckets))
+TIME_SERIES_QUERY = """
+    SELECT
+        date_bin(make_interval(mins => %(minutes)s), bucket, TIMESTAMP '2000-01-01') AS series_bucket,
+        SUM(latency_sum) / SUM(sample_count) AS avg_latency,
+        SUM(cache_hits)::float / SUM(sample_count) AS hit_rate,
+        SUM(sample_count) AS sample_count
+    FROM {table}
+    WHERE variant = %(variant)s AND bucket >= date_trunc(%(unit)s, %(cutoff)s::timestamp)
+    GROUP BY series_bucket
+    ORDER BY series_bucket ASC
+"""
+
+# Aggregates for windows longer than raw retention, from the hourly rollups
+ROLLUP_AGGREGATE_QUERY = """
+    SELECT
+        variant,
+        SUM(sample_count),
+        SUM(latency_sum) / SUM(sample_count),
+        SUM(cache_hits)::float / SUM(sample_count),
+        COALESCE(SUM(coherence_sum) / NULLIF(SUM(coherence_count), 0), 0.0),
+        SUM(primed_sum)::float / SUM(sample_count),
+        EXTRACT(EPOCH FROM MAX(bucket) - MIN(bucket))
+    FROM ab_test_rollup_hour
+    WHERE variant = ANY(%s) AND bucket >= date_trunc('hour', %s::timestamp)
+    GROUP BY variant
+"""
+
+ROLLUP_HISTOGRAM_QUERY = """
+    SELECT variant, h.i - 1 AS slot, SUM(h.n)
+    FROM ab_test_rollup_hour, unnest(latency_histogram) WITH ORDINALITY AS h(n, i)
+    WHERE variant = ANY(%s) AND bucket >= date_trunc('hour', %s::timestamp)
+    GROUP BY variant, slot
+"""
+
+RETENTION_QUERIES = (
+    ("DELETE FROM ab_test_metrics WHERE timestamp < NOW() - make_interval(secs => %s)",
+     AB_TEST_RAW_RETENTION_HOURS * 3600),
+    ("DELETE FROM ab_test_rollup_minute WHERE bucket < NOW() - make_interval(secs => %s)",
+     AB_TEST_MINUTE_RETENTION_DAYS * 86400),
+    ("DELETE FROM ab_test_rollup_hour WHERE bucket < NOW() - make_interval(secs => %s)",
+     AB_TEST_HOUR_RETENTION_DAYS * 86400),
+)
+
+
+def latency_slot(retrieval_time_ms: float) -> int:
+    """Histogram slot of a latency (same as width_bucket(ms, LATENCY_BOUNDS_MS))"""
+    return bisect_right(LATENCY_BOUNDS_MS, retrieval_time_ms)
+
+
+def histogram_percentile(histogram: List[int], q: float) -> float:
+    """Percentile (0-100) from a latency histogram, interpolating inside the slot"""
+    total = sum(histogram)
+    if not total:
+        return 0.0
+    rank = q / 100 * total
+    seen = 0
+    for slot, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            low = LATENCY_BOUNDS_MS[slot - 1] if slot > 0 else 0.0
+            high = LATENCY_BOUNDS_MS[slot] if slot < len(LATENCY_BOUNDS_MS) else LATENCY_BOUNDS_MS[-1]
+            return low + (high - low) * (rank - seen) / count
+        seen += count
+    return LATENCY_BOUNDS_MS[-1]
+
+
+def rollup_rows(batch: List["RetrievalMetrics"], unit: str) -> List[list]:
+    """Per (variant, bucket) totals of a batch, as UPSERT_ROLLUP_QUERY column arrays"""
+    buckets: Dict[Tuple[str, datetime], list] = {}
+    for m in batch:
+        ts = datetime.fromtimestamp(m.timestamp).replace(second=0, microsecond=0)
+        if unit == "hour":
+            ts = ts.replace(minute=0)
+        row = buckets.get((m.variant.value, ts))
+        if row is None:
+            row = buckets[(m.variant.value, ts)] = [
+                m.variant.value, ts, 0, 0.0, m.retrieval_time_ms, m.retrieval_time_ms,
+                0, 0.0, 0, 0, [0] * LATENCY_SLOTS
+            ]
+        row[2] += 1
+        row[3] += m.retrieval_time_ms
+        row[4] = min(row[4], m.retrieval_time_ms)
+        row[5] = max(row[5], m.retrieval_time_ms)
+        row[6] += int(m.cache_hit)
+        if m.context_coherence is not None:
+            row[7] += m.context_coherence
+            row[8] += 1
+        row[9] += m.primed_count
+        row[10][latency_slot(m.retrieval_time_ms)] += 1
+
+    columns = [list(column) for column in zip(*buckets.values())] if buckets else [[] for _ in range(11)]
+    columns[10] = ["{" + ",".join(map(str, histogram)) + "}" for histogram in columns[10]]
+    return columns
+
+
 class TestVariant(str, Enum):
     """A/B test variants"""
     CONTROL = "control"      # Without LAB_005
@@ -60,17 +246,36 @@ class ABTestManager:
     variants, enabling statistical comparison of performance improvements.
     """
 
-    def __init__(self, db_conn_string: str):
+    def __init__(
+        self,
+        db_conn_string: str,
+        pool=None,
+        flush_batch: int = AB_TEST_FLUSH_BATCH,
+        max_pending: int = AB_TEST_MAX_PENDING
+    ):
         self.db_conn_string = db_conn_string
-        self.in_memory_buffer: Dict[TestVariant, List[RetrievalMetrics]] = {
-            TestVariant.CONTROL: [],
-            TestVariant.TREATMENT: []
-        }
+        self.pool = pool
+        self.flush_batch = flush_batch
+        self.max_pending = max_pending
+
+        # Recorded but not yet written (write-behind), oldest first
+        self.pending: List[RetrievalMetrics] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.retention_applied_at = 0.0
+
         self._ensure_tables()
 
+    def connection(self):
+        """Pooled connection when a pool is given, else a dedicated one"""
+        if self.pool is not None:
+            return self.pool.connection()
+        return psycopg.connect(self.db_conn_string)
+
     def _ensure_tables(self):
         """Create A/B testing tables if they don't exist"""
-        with psycopg.connect(self.db_conn_string) as conn:
+        with self.connection() as conn:
             with conn.cursor() as cur:
                 # Metrics table
                 cur.execute("""
@@ -105,6 +310,30 @@ class ABTestManager:
                     CREATE INDEX IF NOT EXISTS idx_ab_variant_timestamp
                     ON ab_test_metrics(variant, timestamp)
                 """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_ab_timestamp
+                    ON ab_test_metrics(timestamp)
+                """)
+
+                # Rollup tables (one row per variant and minute / hour)
+                # (samples recorded before they existed: database/migrations/ab_test_rollups.sql)
+                for table in ROLLUP_TABLES.values():
+                    cur.execute(f"""
+                        CREATE TABLE IF NOT EXISTS {table} (
+                            variant VARCHAR(20) NOT NULL,
+                            bucket TIMESTAMP NOT NULL,
+                            sample_count INTEGER NOT NULL,
+                            latency_sum DOUBLE PRECISION NOT NULL,
+                            latency_min DOUBLE PRECISION NOT NULL,
+                            latency_max DOUBLE PRECISION NOT NULL,
+                            cache_hits INTEGER NOT NULL,
+                            coherence_sum DOUBLE PRECISION NOT NULL,
+                            coherence_count INTEGER NOT NULL,
+                            primed_sum BIGINT NOT NULL,
+                            latency_histogram INTEGER[] NOT NULL,
+                            PRIMARY KEY (variant, bucket)
+                        )
+                    """)
 
                 conn.commit()
 
@@ -117,8 +346,13 @@ class ABTestManager:
         context_coherence: Optional[float] = None,
         primed_count: int = 0,
         query_id: Optional[str] = None
-    ):
-        """Record a single retrieval operation"""
+    ) -> bool:
+        """
+        Record a single retrieval operation (buffered, no database round trip)
+
+        Returns:
+            True when the buffer holds a full batch and should be flushed
+        """
         metrics = RetrievalMetrics(
             variant=variant,
             retrieval_time_ms=retrieval_time_ms,
@@ -129,84 +363,158 @@ class ABTestManager:
             query_id=query_id
         )
 
-        # Add to in-memory buffer
-        self.in_memory_buffer[variant].append(metrics)
-
-        # Persist to database
-        self._persist_metrics(metrics)
-
-    def _persist_metrics(self, metrics: RetrievalMetrics):
-        """Persist metrics to PostgreSQL"""
-        with psycopg.connect(self.db_conn_string) as conn:
+        with self._lock:
+            self.pending.append(metrics)
+            self._trim()
+            return len(self.pending) >= self.flush_batch
+
+    def _trim(self):
+        """Drop the oldest samples past max_pending (database unreachable for long)"""
+        overflow = len(self.pending) - self.max_pending
+        if overflow > 0:
+            del self.pending[:overflow]
+            self.dropped += overflow
+
+    def flush(self) -> int:
+        """
+        Write buffered samples with one COPY
+
+        Returns:
+            Number of samples written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self.pending = self.pending, []
+            if not batch:
+                return 0
+
+            try:
+                with self.connection() as conn:
+                    with conn.cursor() as cur:
+                        with cur.copy(COPY_METRICS_QUERY) as copy:
+                            for metrics in batch:
+                                copy.write_row((
+                                    metrics.variant.value,
+                                    metrics.retrieval_time_ms,
+                                    metrics.cache_hit,
+                                    metrics.num_results,
+                                    metrics.context_coherence,
+                                    metrics.primed_count,
+                                    metrics.query_id,
+                                    datetime.fromtimestamp(metrics.timestamp)
+                                ))
+
+                        # Same transaction: rollups always match the raw rows
+                        for unit, table in ROLLUP_TABLES.items():
+                            cur.execute(
+                                UPSERT_ROLLUP_QUERY.format(table=table, columns=ROLLUP_COLUMNS),
+                                rollup_rows(batch, unit)
+                            )
+                    conn.commit()
+            except Exception:
+                # Keep the batch (ahead of newer samples) for the next flush
+                with self._lock:
+                    self.pending = batch + self.pending
+                    self._trim()
+                raise
+
+            return len(batch)
+
+    def apply_retention(self):
+        """Drop raw samples past raw retention (already rolled up) and expired rollups"""
+        with self.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO ab_test_metrics (
-                        variant, retrieval_time_ms, cache_hit, num_results,
-                        context_coherence, primed_count, query_id, timestamp
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, to_timestamp(%s))
-                """, (
-                    metrics.variant.value,
-                    metrics.retrieval_time_ms,
-                    metrics.cache_hit,
-                    metrics.num_results,
-                    metrics.context_coherence,
-                    metrics.primed_count,
-                    metrics.query_id,
-                    metrics.timestamp
-                ))
-                conn.commit()
-
-    def get_aggregated_metrics(
+                for query, seconds in RETENTION_QUERIES:
+                    cur.execute(query, (seconds,))
+            conn.commit()
+        self.retention_applied_at = time.time()
+
+    def apply_retention_if_due(self) -> bool:
+        if time.time() - self.retention_applied_at < AB_TEST_RETENTION_INTERVAL_SECONDS:
+            return False
+        self.apply_retention()
+        return True
+
+    def aggregate(
         self,
-        variant: TestVariant,
+        variants: List[TestVariant],
         hours_back: int = 24
-    ) -> Optional[AggregatedMetrics]:
-        """Get aggregated metrics for a variant over a time period"""
+    ) -> Dict[TestVariant, AggregatedMetrics]:
+        """Aggregated metrics per variant, computed in SQL (one summary row each)"""
         cutoff_time = datetime.now() - timedelta(hours=hours_back)
 
-        with psycopg.connect(self.db_conn_string) as conn:
+        # Read your own writes: include samples still in the buffer
+        self.flush()
+
+        if hours_back > AB_TEST_RAW_RETENTION_HOURS:
+            return self._aggregate_rollups(variants, cutoff_time)
+
+        with self.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT
-                        retrieval_time_ms,
-                        cache_hit,
-                        context_coherence,
-                        primed_count,
-                        EXTRACT(EPOCH FROM timestamp) as ts
-                    FROM ab_test_metrics
-                    WHERE variant = %s AND timestamp >= %s
-                    ORDER BY timestamp ASC
-                """, (variant.value, cutoff_time))
+                cur.execute(AGGREGATE_METRICS_QUERY, ([v.value for v in variants], cutoff_time))
+                rows = cur.fetchall()
 
+        return {
+            TestVariant(row[0]): AggregatedMetrics(
+                variant=TestVariant(row[0]),
+                sample_count=row[1],
+                avg_retrieval_time_ms=float(row[2]),
+                p50_retrieval_time_ms=float(row[3]),
+                p95_retrieval_time_ms=float(row[4]),
+                cache_hit_rate=float(row[5]),
+                avg_context_coherence=float(row[6]),
+                avg_primed_count=float(row[7]),
+                total_duration_seconds=float(row[8])
+            )
+            for row in rows
+        }
+
+    def _aggregate_rollups(
+        self,
+        variants: List[TestVariant],
+        cutoff_time: datetime
+    ) -> Dict[TestVariant, AggregatedMetrics]:
+        """Window longer than raw retention: hourly rollups, histogram percentiles"""
+        values = [v.value for v in variants]
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(ROLLUP_AGGREGATE_QUERY, (values, cutoff_time))
                 rows = cur.fetchall()
+                cur.execute(ROLLUP_HISTOGRAM_QUERY, (values, cutoff_time))
+                slots = cur.fetchall()
 
-        if not rows:
-            return None
+        histograms = {value: [0] * LATENCY_SLOTS for value in values}
+        for value, slot, count in slots:
+            histograms[value][slot] = int(count)
 
-        # Extract data
-        retrieval_times = [row[0] for row in rows]
-        cache_hits = [row[1] for row in rows]
-        coherence_scores = [row[2] for row in rows if row[2] is not None]
-        primed_counts = [row[3] for row in rows]
-        timestamps = [row[4] for row in rows]
+        return {
+            TestVariant(row[0]): AggregatedMetrics(
+                variant=TestVariant(row[0]),
+                sample_count=int(row[1]),
+                avg_retrieval_time_ms=float(row[2]),
+                p50_retrieval_time_ms=histogram_percentile(histograms[row[0]], 50),
+                p95_retrieval_time_ms=histogram_percentile(histograms[row[0]], 95),
+                cache_hit_rate=float(row[3]),
+                avg_context_coherence=float(row[4]),
+                avg_primed_count=float(row[5]),
+                total_duration_seconds=float(row[6])
+            )
+            for row in rows
+        }
 
-        # Calculate aggregates
-        return AggregatedMetrics(
-            variant=variant,
-            sample_count=len(rows),
-            avg_retrieval_time_ms=float(np.mean(retrieval_times)),
-            p50_retrieval_time_ms=float(np.percentile(retrieval_times, 50)),
-            p95_retrieval_time_ms=float(np.percentile(retrieval_times, 95)),
-            cache_hit_rate=float(sum(cache_hits) / len(cache_hits)),
-            avg_context_coherence=float(np.mean(coherence_scores)) if coherence_scores else 0.0,
-            avg_primed_count=float(np.mean(primed_counts)),
-            total_duration_seconds=max(timestamps) - min(timestamps)
-        )
+    def get_aggregated_metrics(
+        self,
+        variant: TestVariant,
+        hours_back: int = 24
+    ) -> Optional[AggregatedMetrics]:
+        """Get aggregated metrics for a variant over a time period"""
+        return self.aggregate([variant], hours_back).get(variant)
 
     def compare_variants(self, hours_back: int = 24) -> Dict:
         """Compare control vs treatment variants"""
-        control = self.get_aggregated_metrics(TestVariant.CONTROL, hours_back)
-        treatment = self.get_aggregated_metrics(TestVariant.TREATMENT, hours_back)
+        metrics = self.aggregate([TestVariant.CONTROL, TestVariant.TREATMENT], hours_back)
+        control = metrics.get(TestVariant.CONTROL)
+        treatment = metrics.get(TestVariant.TREATMENT)
 
         if not control or not treatment:
             return {
@@ -293,22 +601,24 @@ class ABTestManager:
         hours_back: int = 24,
         bucket_minutes: int = 60
     ) -> List[Dict]:
-        """Get time-series data for visualization"""
+        """
+        Get time-series data for visualization (from the rollups)
+
+        bucket_minutes that are whole hours read the hourly rollup,
+        anything else the per-minute one.
+        """
         cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        self.flush()  # the open bucket includes samples still in the buffer
 
-        with psycopg.connect(self.db_conn_string) as conn:
+        unit = "hour" if bucket_minutes % 60 == 0 else "minute"
+        with self.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(f"""
-                    SELECT
-                        DATE_TRUNC('hour', timestamp) as bucket,
-                        AVG(retrieval_time_ms) as avg_latency,
-                        AVG(CASE WHEN cache_hit THEN 1.0 ELSE 0.0 END) as hit_rate,
-                        COUNT(*) as sample_count
-                    FROM ab_test_metrics
-                    WHERE variant = %s AND timestamp >= %s
-                    GROUP BY bucket
-                    ORDER BY bucket ASC
-                """, (variant.value, cutoff_time))
+                cur.execute(TIME_SERIES_QUERY.format(table=ROLLUP_TABLES[unit]), {
+                    "minutes": bucket_minutes,
+                    "variant": variant.value,
+                    "unit": unit,
+                    "cutoff": cutoff_time
+                })
 
                 rows = cur.fetchall()
 
@@ -317,40 +627,52 @@ class ABTestManager:
                 "timestamp": row[0].isoformat(),
                 "avg_latency_ms": float(row[1]),
                 "cache_hit_rate": float(row[2]),
-                "sample_count": row[3]
+                "sample_count": int(row[3])
             }
             for row in rows
         ]
 
     def clear_test_data(self, variant: Optional[TestVariant] = None):
         """Clear test data (for resetting experiments)"""
-        with psycopg.connect(self.db_conn_string) as conn:
+        # Drop buffered samples first so a later flush cannot bring them back
+        with self._lock:
+            self.pending = [m for m in self.pending if variant and m.variant != variant]
+
+        with self.connection() as conn:
             with conn.cursor() as cur:
                 if variant:
-                    cur.execute(
-                        "DELETE FROM ab_test_metrics WHERE variant = %s",
-                        (variant.value,)
-                    )
+                    for table in ("ab_test_metrics", *ROLLUP_TABLES.values()):
+                        cur.execute(f"DELETE FROM {table} WHERE variant = %s", (variant.value,))
                 else:
-                    cur.execute("TRUNCATE TABLE ab_test_metrics")
+                    cur.execute(f"TRUNCATE TABLE ab_test_metrics, {', '.join(ROLLUP_TABLES.values())}")
                 conn.commit()
 
-        # Clear in-memory buffer
-        if variant:
-            self.in_memory_buffer[variant] = []
-        else:
-            self.in_memory_buffer = {
-                TestVariant.CONTROL: [],
-                TestVariant.TREATMENT: []
+    def get_buffer_stats(self) -> Dict:
+        """Write-behind buffer state"""
+        with self._lock:
+            return {
+                "pending": len(self.pending),
+                "flush_batch": self.flush_batch,
+                "max_pending": self.max_pending,
+                "dropped": self.dropped
             }
 
 
 # Singleton instance
 _ab_test_manager: Optional[ABTestManager] = None
 
-def get_ab_test_manager(db_conn_string: str) -> ABTestManager:
+def get_ab_test_manager(db_conn_string: str, pool=None) -> ABTestManager:
     """Get or create singleton ABTestManager instance"""
     global _ab_test_manager
     if _ab_test_manager is None:
-        _ab_test_manager = ABTestManager(db_conn_string)
+        _ab_test_manager = ABTestManager(db_conn_string, pool=pool)
     return _ab_test_manager
+
+
+def flush_ab_test_metrics() -> int:
+    """Flush the singleton's buffered samples (no-op until A/B testing is used)"""
+    if _ab_test_manager is None:
+        return 0
+    written = _ab_test_manager.flush()
+    _ab_test_manager.apply_retention_if_due()
+    return written
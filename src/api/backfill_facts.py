@@ -2,7 +2,33 @@
 """
 NEXUS Hybrid Memory - Fact Backfill Script
 ===========================================
-Extract facts from all existing episodes and update metadata
+Extract facts from all existing episodes and update metadata + the
+typed fact store (nexus_memory.episode_facts)
+
+Parallel and resumable:
+- The episodic table is split into keyset ranges on episode_id
+- Each range runs in its own worker process (extraction is CPU-bound)
+- Every batch is written set-based: one UPDATE ... FROM unnest() for
+  metadata.facts and one COPY into episode_facts
+- The range checkpoint advances in the same transaction as the batch
+  (memory_system.fact_backfill_ranges), so rerunning the same
+  --run-name resumes where it stopped
+- Once a run has finished, rerunning it without --all plans a fresh pass
+  over the episodes that still have no facts (e.g. added since)
+- Ranges are fixed when a run is planned: an episode inserted later with
+  an id behind a range's checkpoint is not visited by that run. New
+  episodes get their facts from the enrichment worker at ingest; a rerun
+  without --all picks up any that still have none
+- --all keeps the two stores in sync: an episode whose re-extraction
+  yields no facts loses both its episode_facts rows and metadata.facts
+- Throughput and ETA are reported while workers run
+
+Usage:
+    python backfill_facts.py                       # only episodes without facts
+    python backfill_facts.py --all --run-name v3   # re-extract after adding a pattern
+    python backfill_facts.py --workers 8 --batch-size 1000
+
+Schema: database/migrations/fact_backfill_checkpoints.sql
 
 Created: October 27, 2025
 Phase: FASE_8_UPGRADE Session 5
@@ -10,14 +36,18 @@ Phase: FASE_8_UPGRADE Session 5
 
 import psycopg
 from psycopg.types.json import Json
+import argparse
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
 from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from fact_extractor import extract_facts_from_content
+import fact_store
 
 # ============================================================
 # Configuration
@@ -29,169 +59,322 @@ POSTGRES_DB = os.getenv("POSTGRES_DB", "nexus_memory")
 POSTGRES_USER = os.getenv("POSTGRES_USER", "nexus_superuser")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "RpKeuQhnwqMOA4iQPILQshWtwFj0P2hm")
 
+CONN_STRING = f"host={POSTGRES_HOST} port={POSTGRES_PORT} dbname={POSTGRES_DB} user={POSTGRES_USER} password={POSTGRES_PASSWORD}"
+
 # Batch size for processing
-BATCH_SIZE = 100
+BATCH_SIZE = 500
+
+# Worker processes (extraction is CPU-bound)
+DEFAULT_WORKERS = os.cpu_count() or 4
+
+# Seconds between progress reports
+PROGRESS_INTERVAL = 5.0
 
 
 # ============================================================
-# Main Backfill Logic
+# Range planning
 # ============================================================
 
-def backfill_facts():
+def plan_ranges(conn, run_name: str, num_ranges: int, only_missing: bool) -> int:
     """
-    Backfill facts for all existing episodes
+    Create keyset ranges for a run
+
+    An unfinished run is resumed as is. A finished only_missing run is
+    planned again, so episodes added since it ran are picked up; a
+    finished full (--all) run is left alone (use a new run name).
+
+    Returns:
+        Number of ranges for the run
     """
-    print("=" * 70)
-    print("NEXUS Hybrid Memory - Fact Backfill")
-    print("=" * 70)
-    print()
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT COUNT(*), COUNT(*) FILTER (WHERE status = 'done')
+            FROM memory_system.fact_backfill_ranges
+            WHERE run_name = %s
+        """, (run_name,))
+        existing, done = cur.fetchone()
+        if existing and done < existing:
+            print(f"↻ Resuming run '{run_name}' ({existing - done}/{existing} ranges left)")
+            return existing
+        if existing and not only_missing:
+            print(f"✅ Run '{run_name}' already finished; use a new --run-name to re-extract")
+            return existing
+        if existing:
+            cur.execute(
+                "DELETE FROM memory_system.fact_backfill_ranges WHERE run_name = %s",
+                (run_name,)
+            )
+            print(f"↻ Run '{run_name}' finished before; planning a new pass over episodes without facts")
+
+        # One ordered pass over the PK index -> equal-sized keyset ranges
+        missing_filter = "WHERE metadata->'facts' IS NULL" if only_missing else ""
+        cur.execute(f"""
+            INSERT INTO memory_system.fact_backfill_ranges
+                (run_name, range_no, lower_episode_id, upper_episode_id, total_count)
+            SELECT %s, bucket, MIN(episode_id), MAX(episode_id), COUNT(*)
+            FROM (
+                SELECT episode_id, ntile(%s) OVER (ORDER BY episode_id) AS bucket
+                FROM nexus_memory.zep_episodic_memory
+                {missing_filter}
+            ) ranked
+            GROUP BY bucket
+        """, (run_name, num_ranges))
+        created = cur.rowcount
+    conn.commit()
+    print(f"📋 Planned {created} ranges for run '{run_name}'")
+    return created
+
+
+def pending_ranges(conn, run_name: str):
+    """Range numbers of a run that are not done yet"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT range_no FROM memory_system.fact_backfill_ranges
+            WHERE run_name = %s AND status <> 'done'
+            ORDER BY range_no
+        """, (run_name,))
+        pending = [row[0] for row in cur.fetchall()]
+    conn.commit()
+    return pending
 
-    # Connect to database
-    print(f"Connecting to PostgreSQL at {POSTGRES_HOST}:{POSTGRES_PORT}...")
-    conn_string = f"host={POSTGRES_HOST} port={POSTGRES_PORT} dbname={POSTGRES_DB} user={POSTGRES_USER} password={POSTGRES_PASSWORD}"
 
-    try:
-        with psycopg.connect(conn_string) as conn:
-            with conn.cursor() as cur:
-                # Count total episodes
-                cur.execute("SELECT COUNT(*) FROM nexus_memory.zep_episodic_memory")
-                total_episodes = cur.fetchone()[0]
+# ============================================================
+# Worker (runs in a child process)
+# ============================================================
 
-                print(f"✅ Connected successfully")
-                print(f"📊 Total episodes to process: {total_episodes}")
-                print()
+def process_range(run_name: str, range_no: int, batch_size: int, only_missing: bool,
+                  conninfo: str = CONN_STRING) -> int:
+    """
+    Extract and write facts for one keyset range, checkpointing per batch
 
-                # Count episodes that already have facts
-                cur.execute("""
-                    SELECT COUNT(*)
-                    FROM nexus_memory.zep_episodic_memory
-                    WHERE metadata->'facts' IS NOT NULL
-                """)
-                existing_facts = cur.fetchone()[0]
-
-                print(f"📋 Episodes with existing facts: {existing_facts}")
-                print(f"📋 Episodes needing extraction: {total_episodes - existing_facts}")
-                print()
-
-                # Process in batches
-                processed = 0
-                facts_extracted = 0
-                failed = 0
-
-                print(f"Starting batch processing (batch size: {BATCH_SIZE})...")
-                print()
-
-                offset = 0
-                while offset < total_episodes:
-                    # Fetch batch
-                    cur.execute("""
-                        SELECT episode_id, content, metadata, tags
-                        FROM nexus_memory.zep_episodic_memory
-                        ORDER BY created_at ASC
-                        LIMIT %s OFFSET %s
-                    """, (BATCH_SIZE, offset))
+    Args:
+        conninfo: Database to connect to (the CLI's environment by default;
+            jobs pass their own, which reads the password secret file)
 
+    Returns:
+        Number of episodes processed by this call
+    """
+    processed_here = 0
+    missing_filter = "AND metadata->'facts' IS NULL" if only_missing else ""
+
+    with psycopg.connect(conninfo) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE memory_system.fact_backfill_ranges
+                SET status = 'running', updated_at = NOW()
+                WHERE run_name = %s AND range_no = %s
+                RETURNING lower_episode_id, upper_episode_id, last_episode_id
+            """, (run_name, range_no))
+            lower_id, upper_id, last_id = cur.fetchone()
+        conn.commit()
+
+        try:
+            while True:
+                with conn.cursor() as cur:
+                    # Keyset pagination: start inclusive, then strictly after checkpoint
+                    lower_op, lower_value = (">=", lower_id) if last_id is None else (">", last_id)
+                    cur.execute(f"""
+                        SELECT episode_id, content, tags, created_at
+                        FROM nexus_memory.zep_episodic_memory
+                        WHERE episode_id {lower_op} %s AND episode_id <= %s {missing_filter}
+                        ORDER BY episode_id
+                        LIMIT %s
+                    """, (lower_value, upper_id, batch_size))
                     batch = cur.fetchall()
 
                     if not batch:
-                        break
-
-                    # Process each episode in batch
-                    for row in batch:
-                        episode_id = row[0]
-                        content = row[1]
-                        metadata = row[2] or {}
-                        tags = row[3]
-
-                        processed += 1
-
-                        # Skip if already has facts (unless we want to re-extract)
-                        if metadata.get("facts") is not None:
-                            continue
-
-                        try:
-                            # Extract facts
-                            facts = extract_facts_from_content(content, tags)
-
-                            if facts:
-                                # Update metadata with facts
-                                metadata["facts"] = facts
-
-                                # Update episode in database
-                                cur.execute("""
-                                    UPDATE nexus_memory.zep_episodic_memory
-                                    SET metadata = %s
-                                    WHERE episode_id = %s
-                                """, (Json(metadata), episode_id))
-
-                                facts_extracted += 1
-
-                                # Print progress every 50 episodes
-                                if facts_extracted % 50 == 0:
-                                    print(f"  ✅ Processed {processed}/{total_episodes} episodes, extracted facts from {facts_extracted}")
-
-                        except Exception as e:
-                            failed += 1
-                            print(f"  ❌ Error processing episode {episode_id}: {str(e)}")
-
-                    # Commit batch
-                    conn.commit()
-
-                    offset += BATCH_SIZE
-
-                print()
-                print("=" * 70)
-                print("BACKFILL COMPLETE")
-                print("=" * 70)
-                print(f"✅ Total episodes processed: {processed}")
-                print(f"✅ Facts extracted: {facts_extracted}")
-                print(f"❌ Failed: {failed}")
-                print(f"📊 Success rate: {(facts_extracted/processed*100):.1f}%")
-                print()
-
-                # Final statistics
+                        cur.execute("""
+                            UPDATE memory_system.fact_backfill_ranges
+                            SET status = 'done', updated_at = NOW()
+                            WHERE run_name = %s AND range_no = %s
+                        """, (run_name, range_no))
+                        conn.commit()
+                        return processed_here
+
+                    ids, facts_json, fact_rows, no_facts = [], [], [], []
+                    for episode_id, content, tags, created_at in batch:
+                        facts = extract_facts_from_content(content or "", tags)
+                        if facts:
+                            ids.append(episode_id)
+                            facts_json.append(Json(facts))
+                            fact_rows.extend(fact_store.fact_rows(episode_id, facts, created_at))
+                        else:
+                            no_facts.append(episode_id)
+
+                    if ids:
+                        # Set-based metadata update
+                        cur.execute("""
+                            UPDATE nexus_memory.zep_episodic_memory e
+                            SET metadata = jsonb_set(COALESCE(e.metadata, '{}'::jsonb), '{facts}', v.facts)
+                            FROM unnest(%s::uuid[], %s::jsonb[]) AS v(episode_id, facts)
+                            WHERE e.episode_id = v.episode_id
+                        """, (ids, facts_json))
+
+                    if no_facts and not only_missing:
+                        # Re-extraction found nothing: drop facts an older pattern produced
+                        cur.execute("""
+                            UPDATE nexus_memory.zep_episodic_memory
+                            SET metadata = metadata - 'facts'
+                            WHERE episode_id = ANY(%s::uuid[]) AND metadata ? 'facts'
+                        """, (no_facts,))
+
+                    # Typed fact store: replace the whole batch's rows via COPY
+                    # (re-extraction may drop facts an older pattern produced)
+                    fact_store.delete_facts(cur, [row[0] for row in batch])
+                    if fact_rows:
+                        with cur.copy("""
+                            COPY nexus_memory.episode_facts
+                                (episode_id, fact_type, value_text, value_num, confidence, created_at)
+                            FROM STDIN
+                        """) as copy:
+                            for fact_row in fact_rows:
+                                copy.write_row(fact_row)
+
+                    last_id = batch[-1][0]
+                    processed_here += len(batch)
+
+                    # Checkpoint in the same transaction as the writes
+                    cur.execute("""
+                        UPDATE memory_system.fact_backfill_ranges
+                        SET last_episode_id = %s,
+                            processed_count = processed_count + %s,
+                            facts_written = facts_written + %s,
+                            updated_at = NOW()
+                        WHERE run_name = %s AND range_no = %s
+                    """, (last_id, len(batch), len(fact_rows), run_name, range_no))
+                conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            with conn.cursor() as cur:
                 cur.execute("""
-                    SELECT COUNT(*)
-                    FROM nexus_memory.zep_episodic_memory
-                    WHERE metadata->'facts' IS NOT NULL
-                """)
-                final_with_facts = cur.fetchone()[0]
+                    UPDATE memory_system.fact_backfill_ranges
+                    SET status = 'failed', last_error = %s, updated_at = NOW()
+                    WHERE run_name = %s AND range_no = %s
+                """, (str(e), run_name, range_no))
+            conn.commit()
+            raise
+
+
+# ============================================================
+# Progress
+# ============================================================
 
-                print(f"📊 Final stats:")
-                print(f"   - Total episodes: {total_episodes}")
-                print(f"   - Episodes with facts: {final_with_facts} ({final_with_facts/total_episodes*100:.1f}%)")
-                print()
+def read_progress(conn, run_name: str):
+    """(total, processed, facts_written, done_ranges, ranges) for a run"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT COALESCE(SUM(total_count), 0),
+                   COALESCE(SUM(processed_count), 0),
+                   COALESCE(SUM(facts_written), 0),
+                   COUNT(*) FILTER (WHERE status = 'done'),
+                   COUNT(*)
+            FROM memory_system.fact_backfill_ranges
+            WHERE run_name = %s
+        """, (run_name,))
+        row = cur.fetchone()
+    conn.commit()
+    return row
+
+
+def format_progress(total: int, processed: int, facts_written: int, done_ranges: int,
+                    ranges: int, processed_this_run: int, elapsed: float) -> str:
+    """Progress line with throughput and ETA"""
+    rate = processed_this_run / elapsed if elapsed > 0 else 0.0
+    remaining = max(total - processed, 0)
+    eta_text = f"{remaining / rate:.0f}s" if rate > 0 else "--"
+    return (
+        f"  ✅ {processed}/{total} episodes ({processed / max(total, 1) * 100:.1f}%), "
+        f"{facts_written} facts, ranges {done_ranges}/{ranges}, "
+        f"{rate:.0f} episodes/s, ETA {eta_text}"
+    )
 
-                # Show sample of extracted facts
-                print("Sample of extracted facts:")
-                print("-" * 70)
 
-                cur.execute("""
-                    SELECT episode_id, metadata->'facts' as facts
-                    FROM nexus_memory.zep_episodic_memory
-                    WHERE metadata->'facts' IS NOT NULL
-                    ORDER BY created_at DESC
-                    LIMIT 5
-                """)
-
-                samples = cur.fetchall()
-                for i, (ep_id, facts) in enumerate(samples, 1):
-                    print(f"\n{i}. Episode {ep_id}:")
-                    if isinstance(facts, dict):
-                        for key, value in facts.items():
-                            if key not in ["extraction_method", "extraction_confidence", "last_updated"]:
-                                print(f"   - {key}: {value}")
-
-                print()
+# ============================================================
+# Main Backfill Logic
+# ============================================================
+
+def backfill_facts(
+    run_name: str = "default",
+    workers: int = DEFAULT_WORKERS,
+    batch_size: int = BATCH_SIZE,
+    only_missing: bool = True
+):
+    """
+    Backfill facts for existing episodes in parallel
+    """
+    print("=" * 70)
+    print("NEXUS Hybrid Memory - Fact Backfill")
+    print("=" * 70)
+    print()
+
+    print(f"Connecting to PostgreSQL at {POSTGRES_HOST}:{POSTGRES_PORT}...")
+
+    try:
+        with psycopg.connect(CONN_STRING) as conn:
+            # More ranges than workers keeps the pool busy when ranges differ in cost
+            plan_ranges(conn, run_name, num_ranges=workers * 4, only_missing=only_missing)
+
+            pending = pending_ranges(conn, run_name)
+
+            processed_at_start = read_progress(conn, run_name)[1]
+            print(f"Starting {len(pending)} ranges on {workers} workers (batch size: {batch_size})...")
+            print()
+
+            started = time.time()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                not_done = {
+                    pool.submit(process_range, run_name, range_no, batch_size, only_missing)
+                    for range_no in pending
+                }
+                while not_done:
+                    done, not_done = wait(not_done, timeout=PROGRESS_INTERVAL, return_when=FIRST_EXCEPTION)
+
+                    total, processed, facts_written, done_ranges, ranges = read_progress(conn, run_name)
+                    print(format_progress(
+                        total, processed, facts_written, done_ranges, ranges,
+                        processed - processed_at_start, time.time() - started
+                    ))
+
+                    for future in done:
+                        if future.exception() is not None:
+                            print(f"  ❌ Range failed: {future.exception()}")
+
+            print()
+            print("=" * 70)
+            print("BACKFILL COMPLETE")
+            print("=" * 70)
+            total, processed, facts_written, done_ranges, ranges = read_progress(conn, run_name)
+            print(f"✅ Episodes processed: {processed}/{total}")
+            print(f"✅ Fact rows written: {facts_written}")
+            print(f"📊 Ranges done: {done_ranges}/{ranges}")
+            if done_ranges < ranges:
+                print(f"⚠️  Rerun with --run-name {run_name} to resume failed ranges")
+            print()
 
     except Exception as e:
         print(f"❌ Error connecting to database: {str(e)}")
         sys.exit(1)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Parallel, resumable fact backfill")
+    parser.add_argument("--run-name", default="default", help="Checkpoint name; reuse to resume")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--all", action="store_true", help="Re-extract every episode, not only those without facts")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
     start_time = datetime.now()
-    backfill_facts()
+    backfill_facts(
+        run_name=args.run_name,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        only_missing=not args.all
+    )
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
     print(f"⏱️  Total time: {duration:.2f} seconds")
@@ -238,7 +238,8 @@ class BrainOrchestrator:
                             episode_id::text,
                             content,
                             importance_score,
-                            created_at
+                            created_at,
+                            salience_score
                         FROM nexus_memory.zep_episodic_memory
                         WHERE content ILIKE %s
                         ORDER BY importance_score DESC NULLS LAST, created_at DESC
@@ -247,28 +248,30 @@ class BrainOrchestrator:
 
                     episodes = cur.fetchall()
 
-                    # Calculate REAL salience scores using LAB_001 (v1.2)
-                    salience_scores = {}
-                    for ep in episodes:
-                        episode_id = ep[0]
-                        created_at = ep[3]
-                        if created_at:
-                            try:
-                                score_obj = self.salience.calculate_salience(episode_id, created_at)
-                                salience_scores[episode_id] = score_obj.total_score
-
-                                # Track LAB_001 interaction per episode
-                                self._track_interaction(
-                                    from_lab="LAB_001",
-                                    to_lab="LAB_010",
-                                    signal=f"episode={episode_id[:8]}, salience={score_obj.total_score:.3f}"
-                                )
-                            except Exception as e:
-                                # Fallback if salience calculation fails
-                                salience_scores[episode_id] = 0.5
-                                print(f"⚠️ LAB_001 salience failed for {episode_id}: {e}")
-                        else:
-                            salience_scores[episode_id] = 0.5  # Neutral if no timestamp
+                    # LAB_001 salience: stored by the enrichment worker; episodes it
+                    # has not reached yet are scored in one batched query
+                    salience_scores = {ep[0]: float(ep[4]) for ep in episodes if ep[4] is not None}
+                    missing = [
+                        {'episode_id': ep[0], 'timestamp': ep[3]}
+                        for ep in episodes if ep[4] is None and ep[3]
+                    ]
+                    if missing:
+                        try:
+                            computed = self.salience.batch_calculate_salience(missing)
+                            salience_scores.update({
+                                episode_id: score.total_score for episode_id, score in computed.items()
+                            })
+                        except Exception as e:
+                            # Fallback if salience calculation fails
+                            print(f"⚠️ LAB_001 salience failed for {len(missing)} episodes: {e}")
+
+                    # Track LAB_001 interaction per episode
+                    for episode_id, score in salience_scores.items():
+                        self._track_interaction(
+                            from_lab="LAB_001",
+                            to_lab="LAB_010",
+                            signal=f"episode={episode_id[:8]}, salience={score:.3f}"
+                        )
 
                     # Build working memory items from real episodes with REAL salience
                     working_memory_items = [
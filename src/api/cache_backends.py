@@ -0,0 +1,413 @@
+"""
+Pluggable cache backends shared by LAB_005 (priming) and LAB_007 (preloading)
+
+With several uvicorn workers a per-process dict turns every episode primed
+by worker A into a miss on worker B. Backends:
+
+- LocalCache:   in-process, bounded, optional TTL
+- RedisCache:   shared by all workers, TTL per entry, msgpack values
+                (JSON fallback when msgpack is not installed)
+- TwoTierCache: LocalCache in front of RedisCache (write-through; a remote
+                hit is copied into the local tier)
+
+All backends evict by the same score: weight x recency, where weight is the
+activation (priming) or confidence (preloading) and recency decays with
+exp(-age / RECENCY_TIME_CONSTANT). Redis keeps the time-invariant form
+ln(weight) + touched_at / RECENCY_TIME_CONSTANT in a sorted set, so the
+lowest member is always the lowest-scoring entry.
+
+Backend errors never propagate: a failing Redis behaves like a miss.
+Values that cannot be serialized (anything but dicts, lists, str, bytes,
+numbers, bool and None) raise TypeError instead of being stored as text.
+
+The interface is synchronous and thread-safe. The Redis tier does network
+I/O, so async code calls backends through asyncio.to_thread rather than
+on the event loop.
+
+Date: October 2025
+"""
+
+import os
+import json
+import math
+import time
+import base64
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import msgpack
+except ImportError:  # optional: compact binary values
+    msgpack = None
+
+
+RECENCY_TIME_CONSTANT = 3600.0  # seconds (matches LAB_007's original decay over hours)
+
+CACHE_BACKEND = os.getenv("NEXUS_CACHE_BACKEND", "two_tier")  # local | redis | two_tier
+LOCAL_TIER_TTL = float(os.getenv("NEXUS_CACHE_LOCAL_TTL", "10"))
+
+
+def eviction_score(weight: float, touched_at: float, now: float) -> float:
+    """weight x recency (higher = keep)"""
+    return weight * math.exp(-(now - touched_at) / RECENCY_TIME_CONSTANT)
+
+
+def _log_score(weight: float, touched_at: float) -> float:
+    """Order-preserving, time-invariant form of eviction_score"""
+    return (math.log(weight) if weight > 0 else -1e9) + touched_at / RECENCY_TIME_CONSTANT
+
+
+# ============================================================================
+# Serialization
+# ============================================================================
+
+def _encode_bytes(value):
+    if isinstance(value, bytes):
+        return {"$b64": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        return {key: _encode_bytes(item) for key, item in value.items()}
+    return value
+
+
+def _decode_bytes(value):
+    if isinstance(value, dict):
+        if "$b64" in value:
+            return base64.b64decode(value["$b64"])
+        return {key: _decode_bytes(item) for key, item in value.items()}
+    return value
+
+
+def pack(value: Dict[str, Any]) -> bytes:
+    """
+    msgpack (bytes stay binary) or JSON (bytes as base64).
+
+    Raises:
+        TypeError: value holds a type neither format supports (e.g. datetime)
+    """
+    if msgpack is not None:
+        return msgpack.packb(value, use_bin_type=True)
+    return json.dumps(_encode_bytes(value)).encode("utf-8")
+
+
+def unpack(payload: bytes) -> Dict[str, Any]:
+    if msgpack is not None:
+        return msgpack.unpackb(payload, raw=False)
+    return _decode_bytes(json.loads(payload))
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+@dataclass
+class CacheEntry:
+    value: Dict[str, Any]
+    weight: float
+    touched_at: float       # last set/hit (recency for eviction)
+    stored_at: float = 0.0  # last set (TTL)
+
+
+class CacheBackend:
+    """Interface + hit/miss accounting (per process)"""
+
+    tier = "base"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Dict[str, Any], weight: float) -> int:
+        """Store an entry; returns the number of entries evicted to make room"""
+        raise NotImplementedError
+
+    def contains(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def size(self) -> int:
+        raise NotImplementedError
+
+    def weights(self) -> List[float]:
+        """Weights of entries held in this process (empty for remote tiers)"""
+        return []
+
+    def _count(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "tier": self.tier,
+            "size": self.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total > 0 else 0.0,
+        }
+
+
+class LocalCache(CacheBackend):
+    """In-process cache, evicting the lowest weight x recency entry when full"""
+
+    tier = "local"
+
+    def __init__(self, max_size: int = 100, ttl: Optional[float] = None):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self.entries.get(key)
+            now = time.time()
+            if entry is not None and self.ttl is not None and now - entry.stored_at > self.ttl:
+                del self.entries[key]
+                entry = None
+            self._count(entry is not None)
+            if entry is not None:
+                entry.touched_at = now
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Dict[str, Any], weight: float) -> int:
+        with self._lock:
+            evicted = 0
+            if key not in self.entries:
+                while len(self.entries) >= self.max_size:
+                    now = time.time()
+                    victim = min(self.entries, key=lambda k: eviction_score(
+                        self.entries[k].weight, self.entries[k].touched_at, now
+                    ))
+                    del self.entries[victim]
+                    evicted += 1
+            now = time.time()
+            self.entries[key] = CacheEntry(value, weight, now, now)
+            self.entries.move_to_end(key)
+            self.evictions += evicted
+            return evicted
+
+    def contains(self, key: str) -> bool:
+        entry = self.entries.get(key)
+        return entry is not None and (self.ttl is None or time.time() - entry.stored_at <= self.ttl)
+
+    def delete(self, key: str):
+        with self._lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def size(self) -> int:
+        return len(self.entries)
+
+    def weights(self) -> List[float]:
+        with self._lock:
+            return [entry.weight for entry in self.entries.values()]
+
+
+class RedisCache(CacheBackend):
+    """
+    Redis-backed cache shared by all workers.
+
+    Keys:
+        nexus:cache:{namespace}:{key}   packed {v, w, t}, expires after ttl
+        nexus:cache:{namespace}:scores  sorted set for eviction (lowest first)
+
+    get_client returns a redis.Redis created with decode_responses=False
+    (or None while Redis is unavailable). redis-py blocks on every call,
+    so callers on the event loop go through asyncio.to_thread.
+    """
+
+    tier = "redis"
+
+    def __init__(
+        self,
+        get_client: Callable[[], Any],
+        namespace: str,
+        max_size: int = 1000,
+        ttl: int = 300
+    ):
+        super().__init__()
+        self.get_client = get_client
+        self.namespace = namespace
+        self.max_size = max_size
+        self.ttl = ttl
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"nexus:cache:{self.namespace}:{key}"
+
+    @property
+    def _scores_key(self) -> str:
+        return f"nexus:cache:{self.namespace}:scores"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        client = self.get_client()
+        entry = None
+        if client is not None:
+            try:
+                payload = client.get(self._key(key))
+                if payload is not None:
+                    record = unpack(payload)
+                    entry = CacheEntry(record["v"], record["w"], record["t"], record["t"])
+                    # Refresh recency for eviction ordering
+                    client.zadd(self._scores_key, {key: _log_score(entry.weight, time.time())})
+            except Exception as e:
+                self.errors += 1
+                print(f"Cache get error ({self.namespace}): {e}")
+        self._count(entry is not None)
+        return entry
+
+    def set(self, key: str, value: Dict[str, Any], weight: float) -> int:
+        client = self.get_client()
+        if client is None:
+            return 0
+        now = time.time()
+        payload = pack({"v": value, "w": weight, "t": now})
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.setex(self._key(key), self.ttl, payload)
+            pipe.zadd(self._scores_key, {key: _log_score(weight, now)})
+            pipe.zcard(self._scores_key)
+            size = pipe.execute()[-1]
+
+            evicted = 0
+            if size > self.max_size:
+                victims = [member for member, _ in client.zpopmin(self._scores_key, size - self.max_size)]
+                if victims:
+                    client.delete(*[self._key(self._member(v)) for v in victims])
+                evicted = len(victims)
+            self.evictions += evicted
+            return evicted
+        except Exception as e:
+            self.errors += 1
+            print(f"Cache set error ({self.namespace}): {e}")
+            return 0
+
+    def contains(self, key: str) -> bool:
+        client = self.get_client()
+        try:
+            return bool(client is not None and client.exists(self._key(key)))
+        except Exception:
+            self.errors += 1
+            return False
+
+    def delete(self, key: str):
+        client = self.get_client()
+        if client is None:
+            return
+        try:
+            client.delete(self._key(key))
+            client.zrem(self._scores_key, key)
+        except Exception:
+            self.errors += 1
+
+    def clear(self):
+        client = self.get_client()
+        if client is None:
+            return
+        try:
+            members = client.zrange(self._scores_key, 0, -1)
+            keys = [self._key(self._member(m)) for m in members]
+            client.delete(self._scores_key, *keys)
+        except Exception:
+            self.errors += 1
+
+    def size(self) -> int:
+        client = self.get_client()
+        try:
+            return int(client.zcard(self._scores_key)) if client is not None else 0
+        except Exception:
+            self.errors += 1
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**super().get_stats(), "errors": self.errors, "ttl_seconds": self.ttl}
+
+    @staticmethod
+    def _member(member) -> str:
+        return member.decode("utf-8") if isinstance(member, bytes) else member
+
+
+class TwoTierCache(CacheBackend):
+    """Local tier in front of a shared tier (write-through, read-through)"""
+
+    tier = "two_tier"
+
+    def __init__(self, local: LocalCache, remote: CacheBackend):
+        super().__init__()
+        self.local = local
+        self.remote = remote
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self.local.get(key)
+        if entry is None:
+            entry = self.remote.get(key)
+            if entry is not None:
+                self.local.set(key, entry.value, entry.weight)
+        self._count(entry is not None)
+        return entry
+
+    def set(self, key: str, value: Dict[str, Any], weight: float) -> int:
+        self.local.set(key, value, weight)
+        return self.remote.set(key, value, weight)
+
+    def contains(self, key: str) -> bool:
+        return self.local.contains(key) or self.remote.contains(key)
+
+    def delete(self, key: str):
+        self.local.delete(key)
+        self.remote.delete(key)
+
+    def clear(self):
+        self.local.clear()
+        self.remote.clear()
+
+    def size(self) -> int:
+        return self.remote.size()
+
+    def weights(self) -> List[float]:
+        return self.local.weights()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **super().get_stats(),
+            "tiers": {
+                "local": self.local.get_stats(),
+                "redis": self.remote.get_stats(),
+            }
+        }
+
+
+def make_cache_backend(
+    namespace: str,
+    max_size: int,
+    get_redis_client: Optional[Callable[[], Any]] = None,
+    ttl: int = 300,
+    kind: str = CACHE_BACKEND
+) -> CacheBackend:
+    """Build the configured backend (local when no Redis client getter is given)"""
+    if kind == "local" or get_redis_client is None:
+        return LocalCache(max_size)
+    # The shared tier holds what every worker primed, so it gets more room
+    remote = RedisCache(get_redis_client, namespace, max_size=max_size * 10, ttl=ttl)
+    if kind == "redis":
+        return remote
+    return TwoTierCache(LocalCache(max_size, ttl=LOCAL_TIER_TTL), remote)
@@ -11,21 +11,126 @@ Inspired by:
 - bioRxiv 2025: Interleaved replay prevents catastrophic forgetting
 - O'Neill 2010: 5-10x replay of reward-related memories
 
+I/O: one connection from the shared pool (db_pool.py) and ONE transaction
+per run. Score updates are a single UPDATE ... FROM unnest(), traces are
+written with COPY. Schema: database/migrations/memory_traces.sql
+
+Backward tracing indexes the day once (DayIndex) instead of rescanning
+every episode per breakthrough.
+Benchmark: tests/performance/benchmarks/consolidation/
+
 Author: NEXUS + Ricardo
 Date: October 27, 2025
 Lab: LAB_003 - Sleep Consolidation
 """
 
 import numpy as np
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+import psycopg
+from psycopg.rows import dict_row
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 import json
 import math
 
 
+EPISODES_FROM_DATE_QUERY = """
+    SELECT
+        episode_id,
+        content,
+        embedding::text AS embedding,
+        created_at,
+        tags,
+        importance_score,
+        metadata
+    FROM nexus_memory.zep_episodic_memory
+    WHERE created_at >= %s AND created_at < %s
+    ORDER BY created_at ASC
+"""
+
+OLD_IMPORTANT_MEMORIES_QUERY = """
+    SELECT
+        episode_id,
+        content,
+        embedding::text AS embedding,
+        created_at,
+        tags,
+        importance_score,
+        metadata
+    FROM nexus_memory.zep_episodic_memory
+    WHERE created_at >= %s
+      AND created_at < %s
+      AND metadata->>'consolidated_salience_score' IS NOT NULL
+      AND CAST(metadata->>'consolidated_salience_score' AS FLOAT) >= %s
+    ORDER BY RANDOM()
+    LIMIT %s
+"""
+
+# importance_score is CHECKed to [0, 1]; one out-of-range row would abort the run
+UPDATE_SCORES_QUERY = """
+    UPDATE nexus_memory.zep_episodic_memory e
+    SET
+        metadata = COALESCE(e.metadata, '{}'::jsonb) || jsonb_build_object(
+            'consolidated_salience_score', v.consolidated_salience_score,
+            'breakthrough_score', v.breakthrough_score,
+            'last_consolidated_at', %s::text
+        ),
+        importance_score = LEAST(v.importance_score, 1.0)
+    FROM unnest(%s::uuid[], %s::float8[], %s::float8[], %s::float8[])
+        AS v(episode_id, consolidated_salience_score, breakthrough_score, importance_score)
+    WHERE e.episode_id = v.episode_id
+"""
+
+COPY_TRACES_SQL = """
+    COPY nexus_memory.memory_traces
+        (source_episode_id, target_episode_id, trace_type, strength, narrative_id, created_at)
+    FROM STDIN
+"""
+
+
+# Backward tracing (STEP 3)
+CHAIN_LOOKBACK_US = 12 * 3600 * 1_000_000    # breakthrough window: 12 hours back
+PROXIMITY_US = 3600 * 1_000_000              # temporal proximity: 1 hour
+SIMILARITY_THRESHOLD = 0.65
+MIN_SHARED_TAGS = 2
+SIMILARITY_BLOCK = 256                       # breakthroughs per similarity product
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def parse_embedding(value) -> List[float]:
+    """pgvector text '[0.1,...]' (no adapter registered) -> float32 array"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return np.array(value.strip("[]").split(","), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def parse_metadata(value) -> Dict:
+    """jsonb comes back as a dict from psycopg 3; text as a JSON string"""
+    if not value:
+        return {}
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def episode_micros(created_at: datetime) -> int:
+    """Exact integer microseconds since the epoch (naive or aware timestamps)"""
+    epoch = _EPOCH_UTC if created_at.tzinfo is not None else _EPOCH
+    return (created_at - epoch) // _MICROSECOND
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per uint64 word (SWAR; numpy < 2.0 has no bitwise_count)"""
+    x = words - ((words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
 @dataclass
 class Episode:
     """Episode from memory system"""
@@ -72,6 +177,111 @@ class ConsolidationReport:
     processing_time_seconds: float
     top_breakthroughs: List[Dict]
 
+    def to_dict(self) -> Dict:
+        return {
+            "date": self.date.isoformat(),
+            "episodes_processed": self.episodes_processed,
+            "breakthrough_count": self.breakthrough_count,
+            "chain_count": self.chain_count,
+            "episodes_boosted": self.episodes_boosted,
+            "trace_count": self.trace_count,
+            "avg_boost": round(self.avg_boost, 3),
+            "max_boost": round(self.max_boost, 3),
+            "processing_time_seconds": round(self.processing_time_seconds, 2),
+            "top_breakthroughs": self.top_breakthroughs
+        }
+
+
+class DayIndex:
+    """
+    A day's episodes as time-sorted arrays for backward chain tracing
+
+    - times: int64 microseconds, ascending
+    - embeddings: L2-normalized float32 matrix (zero rows for missing embeddings)
+    - tag_bits: one uint64 bitset row per episode over the day's tag vocabulary
+    - sessions: int codes, -1 for no session
+
+    Ties in created_at are ordered by descending list position, which is
+    the order the original per-candidate scan added them to a chain.
+    """
+
+    def __init__(self, episodes: List[Episode]):
+        order = sorted(range(len(episodes)),
+                       key=lambda i: (episodes[i].created_at, -i))
+        self.episodes = [episodes[i] for i in order]
+        self.times = np.array([episode_micros(e.created_at) for e in self.episodes], dtype=np.int64)
+
+        self.dim = next((len(e.embedding) for e in self.episodes if len(e.embedding)), 0)
+        self.embeddings = self.normalized([e.embedding for e in self.episodes])
+
+        self.tag_ids: Dict[str, int] = {}
+        for episode in self.episodes:
+            for tag in episode.tags:
+                self.tag_ids.setdefault(tag, len(self.tag_ids))
+        self.words = max(1, (len(self.tag_ids) + 63) // 64)
+        self.tag_bits = np.stack([self.bitset(e.tags) for e in self.episodes])
+
+        self.session_ids: Dict[str, int] = {}
+        for episode in self.episodes:
+            if episode.session_id:
+                self.session_ids.setdefault(episode.session_id, len(self.session_ids))
+        self.sessions = np.array(
+            [self.session_ids.get(e.session_id, -1) if e.session_id else -1 for e in self.episodes],
+            dtype=np.int64
+        )
+
+    def normalized(self, vectors) -> np.ndarray:
+        """Unit rows; empty, zero or mismatched vectors become zero rows"""
+        matrix = np.zeros((len(vectors), self.dim), dtype=np.float32)
+        for row, vector in enumerate(vectors):
+            if len(vector) == self.dim and self.dim:
+                matrix[row] = vector
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def bitset(self, tags: List[str]) -> np.ndarray:
+        """Tags as bits over the day's vocabulary (unknown tags cannot be shared)"""
+        bits = np.zeros(self.words, dtype=np.uint64)
+        for tag in tags:
+            position = self.tag_ids.get(tag)
+            if position is not None:
+                bits[position // 64] |= np.uint64(1) << np.uint64(position % 64)
+        return bits
+
+    def chain(self, breakthrough: Episode, lo: int, hi: int, time: int,
+              similarities: np.ndarray) -> List[Episode]:
+        """
+        Precursors of one breakthrough among episodes[lo:hi], oldest first
+
+        Session, similarity and tag matches are related outright ("anchors").
+        The 1-hour proximity rule is measured from the last episode added, so
+        walking back from the breakthrough a non-anchor is kept only if every
+        gap between it and the nearest anchor (or the breakthrough) above it
+        is under an hour: the first larger gap drops everything down to the
+        next anchor.
+        """
+        anchors = similarities > SIMILARITY_THRESHOLD
+
+        shared = self.tag_bits[lo:hi] & self.bitset(breakthrough.tags)
+        anchors |= popcount(shared).sum(axis=1) >= MIN_SHARED_TAGS
+
+        if breakthrough.session_id and breakthrough.session_id in self.session_ids:
+            anchors |= self.sessions[lo:hi] == self.session_ids[breakthrough.session_id]
+
+        gaps = np.diff(self.times[lo:hi], append=time)
+        breaks = ~anchors & (gaps >= PROXIMITY_US)
+
+        # Nearest anchor or break at or above each candidate (n = the breakthrough)
+        n = hi - lo
+        positions = np.where(anchors | breaks, np.arange(n), n)
+        nearest = np.minimum.accumulate(positions[::-1])[::-1]
+        related = np.append(anchors, True)[nearest]
+
+        if related.all():
+            return self.episodes[lo:hi]
+        return list(map(self.episodes.__getitem__, (np.flatnonzero(related) + lo).tolist()))
+
 
 class ConsolidationEngine:
     """
@@ -81,67 +291,37 @@ class ConsolidationEngine:
     interleaved processing to prevent catastrophic forgetting.
     """
 
-    def __init__(self,
-                 db_host: str = 'localhost',
-                 db_port: int = 5432,
-                 db_name: str = 'nexus_memory',
-                 db_user: str = 'nexus_user',
-                 db_password: str = 'nexus_password'):
+    def __init__(self, pool=None, conninfo: Optional[str] = None):
         """
         Initialize consolidation engine
 
         Args:
-            db_host: PostgreSQL host
-            db_port: PostgreSQL port
-            db_name: Database name
-            db_user: Database user
-            db_password: Database password
+            pool: Shared psycopg_pool.ConnectionPool (db_pool.create_db_pool)
+            conninfo: Connection string for standalone runs without a pool
         """
-        self.db_host = db_host
-        self.db_port = db_port
-        self.db_name = db_name
-        self.db_user = db_user
-        self.db_password = db_password
-
-        self.conn = None
-        self.cursor = None
-
-    def connect(self):
-        """Establish database connection"""
-        self.conn = psycopg2.connect(
-            host=self.db_host,
-            port=self.db_port,
-            dbname=self.db_name,
-            user=self.db_user,
-            password=self.db_password
-        )
-        self.cursor = self.conn.cursor(cursor_factory=RealDictCursor)
-
-    def close(self):
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
-
-    def __enter__(self):
-        """Context manager entry"""
-        self.connect()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit"""
-        self.close()
+        self.pool = pool
+        self.conninfo = conninfo
+
+    @contextmanager
+    def connection(self):
+        """Pooled connection (or a dedicated one for standalone runs)"""
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                yield conn
+        else:
+            with psycopg.connect(self.conninfo) as conn:
+                yield conn
 
     # =====================================================================
     # STEP 1: FETCH EPISODES
     # =====================================================================
 
-    def fetch_episodes_from_date(self, target_date: datetime) -> List[Episode]:
+    def fetch_episodes_from_date(self, cur, target_date: datetime) -> List[Episode]:
         """
         Fetch all episodes from a specific date
 
         Args:
+            cur: Cursor with dict rows
             target_date: Date to fetch episodes from
 
         Returns:
@@ -150,27 +330,13 @@ class ConsolidationEngine:
         start_of_day = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
         end_of_day = start_of_day + timedelta(days=1)
 
-        query = """
-            SELECT
-                episode_id,
-                content,
-                embedding,
-                created_at,
-                tags,
-                importance_score,
-                metadata
-            FROM nexus_memory.zep_episodic_memory
-            WHERE created_at >= %s AND created_at < %s
-            ORDER BY created_at ASC
-        """
-
-        self.cursor.execute(query, (start_of_day, end_of_day))
-        rows = self.cursor.fetchall()
+        cur.execute(EPISODES_FROM_DATE_QUERY, (start_of_day, end_of_day))
+        rows = cur.fetchall()
 
         episodes = []
         for row in rows:
             # Parse metadata for LAB_001 scores
-            metadata = json.loads(row['metadata']) if row['metadata'] else {}
+            metadata = parse_metadata(row['metadata'])
 
             emotional_8d = metadata.get('emotional_8d', {
                 'joy': 0.5, 'trust': 0.5, 'fear': 0.0, 'surprise': 0.5,
@@ -188,7 +354,7 @@ class ConsolidationEngine:
             episode = Episode(
                 episode_id=str(row['episode_id']),
                 content=row['content'],
-                embedding=row['embedding'] if row['embedding'] else [],
+                embedding=parse_embedding(row['embedding']),
                 created_at=row['created_at'],
                 session_id=None,  # session_id column no longer exists in schema
                 tags=row['tags'] if row['tags'] else [],
@@ -260,7 +426,7 @@ class ConsolidationEngine:
 
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors"""
-        if not vec1 or not vec2:
+        if len(vec1) == 0 or len(vec2) == 0:
             return 0.0
 
         vec1_np = np.array(vec1)
@@ -283,6 +449,12 @@ class ConsolidationEngine:
 
         Based on Dickinson 1996: Retrospective revaluation
 
+        The day is indexed once (DayIndex); each breakthrough's 12h window is
+        a binary search, and similarities for a block of breakthroughs are
+        one matrix product. A candidate is related by session, similarity
+        (> 0.65), shared tags (>= 2) or by lying within 1 hour of the last
+        episode added to the chain.
+
         Args:
             breakthroughs: List of breakthrough episodes
             all_episodes: All episodes from the day
@@ -290,57 +462,38 @@ class ConsolidationEngine:
         Returns:
             List of chains (sequences of related episodes)
         """
-        chains = []
-
-        for breakthrough in breakthroughs:
-            chain = [breakthrough]
-            current_time = breakthrough.created_at
-
-            # Look back up to 12 hours
-            window_start = current_time - timedelta(hours=12)
-
-            # Find candidates
-            candidates = [e for e in all_episodes
-                         if window_start <= e.created_at < current_time]
-
-            # Sort by recency (most recent first)
-            candidates.sort(key=lambda x: x.created_at, reverse=True)
-
-            for candidate in candidates:
-                # Relatedness criteria
-                is_related = False
-
-                # Same session
-                if (candidate.session_id and breakthrough.session_id and
-                    candidate.session_id == breakthrough.session_id):
-                    is_related = True
-
-                # Semantic similarity
-                if candidate.embedding and breakthrough.embedding:
-                    sim = self.cosine_similarity(candidate.embedding,
-                                                 breakthrough.embedding)
-                    if sim > 0.65:
-                        is_related = True
-
-                # Shared tags (at least 2)
-                shared_tags = set(candidate.tags) & set(breakthrough.tags)
-                if len(shared_tags) >= 2:
-                    is_related = True
-
-                # Temporal proximity (within 1 hour)
-                time_diff = (current_time - candidate.created_at).total_seconds()
-                if time_diff < 3600:
-                    is_related = True
-
-                if is_related:
-                    chain.insert(0, candidate)  # Add to beginning
-                    current_time = candidate.created_at  # Update search time
+        if not breakthroughs or not all_episodes:
+            return []
 
-            # Only keep chains with 2+ episodes
-            if len(chain) >= 2:
-                chains.append(chain)
+        day = DayIndex(all_episodes)
+        times = np.array([episode_micros(b.created_at) for b in breakthroughs], dtype=np.int64)
+        highs = np.searchsorted(day.times, times, side='left')
+        lows = np.searchsorted(day.times, times - CHAIN_LOOKBACK_US, side='left')
+
+        # Blocks of breakthroughs close in time share one similarity product
+        order = np.argsort(times, kind='stable')
+        chains_by_breakthrough: Dict[int, List[Episode]] = {}
+
+        for start in range(0, len(order), SIMILARITY_BLOCK):
+            block = order[start:start + SIMILARITY_BLOCK]
+            span_lo, span_hi = int(lows[block].min()), int(highs[block].max())
+            vectors = day.normalized([breakthroughs[i].embedding for i in block])
+            similarities = day.embeddings[span_lo:span_hi] @ vectors.T
+
+            for column, i in enumerate(block):
+                lo, hi = int(lows[i]), int(highs[i])
+                if lo == hi:
+                    continue
+                chain = day.chain(
+                    breakthroughs[i], lo, hi, int(times[i]),
+                    similarities[lo - span_lo:hi - span_lo, column]
+                )
+                # Only keep chains with 2+ episodes
+                if chain:
+                    chains_by_breakthrough[i] = chain + [breakthroughs[i]]
 
-        return chains
+        return [chains_by_breakthrough[i] for i in range(len(breakthroughs))
+                if i in chains_by_breakthrough]
 
     # =====================================================================
     # STEP 4: CONSOLIDATED SALIENCE CALCULATION
@@ -398,6 +551,7 @@ class ConsolidationEngine:
     # =====================================================================
 
     def fetch_old_important_memories(self,
+                                     cur,
                                      sample_size: int,
                                      min_consolidated_salience: float = 0.70,
                                      min_age_days: int = 7,
@@ -408,6 +562,7 @@ class ConsolidationEngine:
         Based on bioRxiv 2025: Prevents catastrophic forgetting
 
         Args:
+            cur: Cursor with dict rows
             sample_size: Number of old memories to sample
             min_consolidated_salience: Minimum salience threshold
             min_age_days: Minimum age in days
@@ -420,36 +575,18 @@ class ConsolidationEngine:
         min_date = now - timedelta(days=max_age_days)
         max_date = now - timedelta(days=min_age_days)
 
-        query = """
-            SELECT
-                episode_id,
-                content,
-                embedding,
-                created_at,
-                tags,
-                importance_score,
-                metadata
-            FROM nexus_memory.zep_episodic_memory
-            WHERE created_at >= %s
-              AND created_at < %s
-              AND metadata->>'consolidated_salience_score' IS NOT NULL
-              AND CAST(metadata->>'consolidated_salience_score' AS FLOAT) >= %s
-            ORDER BY RANDOM()
-            LIMIT %s
-        """
-
-        self.cursor.execute(query, (min_date, max_date,
-                                   min_consolidated_salience, sample_size))
-        rows = self.cursor.fetchall()
+        cur.execute(OLD_IMPORTANT_MEMORIES_QUERY, (min_date, max_date,
+                                                  min_consolidated_salience, sample_size))
+        rows = cur.fetchall()
 
         episodes = []
         for row in rows:
-            metadata = json.loads(row['metadata']) if row['metadata'] else {}
+            metadata = parse_metadata(row['metadata'])
 
             episode = Episode(
                 episode_id=str(row['episode_id']),
                 content=row['content'],
-                embedding=row['embedding'] if row['embedding'] else [],
+                embedding=parse_embedding(row['embedding']),
                 created_at=row['created_at'],
                 session_id=None,  # session_id column no longer exists in schema
                 tags=row['tags'] if row['tags'] else [],
@@ -518,116 +655,110 @@ class ConsolidationEngine:
     # STEP 7: DATABASE UPDATES
     # =====================================================================
 
-    def update_consolidated_scores(self, episodes: List[Episode]):
+    def update_consolidated_scores(self, cur, episodes: List[Episode]) -> int:
         """
-        Update database with consolidated salience scores
+        Update database with consolidated salience scores (one statement)
 
         Args:
+            cur: Cursor inside the run's transaction
             episodes: List of episodes with calculated consolidated scores
+
+        Returns:
+            Number of episodes written
         """
-        for episode in episodes:
-            if episode.consolidated_salience_score is None:
-                continue
-
-            # Update metadata with new scores
-            self.cursor.execute("""
-                UPDATE zep_episodic_memory
-                SET
-                    metadata = metadata || jsonb_build_object(
-                        'consolidated_salience_score', %s,
-                        'breakthrough_score', %s,
-                        'last_consolidated_at', %s
-                    ),
-                    importance_score = %s
-                WHERE uuid = %s
-            """, (
-                float(episode.consolidated_salience_score),
-                float(episode.breakthrough_score),
-                datetime.now().isoformat(),
-                float(episode.importance_score),
-                episode.episode_id
-            ))
-
-        self.conn.commit()
-
-    def store_memory_traces(self, traces: List[MemoryTrace]):
+        # An episode can sit in several chains: the last computed score wins
+        latest = {e.episode_id: e for e in episodes if e.consolidated_salience_score is not None}
+        if not latest:
+            return 0
+
+        batch = list(latest.values())
+        cur.execute(UPDATE_SCORES_QUERY, (
+            datetime.now().isoformat(),
+            [e.episode_id for e in batch],
+            [float(e.consolidated_salience_score) for e in batch],
+            [float(e.breakthrough_score) for e in batch],
+            [float(e.importance_score) for e in batch],
+        ))
+        return len(batch)
+
+    def store_memory_traces(self, cur, traces: List[MemoryTrace]) -> int:
         """
-        Store memory traces in database
+        Store memory traces in database (COPY)
 
         Args:
+            cur: Cursor inside the run's transaction
             traces: List of MemoryTrace objects
+
+        Returns:
+            Number of traces written
         """
-        # Check if table exists
-        self.cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables
-                WHERE table_name = 'memory_traces'
-            )
-        """)
-
-        table_exists = self.cursor.fetchone()['exists']
-
-        if not table_exists:
-            # Create table if it doesn't exist
-            self.cursor.execute("""
-                CREATE TABLE memory_traces (
-                    trace_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    source_episode_id UUID,
-                    target_episode_id UUID,
-                    trace_type VARCHAR(50),
-                    strength FLOAT,
-                    narrative_id VARCHAR(100),
-                    created_at TIMESTAMP DEFAULT NOW()
-                );
-
-                CREATE INDEX idx_memory_traces_source ON memory_traces(source_episode_id);
-                CREATE INDEX idx_memory_traces_target ON memory_traces(target_episode_id);
-                CREATE INDEX idx_memory_traces_narrative ON memory_traces(narrative_id);
-            """)
-            self.conn.commit()
-
-        # Insert traces
-        for trace in traces:
-            self.cursor.execute("""
-                INSERT INTO memory_traces
-                    (source_episode_id, target_episode_id, trace_type,
-                     strength, narrative_id, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                trace.source_episode_id,
-                trace.target_episode_id,
-                trace.trace_type,
-                trace.strength,
-                trace.narrative_id,
-                trace.created_at
-            ))
-
-        self.conn.commit()
+        if not traces:
+            return 0
+
+        with cur.copy(COPY_TRACES_SQL) as copy:
+            for trace in traces:
+                copy.write_row((
+                    trace.source_episode_id,
+                    trace.target_episode_id,
+                    trace.trace_type,
+                    trace.strength,
+                    trace.narrative_id,
+                    trace.created_at
+                ))
+        return len(traces)
 
     # =====================================================================
     # MAIN CONSOLIDATION PIPELINE
     # =====================================================================
 
-    def consolidate_daily_memories(self, target_date: datetime) -> ConsolidationReport:
+    def consolidate_daily_memories(self, target_date: datetime,
+                                   checkpoint: Optional[Callable[[float, str], None]] = None) -> ConsolidationReport:
         """
         Execute complete nightly consolidation process
 
         Mimics biological sleep: selective replay, backward tracing,
-        interleaved processing to prevent forgetting.
+        interleaved processing to prevent forgetting. The whole run is one
+        transaction: a failure leaves no partial scores or traces.
+
+        Args:
+            target_date: Date to consolidate
+            checkpoint: Optional progress(fraction, step) callback; raising
+                from it (job cancellation) rolls the whole run back
+
+        Returns:
+            ConsolidationReport with statistics
+        """
+        with self.connection() as conn:
+            with conn.transaction():
+                with conn.cursor(row_factory=dict_row) as cur:
+                    return self.run(cur, target_date, checkpoint)
+
+    def run(self, cur, target_date: datetime,
+            checkpoint: Optional[Callable[[float, str], None]] = None) -> ConsolidationReport:
+        """
+        Consolidation pipeline on a cursor (caller owns the transaction)
 
         Args:
+            cur: Cursor with dict rows
             target_date: Date to consolidate
+            checkpoint: Optional progress(fraction, step) callback, called
+                before each step
 
         Returns:
             ConsolidationReport with statistics
         """
         start_time = datetime.now()
 
+        def step(number: int, name: str):
+            print(f"  Step {number}: {name}...")
+            if checkpoint is not None:
+                checkpoint((number - 1) / 7, name)
+
         print(f"[{start_time}] Starting consolidation for {target_date.date()}")
 
         # Step 1: Fetch episodes
-        print("  Step 1: Fetching episodes...")
-        episodes = self.fetch_episodes_from_date(target_date)
+        step(1, "Fetching episodes")
+        episodes = self.fetch_episodes_from_date(cur, target_date)
         print(f"    Found {len(episodes)} episodes")
 
         if len(episodes) == 0:
@@ -645,34 +776,34 @@ class ConsolidationEngine:
             )
 
         # Step 2: Identify breakthroughs
-        print("  Step 2: Identifying breakthroughs...")
+        step(2, "Identifying breakthroughs")
         breakthroughs = self.identify_breakthroughs(episodes)
         print(f"    Detected {len(breakthroughs)} breakthroughs")
 
         # Step 3: Trace backward chains
-        print("  Step 3: Tracing backward chains...")
+        step(3, "Tracing backward chains")
         chains = self.trace_breakthrough_chains(breakthroughs, episodes)
         print(f"    Found {len(chains)} chains")
 
         # Step 4: Calculate consolidated salience
-        print("  Step 4: Calculating consolidated salience...")
+        step(4, "Calculating consolidated salience")
         for chain in chains:
             self.consolidate_chain(chain)
 
         # Step 5: Interleaved replay
-        print("  Step 5: Interleaved replay...")
+        step(5, "Interleaved replay")
         if len(chains) > 0:
             old_sample_size = int(len(chains) * 0.3 / 0.7)  # 30% old, 70% new
-            old_memories = self.fetch_old_important_memories(old_sample_size)
+            old_memories = self.fetch_old_important_memories(cur, old_sample_size)
             print(f"    Sampled {len(old_memories)} old memories")
 
         # Step 6: Create memory traces
-        print("  Step 6: Creating memory traces...")
+        step(6, "Creating memory traces")
         traces = self.create_memory_traces(chains)
         print(f"    Created {len(traces)} memory traces")
 
         # Step 7: Update database
-        print("  Step 7: Updating database...")
+        step(7, "Updating database")
 
         # Collect all boosted episodes
         boosted_episodes = []
@@ -684,8 +815,8 @@ class ConsolidationEngine:
                     boost = episode.consolidated_salience_score - episode.salience_score
                     boosts.append(boost)
 
-        self.update_consolidated_scores(boosted_episodes)
-        self.store_memory_traces(traces)
+        episodes_boosted = self.update_consolidated_scores(cur, boosted_episodes)
+        self.store_memory_traces(cur, traces)
 
         # Calculate statistics
         avg_boost = float(np.mean(boosts)) if boosts else 0.0
@@ -712,7 +843,7 @@ class ConsolidationEngine:
             episodes_processed=len(episodes),
             breakthrough_count=len(breakthroughs),
             chain_count=len(chains),
-            episodes_boosted=len(boosted_episodes),
+            episodes_boosted=episodes_boosted,
             trace_count=len(traces),
             avg_boost=avg_boost,
             max_boost=max_boost,
@@ -734,29 +865,26 @@ if __name__ == "__main__":
     DB_USER = os.getenv('POSTGRES_USER', 'nexus_superuser')
     DB_PASSWORD = os.getenv('POSTGRES_PASSWORD', '')
 
-    with ConsolidationEngine(
-        db_host=DB_HOST,
-        db_port=DB_PORT,
-        db_name=DB_NAME,
-        db_user=DB_USER,
-        db_password=DB_PASSWORD
-    ) as engine:
-        # Consolidate yesterday
-        yesterday = datetime.now() - timedelta(days=1)
-        report = engine.consolidate_daily_memories(yesterday)
-
-        print("\n" + "="*60)
-        print("CONSOLIDATION REPORT")
-        print("="*60)
-        print(f"Date: {report.date.date()}")
-        print(f"Episodes processed: {report.episodes_processed}")
-        print(f"Breakthroughs detected: {report.breakthrough_count}")
-        print(f"Chains traced: {report.chain_count}")
-        print(f"Episodes boosted: {report.episodes_boosted}")
-        print(f"Memory traces created: {report.trace_count}")
-        print(f"Average boost: +{report.avg_boost:.3f}")
-        print(f"Max boost: +{report.max_boost:.3f}")
-        print(f"Processing time: {report.processing_time_seconds:.1f}s")
-        print("\nTop Breakthroughs:")
-        for i, bt in enumerate(report.top_breakthroughs, 1):
-            print(f"  {i}. {bt['content']} (score: {bt['breakthrough_score']:.2f})")
+    engine = ConsolidationEngine(
+        conninfo=f"host={DB_HOST} port={DB_PORT} dbname={DB_NAME} user={DB_USER} password={DB_PASSWORD}"
+    )
+
+    # Consolidate yesterday
+    yesterday = datetime.now() - timedelta(days=1)
+    report = engine.consolidate_daily_memories(yesterday)
+
+    print("\n" + "="*60)
+    print("CONSOLIDATION REPORT")
+    print("="*60)
+    print(f"Date: {report.date.date()}")
+    print(f"Episodes processed: {report.episodes_processed}")
+    print(f"Breakthroughs detected: {report.breakthrough_count}")
+    print(f"Chains traced: {report.chain_count}")
+    print(f"Episodes boosted: {report.episodes_boosted}")
+    print(f"Memory traces created: {report.trace_count}")
+    print(f"Average boost: +{report.avg_boost:.3f}")
+    print(f"Max boost: +{report.max_boost:.3f}")
+    print(f"Processing time: {report.processing_time_seconds:.1f}s")
+    print("\nTop Breakthroughs:")
+    for i, bt in enumerate(report.top_breakthroughs, 1):
+        print(f"  {i}. {bt['content']} (score: {bt['breakthrough_score']:.2f})")
@@ -0,0 +1,43 @@
+"""
+Shared psycopg Connection Pool
+
+One sync psycopg 3 pool per API process for work that runs in threads
+(LAB_003 consolidation, batch jobs). Handlers borrow a connection with
+
+    with db_pool.connection() as conn:
+        ...
+
+which commits on success and rolls back on error, then returns the
+connection to the pool instead of closing it.
+
+The pool is created closed so importing main.py never touches the
+database; lifespan opens it on startup and closes it on shutdown.
+
+Date: October 2025
+"""
+
+import os
+
+from psycopg_pool import ConnectionPool
+
+
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+
+
+def create_db_pool(
+    conninfo: str,
+    min_size: int = DB_POOL_MIN_SIZE,
+    max_size: int = DB_POOL_MAX_SIZE,
+    timeout: float = DB_POOL_TIMEOUT
+) -> ConnectionPool:
+    """Closed pool; call open() (lifespan) before the first connection()"""
+    return ConnectionPool(
+        conninfo,
+        min_size=min_size,
+        max_size=max_size,
+        timeout=timeout,
+        open=False,
+        name="nexus"
+    )
@@ -0,0 +1,457 @@
+"""
+Shared embedding server: one model instance per node
+
+Every uvicorn worker used to load its own SentenceTransformer and the
+embeddings worker another one, so `--workers 2` meant three copies of the
+weights and three torch thread pools competing for the same cores. With
+EMBEDDING_SERVER_SOCKET set, one process owns the model and the others
+are thin clients over a Unix socket:
+
+    python src/api/embedding_server.py           # serve
+    python src/api/embedding_server.py --ping    # healthcheck
+
+Design:
+- BATCHING: connections are served by one thread each, but all texts go
+  through a single EmbeddingBatcher thread. It takes whatever requests
+  arrived within EMBEDDING_BATCH_WAIT_MS (up to EMBEDDING_BATCH_MAX texts)
+  and encodes them in one model call, so concurrent requests from
+  different API workers share a batch.
+- PROTOCOL: length-prefixed frames. Requests are JSON ({"op": "encode",
+  "texts": [...]} or {"op": "ping"}); responses are a JSON header
+  followed by the vectors as raw float32 (no per-float JSON encoding).
+- CLIENTS: EmbeddingClient keeps one connection per thread and reconnects
+  once before giving up. SharedEmbeddingModel wraps it behind the
+  SentenceTransformer encode() interface and falls back to an in-process
+  model while the server is unreachable (retrying the server every
+  EMBEDDING_SERVER_RETRY_SECONDS). The fallback model is released as
+  soon as the server answers again, so a server restart does not leave
+  a model copy behind in every API worker.
+- BLOCKING: encode() is a socket round trip (or an in-process model
+  call); async callers run it through asyncio.to_thread.
+
+Date: October 2025
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import signal
+import socket
+import struct
+import threading
+import socketserver
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+EMBEDDINGS_MODEL = os.getenv("EMBEDDINGS_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Unset: every process loads its own model (previous behaviour)
+EMBEDDING_SERVER_SOCKET = os.getenv("EMBEDDING_SERVER_SOCKET", "")
+EMBEDDING_SERVER_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_TIMEOUT", "30"))
+EMBEDDING_SERVER_WAIT_SECONDS = float(os.getenv("EMBEDDING_SERVER_WAIT_SECONDS", "60"))
+EMBEDDING_SERVER_RETRY_SECONDS = float(os.getenv("EMBEDDING_SERVER_RETRY_SECONDS", "30"))
+EMBEDDING_SERVER_FALLBACK = os.getenv("EMBEDDING_SERVER_FALLBACK", "true").lower() == "true"
+
+EMBEDDING_BATCH_MAX = int(os.getenv("EMBEDDING_BATCH_MAX", "64"))
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+_LENGTH = struct.Struct(">I")
+
+
+class EmbeddingServerUnavailable(ConnectionError):
+    """The embedding server could not be reached"""
+
+
+class EmbeddingServerError(RuntimeError):
+    """The embedding server answered with an error"""
+
+
+# ============================================================================
+# Wire protocol
+# ============================================================================
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(sock: socket.socket, payload: bytes):
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> bytes:
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    if size > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Frame of {size} bytes exceeds {MAX_FRAME_BYTES}")
+    return _recv_exact(sock, size)
+
+
+def pack_response(header: Dict[str, Any], body: bytes = b"") -> bytes:
+    encoded = json.dumps(header).encode()
+    return _LENGTH.pack(len(encoded)) + encoded + body
+
+
+def unpack_response(payload: bytes) -> Tuple[Dict[str, Any], bytes]:
+    (size,) = _LENGTH.unpack_from(payload)
+    header = json.loads(payload[_LENGTH.size:_LENGTH.size + size])
+    return header, payload[_LENGTH.size + size:]
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+class EmbeddingBatcher:
+    """Single encode thread; concurrent requests are merged into one model call"""
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch: int = EMBEDDING_BATCH_MAX,
+        max_wait_ms: float = EMBEDDING_BATCH_WAIT_MS,
+    ):
+        self.encode = encode
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.pending: "queue.Queue[Optional[Tuple[List[str], Future]]]" = queue.Queue()
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+        self.largest_batch = 0
+        self.encode_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        future: Future = Future()
+        self.pending.put((texts, future))
+        return future
+
+    def close(self):
+        self.pending.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            batch = [item]
+            size = len(item[0])
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.pending.put(None)  # finish this batch, then stop
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._encode(batch)
+
+    def _encode(self, batch: List[Tuple[List[str], Future]]):
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        started = time.perf_counter()
+        try:
+            vectors = np.asarray(self.encode(texts), dtype=np.float32) if texts else None
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        finally:
+            self.encode_seconds += time.perf_counter() - started
+
+        self.requests += len(batch)
+        self.batches += 1
+        self.texts += len(texts)
+        self.largest_batch = max(self.largest_batch, len(texts))
+
+        offset = 0
+        for request_texts, future in batch:
+            count = len(request_texts)
+            future.set_result(vectors[offset:offset + count] if count else np.zeros((0, 0), np.float32))
+            offset += count
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "encode_seconds": round(self.encode_seconds, 3),
+        }
+
+
+class _EmbeddingRequestHandler(socketserver.BaseRequestHandler):
+    """One thread per connection; a connection carries any number of requests"""
+
+    def setup(self):
+        self.server.connections.add(self.request)
+
+    def finish(self):
+        self.server.connections.discard(self.request)
+
+    def handle(self):
+        while True:
+            try:
+                request = json.loads(recv_frame(self.request))
+            except (ConnectionError, OSError):
+                return
+            except ValueError as e:
+                send_frame(self.request, pack_response({"error": f"Bad request: {e}"}))
+                return
+            send_frame(self.request, self.server.respond(request))
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server around one EmbeddingBatcher"""
+
+    daemon_threads = True
+    request_queue_size = 128  # every API worker may connect at once (default backlog: 5)
+
+    def __init__(self, socket_path: str, batcher: EmbeddingBatcher, model_name: str = EMBEDDINGS_MODEL):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # stale socket from a previous run
+        self.socket_path = socket_path
+        self.batcher = batcher
+        self.model_name = model_name
+        self.dimension: Optional[int] = None
+        self.started = time.time()
+        self.connections = set()
+        super().__init__(socket_path, _EmbeddingRequestHandler)
+        os.chmod(socket_path, 0o660)
+
+    def respond(self, request: Dict[str, Any]) -> bytes:
+        op = request.get("op", "encode")
+        if op == "ping":
+            return pack_response({
+                "model": self.model_name,
+                "dimension": self.dimension,
+                "pid": os.getpid(),
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "stats": self.batcher.get_stats(),
+            })
+        if op != "encode" or not isinstance(request.get("texts"), list):
+            return pack_response({"error": f"Unsupported request: {op}"})
+
+        try:
+            vectors = self.batcher.submit([str(text) for text in request["texts"]]).result()
+        except Exception as e:
+            return pack_response({"error": f"Encoding failed: {str(e)[:200]}"})
+        if vectors.size:
+            self.dimension = vectors.shape[1]
+        return pack_response(
+            {"count": vectors.shape[0], "dimension": self.dimension},
+            vectors.astype("<f4", copy=False).tobytes()
+        )
+
+    def server_close(self):
+        super().server_close()
+        for connection in list(self.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)  # clients reconnect to the next server
+            except OSError:
+                pass
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+# ============================================================================
+# Clients
+# ============================================================================
+
+class EmbeddingClient:
+    """Blocking client; one connection per calling thread"""
+
+    def __init__(self, socket_path: str = EMBEDDING_SERVER_SOCKET, timeout: float = EMBEDDING_SERVER_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _drop(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+        self._local.sock = None
+
+    def _call(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        payload = json.dumps(request).encode()
+        last_error: Optional[Exception] = None
+        # A kept-alive connection may have been closed by a server restart: retry once
+        for _ in range(2):
+            try:
+                if getattr(self._local, "sock", None) is None:
+                    self._local.sock = self._connect()
+                send_frame(self._local.sock, payload)
+                header, body = unpack_response(recv_frame(self._local.sock))
+                break
+            except (OSError, ConnectionError) as e:
+                self._drop()
+                last_error = e
+        else:
+            raise EmbeddingServerUnavailable(f"Embedding server at {self.socket_path}: {last_error}")
+
+        if "error" in header:
+            raise EmbeddingServerError(header["error"])
+        return header, body
+
+    def ping(self) -> Dict[str, Any]:
+        return self._call({"op": "ping"})[0]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """float32 array of shape (len(texts), dimension)"""
+        header, body = self._call({"op": "encode", "texts": list(texts)})
+        vectors = np.frombuffer(body, dtype="<f4")
+        return vectors.reshape(header["count"], -1) if header["count"] else vectors.reshape(0, 0)
+
+    def close(self):
+        self._drop()
+
+
+class SharedEmbeddingModel:
+    """
+    SentenceTransformer-compatible encode() served by the embedding server
+
+    While the server is unreachable, texts are encoded by an in-process
+    model (loaded on first need via load_local) and the server is retried
+    every retry_seconds; the model is dropped again once the server
+    answers. Without load_local the error is raised instead.
+    """
+
+    def __init__(
+        self,
+        client: EmbeddingClient,
+        load_local: Optional[Callable[[], Any]] = None,
+        retry_seconds: float = EMBEDDING_SERVER_RETRY_SECONDS,
+    ):
+        self.client = client
+        self.load_local = load_local
+        self.retry_seconds = retry_seconds
+        self.local_model = None
+        self._local_lock = threading.Lock()
+        self._server_down_until = 0.0
+
+    @property
+    def backend(self) -> str:
+        return "server" if time.monotonic() >= self._server_down_until else "local"
+
+    def wait_for_server(self, timeout: float = EMBEDDING_SERVER_WAIT_SECONDS, interval: float = 0.5) -> bool:
+        """Ping until the server answers; loads the fallback model if it never does"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self.client.ping()
+                self._server_back()
+                return True
+            except EmbeddingServerUnavailable as e:
+                if time.monotonic() + interval > deadline:
+                    self._server_unavailable(e)
+                    self._local()
+                    return False
+                time.sleep(interval)
+
+    def encode(self, sentences, **kwargs):
+        if time.monotonic() >= self._server_down_until:
+            single = isinstance(sentences, str)
+            try:
+                vectors = self.client.encode([sentences] if single else list(sentences))
+                self._server_back()
+                return vectors[0] if single else vectors
+            except EmbeddingServerUnavailable as e:
+                self._server_unavailable(e)
+        return self._local().encode(sentences, **kwargs)
+
+    def _server_unavailable(self, error: Exception):
+        if self.load_local is None:
+            raise error
+        print(f"⚠ {error}; encoding in-process for {self.retry_seconds:.0f}s")
+        self._server_down_until = time.monotonic() + self.retry_seconds
+
+    def _server_back(self):
+        """Server answered: stop retrying it and release the fallback model"""
+        self._server_down_until = 0.0
+        if self.local_model is not None:
+            with self._local_lock:
+                if self.local_model is not None:
+                    self.local_model = None
+                    print("✓ Embedding server reachable again; released the in-process model")
+
+    def _local(self):
+        if self.load_local is None:
+            raise EmbeddingServerUnavailable("Embedding server unavailable and no in-process fallback")
+        if self.local_model is None:
+            with self._local_lock:
+                if self.local_model is None:
+                    self.local_model = self.load_local()
+        return self.local_model
+
+
+# ============================================================================
+# Entry point
+# ============================================================================
+
+def serve(socket_path: str = EMBEDDING_SERVER_SOCKET, model_name: str = EMBEDDINGS_MODEL):
+    """Load the model and serve until SIGTERM/SIGINT"""
+    from sentence_transformers import SentenceTransformer
+
+    print(f"Loading embeddings model: {model_name}")
+    model = SentenceTransformer(model_name)
+    model.encode("warm up")
+
+    batcher = EmbeddingBatcher(lambda texts: model.encode(texts, batch_size=EMBEDDING_BATCH_MAX))
+    server = EmbeddingServer(socket_path, batcher, model_name)
+    server.dimension = model.get_sentence_embedding_dimension()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    thread = threading.Thread(target=server.serve_forever, name="embedding-server", daemon=True)
+    thread.start()
+    print(f"✓ Embedding server listening on {socket_path} (batch <= {EMBEDDING_BATCH_MAX}, wait {EMBEDDING_BATCH_WAIT_MS}ms)")
+    stop.wait()
+
+    server.shutdown()
+    server.server_close()
+    batcher.close()
+    print(f"Embedding server stopped: {batcher.get_stats()}")
+
+
+if __name__ == "__main__":
+    if not EMBEDDING_SERVER_SOCKET:
+        sys.exit("EMBEDDING_SERVER_SOCKET is not set")
+    if "--ping" in sys.argv:
+        try:
+            print(json.dumps(EmbeddingClient(timeout=5).ping()))
+        except (EmbeddingServerUnavailable, EmbeddingServerError) as e:
+            sys.exit(str(e))
+    else:
+        serve()
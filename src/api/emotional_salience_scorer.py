@@ -18,7 +18,34 @@ from typing import Optional, Tuple, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime
 import psycopg
-from psycopg.rows import dict_row
+from psycopg.rows import dict_row, tuple_row
+
+
+# Nearest emotional / somatic row at or before each episode timestamp,
+# for a whole batch in one round trip (two index probes per episode)
+CONTEXT_BATCH_QUERY = """
+    SELECT
+        v.episode_id::text,
+        es.joy, es.trust, es.fear, es.surprise, es.sadness, es.disgust, es.anger,
+        es.anticipation, es.complexity, es.created_at,
+        sm.situation, sm.valence, sm.arousal, sm.strength, sm.created_at
+    FROM unnest(%s::uuid[], %s::timestamptz[]) AS v(episode_id, ts)
+    LEFT JOIN LATERAL (
+        SELECT joy, trust, fear, surprise, sadness, disgust, anger, anticipation,
+               complexity, created_at
+        FROM consciousness.emotional_states_log
+        WHERE created_at <= v.ts
+        ORDER BY created_at DESC
+        LIMIT 1
+    ) es ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT situation, valence, arousal, strength, created_at
+        FROM consciousness.somatic_markers_log
+        WHERE created_at <= v.ts
+        ORDER BY created_at DESC
+        LIMIT 1
+    ) sm ON TRUE
+"""
 
 
 @dataclass
@@ -329,7 +356,20 @@ class EmotionalSalienceScorer:
         """
         # Fetch emotional context
         emotional_state, somatic_marker = self.get_emotional_context(timestamp)
+        return self.score_context(emotional_state, somatic_marker)
+
+    def score_context(self, emotional_state: Optional[EmotionalState],
+                      somatic_marker: Optional[SomaticMarker]) -> SalienceScore:
+        """
+        Salience from an already fetched emotional / somatic context
 
+        Args:
+            emotional_state: Emotional state at encoding (or None)
+            somatic_marker: Somatic marker at encoding (or None)
+
+        Returns:
+            SalienceScore object with total and component scores
+        """
         # If no context available, return neutral salience
         if not emotional_state or not somatic_marker:
             return SalienceScore(
@@ -373,24 +413,66 @@ class EmotionalSalienceScorer:
             has_somatic_context=True
         )
 
-    def batch_calculate_salience(self, episodes: list) -> Dict[str, SalienceScore]:
+    def get_emotional_contexts(self, episodes: list, cursor=None) -> Dict[str, Tuple[Optional[EmotionalState], Optional[SomaticMarker]]]:
+        """
+        Fetch emotional and somatic context for many episodes in one query
+
+        Args:
+            episodes: List of dicts with 'episode_id' and 'timestamp'
+            cursor: Cursor to run on (default: own short-lived connection)
+
+        Returns:
+            Dict mapping episode_id -> (EmotionalState, SomaticMarker)
+        """
+        if not episodes:
+            return {}
+        if cursor is None:
+            with self._get_db_connection() as conn:
+                with conn.cursor(row_factory=tuple_row) as own_cursor:
+                    return self.get_emotional_contexts(episodes, own_cursor)
+
+        cursor.execute(CONTEXT_BATCH_QUERY, (
+            [str(episode['episode_id']) for episode in episodes],
+            [episode['timestamp'] for episode in episodes]
+        ))
+
+        contexts = {}
+        for row in cursor.fetchall():
+            emotional_state = None
+            if row[10] is not None:
+                emotional_state = EmotionalState(*[float(value) for value in row[1:10]], created_at=row[10])
+            somatic_marker = None
+            if row[15] is not None:
+                somatic_marker = SomaticMarker(
+                    situation=row[11],
+                    valence=float(row[12]),
+                    arousal=float(row[13]),
+                    strength=float(row[14]),
+                    timestamp=row[15]
+                )
+            contexts[row[0]] = (emotional_state, somatic_marker)
+        return contexts
+
+    def batch_calculate_salience(self, episodes: list, cursor=None) -> Dict[str, SalienceScore]:
         """
         Calculate salience for multiple episodes efficiently
 
+        One context query for the whole batch instead of two per episode.
+
         Args:
             episodes: List of dicts with 'episode_id' and 'timestamp'
+            cursor: Cursor to run on (default: own short-lived connection)
 
         Returns:
             Dict mapping episode_id -> SalienceScore
         """
-        results = {}
+        contexts = self.get_emotional_contexts(episodes, cursor)
 
+        results = {}
         for episode in episodes:
-            episode_id = episode['episode_id']
-            timestamp = episode['timestamp']
-
-            salience = self.calculate_salience(episode_id, timestamp)
-            results[episode_id] = salience
+            episode_id = str(episode['episode_id'])
+            emotional_state, somatic_marker = contexts.get(episode_id, (None, None))
+            results[episode_id] = self.score_context(emotional_state, somatic_marker)
 
         return results
 
@@ -0,0 +1,166 @@
+"""
+Async Episode Fetcher for LAB_007 (Predictive Preloading)
+
+Loads episodes for the preload cache and the episode read endpoint over
+a pooled asyncpg connection, so preloading never blocks the event loop
+on a sync psycopg connection.
+
+fetch() calls issued in the same event-loop tick (e.g. the
+asyncio.gather in PreloadingScheduler.preload_predictions) are coalesced
+into ONE query:
+
+    SELECT ... FROM nexus_memory.zep_episodic_memory
+    WHERE episode_id = ANY($1::uuid[])
+
+Date: October 2025
+"""
+
+import os
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import asyncpg
+
+
+EPISODE_FETCH_POOL_MIN = int(os.getenv("EPISODE_FETCH_POOL_MIN", "1"))
+EPISODE_FETCH_POOL_MAX = int(os.getenv("EPISODE_FETCH_POOL_MAX", "5"))
+
+FETCH_QUERY = """
+    SELECT episode_id, content, importance_score, tags, created_at
+    FROM nexus_memory.zep_episodic_memory
+    WHERE episode_id = ANY($1::uuid[])
+"""
+
+TRACK_ACCESS_QUERY = "SELECT nexus_memory.update_access_tracking($1::uuid)"
+
+
+def episode_record(row) -> Dict[str, Any]:
+    """asyncpg row -> JSON-ready episode dict (the shape cached by LAB_007)"""
+    return {
+        "episode_id": str(row["episode_id"]),
+        "content": row["content"],
+        "importance_score": float(row["importance_score"]) if row["importance_score"] is not None else None,
+        "tags": list(row["tags"] or []),
+        "created_at": row["created_at"].isoformat() if row["created_at"] is not None else None,
+    }
+
+
+class EpisodeFetcher:
+    """
+    Pooled, batching episode loader.
+
+    Usage:
+        fetcher = EpisodeFetcher(DB_CONN_STRING)
+        episode = await fetcher.fetch(episode_id)       # coalesced
+        episodes = await fetcher.fetch_many(ids)        # explicit batch
+        await fetcher.close()
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = EPISODE_FETCH_POOL_MIN,
+        max_size: int = EPISODE_FETCH_POOL_MAX,
+        pool_factory: Callable[..., Any] = asyncpg.create_pool
+    ):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool_factory = pool_factory
+
+        self._pool = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        # Strong references to in-flight flushes (the loop only keeps weak ones)
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+        self.queries = 0
+        self.episodes_requested = 0
+        self.episodes_fetched = 0
+
+    async def pool(self):
+        """Create the pool on first use (inside the running event loop)"""
+        if self._pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await self.pool_factory(
+                        self.dsn, min_size=self.min_size, max_size=self.max_size
+                    )
+        return self._pool
+
+    async def fetch_many(self, episode_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Load episodes in one round trip.
+
+        Returns:
+            episode_id -> episode dict (missing ids are absent)
+        """
+        episode_ids = list(dict.fromkeys(episode_ids))
+        if not episode_ids:
+            return {}
+        pool = await self.pool()
+        rows = await pool.fetch(FETCH_QUERY, episode_ids)
+        self.queries += 1
+        self.episodes_requested += len(episode_ids)
+        self.episodes_fetched += len(rows)
+        return {str(row["episode_id"]): episode_record(row) for row in rows}
+
+    async def fetch(self, episode_id: str) -> Dict[str, Any]:
+        """
+        Load one episode, batched with every fetch() of the same loop tick.
+
+        Raises:
+            LookupError: episode does not exist
+        """
+        future = self._pending.get(episode_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                # Runs after the callbacks already queued (the other gathered fetches)
+                loop.call_soon(self._schedule_flush)
+            future = self._pending[episode_id] = loop.create_future()
+        return await asyncio.shield(future)
+
+    async def track_access(self, episode_id: str):
+        """Intelligent decay access tracking, off the request path"""
+        pool = await self.pool()
+        await pool.execute(TRACK_ACCESS_QUERY, episode_id)
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pool_max_size": self.max_size,
+            "queries": self.queries,
+            "episodes_requested": self.episodes_requested,
+            "episodes_fetched": self.episodes_fetched,
+            "episodes_per_query": self.episodes_requested / self.queries if self.queries else 0.0,
+        }
+
+    def _schedule_flush(self):
+        task = asyncio.ensure_future(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self):
+        batch, self._pending = self._pending, {}
+        try:
+            episodes = await self.fetch_many(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for episode_id, future in batch.items():
+            if future.done():
+                continue
+            episode = episodes.get(episode_id)
+            if episode is None:
+                future.set_exception(LookupError(f"Episode {episode_id} not found"))
+            else:
+                future.set_result(episode)
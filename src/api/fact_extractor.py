@@ -8,7 +8,7 @@ Phase: FASE_8_UPGRADE Session 5
 """
 
 import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Pattern, Tuple, Union
 from datetime import datetime
 from fact_schemas import EpisodeFacts
 
@@ -138,23 +138,69 @@ FACT_PATTERNS = {
 }
 
 
+# ============================================================
+# COMPILED EXTRACTION ENGINE
+# ============================================================
+
+# All patterns compiled once at import (not per call via the re cache)
+COMPILED_PATTERNS: Dict[str, List[Pattern]] = {
+    fact_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for fact_type, patterns in FACT_PATTERNS.items()
+}
+
+# Keyword prefilter: a fact type is only evaluated if its content
+# (lowercased once) contains at least one of these literals. Every
+# pattern of the fact type requires one of them to match, so skipping
+# is exact - results are identical to running every pattern.
+# None = no cheap necessary literal, always evaluate.
+FACT_PREFILTERS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "nexus_version": (".",),
+    "accuracy_percent": ("%",),
+    "latency_ms": ("ms",),
+    "episode_count": ("episode",),
+    "query_count": ("quer",),
+    "test_count": ("test",),
+    "status": ("status", "state", "complete", "implementation"),
+    "phase_number": ("phase", ":"),
+    "session_number": ("session", ":"),
+    "feature_name": ("feature", "implement"),
+    "implementation_time_hours": ("hour", "time"),
+    "lines_of_code": ("line", "loc"),
+    "benchmark_name": ("benchmark",),
+    "benchmark_score": ("benchmark", "score"),
+    "baseline_score": ("%",),
+    "bug_count": ("bug",),
+    "error_count": ("error",),
+    "commit_hash": None,
+    "decay_score": ("decay",),
+}
+
+
+def _clean_feature_name(value: str) -> str:
+    # Clean up feature name (remove trailing punctuation, etc.)
+    return value.rstrip(".:,;")
+
+
 # ============================================================
 # EXTRACTION FUNCTIONS
 # ============================================================
 
-def extract_with_pattern(content: str, patterns: List[str]) -> Optional[str]:
+def extract_with_pattern(content: str, patterns: List[Union[str, Pattern]]) -> Optional[str]:
     """
     Try multiple patterns to extract a value
 
     Args:
         content: Episode content text
-        patterns: List of regex patterns to try
+        patterns: List of regex patterns (raw strings or precompiled)
 
     Returns:
         First matched value or None
     """
     for pattern in patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
+        if isinstance(pattern, str):
+            match = re.search(pattern, content, re.IGNORECASE)
+        else:
+            match = pattern.search(content)
         if match:
             return match.group(1).strip()
     return None
@@ -236,6 +282,67 @@ def normalize_status(status: Optional[str]) -> Optional[str]:
     return status_upper
 
 
+# Output order and value conversion per fact type
+FACT_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    "nexus_version": str,
+    "accuracy_percent": extract_numeric,
+    "latency_ms": extract_numeric,
+    "episode_count": extract_integer,
+    "query_count": extract_integer,
+    "test_count": extract_integer,
+    "status": normalize_status,
+    "phase_number": extract_integer,
+    "session_number": extract_integer,
+    "feature_name": _clean_feature_name,
+    "implementation_time_hours": extract_numeric,
+    "lines_of_code": extract_integer,
+    "benchmark_name": str,
+    "benchmark_score": extract_numeric,
+    "baseline_score": extract_numeric,
+    "bug_count": extract_integer,
+    "error_count": extract_integer,
+    "commit_hash": str,
+    "decay_score": extract_numeric,
+}
+
+# Precomputed (fact_type, keywords, compiled patterns, converter) plan
+_EXTRACTION_PLAN = [
+    (fact_type, FACT_PREFILTERS.get(fact_type), COMPILED_PATTERNS[fact_type], converter)
+    for fact_type, converter in FACT_CONVERTERS.items()
+]
+
+
+def extract_raw_facts(content: str) -> Dict[str, Any]:
+    """
+    Extract all fact values (without extraction metadata)
+
+    Lowercases content once for the keyword prefilter, then runs only the
+    precompiled patterns of fact types whose keywords are present.
+
+    Args:
+        content: Episode narrative content
+
+    Returns:
+        Dictionary of fact_type -> converted value
+    """
+    facts = {}
+    lowered = content.lower()
+
+    for fact_type, keywords, patterns, converter in _EXTRACTION_PLAN:
+        if keywords is not None and not any(keyword in lowered for keyword in keywords):
+            continue
+
+        for pattern in patterns:
+            match = pattern.search(content)
+            if match:
+                value = match.group(1).strip()
+                if value:
+                    facts[fact_type] = converter(value)
+                break
+
+    return facts
+
+
 def extract_facts_from_content(content: str, tags: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Extract all facts from episode content
@@ -247,95 +354,7 @@ def extract_facts_from_content(content: str, tags: Optional[List[str]] = None) -
     Returns:
         Dictionary of extracted facts
     """
-    facts = {}
-
-    # Extract version
-    version = extract_with_pattern(content, FACT_PATTERNS["nexus_version"])
-    if version:
-        facts["nexus_version"] = version
-
-    # Extract metrics
-    accuracy = extract_with_pattern(content, FACT_PATTERNS["accuracy_percent"])
-    if accuracy:
-        facts["accuracy_percent"] = extract_numeric(accuracy)
-
-    latency = extract_with_pattern(content, FACT_PATTERNS["latency_ms"])
-    if latency:
-        facts["latency_ms"] = extract_numeric(latency)
-
-    # Extract counts
-    episode_count = extract_with_pattern(content, FACT_PATTERNS["episode_count"])
-    if episode_count:
-        facts["episode_count"] = extract_integer(episode_count)
-
-    query_count = extract_with_pattern(content, FACT_PATTERNS["query_count"])
-    if query_count:
-        facts["query_count"] = extract_integer(query_count)
-
-    test_count = extract_with_pattern(content, FACT_PATTERNS["test_count"])
-    if test_count:
-        facts["test_count"] = extract_integer(test_count)
-
-    # Extract status
-    status = extract_with_pattern(content, FACT_PATTERNS["status"])
-    if status:
-        facts["status"] = normalize_status(status)
-
-    # Extract phase & session
-    phase = extract_with_pattern(content, FACT_PATTERNS["phase_number"])
-    if phase:
-        facts["phase_number"] = extract_integer(phase)
-
-    session = extract_with_pattern(content, FACT_PATTERNS["session_number"])
-    if session:
-        facts["session_number"] = extract_integer(session)
-
-    # Extract feature name
-    feature = extract_with_pattern(content, FACT_PATTERNS["feature_name"])
-    if feature:
-        # Clean up feature name (remove trailing punctuation, etc.)
-        facts["feature_name"] = feature.rstrip(".:,;")
-
-    # Extract implementation metrics
-    impl_time = extract_with_pattern(content, FACT_PATTERNS["implementation_time_hours"])
-    if impl_time:
-        facts["implementation_time_hours"] = extract_numeric(impl_time)
-
-    loc = extract_with_pattern(content, FACT_PATTERNS["lines_of_code"])
-    if loc:
-        facts["lines_of_code"] = extract_integer(loc)
-
-    # Extract benchmark info
-    benchmark_name = extract_with_pattern(content, FACT_PATTERNS["benchmark_name"])
-    if benchmark_name:
-        facts["benchmark_name"] = benchmark_name
-
-    benchmark_score = extract_with_pattern(content, FACT_PATTERNS["benchmark_score"])
-    if benchmark_score:
-        facts["benchmark_score"] = extract_numeric(benchmark_score)
-
-    baseline = extract_with_pattern(content, FACT_PATTERNS["baseline_score"])
-    if baseline:
-        facts["baseline_score"] = extract_numeric(baseline)
-
-    # Extract bugs/errors
-    bugs = extract_with_pattern(content, FACT_PATTERNS["bug_count"])
-    if bugs:
-        facts["bug_count"] = extract_integer(bugs)
-
-    errors = extract_with_pattern(content, FACT_PATTERNS["error_count"])
-    if errors:
-        facts["error_count"] = extract_integer(errors)
-
-    # Extract GitHub info
-    commit = extract_with_pattern(content, FACT_PATTERNS["commit_hash"])
-    if commit:
-        facts["commit_hash"] = commit
-
-    # Extract decay
-    decay = extract_with_pattern(content, FACT_PATTERNS["decay_score"])
-    if decay:
-        facts["decay_score"] = extract_numeric(decay)
+    facts = extract_raw_facts(content)
 
     # Add metadata
     if facts:
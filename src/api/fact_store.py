@@ -0,0 +1,188 @@
+"""
+NEXUS Hybrid Memory - Typed Fact Store
+=======================================
+Narrow side table for extracted facts (one row per episode x fact_type)
+
+    nexus_memory.episode_facts
+        (episode_id, fact_type, value_text, value_num, confidence, created_at)
+        index (fact_type, created_at DESC)
+
+"Latest nexus_version" is an index range scan that stops after `limit`
+rows instead of a filtered scan over every episode's metadata JSON.
+metadata.facts stays the source the facts were extracted into; this
+table is the query path for /memory/facts and /memory/hybrid.
+
+Schema: database/migrations/episode_facts.sql
+
+Created: October 2025
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Bookkeeping keys written by the extractor - not facts
+FACT_METADATA_KEYS = ("extraction_method", "extraction_confidence", "last_updated")
+
+DEFAULT_CONFIDENCE = 0.8
+
+_INSERT_SQL = """
+    INSERT INTO nexus_memory.episode_facts
+        (episode_id, fact_type, value_text, value_num, confidence, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON CONFLICT (episode_id, fact_type) DO UPDATE
+        SET value_text = EXCLUDED.value_text,
+            value_num = EXCLUDED.value_num,
+            confidence = EXCLUDED.confidence,
+            created_at = EXCLUDED.created_at
+"""
+
+_QUERY_SQL = """
+    SELECT f.episode_id, f.value_text, f.value_num, f.confidence, f.created_at
+    FROM nexus_memory.episode_facts f
+    {tags_join}
+    WHERE f.fact_type = %(fact_type)s
+      {time_filters}
+    ORDER BY f.created_at {order}
+    LIMIT %(limit)s
+"""
+
+_TAGS_JOIN = """
+    JOIN nexus_memory.zep_episodic_memory e
+      ON e.episode_id = f.episode_id AND e.tags && %(filter_tags)s::TEXT[]
+"""
+
+
+@dataclass
+class StoredFact:
+    """One row of nexus_memory.episode_facts"""
+    episode_id: str
+    value: Any
+    confidence: float
+    created_at: Optional[datetime]
+
+
+def split_value(value: Any) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Split a fact value into (value_text, value_num)
+
+    Numbers keep their text form too so ints and floats round-trip.
+    """
+    if value is None:
+        return None, None
+    if isinstance(value, bool):
+        return str(value).lower(), None
+    if isinstance(value, (int, float)):
+        return str(value), float(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str), None
+    return str(value), None
+
+
+def fact_value(value_text: Optional[str], value_num: Optional[float]) -> Any:
+    """Inverse of split_value: typed value for API responses"""
+    if value_num is None:
+        return value_text
+    if value_text is not None and "." not in value_text and float(value_num).is_integer():
+        return int(value_num)
+    return value_num
+
+
+def fact_rows(episode_id: str, facts: Dict[str, Any], created_at: datetime) -> List[Tuple]:
+    """
+    Convert an extractor result (metadata.facts) into episode_facts rows
+
+    Args:
+        episode_id: Episode UUID
+        facts: Dict from extract_facts_from_content
+        created_at: Episode creation time (used for recency ordering)
+
+    Returns:
+        List of (episode_id, fact_type, value_text, value_num, confidence, created_at)
+    """
+    if not facts:
+        return []
+
+    confidence = facts.get("extraction_confidence", DEFAULT_CONFIDENCE)
+    rows = []
+    for fact_type, value in facts.items():
+        if fact_type in FACT_METADATA_KEYS or value is None:
+            continue
+        value_text, value_num = split_value(value)
+        rows.append((episode_id, fact_type, value_text, value_num, confidence, created_at))
+    return rows
+
+
+def write_facts(cur, episode_id: str, facts: Dict[str, Any], created_at: datetime) -> int:
+    """
+    Replace the stored facts of one episode (caller owns the transaction)
+
+    Returns:
+        Number of fact rows written
+    """
+    cur.execute(
+        "DELETE FROM nexus_memory.episode_facts WHERE episode_id = %s",
+        (episode_id,)
+    )
+    rows = fact_rows(episode_id, facts, created_at)
+    if rows:
+        cur.executemany(_INSERT_SQL, rows)
+    return len(rows)
+
+
+def delete_facts(cur, episode_ids: Sequence) -> None:
+    """Remove facts of deleted / archived episodes"""
+    cur.execute(
+        "DELETE FROM nexus_memory.episode_facts WHERE episode_id = ANY(%s::uuid[])",
+        (list(episode_ids),)
+    )
+
+
+def query_facts(
+    cur,
+    fact_type: str,
+    filter_tags: Optional[List[str]] = None,
+    after: Optional[datetime] = None,
+    before: Optional[datetime] = None,
+    order: str = "desc",
+    limit: int = 1
+) -> List[StoredFact]:
+    """
+    Latest (or oldest) values of one fact type
+
+    Fully parameterized; the only composed fragments are fixed strings.
+
+    Returns:
+        StoredFact list ordered by created_at
+    """
+    time_filters = []
+    if after is not None:
+        time_filters.append("AND f.created_at > %(after)s")
+    if before is not None:
+        time_filters.append("AND f.created_at < %(before)s")
+
+    query = _QUERY_SQL.format(
+        tags_join=_TAGS_JOIN if filter_tags else "",
+        time_filters="\n      ".join(time_filters),
+        order="ASC" if order == "asc" else "DESC"
+    )
+
+    cur.execute(query, {
+        "fact_type": fact_type,
+        "filter_tags": filter_tags,
+        "after": after,
+        "before": before,
+        "limit": limit
+    })
+
+    return [
+        StoredFact(
+            episode_id=str(row[0]),
+            value=fact_value(row[1], row[2]),
+            confidence=row[3] if row[3] is not None else DEFAULT_CONFIDENCE,
+            created_at=row[4]
+        )
+        for row in cur.fetchall()
+    ]
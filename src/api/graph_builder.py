@@ -72,6 +72,28 @@ class GraphBuilder:
             )
             return result.single() is not None
 
+    def delete_episode_nodes(self, episode_ids: List[str]) -> int:
+        """
+        Delete episode nodes (and their relationships) in one round trip
+
+        Args:
+            episode_ids: Episode UUIDs to delete
+
+        Returns:
+            Number of nodes deleted
+        """
+        query = """
+        UNWIND $episode_ids AS episode_id
+        MATCH (e:Episode {episode_id: episode_id})
+        DETACH DELETE e
+        RETURN count(*) AS deleted
+        """
+
+        with self.driver.session() as session:
+            result = session.run(query, episode_ids=list(episode_ids))
+            record = result.single()
+            return record['deleted'] if record else 0
+
     def create_relationship(self, rel: Dict) -> bool:
         """
         Create relationship edge between two episodes
@@ -0,0 +1,649 @@
+"""
+Background Job Runner for NEXUS
+
+Long operations run as jobs instead of inside request handlers: the
+POST returns a job id straight away, GET /jobs/{id} reports status,
+progress and result, and POST /jobs/{id}/cancel stops the job.
+
+Design:
+- PERSISTED: status, progress, result and errors live in memory_system.jobs,
+  so every API worker can report on (and cancel) every job
+- OFF-PROCESS: job functions run in a small spawned process pool, so
+  CPU-heavy work never holds the request workers' event loop or GIL
+- BOUNDED: per-type concurrency limits, enforced across workers in the
+  database (advisory lock + count of running jobs with a live heartbeat),
+  on top of the pool size
+- FAN-OUT: a multi-day consolidation is a parent job with one child job
+  per day; the children run in parallel up to the consolidation limit
+- CANCELLABLE: pending jobs are cancelled at once; running jobs stop at
+  their next JobContext.checkpoint() (consolidation rolls back)
+- RECOVERED: at startup, running jobs whose heartbeat is stale (their
+  worker died or was restarted) are marked interrupted, together with
+  their pending children, so they can be resubmitted
+
+Job types (registered in main.py):
+- consolidation:   LAB_003 consolidation of one day
+- fact_backfill:   resumable fact backfill (backfill_facts.py ranges)
+- pruning:         resumable pruning run (pruning_executor.py)
+- priming_rebuild: LAB_005 priming graph re-bootstrap from pgvector
+
+Schema: database/migrations/jobs.sql
+
+Date: October 2025
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import psycopg
+from psycopg.types.json import Json
+
+
+logger = logging.getLogger(__name__)
+
+
+JOB_PROCESS_WORKERS = int(os.getenv("JOB_PROCESS_WORKERS", "2"))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+JOB_SLOT_POLL_SECONDS = float(os.getenv("JOB_SLOT_POLL_SECONDS", "2"))
+
+# Running jobs whose heartbeat is older than this no longer hold a slot
+# (their worker died without marking them)
+STALE_HEARTBEAT_SECONDS = JOB_HEARTBEAT_SECONDS * 3
+
+# Progress writes from inside a job are throttled to one per interval
+CHECKPOINT_INTERVAL_SECONDS = 1.0
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+JOB_COLUMNS = """
+    job_id, job_type, parent_job_id, status, params, progress, progress_message,
+    result, last_error, cancel_requested, created_at, started_at, heartbeat_at,
+    completed_at
+"""
+
+INSERT_JOB_QUERY = """
+    INSERT INTO memory_system.jobs (job_type, params, parent_job_id, status, started_at, heartbeat_at)
+    VALUES (%(job_type)s, %(params)s, %(parent_job_id)s, %(status)s,
+            CASE WHEN %(status)s = 'running' THEN NOW() END,
+            CASE WHEN %(status)s = 'running' THEN NOW() END)
+    RETURNING job_id
+"""
+
+SELECT_JOB_QUERY = f"SELECT {JOB_COLUMNS} FROM memory_system.jobs WHERE job_id = %s"
+
+SELECT_CHILDREN_QUERY = f"""
+    SELECT {JOB_COLUMNS} FROM memory_system.jobs
+    WHERE parent_job_id = %s
+    ORDER BY created_at, job_id
+"""
+
+# Claim runs in one transaction: the advisory lock serializes claims per type
+CLAIM_LOCK_QUERY = "SELECT pg_advisory_xact_lock(hashtext('memory_system.jobs:' || %s))"
+
+RUNNING_COUNT_QUERY = """
+    SELECT COUNT(*) FROM memory_system.jobs
+    WHERE job_type = %s
+      AND status = 'running'
+      AND heartbeat_at > NOW() - make_interval(secs => %s)
+"""
+
+CLAIM_QUERY = """
+    UPDATE memory_system.jobs
+    SET status = 'running', started_at = NOW(), heartbeat_at = NOW()
+    WHERE job_id = %s AND status = 'pending' AND NOT cancel_requested
+    RETURNING job_id
+"""
+
+HEARTBEAT_QUERY = """
+    UPDATE memory_system.jobs
+    SET heartbeat_at = NOW()
+    WHERE job_id = %s AND status = 'running'
+"""
+
+PROGRESS_QUERY = """
+    UPDATE memory_system.jobs
+    SET progress = %s, progress_message = %s, heartbeat_at = NOW()
+    WHERE job_id = %s
+    RETURNING cancel_requested
+"""
+
+FINISH_QUERY = """
+    UPDATE memory_system.jobs
+    SET status = %(status)s,
+        result = %(result)s,
+        last_error = %(error)s,
+        progress = CASE WHEN %(status)s = 'succeeded' THEN 1.0 ELSE progress END,
+        completed_at = NOW()
+    WHERE job_id = %(job_id)s
+"""
+
+# Pending jobs are cancelled outright; running ones see the flag at their next checkpoint
+CANCEL_QUERY = """
+    UPDATE memory_system.jobs
+    SET cancel_requested = TRUE,
+        status = CASE WHEN status = 'pending' THEN 'cancelled' ELSE status END,
+        completed_at = CASE WHEN status = 'pending' THEN NOW() ELSE completed_at END
+    WHERE (job_id = %(job_id)s OR parent_job_id = %(job_id)s)
+      AND status IN ('pending', 'running')
+"""
+
+INTERRUPT_QUERY = """
+    UPDATE memory_system.jobs
+    SET status = 'interrupted', cancel_requested = TRUE, completed_at = NOW()
+    WHERE job_id = ANY(%s::uuid[]) AND status IN ('pending', 'running')
+"""
+
+
+# Jobs whose worker died without marking them (see STALE_HEARTBEAT_SECONDS)
+INTERRUPT_STALE_QUERY = """
+    WITH stale AS (
+        UPDATE memory_system.jobs
+        SET status = 'interrupted',
+            cancel_requested = TRUE,
+            last_error = COALESCE(last_error, 'worker stopped heartbeating'),
+            completed_at = NOW()
+        WHERE status = 'running'
+          AND COALESCE(heartbeat_at, started_at, created_at) < NOW() - make_interval(secs => %s)
+        RETURNING job_id
+    ), orphans AS (
+        UPDATE memory_system.jobs
+        SET status = 'interrupted', cancel_requested = TRUE, completed_at = NOW()
+        WHERE status = 'pending' AND parent_job_id IN (SELECT job_id FROM stale)
+        RETURNING job_id
+    )
+    SELECT job_id FROM stale UNION ALL SELECT job_id FROM orphans
+"""
+
+
+class JobCancelled(Exception):
+    """Raised by JobContext.checkpoint() once cancellation was requested"""
+
+
+def to_json(value: Any) -> Json:
+    """jsonb parameter; datetimes and other non-JSON values as strings"""
+    return Json(value, dumps=lambda obj: json.dumps(obj, default=str))
+
+
+@dataclass
+class JobStatus:
+    """Snapshot of a job row"""
+    job_id: str
+    job_type: str
+    status: str
+    params: Dict[str, Any]
+    progress: float
+    progress_message: Optional[str] = None
+    result: Optional[Any] = None
+    last_error: Optional[str] = None
+    cancel_requested: bool = False
+    parent_job_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    children: List["JobStatus"] = field(default_factory=list)
+
+    @classmethod
+    def from_row(cls, row) -> "JobStatus":
+        return cls(
+            job_id=str(row[0]),
+            job_type=row[1],
+            parent_job_id=str(row[2]) if row[2] else None,
+            status=row[3],
+            params=row[4] or {},
+            progress=float(row[5] or 0.0),
+            progress_message=row[6],
+            result=row[7],
+            last_error=row[8],
+            cancel_requested=bool(row[9]),
+            created_at=row[10],
+            started_at=row[11],
+            heartbeat_at=row[12],
+            completed_at=row[13]
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.status not in ACTIVE_STATUSES
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class JobStore:
+    """
+    memory_system.jobs access
+
+    Pooled in the API process; job processes get a conninfo-only store
+    (picklable) through their JobContext.
+    """
+
+    def __init__(self, pool=None, conninfo: Optional[str] = None):
+        self.pool = pool
+        self.conninfo = conninfo
+
+    def __getstate__(self):
+        # Pools do not cross process boundaries; job processes connect directly
+        return {"pool": None, "conninfo": self.conninfo}
+
+    @contextmanager
+    def connection(self):
+        """Pooled connection (or a dedicated one in job processes)"""
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                yield conn
+        else:
+            with psycopg.connect(self.conninfo) as conn:
+                yield conn
+
+    def create(self, job_type: str, params: Dict, parent_job_id: Optional[str] = None,
+               status: str = 'pending') -> str:
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(INSERT_JOB_QUERY, {
+                    "job_type": job_type,
+                    "params": to_json(params),
+                    "parent_job_id": parent_job_id,
+                    "status": status
+                })
+                return str(cur.fetchone()[0])
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(SELECT_JOB_QUERY, (job_id,))
+                row = cur.fetchone()
+                if row is None:
+                    return None
+                job = JobStatus.from_row(row)
+                cur.execute(SELECT_CHILDREN_QUERY, (job_id,))
+                job.children = [JobStatus.from_row(child) for child in cur.fetchall()]
+        return job
+
+    def claim(self, job_id: str, job_type: str, max_concurrency: int) -> str:
+        """
+        Move a pending job to running if its type has a free slot
+
+        Returns:
+            'running' when claimed, 'pending' when no slot is free,
+            otherwise the job's current status (e.g. 'cancelled')
+        """
+        with self.connection() as conn:
+            with conn.transaction():
+                with conn.cursor() as cur:
+                    cur.execute(CLAIM_LOCK_QUERY, (job_type,))
+                    cur.execute(RUNNING_COUNT_QUERY, (job_type, STALE_HEARTBEAT_SECONDS))
+                    if cur.fetchone()[0] < max_concurrency:
+                        cur.execute(CLAIM_QUERY, (job_id,))
+                        if cur.fetchone() is not None:
+                            return 'running'
+                    cur.execute(SELECT_JOB_QUERY, (job_id,))
+                    row = cur.fetchone()
+        return row[3] if row else 'cancelled'
+
+    def heartbeat(self, job_id: str):
+        with self.connection() as conn:
+            conn.execute(HEARTBEAT_QUERY, (job_id,))
+
+    def progress(self, job_id: str, progress: float, message: Optional[str] = None) -> bool:
+        """Record progress; returns True once cancellation was requested"""
+        with self.connection() as conn:
+            row = conn.execute(PROGRESS_QUERY, (progress, message, job_id)).fetchone()
+        return bool(row and row[0])
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        with self.connection() as conn:
+            conn.execute(FINISH_QUERY, {
+                "job_id": job_id,
+                "status": status,
+                "result": to_json(result) if result is not None else None,
+                "error": error
+            })
+
+    def request_cancel(self, job_id: str):
+        """Cancel a job and its children (pending now, running at their next checkpoint)"""
+        with self.connection() as conn:
+            conn.execute(CANCEL_QUERY, {"job_id": job_id})
+
+    def interrupt(self, job_ids: List[str]):
+        """Mark jobs this worker can no longer finish (shutdown)"""
+        if not job_ids:
+            return
+        with self.connection() as conn:
+            conn.execute(INTERRUPT_QUERY, (list(job_ids),))
+
+    def interrupt_stale(self, stale_seconds: float) -> List[str]:
+        """Mark running jobs without a recent heartbeat (and their pending children) interrupted"""
+        with self.connection() as conn:
+            rows = conn.execute(INTERRUPT_STALE_QUERY, (stale_seconds,)).fetchall()
+        return [str(row[0]) for row in rows]
+
+
+@dataclass
+class JobContext:
+    """
+    Handed to job functions (in the job process)
+
+    Jobs call checkpoint() between units of work: it records progress
+    and raises JobCancelled once cancellation was requested.
+    """
+    job_id: str
+    store: JobStore
+    interval: float = CHECKPOINT_INTERVAL_SECONDS
+    last_write: float = 0.0
+
+    @property
+    def conninfo(self) -> Optional[str]:
+        return self.store.conninfo
+
+    def checkpoint(self, progress: float, message: Optional[str] = None, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.last_write < self.interval:
+            return
+        self.last_write = now
+        if self.store.progress(self.job_id, progress, message):
+            raise JobCancelled(self.job_id)
+
+
+@dataclass
+class JobType:
+    """A registered job function and its concurrency limit"""
+    name: str
+    fn: Callable[..., Any]
+    max_concurrency: int
+
+
+def execute_job(fn: Callable[..., Any], ctx: JobContext, params: Dict) -> Any:
+    """Entry point in the job process"""
+    return fn(ctx, **params)
+
+
+class JobRunner:
+    """
+    Accepts jobs, runs them in a process pool within per-type limits,
+    and records their outcome in memory_system.jobs
+
+    Usage:
+        runner = JobRunner(JobStore(pool=db_pool), JobStore(conninfo=DB_CONN_STRING))
+        runner.register("consolidation", run_consolidation, max_concurrency=2)
+        job_id = await runner.submit("consolidation", {"date": "2025-10-27"})
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        context_store: Optional[JobStore] = None,
+        max_workers: int = JOB_PROCESS_WORKERS,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            store: Job table access for this process
+            context_store: Store handed to job processes (defaults to store)
+            max_workers: Job processes (ignored when executor is given)
+            executor: Executor to run job functions in (default: spawned process pool)
+        """
+        self.store = store
+        self.context_store = context_store or store
+        self.max_workers = max_workers
+        self._executor = executor
+        self.job_types: Dict[str, JobType] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def executor(self) -> Executor:
+        # Spawned, not forked: the API process has threads (pool, Redis, model)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def register(self, name: str, fn: Callable[..., Any], max_concurrency: int = 1):
+        """Register a job type; fn(ctx, **params) must be a module-level function"""
+        self.job_types[name] = JobType(name, fn, max_concurrency)
+        # Local waiters beyond the limit would only poll for a slot
+        self._semaphores[name] = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def active_jobs(self) -> List[str]:
+        return list(self._tasks)
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    async def submit(self, job_type: str, params: Optional[Dict] = None) -> str:
+        """Create a job and start it in the background; returns its job_id"""
+        job_id, _ = await self._submit(job_type, params or {})
+        return job_id
+
+    async def submit_fanout(self, parent_type: str, job_type: str, param_sets: List[Dict]) -> str:
+        """
+        Parent job with one child job per params; the parent finishes when
+        all children have, with their statuses as its result
+        """
+        if job_type not in self.job_types:
+            raise ValueError(f"Unknown job type: {job_type}")
+        parent_id = await asyncio.to_thread(
+            self.store.create, parent_type, {"job_type": job_type, "jobs": param_sets}, None, 'running'
+        )
+        children = [await self._submit(job_type, params, parent_id) for params in param_sets]
+        self._spawn(parent_id, self._aggregate(parent_id, children))
+        return parent_id
+
+    async def _submit(self, job_type: str, params: Dict, parent_id: Optional[str] = None):
+        if job_type not in self.job_types:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job_id = await asyncio.to_thread(self.store.create, job_type, params, parent_id)
+        task = self._spawn(job_id, self._run(job_id, self.job_types[job_type], params))
+        return job_id, task
+
+    def _spawn(self, job_id: str, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+        return task
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def _run(self, job_id: str, job_type: JobType, params: Dict) -> str:
+        async with self._semaphores[job_type.name]:
+            # Global limit: wait for a slot shared with the other workers
+            while True:
+                state = await asyncio.to_thread(self.store.claim, job_id, job_type.name, job_type.max_concurrency)
+                if state == 'running':
+                    break
+                if state != 'pending':
+                    return state
+                await asyncio.sleep(JOB_SLOT_POLL_SECONDS)
+
+            ctx = JobContext(job_id, self.context_store)
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            result, error = None, None
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.executor, execute_job, job_type.fn, ctx, params)
+                status = 'succeeded'
+            except JobCancelled:
+                status = 'cancelled'
+            except Exception as e:
+                logger.error(f"❌ Job {job_id} ({job_type.name}) failed: {e}")
+                status, error = 'failed', str(e)
+            finally:
+                heartbeat.cancel()
+
+            await asyncio.to_thread(self.store.finish, job_id, status, result, error)
+            return status
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                await asyncio.to_thread(self.store.heartbeat, job_id)
+            except Exception as e:
+                logger.warning(f"Job {job_id} heartbeat failed: {e}")
+
+    async def _aggregate(self, parent_id: str, children) -> str:
+        statuses: Dict[str, str] = {}
+        pending = {task: job_id for job_id, task in children}
+        # The parent is 'running' too: without a heartbeat it would look stale
+        heartbeat = asyncio.create_task(self._heartbeat(parent_id))
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    job_id = pending.pop(task)
+                    if task.cancelled():
+                        statuses[job_id] = 'interrupted'
+                    elif task.exception() is not None:
+                        statuses[job_id] = 'failed'
+                    else:
+                        statuses[job_id] = task.result()
+                await asyncio.to_thread(
+                    self.store.progress, parent_id, len(statuses) / len(children),
+                    f"{len(statuses)}/{len(children)} jobs finished"
+                )
+        finally:
+            heartbeat.cancel()
+
+        failed = sum(1 for s in statuses.values() if s == 'failed')
+        if failed:
+            status, error = 'failed', f"{failed} of {len(children)} jobs failed"
+        elif any(s != 'succeeded' for s in statuses.values()):
+            status, error = 'cancelled', None
+        else:
+            status, error = 'succeeded', None
+
+        await asyncio.to_thread(self.store.finish, parent_id, status, {"jobs": statuses}, error)
+        return status
+
+    # ------------------------------------------------------------------
+    # Status / cancellation
+    # ------------------------------------------------------------------
+
+    async def get(self, job_id: str) -> Optional[JobStatus]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def wait(self, job_id: str) -> Optional[str]:
+        """Final status of a job this worker runs (None if it is not running here)"""
+        task = self._tasks.get(job_id)
+        if task is None:
+            return None
+        return await asyncio.shield(task)
+
+    async def cancel(self, job_id: str) -> Optional[JobStatus]:
+        """Request cancellation (job and children); returns the updated status"""
+        await asyncio.to_thread(self.store.request_cancel, job_id)
+        return await self.get(job_id)
+
+    async def recover_stale(self) -> List[str]:
+        """
+        Interrupt jobs left 'running' by a dead or restarted worker (startup)
+
+        Live jobs heartbeat every JOB_HEARTBEAT_SECONDS, so only jobs
+        nobody has touched for STALE_HEARTBEAT_SECONDS are affected.
+        """
+        try:
+            job_ids = await asyncio.to_thread(self.store.interrupt_stale, STALE_HEARTBEAT_SECONDS)
+        except Exception as e:
+            logger.error(f"Could not recover stale jobs: {e}")
+            return []
+        if job_ids:
+            logger.warning(f"Marked {len(job_ids)} stale jobs interrupted")
+        return job_ids
+
+    async def shutdown(self):
+        """Interrupt this worker's unfinished jobs and stop the pool"""
+        job_ids = self.active_jobs
+        try:
+            await asyncio.to_thread(self.store.interrupt, job_ids)
+        except Exception as e:
+            logger.error(f"Could not mark {len(job_ids)} jobs interrupted: {e}")
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._executor is not None:
+            # Running jobs see cancel_requested at their next checkpoint
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ============================================================================
+# Job functions (run in the job process; imports are local to keep the
+# API process free of their dependencies until a job runs)
+# ============================================================================
+
+def run_consolidation(ctx: JobContext, date: str) -> Dict:
+    """LAB_003 consolidation of one day (one transaction: cancel rolls it back)"""
+    from consolidation_engine import ConsolidationEngine
+
+    engine = ConsolidationEngine(conninfo=ctx.conninfo)
+    report = engine.consolidate_daily_memories(
+        datetime.strptime(date, "%Y-%m-%d"),
+        checkpoint=lambda progress, step: ctx.checkpoint(progress, step, force=True)
+    )
+    return report.to_dict()
+
+
+def run_fact_backfill(ctx: JobContext, run_name: str = "default", batch_size: int = 500,
+                      only_missing: bool = True, ranges: int = 8) -> Dict:
+    """Resumable fact backfill, one keyset range at a time (same run_name resumes)"""
+    import backfill_facts
+
+    with psycopg.connect(ctx.conninfo) as conn:
+        backfill_facts.plan_ranges(conn, run_name, num_ranges=ranges, only_missing=only_missing)
+        pending = backfill_facts.pending_ranges(conn, run_name)
+
+    for i, range_no in enumerate(pending):
+        ctx.checkpoint(i / len(pending), f"range {i + 1}/{len(pending)}", force=True)
+        backfill_facts.process_range(run_name, range_no, batch_size, only_missing, ctx.conninfo)
+
+    with psycopg.connect(ctx.conninfo) as conn:
+        total, processed, facts_written, done_ranges, range_count = backfill_facts.read_progress(conn, run_name)
+    return {
+        "run_name": run_name,
+        "total": total,
+        "processed": processed,
+        "facts_written": facts_written,
+        "ranges_done": done_ranges,
+        "ranges": range_count
+    }
+
+
+def run_pruning(ctx: JobContext, run_id: str) -> Dict:
+    """Resumable pruning run (pruning_executor.start_run), checkpointed per batch"""
+    from neo4j_sync import neo4j_sync
+    from pruning_executor import PruningExecutor
+
+    executor = PruningExecutor(ctx.conninfo, graph_sync=neo4j_sync)
+    while True:
+        run = executor.execute(run_id, max_batches=1)
+        if run.status == 'completed':
+            return run.to_dict()
+        ctx.checkpoint(
+            run.archived_count / max(run.target_count, 1),
+            f"{run.archived_count}/{run.target_count} archived"
+        )
+
+
+def run_priming_rebuild(ctx: JobContext) -> Dict:
+    """Re-bootstrap the LAB_005 priming graph from pgvector and save a snapshot"""
+    from priming_graph_store import PrimingGraphStore
+
+    store = PrimingGraphStore(ctx.conninfo)
+    ctx.checkpoint(0.0, "bootstrapping from pgvector", force=True)
+    graph = store.rebuild()
+    return {"episodes": len(graph), "snapshot": store.loaded_from}
@@ -0,0 +1,128 @@
+"""
+LAB Registry: construct LAB systems on first use
+
+main.py and labs_advanced_endpoints.py used to build every LAB system
+(and import its dependencies) while the module was imported, so a worker
+paid for all of them before serving its first request. Registering a
+factory instead defers both the import and the construction:
+
+    novelty_detector = lab_registry.register(
+        "novelty_detector", lambda: NoveltyDetector(baseline_path=...)
+    )
+    dopamine_system = lab_registry.register("dopamine_system", make_dopamine, shared=True)
+
+- register() returns a LazyLab proxy. The first attribute access builds
+  the system (once, under a lock, so concurrent first requests share one
+  instance) and every later access goes straight to it.
+- shared=True hands the factory to state_registry (state_store.py),
+  which builds the template on first use and returns its SharedSystem
+  proxy, so the system keeps its cross-worker state.
+- warm() builds every pending system, for a background task after
+  startup so that first requests do not pay for construction.
+
+Date: October 2025
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from state_store import state_registry
+
+
+class LazyLab:
+    """Proxy that builds its LAB system on first attribute access"""
+
+    __slots__ = ("_lab_name", "_lab_factory", "_lab_instance", "_lab_lock", "_lab_seconds")
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, "_lab_name", name)
+        object.__setattr__(self, "_lab_factory", factory)
+        object.__setattr__(self, "_lab_instance", None)
+        object.__setattr__(self, "_lab_lock", threading.Lock())
+        object.__setattr__(self, "_lab_seconds", None)
+
+    # Underscored: the proxied system's own attributes must not be shadowed
+    def _lab_constructed(self) -> bool:
+        return self._lab_instance is not None
+
+    def _lab_resolve(self) -> Any:
+        instance = self._lab_instance
+        if instance is not None:
+            return instance
+        with self._lab_lock:
+            if self._lab_instance is None:
+                start = time.perf_counter()
+                object.__setattr__(self, "_lab_instance", self._lab_factory())
+                object.__setattr__(self, "_lab_seconds", time.perf_counter() - start)
+            return self._lab_instance
+
+    def __getattr__(self, attr: str):
+        return getattr(self._lab_resolve(), attr)
+
+    def __setattr__(self, attr: str, value):
+        setattr(self._lab_resolve(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "constructed" if self._lab_constructed() else "pending"
+        return f"<LazyLab {self._lab_name} ({state})>"
+
+
+class LabRegistry:
+    """Named LAB factories; each system is built once, on first use"""
+
+    def __init__(self, shared_registry=state_registry):
+        self.shared_registry = shared_registry
+        self.labs: Dict[str, LazyLab] = {}
+        self.shared: List[str] = []
+
+    def register(self, name: str, factory: Callable[[], Any], shared: bool = False):
+        if name in self.labs or name in self.shared:
+            raise ValueError(f"LAB system '{name}' is already registered")
+        if shared:
+            self.shared.append(name)
+            return self.shared_registry.register(name, factory=factory)
+        lab = LazyLab(name, factory)
+        self.labs[name] = lab
+        return lab
+
+    def get(self, name: str) -> Any:
+        """The constructed system (builds it if needed)"""
+        if name in self.shared:
+            return self.shared_registry.template(name)
+        return self.labs[name]._lab_resolve()
+
+    def is_constructed(self, name: str) -> bool:
+        if name in self.shared:
+            return self.shared_registry.is_constructed(name)
+        return self.labs[name]._lab_constructed()
+
+    def pending(self) -> List[str]:
+        return [name for name in [*self.labs, *self.shared] if not self.is_constructed(name)]
+
+    def warm(self, names: Optional[List[str]] = None) -> Dict[str, str]:
+        """Build pending systems; failures are reported, not raised (first use retries)"""
+        results = {}
+        for name in names if names is not None else self.pending():
+            try:
+                self.get(name)
+                results[name] = "ok"
+            except Exception as e:
+                results[name] = f"error: {str(e)[:100]}"
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        construct_ms = {
+            name: round(lab._lab_seconds * 1000, 1)
+            for name, lab in self.labs.items() if lab._lab_seconds is not None
+        }
+        return {
+            "registered": len(self.labs) + len(self.shared),
+            "constructed": sorted(name for name in [*self.labs, *self.shared] if self.is_constructed(name)),
+            "pending": sorted(self.pending()),
+            "construct_ms": construct_ms,
+        }
+
+
+# Process-wide registry (LAB systems of main.py and labs_advanced_endpoints.py)
+lab_registry = LabRegistry()
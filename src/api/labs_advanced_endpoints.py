@@ -15,32 +15,7 @@ from datetime import datetime
 # LAB_028: Emotional Intelligence (prerequisite for advanced LABs)
 from emotional_intelligence import EmotionalIntelligenceSystem
 
-# FASE 4: Prerequisites (LABS 004-027)
-from novelty_detector import NoveltyDetector
-from spreading_activation import ActivationManager
-from metacognition_logger import ErrorDetector
-from predictive_preloading import PredictionEngine
-from emotional_contagion import EmotionalContagionEngine
-from memory_reconsolidation import ReconsolidationDetector
-from attention_mechanism import AttentionScorer
-from working_memory_buffer import WorkingMemoryBuffer
-from episodic_future_thinking import Episode
-from dopamine_system import RewardPredictionEngine
-from serotonin_system import TimeHorizonManager
-from norepinephrine_system import StressResponseSystem
-from acetylcholine_system import AcetylcholineSystem
-from gaba_glutamate_balance import GABAGlutamateSystem
-from working_memory_executive import WorkingMemoryExecutive
-from cognitive_control import CognitiveControlSystem
-from task_switching import TaskSetManager
-from planning_sequencing import PlanningSequencingSystem
-from goal_management import GoalHierarchyManager
-from theory_of_mind import TheoryOfMindSystem
-from empathy_system import EmpathySystem
-from social_hierarchy import StatusDetector
-from cooperation_trust import ReputationSystem
-from moral_reasoning import MoralReasoningSystem
-
+# FASE 4: Prerequisites (LABS 004-027): basic endpoints only, no system instances
 
 # FASE 5: Creativity & Insight (LABS 029-033)
 from divergent_thinking import DivergentThinkingSystem, Idea
@@ -63,6 +38,7 @@ from synaptic_pruning_neurogenesis import SynapticPruningNeurogenesisSystem
 
 # FASE 8: Homeostasis (LABS 044-050)
 from homeostasis_systems import HomeostasisSystem
+from lab_registry import lab_registry
 
 # ============================================
 # Router
@@ -73,8 +49,10 @@ router = APIRouter(prefix="/labs/advanced", tags=["Advanced LABS 029-050"])
 # Global System Instances
 # ============================================
 
+# Built on first use (lab_registry.py); state shared across workers
+
 # LAB_028: Emotional Intelligence
-emotional_intelligence = EmotionalIntelligenceSystem()
+emotional_intelligence = lab_registry.register("emotional_intelligence", EmotionalIntelligenceSystem, shared=True)
 
 # FASE 4: Prerequisites instances
 # FASE 4: Prerequisites
@@ -105,26 +83,26 @@ emotional_intelligence = EmotionalIntelligenceSystem()
 
 
 # FASE 5: Creativity
-divergent_thinking = DivergentThinkingSystem()
-conceptual_blending = ConceptualBlendingSystem()
-insight_system = InsightAhaSystem()
-analogy_system = AnalogicalReasoningSystem()
-metaphor_system = MetaphorGenerationSystem()
+divergent_thinking = lab_registry.register("divergent_thinking", DivergentThinkingSystem, shared=True)
+conceptual_blending = lab_registry.register("conceptual_blending", ConceptualBlendingSystem, shared=True)
+insight_system = lab_registry.register("insight_system", InsightAhaSystem, shared=True)
+analogy_system = lab_registry.register("analogy_system", AnalogicalReasoningSystem, shared=True)
+metaphor_system = lab_registry.register("metaphor_system", MetaphorGenerationSystem, shared=True)
 
 # FASE 6: Learning
-transfer_learning = TransferLearningSystem()
-reward_prediction = RewardPredictionSystem()
-meta_learning = MetaLearningSystem()
-curiosity_drive = CuriosityDriveSystem()
-intrinsic_motivation = IntrinsicMotivationSystem()
+transfer_learning = lab_registry.register("transfer_learning", TransferLearningSystem, shared=True)
+reward_prediction = lab_registry.register("reward_prediction", RewardPredictionSystem, shared=True)
+meta_learning = lab_registry.register("meta_learning", MetaLearningSystem, shared=True)
+curiosity_drive = lab_registry.register("curiosity_drive", CuriosityDriveSystem, shared=True)
+intrinsic_motivation = lab_registry.register("intrinsic_motivation", IntrinsicMotivationSystem, shared=True)
 
 # FASE 7: Plasticity
-ltp_ltd = LTPLTDSystem()
-hebbian_learning = HebbianLearningSystem()
-synaptic_pruning = SynapticPruningNeurogenesisSystem()
+ltp_ltd = lab_registry.register("ltp_ltd", LTPLTDSystem, shared=True)
+hebbian_learning = lab_registry.register("hebbian_learning", HebbianLearningSystem, shared=True)
+synaptic_pruning = lab_registry.register("synaptic_pruning", SynapticPruningNeurogenesisSystem, shared=True)
 
 # FASE 8: Homeostasis
-homeostasis = HomeostasisSystem()
+homeostasis = lab_registry.register("homeostasis", HomeostasisSystem, shared=True)
 
 # ============================================
 # Pydantic Models
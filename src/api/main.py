@@ -4,7 +4,8 @@ FastAPI Application - Core Endpoints
 DÍA 5 FASE 4 - Base Implementation
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
@@ -14,11 +15,17 @@ import psycopg
 from psycopg.types.json import Json
 from contextlib import asynccontextmanager
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.openmetrics.exposition import (
+    CONTENT_TYPE_LATEST as OPENMETRICS_CONTENT_TYPE, generate_latest as generate_openmetrics
+)
 from starlette.responses import Response
 import time
+import hmac
+import uuid
+import asyncio
+import threading
 import redis
 import json as json_module
-from sentence_transformers import SentenceTransformer
 
 # FASE_8_UPGRADE: Hybrid Memory System
 import sys
@@ -26,6 +33,7 @@ import os
 # Add current directory to Python path for hybrid memory modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from fact_extractor import extract_facts_from_content
+import fact_store
 from fact_schemas import FactQueryRequest, FactQueryResponse, HybridQueryRequest, HybridQueryResponse
 
 # LAB_001: Emotional Salience
@@ -34,9 +42,6 @@ from emotional_salience_scorer import EmotionalSalienceScorer
 # LAB_002: Decay Modulation
 from decay_modulator import DecayModulator
 
-# LAB_003: Sleep Consolidation (lazy import to avoid psycopg2 dependency at startup)
-# from consolidation_engine import ConsolidationEngine
-
 # LAB_005: Spreading Activation
 from spreading_activation import SpreadingActivationEngine
 
@@ -44,7 +49,7 @@ from spreading_activation import SpreadingActivationEngine
 from attention_mechanism import AttentionMechanism, MemoryCandidate
 
 # LAB_011: Working Memory Buffer
-from working_memory_buffer import WorkingMemoryBuffer
+from working_memory_buffer import DEFAULT_SESSION, SessionWorkingMemory, WorkingMemoryStore
 
 # LAB_001: Emotional Salience Scorer
 from emotional_salience_scorer import EmotionalSalienceScorer
@@ -70,38 +75,62 @@ from emotional_contagion import EmotionalContagionEngine
 # LAB_002: Decay Modulation
 from decay_modulator import DecayModulator
 
-# LAB_003: Sleep Consolidation
-from consolidation_engine import ConsolidationEngine
+# LAB_003: Sleep Consolidation (runs as a background job)
 
 # LAB_004: Novelty Detection
-from novelty_detector import NoveltyDetector
+from novelty_detector import NoveltyDetector, NOVELTY_BASELINE_PATH, fetch_training_episodes
 
 # LAB_005: Spreading Activation
 from spreading_activation import SpreadingActivationEngine
 
-# LAB_013: Dopamine System
+# LAB_013-017: Neurochemistry systems (LAYER_4_Neurochemistry_Full, imported on first use)
 import sys
 experiments_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "..", "experiments")
 sys.path.insert(0, experiments_path)
-from LAYER_4_Neurochemistry_Full.LAB_013_Dopamine_System import DopamineSystem
 
-# LAB_014: Serotonin System
-from LAYER_4_Neurochemistry_Full.LAB_014_Serotonin_System import SerotoninSystem
+# Session 12: Consciousness Endpoints (CognitiveStack Integration)
+from consciousness_endpoints import register_consciousness_endpoints
 
-# LAB_015: Norepinephrine System
-from LAYER_4_Neurochemistry_Full.LAB_015_Norepinephrine_System import NorepinephrineSystem
+# A/B Testing Framework
+from ab_testing import AB_TEST_FLUSH_SECONDS, flush_ab_test_metrics, get_ab_test_manager, TestVariant
 
-# LAB_016: Acetylcholine System
-from LAYER_4_Neurochemistry_Full.LAB_016_Acetylcholine_System import AcetylcholineSystem
+# Intelligent Decay: Pruning Executor
+from pruning_executor import PruningExecutor
 
-# LAB_017: GABA System
-from LAYER_4_Neurochemistry_Full.LAB_017_GABA_System import GABASystem
+# Time-partitioned episodic storage: hot/cold tiered search
+from tiered_search import TieredSearchPlanner
 
-# Session 12: Consciousness Endpoints (CognitiveStack Integration)
-from consciousness_endpoints import register_consciousness_endpoints
+# LAB_005: Persistent priming graph (pgvector bootstrap + mmap snapshots)
+from priming_graph_store import PrimingGraphStore, parse_vector
 
-# A/B Testing Framework
-from ab_testing import get_ab_test_manager, TestVariant
+# LAB_005/LAB_007: Cross-worker cache backends (local, Redis, two-tier)
+from cache_backends import make_cache_backend
+
+# Shared state for LAB singletons across uvicorn workers
+from state_store import state_registry, make_state_store
+
+# One embeddings model per node, shared by all workers (optional)
+from embedding_server import EMBEDDING_SERVER_FALLBACK, EMBEDDING_SERVER_SOCKET, EmbeddingClient, SharedEmbeddingModel
+
+# LAB singletons built on first use (and warmed after startup)
+from lab_registry import lab_registry
+
+# LAB_007: Pooled async episode loader (preloading + episode reads)
+from episode_fetcher import EpisodeFetcher
+
+# Shared sync psycopg pool (job table, batch work in threads)
+from db_pool import create_db_pool
+
+# Per-stage request spans (route-template metrics, Server-Timing)
+from request_timing import SERVER_TIMING_ENABLED, request_timing, route_template, span
+
+# On-demand sampling profiler (admin endpoint)
+from sampling_profiler import FORMATS as PROFILE_FORMATS, ProfilerBusy, profiler, route_code_map
+
+# Background jobs: consolidation, backfills, pruning, graph rebuilds
+from job_runner import (
+    JobRunner, JobStore, run_consolidation, run_fact_backfill, run_pruning, run_priming_rebuild
+)
 
 # ============================================
 # Configuration
@@ -119,11 +148,19 @@ try:
 except FileNotFoundError:
     POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "default_password")
 
+# Admin endpoints (profiling): token from Docker Secret, disabled when unset
+NEXUS_ADMIN_TOKEN_FILE = os.getenv("NEXUS_ADMIN_TOKEN_FILE", "/run/secrets/nexus_admin_token")
+try:
+    with open(NEXUS_ADMIN_TOKEN_FILE, 'r') as f:
+        NEXUS_ADMIN_TOKEN = f.read().strip() or None
+except FileNotFoundError:
+    NEXUS_ADMIN_TOKEN = os.getenv("NEXUS_ADMIN_TOKEN") or None
+
 # ============================================
 # Prometheus Metrics
 # ============================================
 
-# API Metrics
+# API Metrics (endpoint = route template, e.g. /memory/prime/{episode_uuid})
 api_requests_total = Counter(
     'nexus_api_requests_total',
     'Total API requests',
@@ -136,6 +173,13 @@ api_request_duration_seconds = Histogram(
     ['method', 'endpoint']
 )
 
+api_stage_duration_seconds = Histogram(
+    'nexus_api_stage_duration_seconds',
+    'Time per request stage (db, embedding, LAB scorers, serialization)',
+    ['endpoint', 'stage'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
 # Memory Metrics
 episodes_created_total = Counter(
     'nexus_episodes_created_total',
@@ -158,11 +202,52 @@ embeddings_queue_depth = Gauge(
     ['state']
 )
 
+# Pruning Metrics
+episodes_archived_total = Counter(
+    'nexus_episodes_archived_total',
+    'Total episodes moved to the pruning archive'
+)
+
+episodes_restored_total = Counter(
+    'nexus_episodes_restored_total',
+    'Total episodes restored from the pruning archive'
+)
+
+pruning_rows_per_second = Gauge(
+    'nexus_pruning_rows_per_second',
+    'Archive throughput of the last pruning run'
+)
+
+# Tiered Search Metrics
+search_tier_results_total = Counter(
+    'nexus_search_tier_results_total',
+    'Search results served per storage tier',
+    ['tier']
+)
+
+# LAB_007 Metrics
+episode_read_duration_seconds = Histogram(
+    'nexus_episode_read_duration_seconds',
+    'Episode read latency by source (preload cache or database)',
+    ['source'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+# LAB side paths that never fail the request (failures are logged and counted)
+lab_side_path_failures_total = Counter(
+    'nexus_lab_side_path_failures_total',
+    'Failures of non-critical LAB work done alongside requests',
+    ['path']
+)
+
 # ============================================
 # Database Connection
 # ============================================
 DB_CONN_STRING = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+# Opened in lifespan; connections are borrowed per run
+db_pool = create_db_pool(DB_CONN_STRING)
+
 # ============================================
 # Redis Configuration
 # ============================================
@@ -184,8 +269,13 @@ except FileNotFoundError:
 # ============================================
 EMBEDDINGS_MODEL = os.getenv("EMBEDDINGS_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
 
-# Global model instance (loaded in lifespan)
+# Global model instance (loaded in the background after startup); with
+# EMBEDDING_SERVER_SOCKET set, a client of the shared embedding server
 embeddings_model = None
+embeddings_model_status = "warming"  # warming | ready | failed
+
+# Build pending LAB systems in the background once the model is warm
+LAB_WARM_ON_STARTUP = os.getenv("LAB_WARM_ON_STARTUP", "true").lower() == "true"
 
 # ============================================
 # Pydantic Models
@@ -209,6 +299,8 @@ class HealthResponse(BaseModel):
     database: str
     redis: Optional[str] = None
     queue_depth: Optional[int] = None
+    embeddings_model: Optional[str] = None
+    embeddings_backend: Optional[str] = None
     timestamp: datetime
 
 class SearchRequest(BaseModel):
@@ -221,6 +313,8 @@ class SearchRequest(BaseModel):
     decay_base: float = Field(default=0.95, ge=0.90, le=0.98, description="LAB_002: Daily decay rate (0.95=standard, 0.93=faster, 0.97=slower)")
     use_attention: bool = Field(default=False, description="LAB_010: Apply attention mechanism for noise filtering")
     attention_temperature: float = Field(default=0.5, ge=0.1, le=2.0, description="LAB_010: Attention temperature (lower=more concentrated)")
+    search_cold_tier: bool = Field(default=True, description="Fall back to cold (older) partitions when recent ones have too few hits")
+    session_id: Optional[str] = Field(default=None, description="LAB_011: Working-memory session to prime after the search (default session)")
 
 class SearchResult(BaseModel):
     episode_id: str
@@ -239,6 +333,8 @@ class SearchResult(BaseModel):
     modulated_decay: Optional[float] = None
     modulation_factor: Optional[float] = None
     effective_age_days: Optional[float] = None
+    # LAB_004: Novelty at ingest (enrichment worker; None until enriched)
+    novelty_score: Optional[float] = None
 
 class SearchResponse(BaseModel):
     success: bool
@@ -300,13 +396,85 @@ class TemporalResponse(BaseModel):
 # ============================================
 # Lifespan Context Manager
 # ============================================
+def load_embeddings_model():
+    """Import and load the sentence-transformers model, then run one encode to warm it"""
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(EMBEDDINGS_MODEL)
+    model.encode("warm up")
+    return model
+
+def connect_embedding_server():
+    """Client of the shared embedding server; loads the in-process model if it does not answer"""
+    model = SharedEmbeddingModel(
+        EmbeddingClient(EMBEDDING_SERVER_SOCKET),
+        load_local=load_embeddings_model if EMBEDDING_SERVER_FALLBACK else None
+    )
+    if model.wait_for_server():
+        print(f"✓ Using shared embedding server: {EMBEDDING_SERVER_SOCKET}")
+    return model
+
+def embeddings_backend() -> Optional[str]:
+    """server | local (None until the model is ready)"""
+    if embeddings_model is None:
+        return None
+    return getattr(embeddings_model, "backend", "local")
+
+def embeddings_stats() -> Dict[str, Any]:
+    """Backend in use, plus the shared server's batching stats when it answers"""
+    stats = {"model": EMBEDDINGS_MODEL, "status": embeddings_model_status, "backend": embeddings_backend()}
+    if isinstance(embeddings_model, SharedEmbeddingModel) and embeddings_model.backend == "server":
+        try:
+            stats["server"] = embeddings_model.client.ping()
+        except Exception as e:
+            stats["server"] = {"error": str(e)[:100]}
+    return stats
+
+async def warm_embeddings_model():
+    """Load the model off the event loop; requests get 503 "warming" until it is ready"""
+    global embeddings_model, embeddings_model_status
+
+    try:
+        print(f"Loading embeddings model: {EMBEDDINGS_MODEL}")
+        started = time.perf_counter()
+        loader = connect_embedding_server if EMBEDDING_SERVER_SOCKET else load_embeddings_model
+        embeddings_model = await asyncio.to_thread(loader)
+        embeddings_model_status = "ready"
+        print(f"✓ Embeddings model loaded successfully ({time.perf_counter() - started:.1f}s)")
+    except Exception as e:
+        print(f"⚠ Embeddings model loading failed: {e}")
+        embeddings_model = None
+        embeddings_model_status = "failed"
+
+    # Then the LAB systems, so first requests do not pay for their construction
+    if LAB_WARM_ON_STARTUP:
+        results = await asyncio.to_thread(lab_registry.warm)
+        failed = {name: result for name, result in results.items() if result != "ok"}
+        print(f"✓ LAB systems warmed: {len(results) - len(failed)}/{len(results)}")
+        for name, result in failed.items():
+            print(f"⚠ LAB {name} warm-up failed: {result}")
+
+def embeddings_unavailable() -> HTTPException:
+    """503 while the model is warming (with Retry-After) or after it failed to load"""
+    if embeddings_model_status == "warming":
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Embeddings model is warming up",
+            headers={"Retry-After": "5"}
+        )
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Embeddings model not loaded"
+    )
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global embeddings_model
-
     # Startup - Track start time for uptime metrics
     app.state.start_time = time.time()
 
+    # Startup - Open the shared psycopg pool (connects in the background)
+    db_pool.open(wait=False)
+
     # Startup - Initialize Redis connection
     try:
         app.state.redis_client = redis.Redis(
@@ -320,24 +488,74 @@ async def lifespan(app: FastAPI):
         # Test connection
         app.state.redis_client.ping()
         print(f"✓ Redis connected: {REDIS_HOST}:{REDIS_PORT}")
+
+        # Binary client for shared priming/preload caches (msgpack values)
+        app.state.redis_cache_client = redis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            password=REDIS_PASSWORD if REDIS_PASSWORD else None,
+            decode_responses=False,
+            socket_connect_timeout=5
+        )
     except Exception as e:
         print(f"⚠ Redis connection failed: {e}")
         app.state.redis_client = None
+        app.state.redis_cache_client = None
 
-    # Startup - Load embeddings model
-    try:
-        print(f"Loading embeddings model: {EMBEDDINGS_MODEL}")
-        embeddings_model = SentenceTransformer(EMBEDDINGS_MODEL)
-        print(f"✓ Embeddings model loaded successfully")
-    except Exception as e:
-        print(f"⚠ Embeddings model loading failed: {e}")
-        embeddings_model = None
+    # Startup - Warm the embeddings model (and LAB systems) in the background;
+    # /health reports "warming" until the model is ready
+    model_task = asyncio.create_task(warm_embeddings_model())
+
+    # Startup - Load/bootstrap the priming graph in the background
+    priming_task = asyncio.create_task(maintain_priming_graph())
+
+    # Startup - Keep LAB_004 novelty baselines fresh (full refits off-process)
+    novelty_task = asyncio.create_task(maintain_novelty_baselines())
+
+    # Startup - Restore and write behind LAB_011 working memory (optional)
+    working_memory_task = asyncio.create_task(persist_working_memory()) if WORKING_MEMORY_PERSIST else None
+
+    # Startup - Write buffered A/B test samples on a timer
+    ab_test_task = asyncio.create_task(flush_ab_test_metrics_periodically())
+
+    # Startup - Release jobs left 'running' by a dead or restarted worker
+    jobs_recovery_task = asyncio.create_task(job_runner.recover_stale())
 
     yield
 
+    # Shutdown - Stop warm-up (a load already running in its thread finishes there)
+    model_task.cancel()
+
+    # Shutdown - Stop priming graph maintenance
+    priming_task.cancel()
+    novelty_task.cancel()
+
+    # Shutdown - Write the last working-memory changes
+    if working_memory_task is not None:
+        working_memory_task.cancel()
+        await flush_working_memory()
+
+    # Shutdown - Write the last buffered A/B test samples
+    ab_test_task.cancel()
+    await flush_ab_test_buffer()
+
+    # Shutdown - Interrupt this worker's background jobs
+    jobs_recovery_task.cancel()
+    await job_runner.shutdown()
+
+    # Shutdown - Close the shared psycopg pool
+    db_pool.close()
+
+    # Shutdown - Close the LAB_007 episode fetcher pool
+    if episode_fetcher is not None:
+        await episode_fetcher.close()
+
     # Shutdown - Close Redis connection
     if app.state.redis_client:
         app.state.redis_client.close()
+    if app.state.redis_cache_client:
+        app.state.redis_cache_client.close()
 
 # ============================================
 # FastAPI App
@@ -359,137 +577,230 @@ app.add_middleware(
 )
 
 # ============================================
-# LAB_011: Global Working Memory Buffer
+# Shared LAB state (NEXUS_STATE_BACKEND=memory|redis)
 # ============================================
-working_memory = WorkingMemoryBuffer(capacity=7)  # Miller's Law: 7±2 items
+# Registered systems below are proxies: with the Redis backend every
+# worker sees the same state (see state_store.py)
+state_registry.configure(make_state_store(
+    get_redis_client=lambda: getattr(app.state, "redis_cache_client", None)
+))
+
+# ============================================
+# LAB_011: Working Memory Buffers (one per session/agent)
+# ============================================
+WORKING_MEMORY_MAX_SESSIONS = int(os.getenv("WORKING_MEMORY_MAX_SESSIONS", "1024"))
+WORKING_MEMORY_PERSIST = os.getenv("WORKING_MEMORY_PERSIST", "false").lower() == "true"
+WORKING_MEMORY_FLUSH_SECONDS = float(os.getenv("WORKING_MEMORY_FLUSH_SECONDS", "5"))
+WORKING_MEMORY_SESSION_TTL_SECONDS = int(os.getenv("WORKING_MEMORY_SESSION_TTL_SECONDS", "86400"))
+
+def make_working_memory():
+    """Local sessions, plus one shared-state key per session when state is shared"""
+    sessions = SessionWorkingMemory(
+        capacity=int(os.getenv("WORKING_MEMORY_CAPACITY", "7")),  # Miller's Law: 7±2 items
+        max_sessions=WORKING_MEMORY_MAX_SESSIONS
+    )
+    # Agents on different sessions load, write and conflict on their own key only
+    sessions.shared_sessions = state_registry.register_keyed(
+        "working_memory_session", sessions.new_buffer, ttl_seconds=WORKING_MEMORY_SESSION_TTL_SECONDS
+    )
+    return sessions
+
+working_memory = lab_registry.register("working_memory", make_working_memory)
+# Optional write-behind to nexus_memory.zep_working_memory
+working_memory_store = WorkingMemoryStore(
+    db_pool, ttl_seconds=int(os.getenv("WORKING_MEMORY_PERSIST_TTL_SECONDS", "86400"))
+)
 
 # ============================================
 # LAB_001: Global Emotional Salience Scorer
 # ============================================
-emotional_scorer = EmotionalSalienceScorer()
+emotional_scorer = lab_registry.register("emotional_scorer", lambda: EmotionalSalienceScorer(
+    db_host=POSTGRES_HOST,
+    db_port=POSTGRES_PORT,
+    db_name=POSTGRES_DB,
+    db_user=POSTGRES_USER,
+    db_password=POSTGRES_PASSWORD
+))
 
 # ============================================
 # LAB_006: Global Metacognition Logger
 # ============================================
-metacognition_logger = MetacognitionLogger()
+metacognition_logger = lab_registry.register("metacognition_logger", lambda: MetacognitionLogger(
+    max_actions=int(os.getenv("METACOGNITION_MAX_ACTIONS", "10000"))  # raw actions kept; stats are running totals
+), shared=True)
 
 # ============================================
 # LAB_009: Global Memory Reconsolidation Engine
 # ============================================
-reconsolidation_engine = MemoryReconsolidationEngine()
+reconsolidation_engine = lab_registry.register("reconsolidation_engine", MemoryReconsolidationEngine)
 
 # ============================================
 # LAB_007: Global Predictive Preloading Engine
 # ============================================
-predictive_preloader = PredictivePreloadingEngine()
+predictive_preloader = lab_registry.register("predictive_preloader", lambda: PredictivePreloadingEngine(
+    cache_backend=make_cache_backend(
+        "preload", 100, lambda: getattr(app.state, "redis_cache_client", None), ttl=600
+    )
+))
 
 # ============================================
 # LAB_012: Global Future Thinking Orchestrator
 # ============================================
-future_thinking = FutureThinkingOrchestrator()
+future_thinking = lab_registry.register("future_thinking", FutureThinkingOrchestrator)
 
 # ============================================
 # LAB_008: Global Emotional Contagion Engine
 # ============================================
-emotional_contagion = EmotionalContagionEngine()
+emotional_contagion = lab_registry.register("emotional_contagion", EmotionalContagionEngine)
 
 # ============================================
 # LAB_002: Global Decay Modulator
 # ============================================
-decay_modulator = DecayModulator()
+decay_modulator = lab_registry.register("decay_modulator", DecayModulator)
 
 # ============================================
-# LAB_003: Global Consolidation Engine
+# Background Jobs (LAB_003 consolidation and other long operations)
 # ============================================
-consolidation_engine = ConsolidationEngine()
+# Job functions run in a spawned process pool; per-type limits hold across workers
+MAX_CONSOLIDATION_DAYS = int(os.getenv("MAX_CONSOLIDATION_DAYS", "31"))
+job_runner = JobRunner(JobStore(pool=db_pool), context_store=JobStore(conninfo=DB_CONN_STRING))
+job_runner.register("consolidation", run_consolidation,
+                    max_concurrency=int(os.getenv("JOB_CONCURRENCY_CONSOLIDATION", "2")))
+job_runner.register("fact_backfill", run_fact_backfill,
+                    max_concurrency=int(os.getenv("JOB_CONCURRENCY_FACT_BACKFILL", "1")))
+job_runner.register("pruning", run_pruning,
+                    max_concurrency=int(os.getenv("JOB_CONCURRENCY_PRUNING", "1")))
+job_runner.register("priming_rebuild", run_priming_rebuild,
+                    max_concurrency=int(os.getenv("JOB_CONCURRENCY_PRIMING_REBUILD", "1")))
 
 # ============================================
 # LAB_004: Global Novelty Detector
 # ============================================
-novelty_detector = NoveltyDetector()
+novelty_detector = lab_registry.register(  # persisted baselines, no refit on restart
+    "novelty_detector", lambda: NoveltyDetector(baseline_path=NOVELTY_BASELINE_PATH)
+)
+NOVELTY_REFIT_INTERVAL_SECONDS = float(os.getenv("NOVELTY_REFIT_INTERVAL_SECONDS", str(7 * 86400)))
+NOVELTY_SYNC_INTERVAL_SECONDS = float(os.getenv("NOVELTY_SYNC_INTERVAL_SECONDS", "300"))
 
 # ============================================
 # LAB_013: Global Dopamine System
 # ============================================
-dopamine_system = DopamineSystem(
-    baseline_lr=0.1,
-    rpe_sensitivity=0.5,
-    motivation_decay=0.95,
-    history_window=10
-)
+def make_dopamine_system():
+    from LAYER_4_Neurochemistry_Full.LAB_013_Dopamine_System import DopamineSystem
+    return DopamineSystem(
+        baseline_lr=0.1,
+        rpe_sensitivity=0.5,
+        motivation_decay=0.95,
+        history_window=10
+    )
+
+dopamine_system = lab_registry.register("dopamine_system", make_dopamine_system, shared=True)
 
 # ============================================
 # LAB_014: Global Serotonin System
 # ============================================
-serotonin_system = SerotoninSystem(
-    baseline_mood=0.5,
-    impulse_threshold=0.7,
-    patience_factor=1.0,
-    reactivity_dampening=0.5,
-    mood_inertia=0.95,
-    history_window=20
-)
+def make_serotonin_system():
+    from LAYER_4_Neurochemistry_Full.LAB_014_Serotonin_System import SerotoninSystem
+    return SerotoninSystem(
+        baseline_mood=0.5,
+        impulse_threshold=0.7,
+        patience_factor=1.0,
+        reactivity_dampening=0.5,
+        mood_inertia=0.95,
+        history_window=20
+    )
+
+serotonin_system = lab_registry.register("serotonin_system", make_serotonin_system, shared=True)
 
 # ============================================
 # LAB_015: Global Norepinephrine System
 # ============================================
-norepinephrine_system = NorepinephrineSystem(
-    baseline_arousal=0.5,
-    stress_sensitivity=0.3,
-    arousal_decay=0.95,
-    optimal_arousal=0.6,
-    focus_threshold=0.5,
-    history_window=20
-)
+def make_norepinephrine_system():
+    from LAYER_4_Neurochemistry_Full.LAB_015_Norepinephrine_System import NorepinephrineSystem
+    return NorepinephrineSystem(
+        baseline_arousal=0.5,
+        stress_sensitivity=0.3,
+        arousal_decay=0.95,
+        optimal_arousal=0.6,
+        focus_threshold=0.5,
+        history_window=20
+    )
+
+norepinephrine_system = lab_registry.register("norepinephrine_system", make_norepinephrine_system, shared=True)
 
 # ============================================
 # LAB_016: Global Acetylcholine System
 # ============================================
-acetylcholine_system = AcetylcholineSystem(
-    baseline_ach=0.5,
-    amplification_gain=0.3,
-    encoding_threshold=0.6,
-    novelty_sensitivity=0.4,
-    ach_decay=0.9,
-    history_window=20
-)
+def make_acetylcholine_system():
+    from LAYER_4_Neurochemistry_Full.LAB_016_Acetylcholine_System import AcetylcholineSystem
+    return AcetylcholineSystem(
+        baseline_ach=0.5,
+        amplification_gain=0.3,
+        encoding_threshold=0.6,
+        novelty_sensitivity=0.4,
+        ach_decay=0.9,
+        history_window=20
+    )
+
+acetylcholine_system = lab_registry.register("acetylcholine_system", make_acetylcholine_system, shared=True)
 
 # ============================================
 # LAB_017: Global GABA System
 # ============================================
-gaba_system = GABASystem(
-    baseline_gaba=0.5,
-    inhibition_strength=0.7,
-    anxiety_threshold=0.6,
-    anxiety_sensitivity=0.3,
-    gaba_decay=0.9,
-    history_window=20
-)
+def make_gaba_system():
+    from LAYER_4_Neurochemistry_Full.LAB_017_GABA_System import GABASystem
+    return GABASystem(
+        baseline_gaba=0.5,
+        inhibition_strength=0.7,
+        anxiety_threshold=0.6,
+        anxiety_sensitivity=0.3,
+        gaba_decay=0.9,
+        history_window=20
+    )
+
+gaba_system = lab_registry.register("gaba_system", make_gaba_system, shared=True)
 
 # ============================================
 # LAB_005: Global Spreading Activation Engine
 # ============================================
-spreading_activation = SpreadingActivationEngine()
+spreading_activation = lab_registry.register("spreading_activation", SpreadingActivationEngine)
 
-# Prometheus Middleware for automatic tracking
+# Shared LAB state: one load per touched system, one CAS write per request
 @app.middleware("http")
-async def prometheus_middleware(request, call_next):
-    """Track all HTTP requests with Prometheus metrics"""
-    start_time = time.time()
-
-    # Execute request
-    response = await call_next(request)
+async def shared_state_middleware(request, call_next):
+    """
+    Scope shared LAB state to the request (no-op in single-worker mode)
 
-    # Calculate duration
-    duration = time.time() - start_time
+    Store errors are counted and served from local state, never a 500.
+    On a CAS conflict the recorded calls are replayed on fresh state, but
+    the response keeps what the handler computed on its first run. The
+    closing write runs in a worker thread, off the event loop.
+    """
+    async with state_registry.async_request_scope():
+        return await call_next(request)
 
-    # Record metrics
-    endpoint = request.url.path
+# Prometheus Middleware for automatic tracking
+@app.middleware("http")
+async def prometheus_middleware(request, call_next):
+    """Track all HTTP requests with Prometheus metrics (labelled by route template)"""
+    with request_timing(request.headers.get("x-request-id")) as timing:
+        # Execute request
+        response = await call_next(request)
+        duration = timing.elapsed()
+
+    # Record metrics (route template, so IDs in the path add no series)
+    endpoint = route_template(request.scope)
     method = request.method
     status_code = str(response.status_code)
+    exemplar = {"request_id": timing.request_id}
 
     api_requests_total.labels(method=method, endpoint=endpoint, status=status_code).inc()
-    api_request_duration_seconds.labels(method=method, endpoint=endpoint).observe(duration)
+    api_request_duration_seconds.labels(method=method, endpoint=endpoint).observe(duration, exemplar)
+    for stage, seconds, _ in timing.items():
+        api_stage_duration_seconds.labels(endpoint=endpoint, stage=stage).observe(seconds, exemplar)
+
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = timing.server_timing(duration)
 
     return response
 
@@ -507,6 +818,69 @@ def get_db_connection():
             detail=f"Database connection failed: {str(e)}"
         )
 
+# Time-partitioned episodic storage: hot-first search planner
+tiered_search_planner = TieredSearchPlanner()
+
+# LAB_007: lazily created async episode fetcher (asyncpg pool)
+episode_fetcher = None
+
+def get_episode_fetcher():
+    """Lazy initialization of the pooled episode fetcher"""
+    global episode_fetcher
+    if episode_fetcher is None:
+        episode_fetcher = EpisodeFetcher(DB_CONN_STRING)
+    return episode_fetcher
+
+# Strong references to in-flight LAB_007 tasks (the loop only keeps weak ones)
+episode_access_tasks = set()
+
+async def process_episode_access(episode_id: str, tags: List[str], track_access: bool):
+    """Learn from an access and preload the predicted next episodes"""
+    fetcher = get_episode_fetcher()
+    try:
+        if track_access:
+            await fetcher.track_access(episode_id)
+        await predictive_preloader.on_episode_access(
+            episode_id, set(tags or []), None, None, fetcher.fetch
+        )
+    except Exception as e:
+        lab_side_path_failures_total.labels(path="episode_access").inc()
+        print(f"LAB_007: Preloading failed for {episode_id}: {e}")
+
+def schedule_episode_access(episode_id: str, tags: List[str], track_access: bool = False):
+    """Feed an access into LAB_007 without delaying the response"""
+    task = asyncio.create_task(process_episode_access(episode_id, tags, track_access))
+    episode_access_tasks.add(task)
+    task.add_done_callback(episode_access_tasks.discard)
+
+# Intelligent Decay: lazily created pruning executor
+pruning_executor = None
+
+def get_pruning_executor():
+    """Lazy initialization of pruning executor"""
+    global pruning_executor
+    if pruning_executor is None:
+        pruning_executor = PruningExecutor(DB_CONN_STRING, graph_sync=neo4j_sync)
+    return pruning_executor
+
+# Strong references to pruning jobs awaited for their metrics
+pruning_tasks = set()
+
+async def record_pruning_job(job_id: str, run_id: str, archived_before: int):
+    """Update pruning metrics and caches once the job archiving run_id finishes"""
+    try:
+        await job_runner.wait(job_id)
+        run = await asyncio.to_thread(get_pruning_executor().get_run, run_id)
+    except Exception as e:
+        print(f"⚠ Pruning job {job_id} metrics not recorded: {e}")
+        return
+    if run is None:
+        return
+    episodes_archived_total.inc(max(run.archived_count - archived_before, 0))
+    pruning_rows_per_second.set(run.rows_per_second)
+    if run.archived_count > archived_before:
+        cache_invalidate("episodes:recent:*")
+
 def get_redis_client():
     """Get Redis client from app state"""
     return app.state.redis_client if hasattr(app.state, 'redis_client') else None
@@ -547,22 +921,18 @@ def cache_invalidate(pattern: str):
     except Exception as e:
         print(f"Cache invalidate error: {e}")
 
-def generate_query_embedding(text: str):
-    """Generate embedding for search query"""
-    global embeddings_model
-
+async def generate_query_embedding(text: str):
+    """Generate embedding for search query (in a thread: encode() blocks)"""
     if embeddings_model is None:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Embeddings model not loaded"
-        )
+        raise embeddings_unavailable()
 
     try:
         # Truncate to 4000 chars (same as worker)
         text_truncated = text[:4000] if len(text) > 4000 else text
 
         # Generate embedding
-        embedding = embeddings_model.encode(text_truncated)
+        with span("embedding"):
+            embedding = await asyncio.to_thread(embeddings_model.encode, text_truncated)
 
         return embedding.tolist()
 
@@ -572,6 +942,26 @@ def generate_query_embedding(text: str):
             detail=f"Error generating embedding: {str(e)}"
         )
 
+def result_saliences(rows) -> Dict[str, float]:
+    """
+    LAB_001 salience per search row
+
+    Uses the score the enrichment worker stored (row[6]); episodes it has
+    not reached yet are scored in one batched context query.
+    """
+    saliences = {str(row[0]): float(row[6]) for row in rows if row[6] is not None}
+    missing = [
+        {'episode_id': str(row[0]), 'timestamp': row[4]}
+        for row in rows if row[6] is None and row[4] is not None
+    ]
+    if missing:
+        try:
+            for episode_id, score in emotional_scorer.batch_calculate_salience(missing).items():
+                saliences[episode_id] = score.total_score
+        except Exception as e:
+            print(f"LAB_001: Salience fallback failed: {e}")
+    return saliences
+
 # ============================================
 # Endpoints
 # ============================================
@@ -588,7 +978,12 @@ async def root():
 
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
-    """Advanced health check endpoint - checks PostgreSQL, Redis, and Queue depth"""
+    """
+    Advanced health check endpoint - checks PostgreSQL, Redis, and Queue depth
+
+    status is "warming" while the embeddings model loads after startup
+    (the worker already serves; embedding endpoints answer 503 until ready).
+    """
     db_status = "unknown"
     redis_status = "unknown"
     queue_depth = None
@@ -630,6 +1025,10 @@ async def health_check():
     # Overall status evaluation
     if queue_depth and queue_depth > 1000:
         overall_status = "degraded"  # High queue depth is warning
+    if embeddings_model_status == "failed" and overall_status == "healthy":
+        overall_status = "degraded"
+    elif embeddings_model_status == "warming" and overall_status == "healthy":
+        overall_status = "warming"
 
     return HealthResponse(
         status=overall_status,
@@ -638,6 +1037,8 @@ async def health_check():
         database=db_status,
         redis=redis_status,
         queue_depth=queue_depth,
+        embeddings_model=embeddings_model_status,
+        embeddings_backend=embeddings_backend(),
         timestamp=datetime.now()
         )
 
@@ -665,6 +1066,16 @@ async def memory_action(request: MemoryActionRequest):
         # Calculate importance_score (default 0.5, can be customized)
         importance_score = request.action_details.get("importance_score", 0.5) if request.action_details else 0.5
 
+        # FASE_8_UPGRADE: Extract structured facts at write time
+        metadata = {
+            "action_type": request.action_type,
+            "action_details": request.action_details,
+            "context_state": request.context_state
+        }
+        facts = extract_facts_from_content(content, request.tags)
+        if facts:
+            metadata["facts"] = facts
+
         # Insert into episodic memory
         with conn.cursor() as cur:
             cur.execute("""
@@ -676,17 +1087,17 @@ async def memory_action(request: MemoryActionRequest):
                 content,
                 importance_score,
                 request.tags or [],
-                Json({
-                    "action_type": request.action_type,
-                    "action_details": request.action_details,
-                    "context_state": request.context_state
-                })
+                Json(metadata)
             ))
 
             result = cur.fetchone()
             episode_id = str(result[0])
             created_at = result[1]
 
+            # Typed fact store (same transaction as the episode)
+            if facts:
+                fact_store.write_facts(cur, episode_id, facts, created_at)
+
         # NEXUS_CREW Phase 2 Priority 3: Real-time Neo4j Sync
         # NON-BLOCKING: Neo4j failures do NOT fail the API endpoint
         try:
@@ -785,6 +1196,52 @@ async def get_recent_episodes(limit: int = 10):
             detail=f"Error fetching episodes: {str(e)}"
         )
 
+@app.get("/memory/episodic/{episode_id}", tags=["Memory"])
+async def get_episode(episode_id: str):
+    """
+    Read one episode: LAB_007 preload cache first, then the database
+
+    The access is fed to LAB_007 in the background, which preloads the
+    episodes predicted to be read next.
+    """
+    try:
+        # Canonical lowercase form: the fetcher and the preload cache key by it
+        episode_id = str(uuid.UUID(episode_id))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid episode id: {episode_id}"
+        )
+
+    try:
+        start_time = time.perf_counter()
+        source = "preload"
+        episode = await asyncio.to_thread(predictive_preloader.get_cached, episode_id)
+        if episode is None:
+            source = "database"
+            with span("db"):
+                episode = await get_episode_fetcher().fetch(episode_id)
+        episode_read_duration_seconds.labels(source=source).observe(time.perf_counter() - start_time)
+
+        schedule_episode_access(episode_id, episode.get("tags") or [], track_access=True)
+
+        return {
+            "success": True,
+            "source": source,
+            "episode": episode
+        }
+
+    except LookupError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Episode {episode_id} not found"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching episode: {str(e)}"
+        )
+
 @app.post("/memory/search", response_model=SearchResponse, tags=["Memory"])
 async def search_memories(request: SearchRequest):
     """
@@ -793,50 +1250,54 @@ async def search_memories(request: SearchRequest):
     """
     try:
         # Generate embedding for search query
-        query_embedding = generate_query_embedding(request.query)
+        query_embedding = await generate_query_embedding(request.query)
 
         # Perform vector similarity search
         conn = get_db_connection()
 
-        with conn.cursor() as cur:
-            # Cosine similarity search using pgvector <=> operator
-            # Lower distance = higher similarity
-            # Convert distance to similarity score (1 - distance)
-            cur.execute("""
-                SELECT
-                    episode_id,
-                    content,
-                    importance_score,
-                    tags,
-                    created_at,
-                    1 - (embedding <=> %s::vector) as similarity_score
-                FROM nexus_memory.zep_episodic_memory
-                WHERE embedding IS NOT NULL
-                    AND 1 - (embedding <=> %s::vector) >= %s
-                ORDER BY embedding <=> %s::vector
-                LIMIT %s
-            """, (
+        with span("db"), conn.cursor() as cur:
+            # Hot-first tiered search over time-partitioned episodic memory
+            # (cold partitions only when the hot tier has too few hits)
+            tiered = tiered_search_planner.search(
+                cur,
                 query_embedding,
-                query_embedding,
-                request.min_similarity,
-                query_embedding,
-                request.limit
-            ))
+                limit=request.limit,
+                min_similarity=request.min_similarity,
+                include_cold=request.search_cold_tier
+            )
+            results = tiered.rows
 
-            results = cur.fetchall()
+        search_tier_results_total.labels(tier='hot').inc(tiered.hot_count)
+        search_tier_results_total.labels(tier='cold').inc(tiered.cold_count)
 
         # Track access for retrieved episodes (intelligent decay feature)
         if results:
             episode_ids = [str(row[0]) for row in results]
-            for ep_id in episode_ids:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT nexus_memory.update_access_tracking(%s::uuid)
-                    """, (ep_id,))
-            conn.commit()
+            with span("db"):
+                for ep_id in episode_ids:
+                    with conn.cursor() as cur:
+                        cur.execute("""
+                            SELECT nexus_memory.update_access_tracking(%s::uuid)
+                        """, (ep_id,))
+                conn.commit()
 
         conn.close()
 
+        # LAB_005: Prime the whole working-memory set (one batched spread, no DB)
+        try:
+            with span("lab_005_priming"):
+                seeds = working_memory.get_episode_ids(request.session_id)
+                await asyncio.to_thread(get_spreading_engine().prime_batch, seeds)
+        except Exception as e:
+            lab_side_path_failures_total.labels(path="search_priming").inc()
+            print(f"LAB_005: Priming failed for session {request.session_id}: {e}")
+
+        # LAB_007: Results become prediction candidates; the top hit counts as
+        # the access (access tracking was already done above)
+        if results:
+            predictive_preloader.observe_candidates([(str(row[0]), row[3]) for row in results])
+            schedule_episode_access(str(results[0][0]), results[0][3] or [])
+
         # Initialize search_results (will be populated below)
         search_results = []
 
@@ -844,6 +1305,8 @@ async def search_memories(request: SearchRequest):
         if request.use_attention and results:
             try:
                 # Convert results to MemoryCandidate format
+                with span("lab_001_salience"):
+                    saliences = result_saliences(results)
                 candidates = []
                 for row in results:
                     episode_id = str(row[0])
@@ -853,13 +1316,8 @@ async def search_memories(request: SearchRequest):
                     importance_score = float(row[2])
                     tags = row[3] or []
 
-                    # LAB_001: Calculate REAL emotional salience (not hardcoded 0.5)
-                    try:
-                        salience_result = emotional_scorer.calculate_salience(episode_id, created_at)
-                        emotional_salience = salience_result.salience_score
-                    except:
-                        # Fallback if no emotional context in DB
-                        emotional_salience = 0.5
+                    # LAB_001: Precomputed salience (neutral if no emotional context)
+                    emotional_salience = saliences.get(episode_id, 0.5)
 
                     candidate = MemoryCandidate(
                         episode_id=episode_id,
@@ -882,12 +1340,13 @@ async def search_memories(request: SearchRequest):
                 )
 
                 # Apply attention (filter noise)
-                attended_candidates, attention_weights = attention_mechanism.attend(
-                    query_embedding,
-                    candidates,
-                    query_context={'tags': []},  # Could extract from query later
-                    apply_filter=True
-                )
+                with span("lab_010_attention"):
+                    attended_candidates, attention_weights = attention_mechanism.attend(
+                        query_embedding,
+                        candidates,
+                        query_context={'tags': []},  # Could extract from query later
+                        apply_filter=True
+                    )
 
                 # Update results to only include attended episodes
                 attended_episode_ids = {c.episode_id for c in attended_candidates}
@@ -902,32 +1361,23 @@ async def search_memories(request: SearchRequest):
         # LAB_001: Apply emotional salience re-ranking if enabled
         if request.use_emotional_salience and results:
             try:
-                # Initialize scorer (connects inside nexus_postgresql container)
-                scorer = EmotionalSalienceScorer(
-                    db_host=POSTGRES_HOST,
-                    db_port=POSTGRES_PORT,
-                    db_name=POSTGRES_DB,
-                    db_user=POSTGRES_USER,
-                    db_password=POSTGRES_PASSWORD
-                )
+                # Precomputed by the enrichment worker (batched fallback for the rest)
+                with span("lab_001_salience"):
+                    saliences = result_saliences(results)
 
-                # Calculate salience for each result
                 reranked_results = []
                 for row in results:
                     episode_id = str(row[0])
                     original_similarity = float(row[5])
-                    timestamp = row[4]
-
-                    # Calculate emotional salience
-                    salience = scorer.calculate_salience(episode_id, timestamp)
+                    salience_score = saliences.get(episode_id, 0.5)
 
                     # Apply re-ranking: final_score = similarity * (1 + alpha * salience)
-                    final_score = original_similarity * (1 + request.salience_boost_alpha * salience.total_score)
+                    final_score = original_similarity * (1 + request.salience_boost_alpha * salience_score)
 
                     reranked_results.append({
                         'row': row,
                         'original_similarity': original_similarity,
-                        'salience_score': salience.total_score,
+                        'salience_score': salience_score,
                         'final_score': final_score
                     })
 
@@ -935,28 +1385,29 @@ async def search_memories(request: SearchRequest):
                 if request.use_decay_modulation:
                     modulator = DecayModulator(decay_base=request.decay_base)
 
-                    for item in reranked_results:
-                        row = item['row']
-                        created_at = row[4]  # timestamp
-
-                        # Calculate decay-modulated score
-                        decay_result = modulator.calculate_decay_modulated_score(
-                            similarity=item['final_score'],  # Use LAB_001 score as input
-                            created_at=created_at,
-                            salience_score=item['salience_score']
-                        )
-
-                        # Update final score with decay modulation
-                        item['final_score'] = decay_result.modulated_score
-
-                        # Store decay metadata
-                        item['decay_metadata'] = {
-                            'age_days': decay_result.actual_age_days,
-                            'base_decay': decay_result.base_decay,
-                            'modulated_decay': decay_result.modulated_decay,
-                            'modulation_factor': decay_result.modulation_factor,
-                            'effective_age_days': decay_result.effective_age_days
-                        }
+                    with span("lab_002_decay"):
+                        for item in reranked_results:
+                            row = item['row']
+                            created_at = row[4]  # timestamp
+
+                            # Calculate decay-modulated score
+                            decay_result = modulator.calculate_decay_modulated_score(
+                                similarity=item['final_score'],  # Use LAB_001 score as input
+                                created_at=created_at,
+                                salience_score=item['salience_score']
+                            )
+
+                            # Update final score with decay modulation
+                            item['final_score'] = decay_result.modulated_score
+
+                            # Store decay metadata
+                            item['decay_metadata'] = {
+                                'age_days': decay_result.actual_age_days,
+                                'base_decay': decay_result.base_decay,
+                                'modulated_decay': decay_result.modulated_decay,
+                                'modulation_factor': decay_result.modulation_factor,
+                                'effective_age_days': decay_result.effective_age_days
+                            }
 
                 # Sort by final score
                 reranked_results.sort(key=lambda x: x['final_score'], reverse=True)
@@ -984,7 +1435,8 @@ async def search_memories(request: SearchRequest):
                         base_decay=decay_meta.get('base_decay'),
                         modulated_decay=decay_meta.get('modulated_decay'),
                         modulation_factor=decay_meta.get('modulation_factor'),
-                        effective_age_days=decay_meta.get('effective_age_days')
+                        effective_age_days=decay_meta.get('effective_age_days'),
+                        novelty_score=row[7]
                     ))
 
             except Exception as e:
@@ -993,24 +1445,27 @@ async def search_memories(request: SearchRequest):
                 request.use_emotional_salience = False  # Disable for fallback
 
         # Build search results (standard or fallback)
-        if not request.use_emotional_salience:
-            for row in results:
-                search_results.append(SearchResult(
-                    episode_id=str(row[0]),
-                    content=row[1],
-                    similarity_score=float(row[5]),
-                    importance_score=float(row[2]),
-                    tags=row[3] or [],
-                    created_at=row[4]
-                ))
-
-        return SearchResponse(
-            success=True,
-            query=request.query,
-            count=len(search_results),
-            results=search_results,
-            timestamp=datetime.now()
-        )
+        with span("serialize"):
+            if not request.use_emotional_salience:
+                for row in results:
+                    search_results.append(SearchResult(
+                        episode_id=str(row[0]),
+                        content=row[1],
+                        similarity_score=float(row[5]),
+                        importance_score=float(row[2]),
+                        tags=row[3] or [],
+                        created_at=row[4],
+                        salience_score=row[6],
+                        novelty_score=row[7]
+                    ))
+
+            return SearchResponse(
+                success=True,
+                query=request.query,
+                count=len(search_results),
+                results=search_results,
+                timestamp=datetime.now()
+            )
 
     except HTTPException:
         raise  # Re-raise HTTP exceptions
@@ -1056,7 +1511,10 @@ async def get_stats():
             "stats": {
                 "total_episodes": total_episodes,
                 "episodes_with_embeddings": total_with_embeddings,
-                "embeddings_queue": queue_stats
+                "embeddings_queue": queue_stats,
+                "shared_state": state_registry.get_stats(),
+                "lab_systems": lab_registry.get_stats(),
+                "embeddings": embeddings_stats()
             }
         }
 
@@ -1435,12 +1893,35 @@ class PruningExecuteRequest(BaseModel):
     min_age_days: int = Field(default=90, ge=30)
     max_prune_count: int = Field(default=100, ge=1, le=500)
     dry_run: bool = Field(default=True, description="Safety: default to dry-run mode")
+    batch_size: int = Field(default=50, ge=1, le=500, description="Episodes archived per transaction")
+    max_rows_per_second: Optional[float] = Field(default=None, gt=0, description="Optional archive rate limit")
+    resume_run_id: Optional[str] = Field(default=None, description="Resume an interrupted pruning run")
 
 class PruningExecuteResponse(BaseModel):
     success: bool
     pruned_count: int
     dry_run: bool
     timestamp: datetime
+    run_id: Optional[str] = None
+    status: Optional[str] = None
+    remaining: Optional[int] = None
+    batch_count: Optional[int] = None
+    rows_per_second: Optional[float] = None
+    neo4j_deleted_count: Optional[int] = None
+    neo4j_pending_count: Optional[int] = None
+    job_id: Optional[str] = None
+
+class PruningRestoreRequest(BaseModel):
+    episode_ids: Optional[List[str]] = Field(default=None, description="Archived episode UUIDs to restore")
+    run_id: Optional[str] = Field(default=None, description="Restore everything archived by this run")
+
+class PruningRestoreResponse(BaseModel):
+    success: bool
+    restored_count: int
+    episode_ids: List[str]
+    skipped_count: int = 0
+    skipped_episode_ids: List[str] = []
+    timestamp: datetime
 
 @app.post("/memory/consciousness/update", response_model=ConsciousnessUpdateResponse, tags=["Consciousness"])
 async def update_consciousness_state(request: ConsciousnessUpdateRequest):
@@ -1842,50 +2323,27 @@ async def execute_pruning(request: PruningExecuteRequest):
     - Never prunes recently accessed episodes
     - Caps at max_prune_count per operation
 
-    Pruned episodes are soft-deleted (moved to archive table, not lost)
+    Pruned episodes are soft-deleted (moved to archive table, not lost):
+    - Archived in batches of batch_size, one transaction per batch
+    - embeddings_queue rows and Neo4j nodes removed alongside
+    - Progress stored per run; pass resume_run_id to continue a run
+    - Optional max_rows_per_second rate limit
+
+    The run executes as a "pruning" background job: the response carries
+    run_id and job_id; follow progress at /memory/pruning/runs/{run_id}
+    or /jobs/{job_id}.
     """
     try:
-        if request.dry_run:
-            # Dry run mode: just count what would be pruned
-            conn = get_db_connection()
+        executor = get_pruning_executor()
 
-            protected_tags = ['milestone', 'critical', 'protected', 'consciousness']
-
-            with conn.cursor() as cur:
-                cur.execute("""
-                    WITH decay_scores AS (
-                        SELECT
-                            episode_id,
-                            nexus_memory.calculate_decay_score(
-                                importance_score,
-                                created_at,
-                                metadata
-                            ) as decay_score,
-                            importance_score,
-                            EXTRACT(EPOCH FROM (NOW() - created_at)) / 86400.0 as age_days,
-                            tags,
-                            CASE
-                                WHEN metadata->'access_tracking'->>'last_accessed' IS NOT NULL THEN
-                                    EXTRACT(EPOCH FROM (NOW() - (metadata->'access_tracking'->>'last_accessed')::TIMESTAMPTZ)) / 86400.0
-                                ELSE
-                                    999999
-                            END as last_accessed_days
-                        FROM nexus_memory.zep_episodic_memory
-                    )
-                    SELECT COUNT(*)
-                    FROM decay_scores
-                    WHERE decay_score < %s
-                        AND age_days >= %s
-                        AND importance_score <= 0.8
-                        AND NOT (tags && %s)
-                        AND last_accessed_days >= 7
-                    LIMIT %s
-                """, (request.min_score_threshold, request.min_age_days,
-                      protected_tags, request.max_prune_count))
-
-                would_prune_count = cur.fetchone()[0]
-
-            conn.close()
+        if request.dry_run:
+            # Dry run mode: just count what would be pruned (same rules as execution)
+            would_prune_count = await asyncio.to_thread(
+                executor.count_candidates,
+                min_score_threshold=request.min_score_threshold,
+                min_age_days=request.min_age_days,
+                cap=request.max_prune_count
+            )
 
             return PruningExecuteResponse(
                 success=True,
@@ -1893,14 +2351,47 @@ async def execute_pruning(request: PruningExecuteRequest):
                 dry_run=True,
                 timestamp=datetime.now()
             )
+
+        # ACTUAL PRUNING - batched archive-and-delete (resumable), as a background job
+        if request.resume_run_id:
+            run_id = request.resume_run_id
         else:
-            # ACTUAL PRUNING - NOT IMPLEMENTED YET
-            # TODO: Implement archive table and soft delete logic
+            run_id = await asyncio.to_thread(
+                executor.start_run,
+                min_score_threshold=request.min_score_threshold,
+                min_age_days=request.min_age_days,
+                target_count=request.max_prune_count,
+                batch_size=request.batch_size,
+                max_rows_per_second=request.max_rows_per_second
+            )
+
+        run = await asyncio.to_thread(executor.get_run, run_id)
+        if run is None:
             raise HTTPException(
-                status_code=status.HTTP_501_NOT_IMPLEMENTED,
-                detail="Actual pruning not yet implemented. Create archive table first."
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Pruning run {run_id} not found"
             )
 
+        job_id = await job_runner.submit("pruning", {"run_id": run_id})
+        task = asyncio.create_task(record_pruning_job(job_id, run_id, run.archived_count))
+        pruning_tasks.add(task)
+        task.add_done_callback(pruning_tasks.discard)
+
+        return PruningExecuteResponse(
+            success=True,
+            pruned_count=run.archived_count,
+            dry_run=False,
+            timestamp=datetime.now(),
+            run_id=run.run_id,
+            status=run.status,
+            remaining=run.remaining,
+            batch_count=run.batch_count,
+            rows_per_second=round(run.rows_per_second, 2),
+            neo4j_deleted_count=run.neo4j_deleted_count,
+            neo4j_pending_count=run.neo4j_pending_count,
+            job_id=job_id
+        )
+
     except HTTPException:
         raise
     except Exception as e:
@@ -1909,11 +2400,155 @@ async def execute_pruning(request: PruningExecuteRequest):
             detail=f"Error executing pruning: {str(e)}"
         )
 
+@app.get("/memory/pruning/runs/{run_id}", tags=["Intelligent Decay"])
+async def get_pruning_run(run_id: str):
+    """
+    Get progress of a pruning run
+
+    Returns archived / remaining counts, rows per second, batch count
+    and Neo4j deletions. Interrupted runs can be resumed by passing
+    resume_run_id to /memory/pruning/execute.
+    """
+    try:
+        run = await asyncio.to_thread(get_pruning_executor().get_run, run_id)
+
+        if run is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Pruning run {run_id} not found"
+            )
+
+        return {
+            "success": True,
+            **run.to_dict()
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching pruning run: {str(e)}"
+        )
+
+@app.post("/memory/pruning/restore", response_model=PruningRestoreResponse, tags=["Intelligent Decay"])
+async def restore_pruned_episodes(request: PruningRestoreRequest):
+    """
+    Restore archived episodes back into episodic memory
+
+    Restored episodes are re-inserted without embeddings, so the
+    embeddings trigger re-enqueues them for the embeddings worker.
+    Episodes whose id is already in episodic memory are skipped and
+    stay archived (skipped_episode_ids).
+    """
+    try:
+        if not request.episode_ids and not request.run_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide episode_ids or run_id"
+            )
+
+        result = await asyncio.to_thread(
+            get_pruning_executor().restore,
+            episode_ids=request.episode_ids,
+            run_id=request.run_id
+        )
+
+        episodes_restored_total.inc(len(result.restored_ids))
+        if result.restored_ids:
+            cache_invalidate("episodes:recent:*")
+
+        return PruningRestoreResponse(
+            success=True,
+            restored_count=len(result.restored_ids),
+            episode_ids=result.restored_ids,
+            skipped_count=len(result.skipped_ids),
+            skipped_episode_ids=result.skipped_ids,
+            timestamp=datetime.now()
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error restoring episodes: {str(e)}"
+        )
+
 @app.get("/metrics", tags=["Monitoring"])
-async def metrics():
-    """Prometheus metrics endpoint"""
+async def metrics(request: Request):
+    """Prometheus metrics endpoint (OpenMetrics, with exemplars, when the scraper asks for it)"""
+    if "application/openmetrics-text" in request.headers.get("accept", ""):
+        return Response(content=generate_openmetrics(), media_type=OPENMETRICS_CONTENT_TYPE)
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
+def require_admin(request: Request):
+    """Admin endpoints need X-Admin-Token (403 when missing/wrong or no token is configured)"""
+    token = request.headers.get("x-admin-token", "")
+    if NEXUS_ADMIN_TOKEN is None or not hmac.compare_digest(token.encode(), NEXUS_ADMIN_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required"
+        )
+
+@app.get("/admin/profile", tags=["Monitoring"])
+async def profile_worker(
+    request: Request,
+    seconds: float = 10.0,
+    format: str = "folded",
+    interval_ms: float = 10.0,
+    loop_only: bool = False,
+    tag_routes: bool = False
+):
+    """
+    Sample this worker's stacks for `seconds` and return a flamegraph profile
+
+    Covers the event-loop thread and the executor/inference threads
+    (loop_only=true: event loop only). format=folded returns collapsed
+    stacks (flamegraph.pl, inferno, speedscope); format=speedscope returns
+    speedscope JSON. tag_routes=true adds the route template of the
+    endpoint on the stack as the first frame.
+
+    Admin only (X-Admin-Token). One session per worker at a time (409).
+    Profiles only the worker that serves this request.
+    """
+    require_admin(request)
+    if format not in PROFILE_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format: {format}. Must be one of {', '.join(PROFILE_FORMATS)}"
+        )
+    if not 0 < seconds <= profiler.max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"seconds must be in (0, {profiler.max_seconds:g}]"
+        )
+
+    try:
+        profile = await asyncio.to_thread(
+            profiler.profile,
+            seconds,
+            interval_ms,
+            loop_thread_id=threading.get_ident(),  # handlers run on the event-loop thread
+            loop_only=loop_only,
+            route_codes=route_code_map(app.routes) if tag_routes else None
+        )
+    except ProfilerBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+    headers = {f"X-Profile-{key.replace('_', '-').title()}": str(value) for key, value in profile.summary().items()}
+    headers["X-Profile-Pid"] = str(os.getpid())
+    if format == "speedscope":
+        return Response(
+            content=json_module.dumps(profile.speedscope(f"nexus-api pid {os.getpid()}")),
+            media_type="application/json",
+            headers=headers
+        )
+    return PlainTextResponse(profile.folded(), headers=headers)
+
 # ============================================
 # FASE_8_UPGRADE: Hybrid Memory Endpoints
 # ============================================
@@ -1921,9 +2556,10 @@ async def metrics():
 @app.post("/memory/facts", response_model=FactQueryResponse, tags=["Hybrid Memory"])
 async def query_facts(request: FactQueryRequest):
     """
-    Query extracted facts directly from episode metadata
+    Query extracted facts from the typed fact store (nexus_memory.episode_facts)
 
-    Fast fact retrieval without semantic search (< 5ms)
+    Fast fact retrieval without semantic search (< 5ms): an index scan on
+    (fact_type, created_at DESC), independent of total episode count
 
     **Valid fact_type values (from EpisodeFacts model):**
     - Versioning: nexus_version, api_version
@@ -1945,80 +2581,48 @@ async def query_facts(request: FactQueryRequest):
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Build query
-                query_parts = ["SELECT episode_id, content, metadata, created_at, tags FROM nexus_memory.zep_episodic_memory"]
-                where_clauses = []
-                params = []
-
-                # Filter by tags if specified
-                if request.filter_tags:
-                    where_clauses.append("tags && %s")
-                    params.append(request.filter_tags)
-
-                # Filter by time range
-                if request.after:
-                    where_clauses.append("created_at > %s")
-                    params.append(request.after)
-
-                if request.before:
-                    where_clauses.append("created_at < %s")
-                    params.append(request.before)
-
-                # Filter by episodes that have the requested fact
-                where_clauses.append(f"metadata->'facts'->'{request.fact_type}' IS NOT NULL")
-
-                # Combine WHERE clauses
-                if where_clauses:
-                    query_parts.append("WHERE " + " AND ".join(where_clauses))
-
-                # Order by timestamp
-                order = "DESC" if request.order == "desc" else "ASC"
-                query_parts.append(f"ORDER BY created_at {order}")
-
-                # Limit
-                query_parts.append(f"LIMIT {request.limit}")
-
-                query = " ".join(query_parts)
-
-                cur.execute(query, params)
-                rows = cur.fetchall()
-
-                if not rows:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"No facts found for type: {request.fact_type}"
-                    )
-
-                # Get first result
-                row = rows[0]
-                episode_id = row[0]
-                metadata = row[2]
-                created_at = row[3]
-
-                # Extract fact value
-                facts = metadata.get("facts", {})
-                fact_value = facts.get(request.fact_type)
-
-                if fact_value is None:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Fact type '{request.fact_type}' not found"
-                    )
+                # Index scan on episode_facts (fact_type, created_at DESC)
+                facts = fact_store.query_facts(
+                    cur,
+                    fact_type=request.fact_type,
+                    filter_tags=request.filter_tags,
+                    after=request.after,
+                    before=request.before,
+                    order=request.order,
+                    limit=request.limit
+                )
 
-                # Get confidence
-                confidence = facts.get("extraction_confidence", 0.8)
+        if not facts:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No facts found for type: {request.fact_type}"
+            )
 
-                query_time_ms = (time.time() - start_time) * 1000
+        # First result is the answer; the rest are returned as context
+        fact = facts[0]
+        query_time_ms = (time.time() - start_time) * 1000
+
+        additional_context = {"query_time_ms": query_time_ms}
+        if len(facts) > 1:
+            additional_context["results"] = [
+                {
+                    "value": f.value,
+                    "source_episode_id": f.episode_id,
+                    "confidence": f.confidence,
+                    "timestamp": f.created_at.isoformat() if f.created_at else None
+                }
+                for f in facts
+            ]
 
-                return FactQueryResponse(
-                    success=True,
-                    fact_type=request.fact_type,
-                    value=fact_value,
-                    source_episode_id=str(episode_id),
-                    confidence=confidence,
-                    timestamp=created_at,
-                    additional_context={"query_time_ms": query_time_ms}
-                )
+        return FactQueryResponse(
+            success=True,
+            fact_type=request.fact_type,
+            value=fact.value,
+            source_episode_id=fact.episode_id,
+            confidence=fact.confidence,
+            timestamp=fact.created_at,
+            additional_context=additional_context
+        )
 
     except HTTPException:
         raise
@@ -2086,17 +2690,15 @@ async def hybrid_query(request: HybridQueryRequest):
     try:
         # Check if embeddings model is loaded
         if embeddings_model is None:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Embeddings model not loaded"
-            )
+            raise embeddings_unavailable()
+
+        # Generate embedding (before taking a connection: encode() can wait on the server)
+        with span("embedding"):
+            embedding = (await asyncio.to_thread(embeddings_model.encode, request.query)).tolist()
 
         # Use existing /memory/search endpoint logic
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Generate embedding
-                embedding = embeddings_model.encode(request.query).tolist()
-
                 # Build query
                 query_parts = [
                     "SELECT episode_id, content, tags, created_at,",
@@ -2163,12 +2765,13 @@ async def hybrid_query(request: HybridQueryRequest):
 # LAB_003: Sleep Consolidation
 # ==============================================================================
 
-@app.post("/memory/consolidate", tags=["LAB_003"])
+@app.post("/memory/consolidate", status_code=status.HTTP_202_ACCEPTED, tags=["LAB_003"])
 async def consolidate_memories(
-    date_str: Optional[str] = None
+    date_str: Optional[str] = None,
+    end_date_str: Optional[str] = None
 ):
     """
-    Manually trigger sleep consolidation for a specific date
+    Start sleep consolidation as a background job
 
     LAB_003: Mimics biological sleep consolidation
     - Detects breakthrough episodes
@@ -2178,48 +2781,172 @@ async def consolidate_memories(
 
     Args:
         date_str: Date to consolidate (YYYY-MM-DD format). Defaults to yesterday.
+        end_date_str: Optional last date (inclusive). Each day becomes a child
+            job of one parent job; days run in parallel within the
+            consolidation concurrency limit.
 
     Returns:
-        Consolidation report with statistics
+        job_id to poll with GET /jobs/{job_id}; the consolidation report
+        is the job's result
     """
     try:
-        # Lazy import (avoid psycopg2 dependency at startup)
-        from consolidation_engine import ConsolidationEngine
-
-        # Parse date
         if date_str:
-            target_date = datetime.strptime(date_str, "%Y-%m-%d")
+            start_date = datetime.strptime(date_str, "%Y-%m-%d")
         else:
-            target_date = datetime.now() - timedelta(days=1)
-
-        # Execute consolidation
-        with ConsolidationEngine(
-            db_host=POSTGRES_HOST,
-            db_port=POSTGRES_PORT,
-            db_name=POSTGRES_DB,
-            db_user=POSTGRES_USER,
-            db_password=POSTGRES_PASSWORD
-        ) as engine:
-            report = engine.consolidate_daily_memories(target_date)
+            start_date = datetime.now() - timedelta(days=1)
+        end_date = datetime.strptime(end_date_str, "%Y-%m-%d") if end_date_str else start_date
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Dates must use the YYYY-MM-DD format"
+        )
+
+    day_count = (end_date.date() - start_date.date()).days + 1
+    if day_count < 1 or day_count > MAX_CONSOLIDATION_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must cover 1 to {MAX_CONSOLIDATION_DAYS} days"
+        )
+
+    try:
+        dates = [(start_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(day_count)]
+        if day_count == 1:
+            job_id = await job_runner.submit("consolidation", {"date": dates[0]})
+        else:
+            job_id = await job_runner.submit_fanout(
+                "consolidation_range", "consolidation", [{"date": date} for date in dates]
+            )
+
+        return {
+            "success": True,
+            "job_id": job_id,
+            "status": "pending",
+            "dates": dates,
+            "status_url": f"/jobs/{job_id}"
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Could not start consolidation: {str(e)}"
+        )
+
+
+# ==============================================================================
+# Background Jobs
+# ==============================================================================
+
+class JobSubmitRequest(BaseModel):
+    job_type: str = Field(..., description="consolidation | fact_backfill | pruning | priming_rebuild")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Keyword arguments for the job")
+
+
+def parse_job_id(job_id: str) -> str:
+    """Unknown and malformed ids are both 404"""
+    try:
+        return str(uuid.UUID(job_id))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+
+
+@app.post("/jobs", status_code=status.HTTP_202_ACCEPTED, tags=["Jobs"])
+async def submit_job(request: JobSubmitRequest):
+    """
+    Start a long-running operation as a background job
+
+    Job types:
+    - consolidation: {"date": "YYYY-MM-DD"}
+    - fact_backfill: {"run_name", "batch_size", "only_missing", "ranges"} (resumable)
+    - pruning: {"run_id"} of a run created by /memory/pruning/execute (resumable)
+    - priming_rebuild: {} - re-bootstrap the LAB_005 priming graph
+    """
+    if request.job_type not in job_runner.job_types:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown job type: {request.job_type}"
+        )
+
+    try:
+        job_id = await job_runner.submit(request.job_type, request.params)
+        return {
+            "success": True,
+            "job_id": job_id,
+            "status": "pending",
+            "status_url": f"/jobs/{job_id}"
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Could not start job: {str(e)}"
+        )
+
+
+@app.get("/jobs/{job_id}", tags=["Jobs"])
+async def get_job(job_id: str):
+    """
+    Status, progress and result of a background job
+
+    Parent jobs (multi-day consolidation) include their child jobs.
+    """
+    job_id = parse_job_id(job_id)
+    try:
+        job = await job_runner.get(job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching job: {str(e)}"
+        )
+
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+
+    return {
+        "success": True,
+        **job.to_dict()
+    }
+
 
+@app.post("/jobs/{job_id}/cancel", tags=["Jobs"])
+async def cancel_job(job_id: str):
+    """
+    Cancel a background job and its child jobs
+
+    Pending jobs are cancelled immediately; running jobs stop at their
+    next checkpoint (a cancelled consolidation day is rolled back).
+    """
+    job_id = parse_job_id(job_id)
+    try:
+        job = await job_runner.get(job_id)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Job {job_id} not found"
+            )
+        if job.finished:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job {job_id} already {job.status}"
+            )
+
+        job = await job_runner.cancel(job_id)
         return {
             "success": True,
-            "date": report.date.isoformat(),
-            "episodes_processed": report.episodes_processed,
-            "breakthrough_count": report.breakthrough_count,
-            "chain_count": report.chain_count,
-            "episodes_boosted": report.episodes_boosted,
-            "trace_count": report.trace_count,
-            "avg_boost": round(report.avg_boost, 3),
-            "max_boost": round(report.max_boost, 3),
-            "processing_time_seconds": round(report.processing_time_seconds, 2),
-            "top_breakthroughs": report.top_breakthroughs
+            **job.to_dict()
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Consolidation failed: {str(e)}"
+            detail=f"Error cancelling job: {str(e)}"
         )
 
 
@@ -2239,11 +2966,117 @@ def get_spreading_engine():
             decay_half_life=30.0,
             cache_size=50,
             top_k_related=5,
-            max_hops=2
+            max_hops=2,
+            cache_backend=make_cache_backend(
+                "priming", 50, lambda: getattr(app.state, "redis_cache_client", None), ttl=300
+            )
         )
     return spreading_engine
 
 
+# Snapshot store shared by all workers on this host
+priming_graph_store = None
+PRIMING_SYNC_INTERVAL_SECONDS = float(os.getenv("PRIMING_SYNC_INTERVAL_SECONDS", "30"))
+
+def get_priming_graph_store():
+    """Lazy initialization of the priming graph store"""
+    global priming_graph_store
+    if priming_graph_store is None:
+        priming_graph_store = PrimingGraphStore(DB_CONN_STRING)
+    return priming_graph_store
+
+
+async def maintain_priming_graph():
+    """
+    Background task: load the latest snapshot (or bootstrap it from
+    pgvector), then keep the graph in sync with new embeddings and
+    periodically write a fresh snapshot.
+    """
+    store = get_priming_graph_store()
+    try:
+        graph = await asyncio.to_thread(store.load_or_bootstrap)
+        get_spreading_engine().similarity_graph = graph
+        print(f"✓ Priming graph ready: {len(graph)} episodes ({store.loaded_from})")
+    except Exception as e:
+        print(f"⚠ Priming graph bootstrap failed: {e}")
+
+    while True:
+        await asyncio.sleep(PRIMING_SYNC_INTERVAL_SECONDS)
+        try:
+            graph = get_spreading_engine().similarity_graph
+            await asyncio.to_thread(store.sync, graph)
+            await asyncio.to_thread(store.save_if_leader, graph)
+        except Exception as e:
+            print(f"⚠ Priming graph sync failed: {e}")
+
+
+def load_novelty_training_episodes():
+    """60-day rolling window for a full LAB_004 baseline refit"""
+    with psycopg.connect(DB_CONN_STRING) as conn:
+        return fetch_training_episodes(conn, days=60)
+
+
+async def maintain_novelty_baselines():
+    """
+    Background task: pick up baselines saved by other workers and, when
+    they are older than the refit interval, refit in a worker process
+    (one worker at a time). Ingest keeps them current in between.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(novelty_detector.sync_baselines)
+            if novelty_detector.refit_due(NOVELTY_REFIT_INTERVAL_SECONDS):
+                future = await asyncio.to_thread(novelty_detector.refit_if_leader, load_novelty_training_episodes)
+                if future is not None:
+                    await asyncio.wrap_future(future)
+                    print(f"✓ Novelty baselines refit: {novelty_detector.get_stats()['episodes_trained']} episodes")
+        except Exception as e:
+            print(f"⚠ Novelty baseline maintenance failed: {e}")
+        await asyncio.sleep(NOVELTY_SYNC_INTERVAL_SECONDS)
+
+
+class PrimeBatchRequest(BaseModel):
+    episode_uuids: Optional[List[str]] = Field(
+        default=None,
+        description="Seeds to prime; defaults to the current working-memory set"
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Working-memory session used when no seeds are given (default session)"
+    )
+
+
+@app.post("/memory/prime/batch", tags=["LAB_005"])
+async def prime_batch(request: PrimeBatchRequest):
+    """
+    Prime many episodes with one multi-source spread
+
+    LAB_005: Spreading Activation & Contextual Priming
+    - Uses the working-memory buffer (LAB_011) when no seeds are given
+    - Seeds not yet in the similarity graph are skipped
+
+    Returns:
+        Seeds used, primed episodes and timing
+    """
+    try:
+        engine = get_spreading_engine()
+        seeds = (request.episode_uuids if request.episode_uuids is not None
+                 else working_memory.get_episode_ids(request.session_id))
+        result = await asyncio.to_thread(engine.prime_batch, seeds)
+
+        return {
+            "success": True,
+            **result,
+            "cache_stats": await asyncio.to_thread(engine.priming_cache.get_stats)
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch priming failed: {str(e)}"
+        )
+
+
 @app.post("/memory/prime/{episode_uuid}", tags=["LAB_005"])
 async def prime_episode(episode_uuid: str):
     """
@@ -2282,10 +3115,11 @@ async def prime_episode(episode_uuid: str):
                     )
 
                 uuid, content, embedding = row
+                uuid = str(uuid)
 
                 # Convert embedding to numpy array
                 import numpy as np
-                embedding_array = np.array(embedding) if embedding else None
+                embedding_array = parse_vector(embedding)
 
                 # Ensure episode is in similarity graph
                 if uuid not in engine.similarity_graph.embeddings:
@@ -2293,7 +3127,10 @@ async def prime_episode(episode_uuid: str):
                         engine.add_episode(uuid, content, embedding_array)
 
                 # Access episode (triggers spreading activation)
-                result = engine.access_episode(uuid, content, embedding_array if embedding_array is not None else np.zeros(384))
+                result = await asyncio.to_thread(
+                    engine.access_episode, uuid, content,
+                    embedding_array if embedding_array is not None else np.zeros(384)
+                )
 
                 return {
                     "success": True,
@@ -2301,7 +3138,7 @@ async def prime_episode(episode_uuid: str):
                     "primed_episodes": result["primed_episodes"],
                     "activation_count": result["activation_count"],
                     "processing_time_ms": result["processing_time_ms"],
-                    "cache_stats": engine.priming_cache.get_stats()
+                    "cache_stats": await asyncio.to_thread(engine.priming_cache.get_stats)
                 }
 
     except HTTPException:
@@ -2322,7 +3159,9 @@ async def get_priming_stats():
     """
     try:
         engine = get_spreading_engine()
-        stats = engine.get_statistics()
+        stats = await asyncio.to_thread(engine.get_statistics)
+        stats["graph_store"] = get_priming_graph_store().get_stats()
+        stats["preload_cache_stats"] = await asyncio.to_thread(predictive_preloader.preload_scheduler.get_cache_stats)
 
         return {
             "success": True,
@@ -2337,6 +3176,29 @@ async def get_priming_stats():
         )
 
 
+@app.get("/memory/preload/stats", tags=["LAB_007"])
+async def get_preload_stats():
+    """
+    Get predictive preloading statistics
+
+    Returns pattern counts, preload hit/waste rates (per worker) and
+    episode fetcher batching
+    """
+    try:
+        return {
+            "success": True,
+            "statistics": await asyncio.to_thread(predictive_preloader.get_stats),
+            "fetcher": get_episode_fetcher().get_stats(),
+            "pending_tasks": len(episode_access_tasks)
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get stats: {str(e)}"
+        )
+
+
 @app.get("/memory/primed/{episode_uuid}", tags=["LAB_005"])
 async def get_primed_episode(episode_uuid: str):
     """
@@ -2346,7 +3208,7 @@ async def get_primed_episode(episode_uuid: str):
     """
     try:
         engine = get_spreading_engine()
-        primed = engine.try_primed_access(episode_uuid)
+        primed = await asyncio.to_thread(engine.try_primed_access, episode_uuid)
 
         if primed:
             return {
@@ -2377,11 +3239,41 @@ async def get_primed_episode(episode_uuid: str):
 # LAB_011: Working Memory Buffer Endpoints
 # ============================================
 
+async def flush_working_memory():
+    """Write changed working-memory sessions to nexus_memory.zep_working_memory"""
+    snapshots = working_memory.take_dirty()
+    if not snapshots:
+        return
+    try:
+        await asyncio.to_thread(working_memory_store.write, snapshots)
+    except Exception as e:
+        working_memory.requeue(snapshots)
+        print(f"⚠ Working memory write-behind failed: {e}")
+
+
+async def persist_working_memory():
+    """
+    Background task (WORKING_MEMORY_PERSIST=true): restore the most recent
+    persisted sessions, then write changed sessions behind every
+    WORKING_MEMORY_FLUSH_SECONDS.
+    """
+    try:
+        snapshots = await asyncio.to_thread(working_memory_store.load, WORKING_MEMORY_MAX_SESSIONS)
+        print(f"✓ Working memory restored: {working_memory.restore(snapshots)} sessions")
+    except Exception as e:
+        print(f"⚠ Working memory restore failed: {e}")
+
+    while True:
+        await asyncio.sleep(WORKING_MEMORY_FLUSH_SECONDS)
+        await flush_working_memory()
+
+
 @app.post("/memory/working/add", tags=["LAB_011"])
 async def add_to_working_memory(
     episode_id: str,
     attention_weight: float = 1.0,
-    tags: Optional[List[str]] = None
+    tags: Optional[List[str]] = None,
+    session_id: Optional[str] = None
 ):
     """
     Add episode reference to working memory buffer (7-item capacity, Miller's Law)
@@ -2395,15 +3287,17 @@ async def add_to_working_memory(
         episode_id: UUID of episode in long-term memory
         attention_weight: Attention score (from LAB_010, default 1.0)
         tags: Optional tags for context
+        session_id: Session/agent whose buffer to use (default session)
     """
     try:
-        added = working_memory.add(episode_id, attention_weight, tags)
+        added = working_memory.add(episode_id, attention_weight, tags, session_id)
 
         return {
             "success": True,
             "added": added,
             "episode_id": episode_id,
-            "buffer_size": len(working_memory.buffer),
+            "session_id": session_id or DEFAULT_SESSION,
+            "buffer_size": working_memory.size(session_id),
             "capacity": working_memory.capacity,
             "message": "Episode added to working memory" if added else "Episode rejected by eviction policy"
         }
@@ -2415,11 +3309,11 @@ async def add_to_working_memory(
 
 
 @app.get("/memory/working/items", tags=["LAB_011"])
-async def get_working_memory_items():
+async def get_working_memory_items(session_id: Optional[str] = None):
     """
-    Get all episode references currently in working memory buffer
+    Get all episode references currently in a session's working memory buffer
 
-    Returns items in order (oldest to newest)
+    Returns items in order (least to most recently accessed)
     """
     try:
         items_list = [
@@ -2433,11 +3327,12 @@ async def get_working_memory_items():
                 "tags": item.tags,
                 "age_seconds": item.age_seconds()
             }
-            for item in working_memory.buffer
+            for item in working_memory.get_items(session_id)
         ]
 
         return {
             "success": True,
+            "session_id": session_id or DEFAULT_SESSION,
             "items": items_list,
             "count": len(items_list),
             "capacity": working_memory.capacity
@@ -2450,17 +3345,17 @@ async def get_working_memory_items():
 
 
 @app.post("/memory/working/clear", tags=["LAB_011"])
-async def clear_working_memory():
+async def clear_working_memory(session_id: Optional[str] = None):
     """
-    Clear all items from working memory buffer
+    Clear all items from a session's working memory buffer
     """
     try:
-        count_before = len(working_memory.buffer)
-        working_memory.clear()
+        cleared = working_memory.clear(session_id)
 
         return {
             "success": True,
-            "cleared_count": count_before,
+            "session_id": session_id or DEFAULT_SESSION,
+            "cleared_count": cleared,
             "message": "Working memory cleared"
         }
     except Exception as e:
@@ -2471,12 +3366,12 @@ async def clear_working_memory():
 
 
 @app.get("/memory/working/stats", tags=["LAB_011"])
-async def get_working_memory_stats():
+async def get_working_memory_stats(session_id: Optional[str] = None):
     """
-    Get working memory buffer statistics
+    Get a session's working memory buffer statistics (plus session counts)
     """
     try:
-        stats = working_memory.get_stats()
+        stats = working_memory.get_stats(session_id)
 
         return {
             "success": True,
@@ -2599,20 +3494,9 @@ async def get_calibration_curve():
     Perfect calibration: confidence = accuracy
     """
     try:
-        stats = metacognition_logger.get_comprehensive_stats()
-
-        # Extract calibration-specific data
-        calibration_data = {
-            "ece": stats.get("ece", 0.0),
-            "total_actions": stats.get("total_actions", 0),
-            "avg_confidence": stats.get("avg_confidence", 0.0),
-            "success_rate": stats.get("success_rate", 0.0),
-            "bins": stats.get("calibration_bins", [])
-        }
-
         return {
             "success": True,
-            **calibration_data
+            **metacognition_logger.get_calibration_curve()
         }
     except Exception as e:
         raise HTTPException(
@@ -3013,6 +3897,30 @@ async def get_gaba_state():
 # A/B Testing Endpoints
 # ============================================
 
+# Strong references to in-flight A/B flushes (the loop only keeps weak ones)
+ab_test_flush_tasks = set()
+
+
+async def flush_ab_test_buffer():
+    """Write buffered A/B samples with one COPY (kept for the next try on failure)"""
+    try:
+        await asyncio.to_thread(flush_ab_test_metrics)
+    except Exception as e:
+        print(f"⚠ A/B test metrics flush failed: {e}")
+
+
+async def flush_ab_test_metrics_periodically():
+    """Background task: flush the A/B write-behind buffer every AB_TEST_FLUSH_SECONDS"""
+    while True:
+        await asyncio.sleep(AB_TEST_FLUSH_SECONDS)
+        await flush_ab_test_buffer()
+
+
+async def ab_test_manager():
+    """The A/B test manager; built in a thread on first use (it creates its tables)"""
+    return await asyncio.to_thread(get_ab_test_manager, DB_CONN_STRING, db_pool)
+
+
 @app.post("/ab-test/record", tags=["A/B Testing"])
 async def record_ab_test_metric(request: ABTestMetricRequest):
     """
@@ -3023,13 +3931,13 @@ async def record_ab_test_metric(request: ABTestMetricRequest):
     - "treatment": With LAB_005 spreading activation
     """
     try:
-        ab_manager = get_ab_test_manager(DB_CONN_STRING)
+        ab_manager = await ab_test_manager()
 
         # Validate variant
         test_variant = TestVariant(request.variant)
 
-        # Record the metric
-        ab_manager.record_retrieval(
+        # Record the metric (buffered; a full batch is flushed in the background)
+        batch_full = ab_manager.record_retrieval(
             variant=test_variant,
             retrieval_time_ms=request.retrieval_time_ms,
             cache_hit=request.cache_hit,
@@ -3038,6 +3946,10 @@ async def record_ab_test_metric(request: ABTestMetricRequest):
             primed_count=request.primed_count,
             query_id=request.query_id
         )
+        if batch_full:
+            task = asyncio.create_task(flush_ab_test_buffer())
+            ab_test_flush_tasks.add(task)
+            task.add_done_callback(ab_test_flush_tasks.discard)
 
         return {
             "success": True,
@@ -3068,8 +3980,8 @@ async def compare_ab_test_variants(hours_back: int = 24):
     - Statistical significance
     """
     try:
-        ab_manager = get_ab_test_manager(DB_CONN_STRING)
-        comparison = ab_manager.compare_variants(hours_back=hours_back)
+        ab_manager = await ab_test_manager()
+        comparison = await asyncio.to_thread(ab_manager.compare_variants, hours_back=hours_back)
 
         return {
             "success": True,
@@ -3087,10 +3999,10 @@ async def compare_ab_test_variants(hours_back: int = 24):
 async def get_variant_metrics(variant: str, hours_back: int = 24):
     """Get aggregated metrics for a specific variant"""
     try:
-        ab_manager = get_ab_test_manager(DB_CONN_STRING)
+        ab_manager = await ab_test_manager()
         test_variant = TestVariant(variant)
 
-        metrics = ab_manager.get_aggregated_metrics(test_variant, hours_back)
+        metrics = await asyncio.to_thread(ab_manager.get_aggregated_metrics, test_variant, hours_back)
 
         if not metrics:
             raise HTTPException(
@@ -3128,18 +4040,24 @@ async def get_variant_metrics(variant: str, hours_back: int = 24):
 
 
 @app.get("/ab-test/timeseries/{variant}", tags=["A/B Testing"])
-async def get_variant_timeseries(variant: str, hours_back: int = 24):
-    """Get time-series data for a variant (for visualization)"""
+async def get_variant_timeseries(variant: str, hours_back: int = 24, bucket_minutes: int = 60):
+    """Get time-series data for a variant (for visualization, from the minute/hour rollups)"""
+    if bucket_minutes < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bucket_minutes must be at least 1"
+        )
     try:
-        ab_manager = get_ab_test_manager(DB_CONN_STRING)
+        ab_manager = await ab_test_manager()
         test_variant = TestVariant(variant)
 
-        timeseries = ab_manager.get_time_series(test_variant, hours_back)
+        timeseries = await asyncio.to_thread(ab_manager.get_time_series, test_variant, hours_back, bucket_minutes)
 
         return {
             "success": True,
             "variant": variant,
             "hours_analyzed": hours_back,
+            "bucket_minutes": bucket_minutes,
             "data_points": len(timeseries),
             "timeseries": timeseries
         }
@@ -3159,14 +4077,14 @@ async def get_variant_timeseries(variant: str, hours_back: int = 24):
 async def clear_ab_test_data(variant: Optional[str] = None):
     """Clear A/B test data (for resetting experiments)"""
     try:
-        ab_manager = get_ab_test_manager(DB_CONN_STRING)
+        ab_manager = await ab_test_manager()
 
         if variant:
             test_variant = TestVariant(variant)
-            ab_manager.clear_test_data(test_variant)
+            await asyncio.to_thread(ab_manager.clear_test_data, test_variant)
             message = f"Cleared data for variant '{variant}'"
         else:
-            ab_manager.clear_test_data()
+            await asyncio.to_thread(ab_manager.clear_test_data)
             message = "Cleared all A/B test data"
 
         return {
@@ -7,17 +7,32 @@ calibration metrics, and reasoning traces.
 Based on neuroscience: Prefrontal metacognition (dmPFC, frontopolar cortex)
 and AI metacognitive monitoring (2024-2025 research).
 
+Statistics are streaming: every outcome updates running totals per
+confidence bin, confidence band and action type in O(1), so the stats
+endpoints cost the same after a million actions as after ten. Raw
+actions are only kept in a bounded ring (max_actions, oldest dropped),
+which also bounds the shared state written to Redis.
+
 Author: NEXUS (Autonomous)
 Date: October 28, 2025
 """
 
+from bisect import bisect_right
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
+import math
 import numpy as np
 
 
+MAX_ACTIONS = 10000          # raw actions retained (ring)
+MAX_ACTION_TYPES = 256       # per-type breakdowns; further types count as OTHER_ACTION_TYPE
+OTHER_ACTION_TYPE = "other"
+RECENT_MISMATCHES = 100      # mismatch_actions reported by ErrorDetector stats
+
+
 # ============================================================================
 # Data Structures
 # ============================================================================
@@ -30,6 +45,23 @@ class ConfidenceBand(Enum):
     VERY_UNCERTAIN = "very_uncertain"    # 0.0-0.5
 
 
+def confidence_band(confidence: float) -> ConfidenceBand:
+    """Categorize confidence into bands"""
+    if confidence >= 0.9:
+        return ConfidenceBand.VERY_CONFIDENT
+    elif confidence >= 0.7:
+        return ConfidenceBand.CONFIDENT
+    elif confidence >= 0.5:
+        return ConfidenceBand.UNCERTAIN
+    else:
+        return ConfidenceBand.VERY_UNCERTAIN
+
+
+def calibration_bin(confidence: float, edges: List[float]) -> int:
+    """Index of the bin with edges[i] <= confidence < edges[i + 1] (1.0 in the last bin)"""
+    return min(max(bisect_right(edges, confidence) - 1, 0), len(edges) - 2)
+
+
 @dataclass
 class Action:
     """Logged action with metacognitive data"""
@@ -51,11 +83,26 @@ class ConfidenceTracker:
     Track confidence levels for each action/decision.
 
     Confidence should predict success: high confidence → high success rate.
+
+    Keeps the last max_actions actions (oldest dropped first) and running
+    confidence statistics over every action ever logged.
     """
 
-    def __init__(self):
-        # {action_id: Action}
-        self.actions: Dict[str, Action] = {}
+    def __init__(self, max_actions: int = MAX_ACTIONS):
+        self.max_actions = max_actions
+
+        # {action_id: Action}, oldest first
+        self.actions: "OrderedDict[str, Action]" = OrderedDict()
+
+        # Running confidence statistics (Welford) over all logged actions
+        self.total_actions = 0
+        self.confidence_mean = 0.0
+        self.confidence_m2 = 0.0
+        self.min_confidence = 1.0
+        self.max_confidence = 0.0
+
+        # Retained actions still waiting for an outcome
+        self.pending = 0
 
     def log_action(
         self,
@@ -87,36 +134,45 @@ class ConfidenceTracker:
             timestamp=datetime.now()
         )
 
+        previous = self.actions.pop(action_id, None)
+        if previous is not None and previous.outcome is None:
+            self.pending -= 1
         self.actions[action_id] = action
+        self.pending += 1
+
+        while len(self.actions) > self.max_actions:
+            _, dropped = self.actions.popitem(last=False)
+            if dropped.outcome is None:
+                self.pending -= 1
+
+        self.total_actions += 1
+        delta = confidence - self.confidence_mean
+        self.confidence_mean += delta / self.total_actions
+        self.confidence_m2 += delta * (confidence - self.confidence_mean)
+        self.min_confidence = min(self.min_confidence, confidence)
+        self.max_confidence = max(self.max_confidence, confidence)
+
         return action
 
     def get_confidence_band(self, confidence: float) -> ConfidenceBand:
         """Categorize confidence into bands"""
-        if confidence >= 0.9:
-            return ConfidenceBand.VERY_CONFIDENT
-        elif confidence >= 0.7:
-            return ConfidenceBand.CONFIDENT
-        elif confidence >= 0.5:
-            return ConfidenceBand.UNCERTAIN
-        else:
-            return ConfidenceBand.VERY_UNCERTAIN
+        return confidence_band(confidence)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get confidence statistics"""
-        if not self.actions:
+        if not self.total_actions:
             return {
                 'total_actions': 0,
                 'avg_confidence': 0.0
             }
 
-        confidences = [a.confidence for a in self.actions.values()]
-
         return {
-            'total_actions': len(self.actions),
-            'avg_confidence': np.mean(confidences),
-            'std_confidence': np.std(confidences),
-            'min_confidence': min(confidences),
-            'max_confidence': max(confidences)
+            'total_actions': self.total_actions,
+            'retained_actions': len(self.actions),
+            'avg_confidence': self.confidence_mean,
+            'std_confidence': math.sqrt(self.confidence_m2 / self.total_actions),
+            'min_confidence': self.min_confidence,
+            'max_confidence': self.max_confidence
         }
 
 
@@ -129,10 +185,12 @@ class OutcomeTracker:
     Track actual outcomes of actions.
 
     Enables calibration analysis: Were high-confidence actions actually successful?
+    Every outcome is folded into running CalibrationStats.
     """
 
     def __init__(self, confidence_tracker: ConfidenceTracker):
         self.confidence_tracker = confidence_tracker
+        self.calibration = CalibrationStats()
 
     def log_outcome(
         self,
@@ -149,19 +207,26 @@ class OutcomeTracker:
             error_type: If failed, what type of error? (optional)
 
         Returns:
-            True if action found and updated
+            True if action found (still retained) and updated
         """
-        if action_id not in self.confidence_tracker.actions:
+        action = self.confidence_tracker.actions.get(action_id)
+        if action is None:
             return False
 
-        action = self.confidence_tracker.actions[action_id]
+        if action.outcome is None:
+            self.confidence_tracker.pending -= 1
+        else:
+            # Corrected outcome: replace the earlier one in the totals
+            self.calibration.record(action, weight=-1)
+
         action.outcome = success
         action.error_type = error_type
+        self.calibration.record(action)
 
         return True
 
     def get_completed_actions(self) -> List[Action]:
-        """Get actions with known outcomes"""
+        """Get retained actions with known outcomes"""
         return [
             a for a in self.confidence_tracker.actions.values()
             if a.outcome is not None
@@ -169,40 +234,26 @@ class OutcomeTracker:
 
     def get_success_rate(self) -> float:
         """Overall success rate"""
-        completed = self.get_completed_actions()
-        if not completed:
-            return 0.0
-
-        successes = sum(1 for a in completed if a.outcome)
-        return successes / len(completed)
+        return self.calibration.total.success_rate
 
     def get_stats(self) -> Dict[str, Any]:
         """Get outcome statistics"""
-        completed = self.get_completed_actions()
+        total = self.calibration.total
 
-        if not completed:
+        if not total.count:
             return {
                 'completed_actions': 0,
                 'success_rate': 0.0,
-                'pending_actions': len(self.confidence_tracker.actions)
+                'pending_actions': self.confidence_tracker.pending
             }
 
-        successes = sum(1 for a in completed if a.outcome)
-        failures = len(completed) - successes
-
-        # Error type breakdown
-        error_types = {}
-        for action in completed:
-            if not action.outcome and action.error_type:
-                error_types[action.error_type] = error_types.get(action.error_type, 0) + 1
-
         return {
-            'completed_actions': len(completed),
-            'success_rate': successes / len(completed),
-            'successes': successes,
-            'failures': failures,
-            'error_types': error_types,
-            'pending_actions': len(self.confidence_tracker.actions) - len(completed)
+            'completed_actions': total.count,
+            'success_rate': total.success_rate,
+            'successes': total.successes,
+            'failures': total.count - total.successes,
+            'error_types': {k: v for k, v in self.calibration.error_types.items() if v},
+            'pending_actions': self.confidence_tracker.pending
         }
 
 
@@ -269,11 +320,152 @@ class ErrorDetector:
             'mismatch_actions': [a.action_id for a in mismatches]
         }
 
+    def summarize(self, stats: "CalibrationStats") -> Dict[str, Any]:
+        """Same as analyze_errors, from running totals (most recent mismatch ids only)"""
+        if not stats.total.count:
+            return {
+                'confidence_mismatches': 0,
+                'mismatch_rate': 0.0,
+                'avg_mismatch_confidence': 0.0
+            }
+
+        mismatches = stats.mismatches
+        return {
+            'confidence_mismatches': mismatches.count,
+            'mismatch_rate': mismatches.count / stats.total.count,
+            'avg_mismatch_confidence': mismatches.avg_confidence,
+            'mismatch_actions': list(stats.recent_mismatches)
+        }
+
 
 # ============================================================================
 # Calibration Analyzer
 # ============================================================================
 
+@dataclass
+class CalibrationAccumulator:
+    """Running totals for one group of completed actions (bin, band, type)"""
+    count: int = 0
+    confidence_sum: float = 0.0
+    successes: int = 0
+    squared_error_sum: float = 0.0  # Brier numerator
+
+    def update(self, confidence: float, success: bool, weight: int = 1):
+        self.count += weight
+        self.confidence_sum += weight * confidence
+        self.successes += weight * int(success)
+        self.squared_error_sum += weight * (confidence - int(success)) ** 2
+
+    @property
+    def avg_confidence(self) -> float:
+        return self.confidence_sum / self.count if self.count else 0.0
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.count if self.count else 0.0
+
+    @property
+    def brier_score(self) -> float:
+        return self.squared_error_sum / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'success_rate': self.success_rate,
+            'avg_confidence': self.avg_confidence,
+            'brier_score': self.brier_score
+        }
+
+
+class CalibrationStats:
+    """
+    Streaming calibration over every completed action.
+
+    record() updates one accumulator per confidence bin, confidence band,
+    action type and overall in O(1); weight=-1 takes an outcome back out
+    (corrected outcomes). ECE, Brier score and the breakdowns are read
+    from the accumulators and match CalibrationAnalyzer on the same actions.
+    """
+
+    def __init__(self, num_bins: int = 10, mismatch_threshold: float = 0.8):
+        self.edges = [float(edge) for edge in np.linspace(0, 1, num_bins + 1)]
+        self.mismatch_threshold = mismatch_threshold
+
+        self.total = CalibrationAccumulator()
+        self.bins = [CalibrationAccumulator() for _ in range(num_bins)]
+        self.bands = {band.value: CalibrationAccumulator() for band in ConfidenceBand}
+        self.by_action_type: Dict[str, CalibrationAccumulator] = {}
+
+        # Failures: by error type, and high-confidence ones (ErrorDetector)
+        self.error_types: Dict[str, int] = {}
+        self.mismatches = CalibrationAccumulator()
+        self.recent_mismatches: deque = deque(maxlen=RECENT_MISMATCHES)
+
+    def record(self, action: Action, weight: int = 1):
+        """Add (or with weight=-1 remove) a completed action"""
+        confidence, success = action.confidence, bool(action.outcome)
+
+        self.total.update(confidence, success, weight)
+        self.bins[calibration_bin(confidence, self.edges)].update(confidence, success, weight)
+        self.bands[confidence_band(confidence).value].update(confidence, success, weight)
+        self._action_type(action.action_type).update(confidence, success, weight)
+
+        if not success and action.error_type:
+            self.error_types[action.error_type] = self.error_types.get(action.error_type, 0) + weight
+
+        if not success and confidence >= self.mismatch_threshold:
+            self.mismatches.update(confidence, success, weight)
+            if weight > 0:
+                self.recent_mismatches.append(action.action_id)
+            elif action.action_id in self.recent_mismatches:
+                self.recent_mismatches.remove(action.action_id)
+
+    def _action_type(self, action_type: str) -> CalibrationAccumulator:
+        accumulator = self.by_action_type.get(action_type)
+        if accumulator is None:
+            if len(self.by_action_type) >= MAX_ACTION_TYPES:
+                action_type = OTHER_ACTION_TYPE
+            accumulator = self.by_action_type.setdefault(action_type, CalibrationAccumulator())
+        return accumulator
+
+    def expected_calibration_error(self) -> float:
+        if not self.total.count:
+            return 0.0
+        return sum(
+            b.count / self.total.count * abs(b.avg_confidence - b.success_rate)
+            for b in self.bins if b.count
+        )
+
+    def curve(self) -> List[Dict[str, float]]:
+        """Calibration curve: per-bin confidence vs accuracy"""
+        return [
+            {
+                'bin_min': self.edges[i],
+                'bin_max': self.edges[i + 1],
+                'count': b.count,
+                'avg_confidence': b.avg_confidence,
+                'accuracy': b.success_rate
+            }
+            for i, b in enumerate(self.bins)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        if not self.total.count:
+            return {
+                'ece': 0.0,
+                'brier_score': 0.0,
+                'by_confidence_band': {}
+            }
+
+        return {
+            'ece': self.expected_calibration_error(),
+            'brier_score': self.total.brier_score,
+            'by_confidence_band': {name: band.to_dict() for name, band in self.bands.items()},
+            'by_action_type': {name: acc.to_dict() for name, acc in self.by_action_type.items() if acc.count},
+            'sample_size': self.total.count
+        }
+
+
 class CalibrationAnalyzer:
     """
     Analyze confidence calibration.
@@ -308,34 +500,15 @@ class CalibrationAnalyzer:
         if not completed:
             return 0.0
 
-        # Create bins
-        bins = np.linspace(0, 1, num_bins + 1)
-        bin_errors = []
-        bin_counts = []
-
-        for i in range(num_bins):
-            bin_min, bin_max = bins[i], bins[i + 1]
-
-            # Actions in this bin
-            bin_actions = [
-                a for a in completed
-                if bin_min <= a.confidence < bin_max or (i == num_bins - 1 and a.confidence == 1.0)
-            ]
+        # Create bins (one pass over the actions)
+        edges = [float(edge) for edge in np.linspace(0, 1, num_bins + 1)]
+        bins = [CalibrationAccumulator() for _ in range(num_bins)]
+        for a in completed:
+            bins[calibration_bin(a.confidence, edges)].update(a.confidence, a.outcome)
 
-            if not bin_actions:
-                continue
-
-            # Bin confidence (average)
-            bin_conf = np.mean([a.confidence for a in bin_actions])
-
-            # Bin accuracy (success rate)
-            bin_acc = sum(1 for a in bin_actions if a.outcome) / len(bin_actions)
-
-            # Error
-            bin_error = abs(bin_conf - bin_acc)
-
-            bin_errors.append(bin_error)
-            bin_counts.append(len(bin_actions))
+        # Error per non-empty bin: |average confidence - success rate|
+        bin_errors = [abs(b.avg_confidence - b.success_rate) for b in bins if b.count]
+        bin_counts = [b.count for b in bins if b.count]
 
         if not bin_errors:
             return 0.0
@@ -443,8 +616,8 @@ class MetacognitionLogger:
     Logs confidence, outcomes, detects errors, analyzes calibration.
     """
 
-    def __init__(self):
-        self.confidence_tracker = ConfidenceTracker()
+    def __init__(self, max_actions: int = MAX_ACTIONS):
+        self.confidence_tracker = ConfidenceTracker(max_actions)
         self.outcome_tracker = OutcomeTracker(self.confidence_tracker)
         self.error_detector = ErrorDetector()
         self.calibration_analyzer = CalibrationAnalyzer()
@@ -474,21 +647,32 @@ class MetacognitionLogger:
         return self.outcome_tracker.log_outcome(action_id, success, error_type)
 
     def get_comprehensive_stats(self) -> Dict[str, Any]:
-        """Get all metacognition statistics"""
-        actions = list(self.confidence_tracker.actions.values())
+        """Get all metacognition statistics (from running totals, O(bins + action types))"""
+        calibration = self.outcome_tracker.calibration
 
         return {
             'confidence': self.confidence_tracker.get_stats(),
             'outcomes': self.outcome_tracker.get_stats(),
-            'errors': self.error_detector.analyze_errors(actions),
-            'calibration': self.calibration_analyzer.get_calibration_stats(actions)
+            'errors': self.error_detector.summarize(calibration),
+            'calibration': calibration.to_dict()
+        }
+
+    def get_calibration_curve(self) -> Dict[str, Any]:
+        """ECE, Brier score and per-bin confidence vs accuracy"""
+        calibration = self.outcome_tracker.calibration
+
+        return {
+            'ece': calibration.expected_calibration_error(),
+            'brier_score': calibration.total.brier_score,
+            'total_actions': calibration.total.count,
+            'avg_confidence': calibration.total.avg_confidence,
+            'success_rate': calibration.total.success_rate,
+            'bins': calibration.curve()
         }
 
     def is_well_calibrated(self, ece_threshold: float = 0.1) -> bool:
         """Check if system is well-calibrated (ECE < threshold)"""
-        stats = self.get_comprehensive_stats()
-        ece = stats['calibration']['ece']
-        return ece < ece_threshold
+        return self.outcome_tracker.calibration.expected_calibration_error() < ece_threshold
 
 
 # ============================================================================
@@ -25,11 +25,11 @@ Usage:
 import sys
 import os
 import logging
+import threading
 from datetime import datetime
 from typing import List, Optional
 
-# Import GraphBuilder from local copy
-from graph_builder import GraphBuilder
+# GraphBuilder (and the neo4j driver) is imported on first use, not at API startup
 
 
 # Configure logging
@@ -64,13 +64,26 @@ class Neo4jSync:
         self.uri = uri
         self.username = username
         self.password = password
-        self.graph_builder = None
-        self._initialize_connection()
+        self._graph_builder = None
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    @property
+    def graph_builder(self):
+        """GraphBuilder, connected on first use (None if that failed)"""
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._initialize_connection()
+                    self._initialized = True
+        return self._graph_builder
 
     def _initialize_connection(self):
         """Initialize GraphBuilder connection (lazy loading)"""
         try:
-            self.graph_builder = GraphBuilder(
+            from graph_builder import GraphBuilder
+
+            self._graph_builder = GraphBuilder(
                 uri=self.uri,
                 username=self.username,
                 password=self.password
@@ -78,7 +91,7 @@ class Neo4jSync:
             logger.info(f"✅ Neo4j connection initialized: {self.uri}")
         except Exception as e:
             logger.error(f"❌ Failed to initialize Neo4j connection: {e}")
-            self.graph_builder = None
+            self._graph_builder = None
 
     def sync_episode(
         self,
@@ -135,6 +148,35 @@ class Neo4jSync:
             logger.error(f"❌ Neo4j sync FAILED for {episode_id}: {e}")
             return False
 
+    def delete_episodes(self, episode_ids: List[str]) -> int:
+        """
+        Delete pruned episodes from Neo4j Knowledge Graph
+
+        Args:
+            episode_ids: Episode UUIDs archived in PostgreSQL
+
+        Returns:
+            Number of nodes deleted (0 if Neo4j unavailable)
+
+        Note:
+            This method NEVER raises exceptions - pruning must not
+            depend on Neo4j availability.
+        """
+        if not episode_ids:
+            return 0
+
+        if not self.graph_builder:
+            logger.warning(f"⚠️ Neo4j delete skipped (no connection): {len(episode_ids)} episodes")
+            return 0
+
+        try:
+            deleted = self.graph_builder.delete_episode_nodes(episode_ids)
+            logger.info(f"✅ Neo4j delete SUCCESS: {deleted}/{len(episode_ids)} nodes")
+            return deleted
+        except Exception as e:
+            logger.error(f"❌ Neo4j delete FAILED for {len(episode_ids)} episodes: {e}")
+            return 0
+
     def health_check(self) -> dict:
         """
         Check Neo4j connection health
@@ -166,11 +208,11 @@ class Neo4jSync:
 
     def close(self):
         """Close Neo4j connection"""
-        if self.graph_builder:
-            self.graph_builder.close()
+        if self._graph_builder:
+            self._graph_builder.close()
             logger.info("🔌 Neo4j connection closed")
 
 
 # Global singleton instance
-# Initialized once when module is imported
+# Created when the module is imported; connects on the first sync
 neo4j_sync = Neo4jSync()
@@ -12,6 +12,13 @@ Research basis:
 - Bubic et al. (2010): Sequence prediction violation
 - Ranganath & Ritchey (2012): Contextual schema mismatch
 
+Baselines are maintained online: update_baselines() folds each batch of
+new episodes into the semantic/context centroids (mini-batch k-means
+updates), the emotional running statistics (Welford) and the sequence
+counts. Full KMeans refits run in a background process
+(refit_in_background) and baselines are persisted to one .npz file, so
+restarts load them instead of refitting.
+
 Author: NEXUS (Claude Code)
 Date: October 27, 2025
 """
@@ -20,9 +27,24 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+import os
+import json
+import fcntl
+import threading
 import numpy as np
-from scipy.spatial.distance import cosine
-from sklearn.cluster import KMeans
+
+
+NOVELTY_BASELINE_PATH = os.getenv("NOVELTY_BASELINE_PATH", "/app/data/novelty_baselines.npz")
+
+# Per-centroid memory of the online updates: beyond this many assignments a
+# centroid behaves like an exponential moving average (tracks drift)
+CENTROID_MAX_COUNT = 5000
+
+# After a failed refit, refit_due() stays false for this long, doubling per
+# consecutive failure up to the max (a broken refit is not retried on every sync)
+REFIT_RETRY_SECONDS = 600
+REFIT_RETRY_MAX_SECONDS = 6 * 3600
 
 
 # =====================================================================
@@ -64,6 +86,71 @@ class NoveltyBreakdown:
     total_novelty: float
 
 
+# =====================================================================
+# ONLINE CENTROIDS
+# =====================================================================
+
+def cosine_distances(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Cosine distance of every row of vectors to every centroid (n x k)"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    centroids = np.atleast_2d(np.asarray(centroids, dtype=np.float32))
+    v_norm = np.linalg.norm(vectors, axis=1, keepdims=True)
+    c_norm = np.linalg.norm(centroids, axis=1, keepdims=True)
+    sims = (vectors / np.maximum(v_norm, 1e-12)) @ (centroids / np.maximum(c_norm, 1e-12)).T
+    return 1.0 - sims
+
+
+class OnlineCentroids:
+    """
+    Mini-batch k-means centroids (Sculley 2010).
+
+    Each batch moves a centroid towards the mean of the points assigned
+    to it with step n / (count + n); count is capped at max_count so old
+    history fades instead of freezing the centroid.
+    """
+
+    def __init__(self, centroids, counts=None, max_count: int = CENTROID_MAX_COUNT):
+        self.centroids = np.atleast_2d(np.asarray(centroids, dtype=np.float32)).copy()
+        self.counts = (
+            np.asarray(counts, dtype=np.float64).copy() if counts is not None
+            else np.ones(len(self.centroids))
+        )
+        self.max_count = max_count
+
+    @classmethod
+    def fit(cls, embeddings, n_clusters: int = 10, max_count: int = CENTROID_MAX_COUNT) -> "OnlineCentroids":
+        centroids, labels = build_semantic_clusters(embeddings, n_clusters)
+        counts = np.bincount(labels, minlength=len(centroids)).astype(np.float64)
+        return cls(centroids, np.minimum(counts, max_count), max_count)
+
+    def __len__(self) -> int:
+        return len(self.centroids)
+
+    def min_distances(self, embeddings) -> np.ndarray:
+        """Distance from each embedding to its nearest centroid"""
+        return cosine_distances(embeddings, self.centroids).min(axis=1)
+
+    def partial_fit(self, embeddings):
+        """Fold a batch of embeddings into the centroids"""
+        batch = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if batch.size == 0 or len(self.centroids) == 0:
+            return
+        labels = cosine_distances(batch, self.centroids).argmin(axis=1)
+        assigned = np.bincount(labels, minlength=len(self.centroids)).astype(np.float64)
+        sums = np.zeros_like(self.centroids, dtype=np.float64)
+        np.add.at(sums, labels, batch)
+
+        touched = assigned > 0
+        prior = np.minimum(self.counts[touched], self.max_count)
+        n = assigned[touched][:, None]
+        current = self.centroids[touched].astype(np.float64)
+        self.centroids[touched] = (current + (sums[touched] - n * current) / (prior[:, None] + n)).astype(np.float32)
+        self.counts[touched] = np.minimum(prior + assigned[touched], self.max_count)
+
+    def to_list(self) -> List[List[float]]:
+        return self.centroids.tolist()
+
+
 # =====================================================================
 # BASELINE MODEL BUILDING
 # =====================================================================
@@ -88,7 +175,8 @@ def build_semantic_clusters(embeddings: List[List[float]], n_clusters: int = 10)
 
     embeddings_array = np.array(embeddings)
 
-    # K-means clustering
+    # K-means clustering (sklearn imported here: only full refits need it)
+    from sklearn.cluster import KMeans
     kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
     labels = kmeans.fit_predict(embeddings_array)
     centroids = kmeans.cluster_centers_.tolist()
@@ -135,7 +223,12 @@ def build_emotional_baseline(episodes: List[Episode]) -> Dict[str, Any]:
         'valence_mean': float(np.mean(valences)),
         'valence_std': float(np.std(valences)) if len(valences) > 1 else 0.3,
         'arousal_mean': float(np.mean(arousals)),
-        'arousal_std': float(np.std(arousals)) if len(arousals) > 1 else 0.25
+        'arousal_std': float(np.std(arousals)) if len(arousals) > 1 else 0.25,
+        # Running-statistics state for update_emotional_baseline
+        'valence_n': len(valences),
+        'valence_m2': float(np.var(valences) * len(valences)),
+        'arousal_n': len(arousals),
+        'arousal_m2': float(np.var(arousals) * len(arousals))
     }
 
     # Learn typical transition magnitudes
@@ -160,6 +253,32 @@ def build_emotional_baseline(episodes: List[Episode]) -> Dict[str, Any]:
     return stats
 
 
+def update_emotional_baseline(stats: Dict[str, Any], episodes: List[Episode]):
+    """
+    Fold new episodes into the emotional baseline in place
+
+    Merges the batch mean/variance into the running ones (Chan et al.
+    parallel variance), so no history is needed. typical_transitions
+    percentiles only change on full refits.
+    """
+    for key, default in (('valence', 0.0), ('arousal', 0.5)):
+        values = np.array([ep.somatic_7d.get(key, default) for ep in episodes if ep.somatic_7d], dtype=np.float64)
+        if values.size == 0:
+            continue
+        n_a = stats.get(f'{key}_n', 0)
+        n_b = values.size
+        mean_a = stats.get(f'{key}_mean', default)
+        mean_b = float(values.mean())
+        delta = mean_b - mean_a
+        n = n_a + n_b
+
+        stats[f'{key}_mean'] = mean_a + delta * n_b / n
+        stats[f'{key}_m2'] = stats.get(f'{key}_m2', 0.0) + float(((values - mean_b) ** 2).sum()) + delta ** 2 * n_a * n_b / n
+        stats[f'{key}_n'] = n
+        if n > 1:
+            stats[f'{key}_std'] = float(np.sqrt(stats[f'{key}_m2'] / n))
+
+
 def classify_episode_type(episode: Episode) -> str:
     """
     Infer episode type from content/tags
@@ -219,37 +338,52 @@ def build_sequence_model(episodes: List[Episode], n: int = 2) -> Dict[str, Any]:
     Returns:
         Dictionary with transition probabilities and episode types
     """
+    model = {
+        'transitions': {},
+        'counts': {},
+        'n': n,
+        'episode_types': [],
+        'last_type': None
+    }
+    update_sequence_model(model, episodes)
+    return model
+
+
+def update_sequence_model(model: Dict[str, Any], episodes: List[Episode]):
+    """
+    Fold new (chronological) episodes into the bigram counts in place
+
+    The first new episode continues from the last type already seen, and
+    only the probabilities of sources that got new transitions are redone.
+    """
     if not episodes:
-        return {
-            'transitions': {},
-            'n': n,
-            'episode_types': []
-        }
+        return
 
     # Extract episode types
     types = [classify_episode_type(ep) for ep in episodes]
+    if model.get('last_type') is not None:
+        types = [model['last_type']] + types
 
     # Count bigrams
-    bigrams = defaultdict(Counter)
-    for i in range(len(types) - 1):
-        current, next_type = types[i], types[i+1]
-        bigrams[current][next_type] += 1
+    counts = model.setdefault('counts', {})
+    touched = set()
+    for current, next_type in zip(types, types[1:]):
+        counts[(current, next_type)] = counts.get((current, next_type), 0) + 1
+        touched.add(current)
 
     # Convert to probabilities
-    transitions = {}
-    for current, next_counts in bigrams.items():
-        total = sum(next_counts.values())
-        for next_type, count in next_counts.items():
-            transitions[(current, next_type)] = count / total
+    totals = Counter()
+    for (current, _), count in counts.items():
+        if current in touched:
+            totals[current] += count
+    transitions = model['transitions']
+    for (current, next_type), count in counts.items():
+        if current in touched:
+            transitions[(current, next_type)] = count / totals[current]
 
     # Get unique episode types
-    unique_types = sorted(list(set(types)))
-
-    return {
-        'transitions': transitions,
-        'n': n,
-        'episode_types': unique_types
-    }
+    model['episode_types'] = sorted(set(model['episode_types']) | set(types))
+    model['last_type'] = types[-1]
 
 
 def build_context_model(episodes: List[Episode]) -> Dict[str, Any]:
@@ -272,7 +406,7 @@ def build_context_model(episodes: List[Episode]) -> Dict[str, Any]:
     context_groups = defaultdict(list)
     for ep in episodes:
         context = ep.metadata.get('context', 'unknown') if ep.metadata else 'unknown'
-        if ep.embedding:
+        if ep.embedding is not None and len(ep.embedding):
             context_groups[context].append(ep.embedding)
 
     # For each context, find typical content centroids
@@ -280,12 +414,7 @@ def build_context_model(episodes: List[Episode]) -> Dict[str, Any]:
     for context, embeddings in context_groups.items():
         if len(embeddings) >= 5:  # Need minimum data
             # Cluster into 3 typical content types per context
-            n_clusters = min(3, len(embeddings) // 2)
-            if n_clusters >= 1:
-                embeddings_array = np.array(embeddings)
-                kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-                kmeans.fit(embeddings_array)
-                context_profiles[context] = kmeans.cluster_centers_.tolist()
+            context_profiles[context] = OnlineCentroids.fit(embeddings, n_clusters=min(3, len(embeddings) // 2))
 
     return {'profiles': context_profiles}
 
@@ -309,31 +438,35 @@ def calculate_semantic_novelty(episode_embedding: List[float],
     Returns:
         semantic_novelty: 0.0 (very familiar) to 1.0 (very novel)
     """
-    if not cluster_centroids or not episode_embedding:
+    if episode_embedding is None or len(episode_embedding) == 0:
         return 0.5  # Default: moderate novelty if no baseline
+    return float(semantic_novelty_batch([episode_embedding], cluster_centroids)[0])
 
-    # Calculate distance to each cluster
-    distances = []
-    for centroid in cluster_centroids:
-        try:
-            dist = cosine(episode_embedding, centroid)
-            distances.append(dist)
-        except:
-            continue
 
-    if not distances:
-        return 0.5
+def semantic_novelty_batch(embeddings, cluster_centroids) -> np.ndarray:
+    """
+    calculate_semantic_novelty for many episodes at once (one matrix product)
+
+    Args:
+        embeddings: n embeddings (n x dim)
+        cluster_centroids: k centroids (k x dim) or an OnlineCentroids
+
+    Returns:
+        n novelty scores
+    """
+    if isinstance(cluster_centroids, OnlineCentroids):
+        cluster_centroids = cluster_centroids.centroids
+    if cluster_centroids is None or len(cluster_centroids) == 0 or len(embeddings) == 0:
+        return np.full(len(embeddings), 0.5)
 
     # Use minimum distance (nearest cluster)
-    min_distance = min(distances)
+    min_distance = cosine_distances(embeddings, cluster_centroids).min(axis=1)
 
     # Normalize to 0-1 scale
     # Distance 0.0 = perfect match (novelty 0.0)
     # Distance 0.5+ = very far (novelty 1.0)
     # Based on Yassa & Stark: optimal novelty ~0.6
-    semantic_novelty = min(min_distance / 0.5, 1.0)
-
-    return float(semantic_novelty)
+    return np.clip(min_distance / 0.5, 0.0, 1.0)
 
 
 def calculate_emotional_surprise(current_emotional_state: Dict[str, float],
@@ -438,29 +571,19 @@ def calculate_contextual_mismatch(episode_embedding: List[float],
     Returns:
         contextual_mismatch: 0.0 (fits context) to 1.0 (doesn't fit)
     """
-    if not episode_embedding or not context_model:
+    if episode_embedding is None or len(episode_embedding) == 0 or not context_model:
         return 0.0  # Can't judge mismatch without data
 
     # Get expected content centroids for this context
-    expected_centroids = context_model.get(episode_context, [])
+    expected_centroids = context_model.get(episode_context)
+    if isinstance(expected_centroids, OnlineCentroids):
+        expected_centroids = expected_centroids.centroids
 
-    if not expected_centroids:
+    if expected_centroids is None or len(expected_centroids) == 0:
         return 0.0  # Unknown context, can't judge mismatch
 
-    # Calculate similarity to each expected centroid
-    similarities = []
-    for centroid in expected_centroids:
-        try:
-            similarity = 1.0 - cosine(episode_embedding, centroid)
-            similarities.append(similarity)
-        except:
-            continue
-
-    if not similarities:
-        return 0.0
-
     # Use maximum similarity (best match to expected content)
-    max_similarity = max(similarities)
+    max_similarity = 1.0 - float(cosine_distances(episode_embedding, expected_centroids).min())
 
     # Low similarity = high mismatch
     contextual_mismatch = 1.0 - max_similarity
@@ -473,7 +596,8 @@ def calculate_contextual_mismatch(episode_embedding: List[float],
 
 def calculate_novelty_score(episode: Episode,
                             recent_history: List[Episode],
-                            baseline_models: BaselineModels) -> Tuple[float, NoveltyBreakdown]:
+                            baseline_models: BaselineModels,
+                            semantic_novelty: Optional[float] = None) -> Tuple[float, NoveltyBreakdown]:
     """
     Master function: Calculate composite novelty score
 
@@ -487,22 +611,24 @@ def calculate_novelty_score(episode: Episode,
         episode: New episode to score
         recent_history: Last 6 hours of episodes
         baseline_models: All baseline models
+        semantic_novelty: Precomputed semantic component (batch scoring)
 
     Returns:
         novelty_score: 0.0 to 1.0
         breakdown: NoveltyBreakdown with individual components
     """
     # Extract baseline models
-    semantic_clusters = baseline_models.semantic_clusters.get('centroids', [])
+    semantic_clusters = baseline_models.semantic_clusters.get('centroids')
     emotional_baseline = baseline_models.emotional_baseline
     sequence_model = baseline_models.sequence_patterns.get('transitions', {})
     context_model = baseline_models.context_content.get('profiles', {})
 
     # Calculate each component
-    semantic_novelty = calculate_semantic_novelty(
-        episode.embedding,
-        semantic_clusters
-    )
+    if semantic_novelty is None:
+        semantic_novelty = calculate_semantic_novelty(
+            episode.embedding,
+            semantic_clusters
+        )
 
     emotional_surprise = calculate_emotional_surprise(
         episode.somatic_7d,
@@ -550,26 +676,117 @@ def calculate_novelty_score(episode: Episode,
 # NOVELTY DETECTOR CLASS
 # =====================================================================
 
+def fit_baseline_models(episodes: List[Episode]) -> BaselineModels:
+    """
+    Full fit of all baseline models (KMeans); runs in a worker process for
+    background refits
+
+    Args:
+        episodes: Historical episodes (30-60 days recommended)
+    """
+    # 1. Semantic clusters
+    embeddings = [ep.embedding for ep in episodes if ep.embedding is not None and len(ep.embedding)]
+    semantic_model = {
+        'centroids': OnlineCentroids.fit(embeddings) if embeddings else None,
+        'trained_on_episodes': len(embeddings)
+    }
+    semantic_model['n_clusters'] = len(semantic_model['centroids']) if embeddings else 0
+
+    return BaselineModels(
+        semantic_clusters=semantic_model,
+        emotional_baseline=build_emotional_baseline(episodes),     # 2. Emotional baseline
+        sequence_patterns=build_sequence_model(episodes),          # 3. Sequence patterns
+        context_content=build_context_model(episodes),             # 4. Context-content model
+        created_at=datetime.now(),
+        episodes_trained=len(episodes)
+    )
+
+
+TRAINING_EPISODES_QUERY = """
+    SELECT episode_id, content, embedding::text, created_at, metadata
+    FROM nexus_memory.zep_episodic_memory
+    WHERE created_at >= NOW() - make_interval(days => %s)
+    ORDER BY created_at ASC
+    LIMIT %s
+"""
+
+
+def fetch_training_episodes(conn, days: int = 60, limit: int = 50000) -> List[Episode]:
+    """Rolling window of episodes (chronological) for a full refit"""
+    with conn.cursor() as cur:
+        cur.execute(TRAINING_EPISODES_QUERY, (days, limit))
+        rows = cur.fetchall()
+
+    return [episode_from_row(*row) for row in rows]
+
+
+def episode_from_row(episode_id, content, embedding, created_at, metadata) -> Episode:
+    """(episode_id, content, embedding::text, created_at, metadata) row -> Episode"""
+    metadata = metadata or {}
+    return Episode(
+        episode_id=str(episode_id),
+        content=content or "",
+        embedding=np.array(embedding.strip("[]").split(","), dtype=np.float32) if embedding else [],
+        created_at=created_at,
+        somatic_7d=metadata.get('somatic_7d', {}),
+        emotional_8d=metadata.get('emotional_8d'),
+        metadata=metadata
+    )
+
+
+_refit_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_refit_executor() -> ProcessPoolExecutor:
+    """One background process for full refits (spawned: no forked server threads)"""
+    global _refit_executor
+    if _refit_executor is None:
+        import multiprocessing
+        _refit_executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _refit_executor
+
+
 class NoveltyDetector:
     """
     Main class for novelty detection and baseline model management
 
     Usage:
-        detector = NoveltyDetector(db_connection)
-        detector.build_baseline_models()  # One-time setup
+        detector = NoveltyDetector(baseline_path=NOVELTY_BASELINE_PATH)
+        if detector.baseline_models is None:
+            detector.build_baseline_models(history)   # One-time setup
 
-        novelty, breakdown = detector.score_episode(new_episode)
+        detector.update_baselines(new_episodes)         # Every ingest batch
+        scores = detector.score_episodes(new_episodes, recent_history)
+        detector.refit_in_background(history)           # Weekly
     """
 
-    def __init__(self, db_conn=None):
+    def __init__(self, db_conn=None, baseline_path: Optional[str] = None):
         """
         Initialize novelty detector
 
         Args:
             db_conn: Database connection for baseline storage (optional)
+            baseline_path: .npz file to persist baselines to (loaded if present)
         """
         self.db_conn = db_conn
+        self.baseline_path = baseline_path
         self.baseline_models: Optional[BaselineModels] = None
+        self.loaded_at: Optional[float] = None
+        self.refits = 0
+        self.refit_failures = 0  # consecutive, reset by a successful refit
+        self.online_updates = 0
+        self._refit_retry_at: Optional[datetime] = None
+
+        # Batches folded in while a background refit runs (replayed onto its result)
+        self._refit_future: Optional[Future] = None
+        self._replay: List[List[Episode]] = []
+        self._lock = threading.Lock()
+
+        if baseline_path and os.path.exists(baseline_path):
+            try:
+                self.load_baselines(baseline_path)
+            except Exception as e:
+                print(f"⚠ Novelty baselines not loaded ({baseline_path}): {e}")
 
     def build_baseline_models(self, episodes: List[Episode]) -> BaselineModels:
         """
@@ -583,44 +800,57 @@ class NoveltyDetector:
         """
         print(f"Building baseline models from {len(episodes)} episodes...")
 
-        # 1. Semantic clusters
-        embeddings = [ep.embedding for ep in episodes if ep.embedding]
-        centroids, labels = build_semantic_clusters(embeddings)
-
-        semantic_model = {
-            'centroids': centroids,
-            'n_clusters': len(centroids),
-            'trained_on_episodes': len(embeddings)
-        }
-
-        # 2. Emotional baseline
-        emotional_model = build_emotional_baseline(episodes)
-
-        # 3. Sequence patterns
-        sequence_model = build_sequence_model(episodes)
-
-        # 4. Context-content model
-        context_model = build_context_model(episodes)
-
-        # Create baseline models object
-        baseline_models = BaselineModels(
-            semantic_clusters=semantic_model,
-            emotional_baseline=emotional_model,
-            sequence_patterns=sequence_model,
-            context_content=context_model,
-            created_at=datetime.now(),
-            episodes_trained=len(episodes)
-        )
-
+        baseline_models = fit_baseline_models(episodes)
         self.baseline_models = baseline_models
 
         print(f"✅ Baseline models built:")
-        print(f"   - {len(centroids)} semantic clusters")
-        print(f"   - {len(sequence_model['episode_types'])} episode types")
-        print(f"   - {len(context_model['profiles'])} context profiles")
+        print(f"   - {baseline_models.semantic_clusters['n_clusters']} semantic clusters")
+        print(f"   - {len(baseline_models.sequence_patterns['episode_types'])} episode types")
+        print(f"   - {len(baseline_models.context_content['profiles'])} context profiles")
 
         return baseline_models
 
+    def update_baselines(self, episodes: List[Episode]):
+        """
+        Fold new episodes into the baselines without refitting
+
+        Args:
+            episodes: New episodes in chronological order
+        """
+        if not episodes:
+            return
+        if self.baseline_models is None:
+            self.build_baseline_models(episodes)
+            return
+        with self._lock:
+            if self._refit_future is not None:
+                self._replay.append(list(episodes))
+            self._apply_update(self.baseline_models, episodes)
+            self.online_updates += 1
+
+    def _apply_update(self, models: BaselineModels, episodes: List[Episode]):
+        embedded = [ep for ep in episodes if ep.embedding is not None and len(ep.embedding)]
+
+        semantic = models.semantic_clusters
+        # Without centroids (no embeddings at fit time) the next refit creates them
+        if embedded and semantic.get('centroids') is not None:
+            semantic['centroids'].partial_fit([ep.embedding for ep in embedded])
+            semantic['trained_on_episodes'] = semantic.get('trained_on_episodes', 0) + len(embedded)
+
+        update_emotional_baseline(models.emotional_baseline, episodes)
+        update_sequence_model(models.sequence_patterns, episodes)
+
+        by_context = defaultdict(list)
+        for ep in embedded:
+            by_context[ep.metadata.get('context', 'unknown') if ep.metadata else 'unknown'].append(ep.embedding)
+        profiles = models.context_content['profiles']
+        for context, embeddings in by_context.items():
+            # New contexts get a profile on the next full refit
+            if context in profiles:
+                profiles[context].partial_fit(embeddings)
+
+        models.episodes_trained += len(episodes)
+
     def score_episode(self, episode: Episode, recent_history: List[Episode]) -> Tuple[float, NoveltyBreakdown]:
         """
         Calculate novelty score for a new episode
@@ -638,6 +868,32 @@ class NoveltyDetector:
 
         return calculate_novelty_score(episode, recent_history, self.baseline_models)
 
+    def score_episodes(self, episodes: List[Episode], recent_history: List[Episode]) -> List[Tuple[float, NoveltyBreakdown]]:
+        """
+        Score a chronological batch; semantic distances for the whole batch
+        are one matrix product. Each episode sees the earlier ones of the
+        batch as recent history.
+        """
+        if not self.baseline_models:
+            raise ValueError("Baseline models not loaded. Call build_baseline_models() first.")
+        if not episodes:
+            return []
+
+        semantic = np.full(len(episodes), 0.5)
+        embedded = [i for i, ep in enumerate(episodes) if ep.embedding is not None and len(ep.embedding)]
+        centroids = self.baseline_models.semantic_clusters.get('centroids')
+        if embedded and centroids is not None:
+            semantic[embedded] = semantic_novelty_batch([episodes[i].embedding for i in embedded], centroids)
+
+        history = list(recent_history)
+        results = []
+        for i, episode in enumerate(episodes):
+            results.append(calculate_novelty_score(
+                episode, history, self.baseline_models, semantic_novelty=float(semantic[i])
+            ))
+            history.append(episode)
+        return results
+
     def refresh_baselines(self, episodes: List[Episode]):
         """
         Refresh baseline models with new data (weekly recommended)
@@ -649,6 +905,222 @@ class NoveltyDetector:
         self.build_baseline_models(episodes)
         print("✅ Baselines refreshed")
 
+    def refit_in_background(self, episodes: List[Episode]) -> Future:
+        """
+        Full refit in a worker process; scoring continues on the current
+        baselines, and batches folded in meanwhile are replayed onto the
+        new ones. Saves to baseline_path when set.
+        """
+        if self._refit_future is not None and not self._refit_future.done():
+            return self._refit_future
+
+        self._replay = []
+        future = _get_refit_executor().submit(fit_baseline_models, episodes)
+        self._refit_future = future
+
+        def install(done: Future):
+            if done.exception() is not None:
+                self._refit_failed(done.exception())
+                self._refit_future = None
+                return
+            models = done.result()
+            with self._lock:
+                for batch in self._replay:
+                    self._apply_update(models, batch)
+                self.baseline_models = models
+                self._replay = []
+                self.refits += 1
+                self.refit_failures = 0
+                self._refit_retry_at = None
+                if self.baseline_path:
+                    self.save_baselines(self.baseline_path)
+                # Cleared last: refit_running stays true until the file is written
+                self._refit_future = None
+
+        future.add_done_callback(install)
+        return future
+
+    def _refit_failed(self, error: BaseException):
+        """Log a failed refit and back off before the next attempt"""
+        self.refit_failures += 1
+        delay = min(REFIT_RETRY_SECONDS * 2 ** (self.refit_failures - 1), REFIT_RETRY_MAX_SECONDS)
+        self._refit_retry_at = datetime.now() + timedelta(seconds=delay)
+        print(f"⚠ Novelty baseline refit failed ({self.refit_failures}x, retry in {delay:.0f}s): {error}")
+
+    def refit_due(self, max_age_seconds: float) -> bool:
+        """Baselines missing or older than max_age_seconds, and not backing off after a failure"""
+        if self._refit_retry_at is not None and datetime.now() < self._refit_retry_at:
+            return False
+        models = self.baseline_models
+        return models is None or (datetime.now() - models.created_at).total_seconds() > max_age_seconds
+
+    def refit_if_leader(self, load_episodes) -> Optional[Future]:
+        """
+        Start a background refit unless another worker holds the refit lock
+        (the others pick up its file through sync_baselines)
+
+        A failure to load the episodes or fit counts towards the refit
+        backoff (see refit_due); load errors are re-raised.
+
+        Args:
+            load_episodes: Callable returning the training episodes
+        """
+        if not self.baseline_path:
+            return self.refit_in_background(self._load_training_episodes(load_episodes))
+        os.makedirs(os.path.dirname(self.baseline_path) or ".", exist_ok=True)
+        lock_file = open(f"{self.baseline_path}.lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+        try:
+            future = self.refit_in_background(self._load_training_episodes(load_episodes))
+        except Exception:
+            lock_file.close()
+            raise
+        future.add_done_callback(lambda _: lock_file.close())
+        return future
+
+    def _load_training_episodes(self, load_episodes) -> List[Episode]:
+        try:
+            return load_episodes()
+        except Exception as e:
+            self._refit_failed(e)
+            raise
+
+    def save_if_leader(self) -> bool:
+        """
+        Save the online-updated baselines unless a refit holds the lock
+        (the refit's file is picked up through sync_baselines instead)
+        """
+        if not self.baseline_path or self.baseline_models is None:
+            return False
+        os.makedirs(os.path.dirname(self.baseline_path) or ".", exist_ok=True)
+        with open(f"{self.baseline_path}.lock", "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            try:
+                with self._lock:
+                    self.save_baselines(self.baseline_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return True
+
+    def sync_baselines(self) -> bool:
+        """Reload baselines another worker saved since we loaded ours"""
+        path = self.baseline_path
+        if not path or not os.path.exists(path) or self._refit_future is not None:
+            return False
+        if self.loaded_at is not None and os.path.getmtime(path) <= self.loaded_at:
+            return False
+        with self._lock:
+            self.load_baselines(path)
+        return True
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save_baselines(self, path: str):
+        """Write baselines to one .npz (atomic replace)"""
+        models = self.baseline_models
+        if models is None:
+            return
+        arrays: Dict[str, np.ndarray] = {}
+        semantic = models.semantic_clusters
+        if semantic.get('centroids') is not None:
+            arrays['semantic_centroids'] = semantic['centroids'].centroids
+            arrays['semantic_counts'] = semantic['centroids'].counts
+
+        contexts = sorted(models.context_content['profiles'])
+        for i, context in enumerate(contexts):
+            profile = models.context_content['profiles'][context]
+            arrays[f'context_{i}_centroids'] = profile.centroids
+            arrays[f'context_{i}_counts'] = profile.counts
+
+        sequence = models.sequence_patterns
+        meta = {
+            'created_at': models.created_at.isoformat(),
+            'episodes_trained': models.episodes_trained,
+            'semantic_trained_on_episodes': semantic.get('trained_on_episodes', 0),
+            'emotional_baseline': models.emotional_baseline,
+            'sequence': {
+                'counts': [[a, b, c] for (a, b), c in sequence.get('counts', {}).items()],
+                'n': sequence.get('n', 2),
+                'episode_types': sequence.get('episode_types', []),
+                'last_type': sequence.get('last_type'),
+            },
+            'contexts': contexts,
+        }
+        arrays['meta'] = np.array(json.dumps(meta))
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        self.loaded_at = os.path.getmtime(path)
+
+    def load_baselines(self, path: str) -> BaselineModels:
+        """Load baselines written by save_baselines"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            centroids = (
+                OnlineCentroids(data['semantic_centroids'], data['semantic_counts'])
+                if 'semantic_centroids' in data else None
+            )
+            profiles = {
+                context: OnlineCentroids(data[f'context_{i}_centroids'], data[f'context_{i}_counts'])
+                for i, context in enumerate(meta['contexts'])
+            }
+
+        sequence = {
+            'transitions': {},
+            'counts': {},
+            'n': meta['sequence']['n'],
+            'episode_types': meta['sequence']['episode_types'],
+            'last_type': None
+        }
+        counts = {(a, b): c for a, b, c in meta['sequence']['counts']}
+        totals = Counter()
+        for (a, _), c in counts.items():
+            totals[a] += c
+        sequence['counts'] = counts
+        sequence['transitions'] = {(a, b): c / totals[a] for (a, b), c in counts.items()}
+        sequence['last_type'] = meta['sequence']['last_type']
+
+        self.baseline_models = BaselineModels(
+            semantic_clusters={
+                'centroids': centroids,
+                'n_clusters': len(centroids) if centroids is not None else 0,
+                'trained_on_episodes': meta['semantic_trained_on_episodes']
+            },
+            emotional_baseline=meta['emotional_baseline'],
+            sequence_patterns=sequence,
+            context_content={'profiles': profiles},
+            created_at=datetime.fromisoformat(meta['created_at']),
+            episodes_trained=meta['episodes_trained']
+        )
+        self.loaded_at = os.path.getmtime(path)
+        return self.baseline_models
+
+    def get_stats(self) -> Dict[str, Any]:
+        models = self.baseline_models
+        return {
+            'baselines_loaded': models is not None,
+            'created_at': models.created_at.isoformat() if models else None,
+            'episodes_trained': models.episodes_trained if models else 0,
+            'semantic_clusters': models.semantic_clusters.get('n_clusters', 0) if models else 0,
+            'context_profiles': len(models.context_content['profiles']) if models else 0,
+            'online_updates': self.online_updates,
+            'refits': self.refits,
+            'refit_failures': self.refit_failures,
+            'refit_running': self._refit_future is not None,
+        }
+
 
 # =====================================================================
 # HELPER FUNCTIONS
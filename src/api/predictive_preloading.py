@@ -12,14 +12,19 @@ Date: October 28, 2025
 """
 
 import asyncio
-from collections import defaultdict, deque
+import time
+import threading
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Hashable, List, Optional, Set, Tuple
 import math
+import hashlib
 import heapq
 import numpy as np
 
+from cache_backends import CacheBackend, LocalCache
+
 
 # ============================================================================
 # Data Structures
@@ -81,26 +86,209 @@ class SessionContext:
 # Component 1: TemporalPatternLearner
 # ============================================================================
 
+DECAY_RATE = 0.1            # per day: weight = exp(-DECAY_RATE * age_days)
+EXPIRY_AGE_DAYS = 47        # weight < 1% from here on (exp(-4.7) ~ 0.009)
+MAX_PATTERNS = 1_000_000    # transitions kept exactly, per model
+PRUNE_TARGET = 0.9          # pruning shrinks a full model to this fraction
+
+
+def day_epoch(timestamp: datetime) -> int:
+    """Global decay epoch: whole days since the Unix epoch"""
+    return int(timestamp.timestamp() // 86400)
+
+
+class CountMinSketch:
+    """
+    Approximate counts (never under-estimates) in depth x width cells.
+
+    Keeps the mass of transitions pruned from the exact index, so a rare
+    transition that comes back resumes from (about) its old count.
+    """
+
+    def __init__(self, width: int = 1 << 16, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self._rows = np.arange(depth)
+
+    def _columns(self, key) -> np.ndarray:
+        # Stable across processes (unlike hash()); double hashing for the rows
+        digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)])
+
+    def add(self, key, count: int = 1):
+        self.table[self._rows, self._columns(key)] += count
+
+    def estimate(self, key) -> int:
+        return int(self.table[self._rows, self._columns(key)].min())
+
+
+class TransitionIndex:
+    """
+    N-gram transitions indexed by source.
+
+    successors[source][target] = [count, last_epoch, restored]
+      count       transitions observed (including mass restored from the sketch)
+      last_epoch  day_epoch of the latest observation
+      restored    part of count that came from the sketch (not re-added on prune)
+
+    Reads touch only the source's own successors, so prediction cost
+    depends on fan-out, not on how many patterns were learned. Each source
+    keeps a successor list ranked by count, rebuilt lazily after writes;
+    reads stop at the first target below min_confidence.
+
+    Decay is lazy: weights are computed from the epoch at read time.
+    Sources are bucketed by the epoch they were last written, so
+    expire() visits only sources that went quiet, and stale targets of
+    live sources are dropped when their list is re-ranked.
+    """
+
+    def __init__(self, max_patterns: int = MAX_PATTERNS, sketch: Optional[CountMinSketch] = None):
+        self.max_patterns = max_patterns
+        self.sketch = sketch if sketch is not None else CountMinSketch()
+        self.successors: Dict[Hashable, Dict[str, list]] = {}
+        self.totals: Dict[Hashable, int] = {}
+        self.size = 0
+        self.pruned = 0
+        self.expired = 0
+        self._ranked: Dict[Hashable, List[str]] = {}
+        self._last_touched: Dict[Hashable, int] = {}
+        self._sources_by_epoch: Dict[int, Set[Hashable]] = defaultdict(set)
+
+    def add(self, source: Hashable, target: str, epoch: int):
+        targets = self.successors.get(source)
+        if targets is None:
+            targets = self.successors[source] = {}
+            self.totals[source] = 0
+
+        entry = targets.get(target)
+        if entry is None:
+            restored = self.sketch.estimate((source, target))
+            entry = targets[target] = [restored, epoch, restored]
+            self.size += 1
+        entry[0] += 1
+        entry[1] = epoch
+        # Restored mass may exceed what this source's total still remembers
+        self.totals[source] = max(self.totals[source] + 1, entry[0])
+        self._ranked.pop(source, None)
+        self._touch(source, epoch)
+
+        if self.size > self.max_patterns:
+            self.prune()
+
+    def get_successors(
+        self,
+        source: Hashable,
+        now_epoch: int,
+        min_confidence: float
+    ) -> List[Tuple[str, float, float]]:
+        """(target, probability, weight) with probability >= min_confidence, best first"""
+        targets = self.successors.get(source)
+        if not targets:
+            return []
+
+        ranked = self._ranked.get(source)
+        if ranked is None:
+            ranked = self._rank(source, now_epoch)
+
+        total = self.totals[source]
+        successors = []
+        for target in ranked:
+            count, last_epoch, _ = targets[target]
+            probability = count / total
+            if probability < min_confidence:
+                break
+            weight = math.exp(-DECAY_RATE * max(now_epoch - last_epoch, 0))
+            successors.append((target, probability, weight))
+
+        successors.sort(key=lambda x: x[1] * x[2], reverse=True)
+        return successors
+
+    def expire(self, now_epoch: int) -> int:
+        """Drop sources not written for EXPIRY_AGE_DAYS; returns transitions removed"""
+        horizon = now_epoch - EXPIRY_AGE_DAYS
+        removed = 0
+        for epoch in [e for e in self._sources_by_epoch if e <= horizon]:
+            for source in self._sources_by_epoch.pop(epoch):
+                removed += len(self.successors[source])
+                self._drop_source(source)
+        self.size -= removed
+        self.expired += removed
+        return removed
+
+    def prune(self):
+        """
+        Shrink to PRUNE_TARGET x max_patterns by evicting the rarest
+        transitions (count <= 1, then <= 2, 4, ...) into the sketch.
+        """
+        goal = int(self.max_patterns * PRUNE_TARGET)
+        threshold = 1
+        while self.size > goal:
+            for source in list(self.successors):
+                targets = self.successors[source]
+                rare = [t for t, (count, _, _) in targets.items() if count <= threshold]
+                for target in rare:
+                    count, _, restored = targets.pop(target)
+                    self.sketch.add((source, target), count - restored)
+                if rare:
+                    self.size -= len(rare)
+                    self.pruned += len(rare)
+                    self._ranked.pop(source, None)
+                    if not targets:
+                        self._sources_by_epoch[self._last_touched[source]].discard(source)
+                        self._drop_source(source)
+                if self.size <= goal:
+                    break
+            threshold *= 2
+
+    def _rank(self, source: Hashable, now_epoch: int) -> List[str]:
+        targets = self.successors[source]
+        stale = [t for t, (_, last_epoch, _) in targets.items() if now_epoch - last_epoch >= EXPIRY_AGE_DAYS]
+        for target in stale:
+            self.totals[source] -= targets.pop(target)[0]
+        self.size -= len(stale)
+        self.expired += len(stale)
+
+        ranked = sorted(targets, key=lambda t: targets[t][0], reverse=True)
+        self._ranked[source] = ranked
+        return ranked
+
+    def _touch(self, source: Hashable, epoch: int):
+        previous = self._last_touched.get(source)
+        if previous == epoch:
+            return
+        if previous is not None:
+            self._sources_by_epoch[previous].discard(source)
+        self._last_touched[source] = epoch
+        self._sources_by_epoch[epoch].add(source)
+
+    def _drop_source(self, source: Hashable):
+        del self.successors[source]
+        del self.totals[source]
+        del self._last_touched[source]
+        self._ranked.pop(source, None)
+
+
 class TemporalPatternLearner:
     """
     Learn temporal sequences from access history.
     Implements bigram and trigram models with pattern decay.
+
+    Both models are TransitionIndex instances (source-indexed, lazily
+    decayed, bounded by count-min pruning), so predictions stay O(fan-out)
+    however many patterns accumulate.
     """
 
-    def __init__(self, history_size: int = 100):
+    def __init__(self, history_size: int = 100, max_patterns: int = MAX_PATTERNS):
         self.access_history: deque = deque(maxlen=history_size)
 
-        # Bigram model: (source, target) -> count
-        self.bigram_counts: Dict[Tuple[str, str], int] = defaultdict(int)
-        self.bigram_last_seen: Dict[Tuple[str, str], datetime] = {}
+        # Bigram model: source -> {target: stats}
+        self.bigrams = TransitionIndex(max_patterns)
 
-        # Trigram model: (prev_prev, prev, current) -> count
-        self.trigram_counts: Dict[Tuple[str, str, str], int] = defaultdict(int)
-        self.trigram_last_seen: Dict[Tuple[str, str, str], datetime] = {}
-
-        # Total transitions from each source (for probability calculation)
-        self.source_totals: Dict[str, int] = defaultdict(int)
-        self.trigram_source_totals: Dict[Tuple[str, str], int] = defaultdict(int)
+        # Trigram model: (prev_prev, prev) -> {current: stats}
+        self.trigrams = TransitionIndex(max_patterns)
 
     def learn_from_access(self, episode_id: str, timestamp: datetime):
         """
@@ -110,23 +298,15 @@ class TemporalPatternLearner:
             episode_id: Accessed episode
             timestamp: When it was accessed
         """
-        recent = list(self.access_history)
+        epoch = day_epoch(timestamp)
 
         # Learn bigram: previous → current
-        if len(recent) >= 1:
-            prev = recent[-1]
-            key = (prev, episode_id)
-            self.bigram_counts[key] += 1
-            self.bigram_last_seen[key] = timestamp
-            self.source_totals[prev] += 1
+        if len(self.access_history) >= 1:
+            self.bigrams.add(self.access_history[-1], episode_id, epoch)
 
         # Learn trigram: (prev_prev, prev) → current
-        if len(recent) >= 2:
-            prev_prev, prev = recent[-2], recent[-1]
-            key = (prev_prev, prev, episode_id)
-            self.trigram_counts[key] += 1
-            self.trigram_last_seen[key] = timestamp
-            self.trigram_source_totals[(prev_prev, prev)] += 1
+        if len(self.access_history) >= 2:
+            self.trigrams.add((self.access_history[-2], self.access_history[-1]), episode_id, epoch)
 
         # Add to history
         self.access_history.append(episode_id)
@@ -144,29 +324,9 @@ class TemporalPatternLearner:
             min_confidence: Minimum probability threshold
 
         Returns:
-            List of (target_id, probability, weight) sorted by probability
+            List of (target_id, probability, weight) sorted by probability x weight
         """
-        if source_id not in self.source_totals:
-            return []
-
-        total = self.source_totals[source_id]
-        successors = []
-
-        for (src, tgt), count in self.bigram_counts.items():
-            if src == source_id:
-                probability = count / total
-
-                if probability >= min_confidence:
-                    # Compute decay weight
-                    last_seen = self.bigram_last_seen[(src, tgt)]
-                    age_days = (datetime.now() - last_seen).days
-                    weight = math.exp(-0.1 * age_days)
-
-                    successors.append((tgt, probability, weight))
-
-        # Sort by probability (descending)
-        successors.sort(key=lambda x: x[1] * x[2], reverse=True)
-        return successors
+        return self.bigrams.get_successors(source_id, day_epoch(datetime.now()), min_confidence)
 
     def get_trigram_successors(
         self,
@@ -185,62 +345,28 @@ class TemporalPatternLearner:
         Returns:
             List of (target_id, probability, weight)
         """
-        key = (prev_prev_id, prev_id)
-        if key not in self.trigram_source_totals:
-            return []
-
-        total = self.trigram_source_totals[key]
-        successors = []
+        return self.trigrams.get_successors((prev_prev_id, prev_id), day_epoch(datetime.now()), min_confidence)
 
-        for (pp, p, curr), count in self.trigram_counts.items():
-            if (pp, p) == key:
-                probability = count / total
-
-                if probability >= min_confidence:
-                    last_seen = self.trigram_last_seen[(pp, p, curr)]
-                    age_days = (datetime.now() - last_seen).days
-                    weight = math.exp(-0.1 * age_days)
-
-                    successors.append((curr, probability, weight))
-
-        successors.sort(key=lambda x: x[1] * x[2], reverse=True)
-        return successors
-
-    def decay_patterns(self):
+    def decay_patterns(self, now: Optional[datetime] = None) -> int:
         """
-        Remove old patterns that have decayed to near zero.
-        Call periodically (e.g., daily).
+        Remove patterns that have decayed to near zero.
+        Call periodically (e.g., daily); only sources idle past the expiry
+        age are visited.
+
+        Returns:
+            Number of transitions removed
         """
-        threshold_weight = 0.01  # 1% strength
-        now = datetime.now()
+        epoch = day_epoch(now or datetime.now())
+        return self.bigrams.expire(epoch) + self.trigrams.expire(epoch)
 
-        # Decay bigrams
-        to_remove = []
-        for key, last_seen in self.bigram_last_seen.items():
-            age_days = (now - last_seen).days
-            weight = math.exp(-0.1 * age_days)
-            if weight < threshold_weight:
-                to_remove.append(key)
-
-        for key in to_remove:
-            source, target = key
-            self.source_totals[source] -= self.bigram_counts[key]
-            del self.bigram_counts[key]
-            del self.bigram_last_seen[key]
-
-        # Decay trigrams (similar logic)
-        to_remove = []
-        for key, last_seen in self.trigram_last_seen.items():
-            age_days = (now - last_seen).days
-            weight = math.exp(-0.1 * age_days)
-            if weight < threshold_weight:
-                to_remove.append(key)
-
-        for key in to_remove:
-            pp, p, curr = key
-            self.trigram_source_totals[(pp, p)] -= self.trigram_counts[key]
-            del self.trigram_counts[key]
-            del self.trigram_last_seen[key]
+    def get_stats(self) -> dict:
+        return {
+            'bigram_patterns': self.bigrams.size,
+            'trigram_patterns': self.trigrams.size,
+            'pruned_patterns': self.bigrams.pruned + self.trigrams.pruned,
+            'expired_patterns': self.bigrams.expired + self.trigrams.expired,
+            'history_size': len(self.access_history)
+        }
 
 
 # ============================================================================
@@ -462,18 +588,40 @@ class PreloadingScheduler:
     """
     Schedule and execute background preloading of predicted episodes.
     Manages cache, resource limits, and eviction policy.
+
+    The cache is a pluggable backend (cache_backends) so preloads done by
+    one worker are hits on the others; eviction is confidence x recency.
+    The async preload path calls the backend in a thread (the Redis tier
+    blocks); get_cached is synchronous, so async callers wrap it the same way.
+
+    Usefulness is tracked per process: a preload is "used" when read from
+    the cache, and "wasted" once it is pushed out of the unused window
+    (more than max_cache_size newer preloads) or older than waste_after
+    seconds without a read.
     """
 
-    def __init__(self, max_cache_size: int = 100):
+    def __init__(
+        self,
+        max_cache_size: int = 100,
+        cache_backend: Optional[CacheBackend] = None,
+        waste_after: float = 600.0
+    ):
         self.max_cache_size = max_cache_size
+        self.waste_after = waste_after
 
-        # Cache: {episode_id: (data, confidence, timestamp)}
-        self.cache: Dict[str, Tuple[dict, float, datetime]] = {}
+        # Cache: episode_id -> episode data, weighted by prediction confidence
+        self.cache = cache_backend if cache_backend is not None else LocalCache(max_cache_size)
+
+        # Preloaded, not yet read: episode_id -> preload time (oldest first).
+        # Touched from the loop and from threads running get_cached / stats
+        self.unused: "OrderedDict[str, float]" = OrderedDict()
+        self._unused_lock = threading.Lock()
 
         # Metrics
         self.metrics = {
             'preload_success': 0,
             'preload_failure': 0,
+            'preload_used': 0,    # Preloaded, then read from the cache
             'preload_wasted': 0,  # Preloaded but never accessed
             'cache_hits': 0,
             'cache_misses': 0
@@ -492,17 +640,16 @@ class PreloadingScheduler:
             fetch_fn: Async function to fetch episode data
         """
         tasks = []
+        cached = await asyncio.to_thread(
+            lambda: {p.episode_id for p in predictions if self.cache.contains(p.episode_id)}
+        )
 
         for prediction in predictions:
             # Skip if already cached
-            if prediction.episode_id in self.cache:
+            if prediction.episode_id in cached:
                 continue
 
-            # Check resource limits
-            if len(self.cache) >= self.max_cache_size:
-                self._evict_lowest_score()
-
-            # Schedule preload task
+            # Schedule preload task (the backend evicts when full)
             task = self._preload_single(
                 prediction.episode_id,
                 prediction.confidence,
@@ -523,11 +670,26 @@ class PreloadingScheduler:
         """Preload single episode"""
         try:
             data = await fetch_fn(episode_id)
-            self.cache[episode_id] = (data, confidence, datetime.now())
+            await asyncio.to_thread(self.cache.set, episode_id, data, confidence)
             self.metrics['preload_success'] += 1
+            with self._unused_lock:
+                self.unused[episode_id] = time.time()
+                self.unused.move_to_end(episode_id)
+            self._expire_unused()
         except Exception as e:
             self.metrics['preload_failure'] += 1
 
+    def _expire_unused(self):
+        """Count preloads that left the unused window without a read as wasted"""
+        horizon = time.time() - self.waste_after
+        with self._unused_lock:
+            while self.unused:
+                episode_id, preloaded_at = next(iter(self.unused.items()))
+                if len(self.unused) <= self.max_cache_size and preloaded_at >= horizon:
+                    break
+                del self.unused[episode_id]
+                self.metrics['preload_wasted'] += 1
+
     def get_cached(self, episode_id: str) -> Optional[dict]:
         """
         Retrieve from cache.
@@ -538,34 +700,17 @@ class PreloadingScheduler:
         Returns:
             Episode data if cached, None otherwise
         """
-        if episode_id in self.cache:
+        entry = self.cache.get(episode_id)
+        if entry is not None:
             self.metrics['cache_hits'] += 1
-            data, confidence, timestamp = self.cache[episode_id]
-            return data
+            with self._unused_lock:
+                if self.unused.pop(episode_id, None) is not None:
+                    self.metrics['preload_used'] += 1
+            return entry.value
         else:
             self.metrics['cache_misses'] += 1
             return None
 
-    def _evict_lowest_score(self):
-        """
-        Evict entry with lowest combined score (recency * confidence).
-        """
-        if not self.cache:
-            return
-
-        now = datetime.now()
-        scores = {}
-
-        for ep_id, (data, confidence, timestamp) in self.cache.items():
-            age_seconds = (now - timestamp).total_seconds()
-            recency_score = math.exp(-age_seconds / 3600)  # Decay over hours
-            scores[ep_id] = recency_score * confidence
-
-        # Evict lowest
-        min_id = min(scores, key=scores.get)
-        del self.cache[min_id]
-        self.metrics['preload_wasted'] += 1
-
     def get_cache_stats(self) -> dict:
         """Get cache performance statistics"""
         total_requests = self.metrics['cache_hits'] + self.metrics['cache_misses']
@@ -580,17 +725,25 @@ class PreloadingScheduler:
             if total_preloads > 0 else 0.0
         )
 
+        self._expire_unused()
         waste_rate = (
             self.metrics['preload_wasted'] / self.metrics['preload_success']
             if self.metrics['preload_success'] > 0 else 0.0
         )
+        used_rate = (
+            self.metrics['preload_used'] / self.metrics['preload_success']
+            if self.metrics['preload_success'] > 0 else 0.0
+        )
 
         return {
-            'cache_size': len(self.cache),
+            'cache_size': self.cache.size(),
+            'cache_backend': self.cache.get_stats(),
             'max_cache_size': self.max_cache_size,
             'cache_hit_rate': hit_rate,
             'preload_success_rate': success_rate,
+            'preload_used_rate': used_rate,
             'preload_waste_rate': waste_rate,
+            'preload_pending': len(self.unused),
             **self.metrics
         }
 
@@ -609,7 +762,9 @@ class PredictivePreloadingEngine:
         self,
         max_cache_size: int = 100,
         prediction_k: int = 5,
-        min_confidence: float = 0.5
+        min_confidence: float = 0.5,
+        cache_backend: Optional[CacheBackend] = None,
+        candidate_pool_size: int = 200
     ):
         self.pattern_learner = TemporalPatternLearner()
         self.context_analyzer = ContextAnalyzer()
@@ -617,7 +772,7 @@ class PredictivePreloadingEngine:
             self.pattern_learner,
             self.context_analyzer
         )
-        self.preload_scheduler = PreloadingScheduler(max_cache_size)
+        self.preload_scheduler = PreloadingScheduler(max_cache_size, cache_backend)
 
         self.prediction_k = prediction_k
         self.min_confidence = min_confidence
@@ -625,12 +780,36 @@ class PredictivePreloadingEngine:
         # Recent access history for context
         self.recent_events: deque = deque(maxlen=10)
 
+        # Recently surfaced episodes (search results, reads): default candidate pool
+        self.candidate_pool_size = candidate_pool_size
+        self.recent_candidates: "OrderedDict[str, dict]" = OrderedDict()
+
+    def observe_candidates(self, episodes: List[Tuple[str, Set[str]]]):
+        """Remember surfaced episodes (episode_id, tags) as prediction candidates"""
+        for episode_id, tags in episodes:
+            self.recent_candidates[episode_id] = {'tags': set(tags or [])}
+            self.recent_candidates.move_to_end(episode_id)
+        while len(self.recent_candidates) > self.candidate_pool_size:
+            self.recent_candidates.popitem(last=False)
+
+    def build_candidate_pool(self, episode_id: str) -> Dict[str, dict]:
+        """Learned successors of the current sequence + recently surfaced episodes"""
+        pool = dict(self.recent_candidates)
+        history = self.pattern_learner.access_history
+        successors = self.pattern_learner.get_bigram_successors(episode_id)
+        if len(history) >= 2:
+            successors += self.pattern_learner.get_trigram_successors(history[-2], history[-1])
+        for target_id, _, _ in successors:
+            pool.setdefault(target_id, {'tags': set()})
+        pool.pop(episode_id, None)
+        return pool
+
     async def on_episode_access(
         self,
         episode_id: str,
         tags: Set[str],
         embedding: Optional[np.ndarray],
-        candidate_pool: Dict[str, dict],
+        candidate_pool: Optional[Dict[str, dict]],
         fetch_fn
     ):
         """
@@ -646,6 +825,7 @@ class PredictivePreloadingEngine:
             tags: Episode tags
             embedding: Episode embedding
             candidate_pool: Pool of all episodes to consider
+                (None: build_candidate_pool after learning this access)
             fetch_fn: Async function to fetch episode data
         """
         now = datetime.now()
@@ -662,6 +842,9 @@ class PredictivePreloadingEngine:
         # Learn temporal patterns
         self.pattern_learner.learn_from_access(episode_id, now)
 
+        if candidate_pool is None:
+            candidate_pool = self.build_candidate_pool(episode_id)
+
         # Build session context
         context = self.context_analyzer.build_context(list(self.recent_events))
 
@@ -685,12 +868,9 @@ class PredictivePreloadingEngine:
     def get_stats(self) -> dict:
         """Get comprehensive statistics"""
         return {
-            'pattern_learner': {
-                'bigram_patterns': len(self.pattern_learner.bigram_counts),
-                'trigram_patterns': len(self.pattern_learner.trigram_counts),
-                'history_size': len(self.pattern_learner.access_history)
-            },
-            'preload_scheduler': self.preload_scheduler.get_cache_stats()
+            'pattern_learner': self.pattern_learner.get_stats(),
+            'preload_scheduler': self.preload_scheduler.get_cache_stats(),
+            'candidate_pool_size': len(self.recent_candidates)
         }
 
 
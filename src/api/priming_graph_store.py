@@ -0,0 +1,340 @@
+"""
+Priming Graph Store for LAB_005 (Spreading Activation)
+
+Keeps the SimilarityGraph warm across restarts and shared across workers:
+
+1. Bootstrap: seed the graph with the top-N most important + most recent
+   episodes. Neighbor lists come from pgvector kNN queries (HNSW index),
+   one LATERAL query per batch of seeds, so Python never computes an
+   N x N similarity matrix. Edges to episodes outside the seed set are
+   dropped; those episodes join the graph when primed or re-embedded.
+2. Snapshots: the graph is written to <PRIMING_GRAPH_DIR>/snapshot-<ts>
+   and the `current` symlink is swapped atomically. Loading memory-maps
+   the arrays, so restarts and extra uvicorn workers load in milliseconds
+   and share the same page cache.
+3. Incremental updates: episodes whose embedding the worker finished since
+   the snapshot watermark (embeddings_queue.processed_at, episode_id) are
+   added with SimilarityGraph.add_episode. Paging is keyset on both
+   columns, so rows sharing a processed_at at a page boundary are not
+   skipped. Each add holds the graph lock only for that episode, so
+   request handlers priming on the same graph wait at most one insert.
+
+Only one worker bootstraps: the others wait on an flock and then load the
+snapshot it wrote.
+
+Schema: database/migrations/priming_graph_sync.sql (watermark index)
+
+Date: October 2025
+"""
+
+import os
+import time
+import fcntl
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import psycopg
+
+from spreading_activation import SimilarityGraph
+
+
+PRIMING_GRAPH_DIR = os.getenv("PRIMING_GRAPH_DIR", "/app/data/priming_graph")
+BOOTSTRAP_LIMIT = int(os.getenv("PRIMING_BOOTSTRAP_LIMIT", "20000"))
+BOOTSTRAP_BATCH_SIZE = int(os.getenv("PRIMING_BOOTSTRAP_BATCH_SIZE", "256"))
+SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv("PRIMING_SNAPSHOT_MAX_AGE_SECONDS", str(6 * 3600)))
+SNAPSHOT_INTERVAL_SECONDS = int(os.getenv("PRIMING_SNAPSHOT_INTERVAL_SECONDS", "600"))
+SYNC_BATCH_SIZE = 500
+
+# Keyset tiebreak for a bare processed_at watermark: rows at it count as applied
+MAX_EPISODE_ID = "ffffffff-ffff-ffff-ffff-ffffffffffff"
+
+# Half of the budget by importance, the other half by recency (overlap is merged)
+SEED_QUERY = """
+    SELECT episode_id, embedding::text FROM (
+        (SELECT episode_id, embedding FROM nexus_memory.zep_episodic_memory
+         WHERE embedding IS NOT NULL
+         ORDER BY importance_score DESC NULLS LAST
+         LIMIT %(half)s)
+        UNION
+        (SELECT episode_id, embedding FROM nexus_memory.zep_episodic_memory
+         WHERE embedding IS NOT NULL
+         ORDER BY created_at DESC
+         LIMIT %(half)s)
+    ) seeds
+"""
+
+# One HNSW index scan per seed; ORDER BY distance + LIMIT is what the index serves
+KNN_QUERY = """
+    SELECT q.episode_id, n.episode_id, n.similarity
+    FROM nexus_memory.zep_episodic_memory q
+    CROSS JOIN LATERAL (
+        SELECT e.episode_id, 1 - (e.embedding <=> q.embedding) AS similarity
+        FROM nexus_memory.zep_episodic_memory e
+        WHERE e.embedding IS NOT NULL
+        ORDER BY e.embedding <=> q.embedding
+        LIMIT %(k)s
+    ) n
+    WHERE q.episode_id = ANY(%(ids)s::uuid[])
+"""
+
+SYNC_QUERY = """
+    SELECT q.episode_id, q.processed_at, e.embedding::text
+    FROM memory_system.embeddings_queue q
+    JOIN nexus_memory.zep_episodic_memory e ON e.episode_id = q.episode_id
+    WHERE q.state = 'done'
+        AND (q.processed_at, q.episode_id) > (%(since)s, %(after_id)s::uuid)
+        AND e.embedding IS NOT NULL
+    ORDER BY q.processed_at, q.episode_id
+    LIMIT %(limit)s
+"""
+
+
+def parse_vector(value) -> Optional[np.ndarray]:
+    """pgvector value (text '[0.1,...]' without the adapter, or a sequence) -> float32 array"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return np.array(value.strip("[]").split(","), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+class PrimingGraphStore:
+    """
+    Bootstraps, snapshots and incrementally syncs a SimilarityGraph.
+
+    Usage:
+        store = PrimingGraphStore(DB_CONN_STRING)
+        engine.similarity_graph = store.load_or_bootstrap()
+        store.sync(engine.similarity_graph)  # periodically
+    """
+
+    def __init__(
+        self,
+        db_conn_string: str,
+        snapshot_dir: str = PRIMING_GRAPH_DIR,
+        similarity_threshold: float = 0.7,
+        max_neighbors: int = 32,
+        bootstrap_limit: int = BOOTSTRAP_LIMIT,
+        batch_size: int = BOOTSTRAP_BATCH_SIZE,
+        max_age_seconds: int = SNAPSHOT_MAX_AGE_SECONDS,
+        snapshot_interval_seconds: int = SNAPSHOT_INTERVAL_SECONDS
+    ):
+        self.db_conn_string = db_conn_string
+        self.snapshot_dir = snapshot_dir
+        self.similarity_threshold = similarity_threshold
+        self.max_neighbors = max_neighbors
+        self.bootstrap_limit = bootstrap_limit
+        self.batch_size = batch_size
+        self.max_age_seconds = max_age_seconds
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+
+        # Newest (embeddings_queue.processed_at, episode_id) applied to the graph
+        self.synced_until: Optional[datetime] = None
+        self.synced_after_id: str = MAX_EPISODE_ID
+        self.loaded_from: Optional[str] = None
+        self.last_load_ms: Optional[float] = None
+        self.pending_changes = 0
+        self.last_saved_at = 0.0
+
+    @property
+    def current_path(self) -> str:
+        return os.path.join(self.snapshot_dir, "current")
+
+    # ------------------------------------------------------------------
+    # Load / bootstrap
+    # ------------------------------------------------------------------
+
+    def load_or_bootstrap(self) -> SimilarityGraph:
+        """Load a fresh snapshot, or bootstrap (one worker at a time) and save"""
+        graph = self._load_if_fresh()
+        if graph is not None:
+            return graph
+
+        with self._lock():
+            # Another worker may have written it while we waited
+            graph = self._load_if_fresh()
+            if graph is not None:
+                return graph
+
+            with psycopg.connect(self.db_conn_string) as conn:
+                graph, watermark = self.bootstrap(conn)
+            self.synced_until, self.synced_after_id = watermark, MAX_EPISODE_ID
+            self.save(graph)
+            return graph
+
+    def rebuild(self) -> SimilarityGraph:
+        """Bootstrap from pgvector and save, even if a fresh snapshot exists"""
+        with self._lock():
+            with psycopg.connect(self.db_conn_string) as conn:
+                graph, watermark = self.bootstrap(conn)
+            self.synced_until, self.synced_after_id = watermark, MAX_EPISODE_ID
+            self.save(graph)
+            return graph
+
+    def bootstrap(self, conn) -> Tuple[SimilarityGraph, Optional[datetime]]:
+        """
+        Build a graph from pgvector kNN for the seed episodes.
+
+        Returns:
+            (graph, watermark) - watermark is the embeddings_queue position
+            the graph reflects, read before seeding so nothing is missed
+        """
+        graph = SimilarityGraph(self.similarity_threshold, self.max_neighbors)
+
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT MAX(processed_at) FROM memory_system.embeddings_queue
+                WHERE state = 'done'
+            """)
+            watermark = cur.fetchone()[0]
+
+            cur.execute(SEED_QUERY, {"half": max(self.bootstrap_limit // 2, 1)})
+            seeds = [(str(episode_id), parse_vector(embedding)) for episode_id, embedding in cur.fetchall()]
+            if not seeds:
+                return graph, watermark
+
+            ids = [episode_id for episode_id, _ in seeds]
+            graph.add_embeddings(ids, np.stack([vector for _, vector in seeds]))
+
+            for start in range(0, len(ids), self.batch_size):
+                batch = ids[start:start + self.batch_size]
+                # +1: the nearest hit is the episode itself
+                cur.execute(KNN_QUERY, {"ids": batch, "k": self.max_neighbors + 1})
+                neighbors: Dict[str, List[Tuple[str, float]]] = {}
+                for source, neighbor, similarity in cur.fetchall():
+                    neighbors.setdefault(str(source), []).append((str(neighbor), float(similarity)))
+                for source, edges in neighbors.items():
+                    graph.set_neighbors(source, edges)
+
+        return graph, watermark
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def save(self, graph: SimilarityGraph) -> str:
+        """Write a new snapshot and atomically point `current` at it"""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        name = f"snapshot-{time.time_ns()}"
+        path = os.path.join(self.snapshot_dir, name)
+        graph.save_snapshot(path, meta={
+            "created_at": time.time(),
+            "synced_until": self.synced_until.isoformat() if self.synced_until else None,
+            "synced_after_id": self.synced_after_id,
+        })
+
+        link = os.path.join(self.snapshot_dir, f".current-{name}")
+        os.symlink(name, link)
+        os.replace(link, self.current_path)
+
+        # Workers still mapping an old snapshot keep their pages until they reload
+        for entry in os.listdir(self.snapshot_dir):
+            if entry.startswith("snapshot-") and entry != name:
+                shutil.rmtree(os.path.join(self.snapshot_dir, entry), ignore_errors=True)
+
+        self.loaded_from = path
+        self.pending_changes = 0
+        self.last_saved_at = time.time()
+        return path
+
+    def save_if_leader(self, graph: SimilarityGraph) -> Optional[str]:
+        """Save pending changes (at most once per interval) unless another worker is writing"""
+        if not self.pending_changes or time.time() - self.last_saved_at < self.snapshot_interval_seconds:
+            return None
+        try:
+            with self._lock(blocking=False):
+                return self.save(graph)
+        except BlockingIOError:
+            return None
+
+    def _load_if_fresh(self) -> Optional[SimilarityGraph]:
+        # Resolve `current` once: a concurrent save() may repoint it between files
+        path = os.path.realpath(self.current_path)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            return None
+
+        start = time.perf_counter()
+        try:
+            graph = SimilarityGraph.load_snapshot(path)
+        except FileNotFoundError:
+            # Superseded and removed by a newer save while we were loading
+            return None
+        meta = graph.snapshot_meta
+        if time.time() - meta.get("created_at", 0) > self.max_age_seconds:
+            return None
+        if (meta["similarity_threshold"], meta["max_neighbors"]) != (self.similarity_threshold, self.max_neighbors):
+            return None
+
+        synced_until = meta.get("synced_until")
+        self.synced_until = datetime.fromisoformat(synced_until) if synced_until else None
+        self.synced_after_id = meta.get("synced_after_id", MAX_EPISODE_ID)
+        self.last_saved_at = meta["created_at"]
+        self.loaded_from = path
+        self.last_load_ms = (time.perf_counter() - start) * 1000
+        return graph
+
+    @contextmanager
+    def _lock(self, blocking: bool = True):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        with open(os.path.join(self.snapshot_dir, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def sync(self, graph: SimilarityGraph, conn=None) -> int:
+        """
+        Add episodes embedded since the watermark.
+
+        Without a watermark (bootstrap failed or never ran) tracking starts
+        at the current queue position instead of replaying the whole table.
+
+        Returns:
+            Number of episodes applied
+        """
+        if conn is None:
+            with psycopg.connect(self.db_conn_string) as own_conn:
+                return self.sync(graph, own_conn)
+
+        with conn.cursor() as cur:
+            if self.synced_until is None:
+                cur.execute("""
+                    SELECT MAX(processed_at) FROM memory_system.embeddings_queue
+                    WHERE state = 'done'
+                """)
+                self.synced_until = cur.fetchone()[0] or datetime.now(timezone.utc)
+                self.synced_after_id = MAX_EPISODE_ID
+                return 0
+
+        since, after_id = self.synced_until, self.synced_after_id
+        applied = 0
+        with conn.cursor() as cur:
+            while True:
+                cur.execute(SYNC_QUERY, {"since": since, "after_id": after_id, "limit": SYNC_BATCH_SIZE})
+                rows = cur.fetchall()
+                for episode_id, processed_at, embedding in rows:
+                    graph.add_episode(str(episode_id), parse_vector(embedding))
+                    since, after_id = processed_at, str(episode_id)
+                applied += len(rows)
+                if len(rows) < SYNC_BATCH_SIZE:
+                    break
+
+        self.synced_until, self.synced_after_id = since, after_id
+        self.pending_changes += applied
+        return applied
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "snapshot": self.loaded_from,
+            "last_load_ms": self.last_load_ms,
+            "synced_until": self.synced_until.isoformat() if self.synced_until else None,
+            "pending_changes": self.pending_changes,
+        }
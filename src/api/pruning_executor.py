@@ -0,0 +1,595 @@
+"""
+Pruning Executor for NEXUS Intelligent Decay
+
+Moves prunable episodes out of nexus_memory.zep_episodic_memory into
+nexus_memory.zep_episodic_memory_archive in bounded batches. Keeping the
+hot table small keeps the HNSW and GIN indexes small, which is the biggest
+lever on search latency.
+
+Design:
+- SAME RULES AS PREVIEW: one SQL predicate shared by dry-run and execution
+- BOUNDED: each batch is its own transaction (lock, archive, delete, commit)
+- RESUMABLE: progress lives in memory_system.pruning_runs and is updated in
+  the same transaction as the batch, so an interrupted run resumes exactly
+- RATE-LIMITED: optional max_rows_per_second throttles between batches
+- OBSERVABLE: rows/sec, archived, remaining (counted, not derived from the
+  target) and batch count per run
+- NON-CRITICAL GRAPH: Neo4j deletions follow each committed batch and never
+  fail the run (PostgreSQL is source of truth); failed deletions are kept
+  on the run row and retried on its next pass
+- SAFE RESTORE: an archived episode whose id is back in the hot table is
+  skipped (and kept in the archive) instead of aborting the restore
+
+Schema: database/migrations/pruning_archive.sql
+
+Date: October 2025
+Feature: Intelligent Decay - Pruning Execution
+"""
+
+import time
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import psycopg
+
+import fact_store
+
+
+logger = logging.getLogger(__name__)
+
+
+# Never prune episodes carrying these tags
+PROTECTED_TAGS = ['milestone', 'critical', 'protected', 'consciousness']
+
+# Never prune episodes accessed within this many days
+RECENT_ACCESS_DAYS = 7
+
+# Never prune episodes above this importance
+MAX_PRUNABLE_IMPORTANCE = 0.8
+
+# Safety rules shared by dry-run counting and execution.
+# Parameters: %(protected_tags)s, %(min_age_days)s, %(min_score_threshold)s
+PRUNABLE_PREDICATE = f"""
+    e.created_at <= NOW() - make_interval(days => %(min_age_days)s::INT)
+    AND e.importance_score <= {MAX_PRUNABLE_IMPORTANCE}
+    AND NOT (COALESCE(e.tags, '{{}}'::TEXT[]) && %(protected_tags)s::TEXT[])
+    AND COALESCE(
+        (e.metadata->'access_tracking'->>'last_accessed')::TIMESTAMPTZ,
+        '-infinity'::TIMESTAMPTZ
+    ) < NOW() - INTERVAL '{RECENT_ACCESS_DAYS} days'
+    AND nexus_memory.calculate_decay_score(
+        e.importance_score, e.created_at, e.metadata
+    ) < %(min_score_threshold)s::FLOAT
+"""
+
+# Columns copied verbatim between the hot table and the archive
+# (embedding is intentionally NOT archived - restore re-enqueues it)
+EPISODE_COLUMNS = (
+    "episode_id, timestamp, content, importance_score, tags, "
+    "embedding_version, project_id, metadata, created_at"
+)
+
+# An episode archived earlier (and since restored or re-created) is
+# replaced by the version being archived now, never dropped
+ARCHIVE_CONFLICT_UPDATE = ", ".join(
+    f"{column} = EXCLUDED.{column}"
+    for column in [c.strip() for c in EPISODE_COLUMNS.split(",") if c.strip() != "episode_id"]
+    + ["decay_score", "pruning_run_id"]
+) + ", archived_at = NOW()"
+
+
+@dataclass
+class PruningRunStatus:
+    """Progress snapshot of a pruning run"""
+    run_id: str
+    status: str
+    target_count: int
+    archived_count: int
+    remaining: int
+    batch_count: int
+    neo4j_deleted_count: int
+    rows_per_second: float
+    active_seconds: float
+    min_score_threshold: float
+    min_age_days: int
+    batch_size: int
+    max_rows_per_second: Optional[float] = None
+    neo4j_pending_count: int = 0
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class RestoreResult:
+    """Outcome of a restore"""
+    restored_ids: List[str]
+    skipped_ids: List[str]  # id already in the hot table; left in the archive
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class PruningExecutor:
+    """
+    Batched archive-and-delete executor for episodic memory pruning
+
+    Each batch:
+    1. Locks up to batch_size prunable episodes (FOR UPDATE SKIP LOCKED)
+    2. Deletes their embeddings_queue and episode_facts rows
+    3. Moves them into the archive table (DELETE ... RETURNING -> INSERT)
+    4. Advances the run's archived_count
+    5. Commits, then deletes the matching Neo4j nodes (best effort; ids
+       whose deletion failed are recorded on the run and retried)
+    """
+
+    def __init__(
+        self,
+        db_conn_string: str,
+        graph_sync=None,
+        protected_tags: Optional[List[str]] = None
+    ):
+        """
+        Initialize pruning executor
+
+        Args:
+            db_conn_string: PostgreSQL connection string
+            graph_sync: Optional Neo4jSync-like object exposing
+                delete_episodes(ids) and sync_episode(...)
+            protected_tags: Tags that are never pruned (default: PROTECTED_TAGS)
+        """
+        self.db_conn_string = db_conn_string
+        self.graph_sync = graph_sync
+        self.protected_tags = protected_tags or list(PROTECTED_TAGS)
+
+    # ------------------------------------------------------------------
+    # Candidate counting (dry run)
+    # ------------------------------------------------------------------
+
+    def count_candidates(
+        self,
+        min_score_threshold: float,
+        min_age_days: int,
+        cap: Optional[int] = None
+    ) -> int:
+        """
+        Count episodes that execution would archive
+
+        Args:
+            min_score_threshold: Prune only below this decay score
+            min_age_days: Prune only episodes older than this
+            cap: Optional upper bound for the returned count
+
+        Returns:
+            Number of prunable episodes (capped)
+        """
+        params = self._predicate_params(min_score_threshold, min_age_days)
+        params["cap"] = cap
+
+        with psycopg.connect(self.db_conn_string) as conn:
+            with conn.cursor() as cur:
+                # The cap bounds the scan, not just the result
+                cur.execute(f"""
+                    SELECT COUNT(*) FROM (
+                        SELECT 1
+                        FROM nexus_memory.zep_episodic_memory e
+                        WHERE {PRUNABLE_PREDICATE}
+                        LIMIT %(cap)s
+                    ) candidates
+                """, params)
+                return cur.fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Run lifecycle
+    # ------------------------------------------------------------------
+
+    def start_run(
+        self,
+        min_score_threshold: float,
+        min_age_days: int,
+        target_count: int,
+        batch_size: int = 50,
+        max_rows_per_second: Optional[float] = None
+    ) -> str:
+        """
+        Register a new pruning run
+
+        Returns:
+            run_id of the created run
+        """
+        with psycopg.connect(self.db_conn_string) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO memory_system.pruning_runs
+                    (min_score_threshold, min_age_days, target_count,
+                     batch_size, max_rows_per_second)
+                    VALUES (%s, %s, %s, %s, %s)
+                    RETURNING run_id
+                """, (min_score_threshold, min_age_days, target_count,
+                      batch_size, max_rows_per_second))
+                run_id = str(cur.fetchone()[0])
+            conn.commit()
+
+        return run_id
+
+    def execute(self, run_id: str, max_batches: Optional[int] = None) -> PruningRunStatus:
+        """
+        Execute (or resume) a pruning run until its target is reached,
+        no prunable episodes remain, or max_batches is exhausted
+
+        Args:
+            run_id: Run created by start_run()
+            max_batches: Optional cap on batches in this invocation
+                (the run stays 'interrupted' and can be resumed)
+
+        Returns:
+            Final PruningRunStatus of this invocation
+        """
+        run = self._read_run(run_id)
+        if run is None:
+            raise ValueError(f"Pruning run {run_id} not found")
+
+        self._retry_graph_deletes(run_id)
+        if run.status == 'completed':
+            return self.get_run(run_id)
+
+        self._set_status(run_id, 'running')
+
+        batches_done = 0
+        exhausted = False
+
+        try:
+            while run.archived_count < run.target_count:
+                if max_batches is not None and batches_done >= max_batches:
+                    break
+
+                limit = min(run.batch_size, run.target_count - run.archived_count)
+
+                batch_start = time.time()
+                archived_ids = self._archive_batch(run, limit)
+                batch_seconds = time.time() - batch_start
+
+                if archived_ids:
+                    neo4j_deleted = self._delete_graph_nodes(archived_ids)
+                    self._record_graph_progress(
+                        run_id, neo4j_deleted or 0, batch_seconds,
+                        failed_ids=archived_ids if neo4j_deleted is None else []
+                    )
+
+                batches_done += 1
+                run = self._read_run(run_id)
+
+                if len(archived_ids) < limit:
+                    # Fewer eligible rows than requested: nothing left to prune
+                    exhausted = True
+                    break
+
+                self._throttle(len(archived_ids), batch_seconds, run.max_rows_per_second)
+
+        except Exception as e:
+            logger.error(f"❌ Pruning run {run_id} failed: {e}")
+            self._set_status(run_id, 'failed', last_error=str(e))
+            raise
+
+        finished = exhausted or run.archived_count >= run.target_count
+        self._set_status(run_id, 'completed' if finished else 'interrupted')
+
+        status = self.get_run(run_id)
+        logger.info(
+            f"✅ Pruning run {run_id}: {status.archived_count}/{status.target_count} archived "
+            f"({status.rows_per_second:.1f} rows/s, {status.batch_count} batches)"
+        )
+        return status
+
+    def get_run(self, run_id: str) -> Optional[PruningRunStatus]:
+        """
+        Get progress snapshot for a run (None if unknown)
+
+        remaining is counted: prunable episodes still in the hot table,
+        capped at what the run has left to archive.
+        """
+        run = self._read_run(run_id)
+        if run is not None and run.status != 'completed' and run.remaining > 0:
+            run.remaining = self.count_candidates(
+                run.min_score_threshold, run.min_age_days, cap=run.remaining
+            )
+        return run
+
+    def _read_run(self, run_id: str) -> Optional[PruningRunStatus]:
+        """Run row only (remaining = what is left of the target, no count)"""
+        with psycopg.connect(self.db_conn_string) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT run_id, status, target_count, archived_count,
+                           batch_count, neo4j_deleted_count, active_seconds,
+                           min_score_threshold, min_age_days, batch_size,
+                           max_rows_per_second, last_error, created_at,
+                           completed_at, cardinality(neo4j_pending_ids)
+                    FROM memory_system.pruning_runs
+                    WHERE run_id = %s
+                """, (run_id,))
+                row = cur.fetchone()
+
+        if not row:
+            return None
+
+        target_count = row[2]
+        archived_count = row[3] or 0
+        active_seconds = float(row[6] or 0.0)
+        status = row[1]
+
+        return PruningRunStatus(
+            run_id=str(row[0]),
+            status=status,
+            target_count=target_count,
+            archived_count=archived_count,
+            remaining=0 if status == 'completed' else max(target_count - archived_count, 0),
+            batch_count=row[4] or 0,
+            neo4j_deleted_count=row[5] or 0,
+            rows_per_second=archived_count / active_seconds if active_seconds > 0 else 0.0,
+            active_seconds=active_seconds,
+            min_score_threshold=float(row[7]),
+            min_age_days=row[8],
+            batch_size=row[9],
+            max_rows_per_second=row[10],
+            neo4j_pending_count=row[14] or 0,
+            last_error=row[11],
+            created_at=row[12],
+            completed_at=row[13]
+        )
+
+    # ------------------------------------------------------------------
+    # Restore
+    # ------------------------------------------------------------------
+
+    def restore(
+        self,
+        episode_ids: Optional[List[str]] = None,
+        run_id: Optional[str] = None
+    ) -> RestoreResult:
+        """
+        Move archived episodes back into the hot table
+
+        Restored rows are inserted with embedding NULL, so the
+        auto_generate_embedding trigger re-enqueues them for the
+        embeddings worker. Neo4j nodes are re-created (best effort).
+        Episodes whose id is already in the hot table (re-created since
+        they were archived) are skipped and stay in the archive.
+
+        Args:
+            episode_ids: Specific archived episodes to restore
+            run_id: Restore everything archived by this pruning run
+
+        Returns:
+            RestoreResult with the restored and the skipped episode IDs
+        """
+        if not episode_ids and not run_id:
+            raise ValueError("Provide episode_ids or run_id to restore")
+
+        if episode_ids:
+            where_clause = "a.episode_id = ANY(%s::uuid[])"
+            params = (episode_ids,)
+        else:
+            where_clause = "a.pruning_run_id = %s"
+            params = (run_id,)
+
+        with psycopg.connect(self.db_conn_string) as conn:
+            with conn.cursor() as cur:
+                # NOT EXISTS covers the partitioned table too, whose unique key
+                # is (episode_id, created_at); ON CONFLICT covers concurrent inserts.
+                # Only rows actually inserted leave the archive.
+                cur.execute(f"""
+                    WITH selected AS (
+                        SELECT {EPISODE_COLUMNS}
+                        FROM nexus_memory.zep_episodic_memory_archive a
+                        WHERE {where_clause}
+                        FOR UPDATE
+                    ),
+                    restored AS (
+                        INSERT INTO nexus_memory.zep_episodic_memory ({EPISODE_COLUMNS})
+                        SELECT {EPISODE_COLUMNS} FROM selected s
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM nexus_memory.zep_episodic_memory h
+                            WHERE h.episode_id = s.episode_id
+                        )
+                        ON CONFLICT DO NOTHING
+                        RETURNING episode_id, content, importance_score, tags, created_at, metadata
+                    ),
+                    removed AS (
+                        DELETE FROM nexus_memory.zep_episodic_memory_archive
+                        WHERE episode_id IN (SELECT episode_id FROM restored)
+                    )
+                    SELECT episode_id, content, importance_score, tags, created_at, metadata, TRUE
+                    FROM restored
+                    UNION ALL
+                    SELECT episode_id, NULL, NULL, NULL, NULL, NULL, FALSE
+                    FROM selected
+                    WHERE episode_id NOT IN (SELECT episode_id FROM restored)
+                """, params)
+                results = cur.fetchall()
+                rows = [row[:6] for row in results if row[6]]
+                skipped = [str(row[0]) for row in results if not row[6]]
+
+                # Facts travel in metadata; rebuild their typed rows
+                for row in rows:
+                    facts = (row[5] or {}).get("facts")
+                    if isinstance(facts, dict):
+                        fact_store.write_facts(cur, row[0], facts, row[4])
+            conn.commit()
+
+        if self.graph_sync is not None:
+            for row in rows:
+                try:
+                    self.graph_sync.sync_episode(
+                        episode_id=str(row[0]),
+                        content=row[1],
+                        importance_score=row[2],
+                        tags=row[3] or [],
+                        created_at=row[4]
+                    )
+                except Exception as e:
+                    logger.error(f"Neo4j re-sync failed for {row[0]}: {e}")
+
+        if skipped:
+            logger.warning(f"Restore skipped {len(skipped)} episodes already in the hot table")
+
+        return RestoreResult(restored_ids=[str(row[0]) for row in rows], skipped_ids=skipped)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _predicate_params(self, min_score_threshold: float, min_age_days: int) -> Dict:
+        return {
+            "protected_tags": self.protected_tags,
+            "min_age_days": min_age_days,
+            "min_score_threshold": min_score_threshold
+        }
+
+    def _archive_batch(self, run: PruningRunStatus, limit: int) -> List[str]:
+        """Archive one bounded batch in a single transaction"""
+        params = self._predicate_params(run.min_score_threshold, run.min_age_days)
+        params.update({"limit": limit, "run_id": run.run_id})
+
+        with psycopg.connect(self.db_conn_string) as conn:
+            with conn.cursor() as cur:
+                # 1. Lock candidates (oldest first - stable, index friendly)
+                cur.execute(f"""
+                    SELECT e.episode_id
+                    FROM nexus_memory.zep_episodic_memory e
+                    WHERE {PRUNABLE_PREDICATE}
+                    ORDER BY e.created_at ASC
+                    LIMIT %(limit)s
+                    FOR UPDATE SKIP LOCKED
+                """, params)
+                episode_ids = [row[0] for row in cur.fetchall()]
+
+                if not episode_ids:
+                    conn.rollback()
+                    return []
+
+                params["episode_ids"] = episode_ids
+
+                # 2. Embeddings queue + typed fact store cleanup
+                cur.execute("""
+                    DELETE FROM memory_system.embeddings_queue
+                    WHERE episode_id = ANY(%(episode_ids)s)
+                """, params)
+                fact_store.delete_facts(cur, episode_ids)
+
+                # 3. Move rows into archive
+                cur.execute(f"""
+                    WITH moved AS (
+                        DELETE FROM nexus_memory.zep_episodic_memory
+                        WHERE episode_id = ANY(%(episode_ids)s)
+                        RETURNING {EPISODE_COLUMNS}
+                    )
+                    INSERT INTO nexus_memory.zep_episodic_memory_archive
+                    ({EPISODE_COLUMNS}, decay_score, pruning_run_id)
+                    SELECT {EPISODE_COLUMNS},
+                           nexus_memory.calculate_decay_score(
+                               importance_score, created_at, metadata
+                           ),
+                           %(run_id)s
+                    FROM moved
+                    ON CONFLICT (episode_id) DO UPDATE SET {ARCHIVE_CONFLICT_UPDATE}
+                """, params)
+
+                # 4. Progress checkpoint (same transaction as the move)
+                cur.execute("""
+                    UPDATE memory_system.pruning_runs
+                    SET archived_count = archived_count + %s,
+                        batch_count = batch_count + 1,
+                        updated_at = NOW()
+                    WHERE run_id = %s
+                """, (len(episode_ids), run.run_id))
+
+            conn.commit()
+
+        return [str(episode_id) for episode_id in episode_ids]
+
+    def _delete_graph_nodes(self, episode_ids: List[str]) -> Optional[int]:
+        """Delete Neo4j nodes for archived episodes (None if it failed; never raises)"""
+        if self.graph_sync is None:
+            return 0
+        try:
+            return self.graph_sync.delete_episodes(episode_ids)
+        except Exception as e:
+            logger.error(f"Neo4j delete failed for {len(episode_ids)} episodes: {e}")
+            return None
+
+    def _record_graph_progress(self, run_id: str, neo4j_deleted: int, batch_seconds: float,
+                               failed_ids: List[str] = ()):
+        with psycopg.connect(self.db_conn_string) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE memory_system.pruning_runs
+                    SET neo4j_deleted_count = neo4j_deleted_count + %s,
+                        active_seconds = active_seconds + %s,
+                        neo4j_pending_ids = neo4j_pending_ids || %s::uuid[],
+                        updated_at = NOW()
+                    WHERE run_id = %s
+                """, (neo4j_deleted, batch_seconds, list(failed_ids), run_id))
+            conn.commit()
+
+    def _retry_graph_deletes(self, run_id: str):
+        """Retry the Neo4j deletions of earlier batches that failed (never raises)"""
+        if self.graph_sync is None:
+            return
+        with psycopg.connect(self.db_conn_string) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT neo4j_pending_ids FROM memory_system.pruning_runs
+                    WHERE run_id = %s
+                """, (run_id,))
+                row = cur.fetchone()
+        pending = [str(episode_id) for episode_id in (row[0] if row and row[0] else [])]
+        if not pending:
+            return
+
+        deleted = self._delete_graph_nodes(pending)
+        if deleted is None:
+            return
+
+        with psycopg.connect(self.db_conn_string) as conn:
+            with conn.cursor() as cur:
+                # Ids recorded by a concurrent batch in the meantime stay pending
+                cur.execute("""
+                    UPDATE memory_system.pruning_runs
+                    SET neo4j_deleted_count = neo4j_deleted_count + %s,
+                        neo4j_pending_ids = ARRAY(
+                            SELECT unnest(neo4j_pending_ids)
+                            EXCEPT SELECT unnest(%s::uuid[])
+                        ),
+                        updated_at = NOW()
+                    WHERE run_id = %s
+                """, (deleted, pending, run_id))
+            conn.commit()
+        logger.info(f"Neo4j delete retried for {len(pending)} episodes of run {run_id}")
+
+    def _set_status(self, run_id: str, status: str, last_error: Optional[str] = None):
+        with psycopg.connect(self.db_conn_string) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE memory_system.pruning_runs
+                    SET status = %s,
+                        last_error = COALESCE(%s, last_error),
+                        updated_at = NOW(),
+                        completed_at = CASE WHEN %s = 'completed' THEN NOW() ELSE completed_at END
+                    WHERE run_id = %s
+                """, (status, last_error, status, run_id))
+            conn.commit()
+
+    @staticmethod
+    def _throttle(rows: int, batch_seconds: float, max_rows_per_second: Optional[float]):
+        """Sleep so that this batch does not exceed max_rows_per_second"""
+        if not max_rows_per_second or rows <= 0:
+            return
+        min_seconds = rows / max_rows_per_second
+        if batch_seconds < min_seconds:
+            time.sleep(min_seconds - batch_seconds)
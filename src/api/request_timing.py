@@ -0,0 +1,130 @@
+"""
+Request Timing: per-stage spans on the API hot path
+
+The Prometheus middleware in main.py opens a RequestTiming per request;
+code on the hot path marks its stages:
+
+    with span("db"):
+        rows = tiered_search_planner.search(cur, ...)
+
+Spans of the same stage add up (three queries -> one "db" entry with
+count 3). At the end of the request the middleware observes each stage
+into nexus_api_stage_duration_seconds{route, stage} (with the request id
+as exemplar) and, when SERVER_TIMING_ENABLED, returns them as a
+Server-Timing header:
+
+    Server-Timing: embedding;dur=12.4, db;dur=3.1;desc="3 calls", total;dur=19.8
+
+Labels stay bounded: routes are the matched route template
+("/memory/prime/{episode_uuid}", never the UUID), stages are literals in
+the code. Outside a request span() is a no-op, so background tasks and
+jobs can share the same helpers.
+
+Date: October 2025
+"""
+
+import os
+import re
+import time
+import uuid
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+# Label for requests that matched no route (404 probes, scanners)
+UNMATCHED_ROUTE = "unmatched"
+
+# Exemplar label values are capped (OpenMetrics: 128 chars for all labels)
+MAX_REQUEST_ID_LENGTH = 64
+
+_STAGE_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class RequestTiming:
+    """Stage durations of one request, in first-seen order"""
+
+    def __init__(self, request_id: Optional[str] = None):
+        self.request_id = (request_id or uuid.uuid4().hex[:16])[:MAX_REQUEST_ID_LENGTH]
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List] = {}  # stage -> [seconds, count]
+
+    def add(self, stage: str, seconds: float):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def items(self) -> List[Tuple[str, float, int]]:
+        return [(stage, seconds, count) for stage, (seconds, count) in self.stages.items()]
+
+    def server_timing(self, total_seconds: Optional[float] = None) -> str:
+        """Server-Timing header value (durations in milliseconds)"""
+        entries = []
+        for stage, seconds, count in self.items():
+            entry = f"{stage};dur={seconds * 1000:.1f}"
+            if count > 1:
+                entry += f';desc="{count} calls"'
+            entries.append(entry)
+        total = self.elapsed() if total_seconds is None else total_seconds
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar(
+    "nexus_request_timing", default=None
+)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+@contextmanager
+def request_timing(request_id: Optional[str] = None):
+    """Collect spans for the duration of a request (the middleware opens this)"""
+    timing = RequestTiming(request_id)
+    token = _current.set(timing)
+    try:
+        yield timing
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(stage: str):
+    """Time a stage of the current request (no-op outside a request)"""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    if not _STAGE_NAME.match(stage):
+        raise ValueError(f"Invalid stage name: {stage!r}")
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(stage, time.perf_counter() - start)
+
+
+def route_template(scope: dict) -> str:
+    """Matched route path ("/memory/prime/{episode_uuid}"), never the raw URL"""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if path:
+        return path
+
+    # Starlette routes (docs, openapi.json) only set scope["endpoint"]
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        for candidate in getattr(getattr(scope.get("app"), "router", None), "routes", ()):
+            if getattr(candidate, "endpoint", None) is endpoint:
+                return getattr(candidate, "path", UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
@@ -217,11 +217,16 @@ class ModelBasedPredictor:
         return expected_return
 
 
+def _value_window() -> deque:
+    """Per-state value window (module-level so the history stays picklable)"""
+    return deque(maxlen=100)
+
+
 class UncertaintyEstimator:
     """Estimates uncertainty in value predictions"""
 
     def __init__(self):
-        self.value_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+        self.value_history: Dict[str, deque] = defaultdict(_value_window)
 
     def record_value(self, state_id: str, value: float):
         """Record value estimate"""
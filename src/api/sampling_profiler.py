@@ -0,0 +1,244 @@
+"""
+On-demand sampling profiler for a live API worker
+
+GET /admin/profile runs a profile inside the worker that serves the
+request and returns the result as folded stacks (flamegraph.pl,
+speedscope, inferno) or speedscope JSON.
+
+Design:
+- SAMPLING: a dedicated thread reads sys._current_frames() every
+  interval and walks each thread's stack. Nothing is installed in the
+  profiled threads (no sys.setprofile), so their code runs unchanged.
+- ALL THREADS: the event-loop thread, the to_thread/executor pool and
+  the model inference threads are sampled together. Threads are grouped
+  by name without their numeric suffix (ThreadPoolExecutor-0_3 ->
+  ThreadPoolExecutor) and the loop thread is reported as "event-loop".
+- ROUTE TAGS (optional): a sample whose stack passes through an
+  endpoint function gets the endpoint's route template as its first
+  frame. The tag comes from the stack itself, so the request path pays
+  nothing for it. Work an async endpoint hands to another thread is not
+  tagged.
+- BOUNDED: identical stacks are counted, not stored per sample. The
+  sampler sleeps at least OVERHEAD_FACTOR times as long as each pass
+  took, which keeps its share of the GIL under about 5% at any thread
+  count. Duration, interval and stack depth are capped, and only one
+  session runs per worker at a time (ProfilerBusy otherwise).
+
+Date: October 2025
+"""
+
+import os
+import re
+import sys
+import time
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+PROFILER_MIN_INTERVAL_MS = 1.0
+PROFILER_DEFAULT_INTERVAL_MS = 10.0
+MAX_STACK_DEPTH = 128
+
+# Sleep >= OVERHEAD_FACTOR x the time a sampling pass took (~5% cap)
+OVERHEAD_FACTOR = 19
+
+EVENT_LOOP_THREAD = "event-loop"
+UNTAGGED_ROUTE = "untagged"
+
+FORMATS = ("folded", "speedscope")
+
+_THREAD_SUFFIX = re.compile(r"[-_]\d+(_\d+)?$")
+
+Stack = Tuple[str, Optional[str], Tuple]  # (thread group, route, code objects root -> leaf)
+
+
+class ProfilerBusy(RuntimeError):
+    """A profiling session is already running in this worker"""
+
+
+def thread_group(name: str) -> str:
+    """Thread name without its pool/worker number"""
+    return _THREAD_SUFFIX.sub("", name) or name
+
+
+def frame_name(code) -> str:
+    """Function-level frame label: qualified name (file:first line)"""
+    filename = code.co_filename
+    parts = filename.replace("\\", "/").rsplit("/", 2)
+    short = "/".join(parts[-2:]) if len(parts) > 1 else filename
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({short}:{code.co_firstlineno})"
+
+
+class Profile:
+    """Counted stacks of one session"""
+
+    def __init__(self, interval: float, tag_routes: bool):
+        self.interval = interval
+        self.tag_routes = tag_routes
+        self.stacks: Counter = Counter()
+        self.samples = 0          # sampling passes
+        self.started = time.time()
+        self.duration = 0.0
+        self.sampler_seconds = 0.0
+
+    def overhead(self) -> float:
+        """Share of wall time the sampler spent walking stacks"""
+        return self.sampler_seconds / self.duration if self.duration else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            "duration_seconds": round(self.duration, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "unique_stacks": len(self.stacks),
+            "sampler_overhead": round(self.overhead(), 4),
+        }
+
+    def _frames(self, stack: Stack) -> List[str]:
+        thread, route, codes = stack
+        frames = [thread]
+        if self.tag_routes:
+            frames.append(f"route:{route or UNTAGGED_ROUTE}")
+        frames.extend(frame_name(code) for code in codes)
+        return frames
+
+    def folded(self) -> str:
+        """One line per unique stack: frame;frame;...;leaf count"""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            lines.append(";".join(f.replace(";", ":") for f in self._frames(stack)) + f" {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self, name: str = "nexus-api") -> Dict:
+        """speedscope file format: one sampled profile per thread group, weights in seconds"""
+        frames: List[Dict] = []
+        frame_index: Dict[str, int] = {}
+        profiles: Dict[str, Dict] = {}
+
+        def index(label: str) -> int:
+            if label not in frame_index:
+                frame_index[label] = len(frames)
+                frames.append({"name": label})
+            return frame_index[label]
+
+        for stack, count in self.stacks.most_common():
+            frames_of_stack = self._frames(stack)
+            profile = profiles.setdefault(frames_of_stack[0], {
+                "type": "sampled",
+                "name": frames_of_stack[0],
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(self.duration, 6),
+                "samples": [],
+                "weights": [],
+            })
+            profile["samples"].append([index(label) for label in frames_of_stack[1:]])
+            profile["weights"].append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "nexus-cerebro sampling_profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+
+class SamplingProfiler:
+    """Stack sampler over every thread of this process; one session at a time"""
+
+    def __init__(self, max_seconds: float = PROFILER_MAX_SECONDS):
+        self.max_seconds = max_seconds
+        self._session = threading.Lock()
+        self.sessions = 0
+
+    @property
+    def active(self) -> bool:
+        return self._session.locked()
+
+    def profile(
+        self,
+        seconds: float,
+        interval_ms: float = PROFILER_DEFAULT_INTERVAL_MS,
+        loop_thread_id: Optional[int] = None,
+        loop_only: bool = False,
+        route_codes: Optional[Dict] = None,
+    ) -> Profile:
+        """
+        Sample for `seconds` (blocking; call from a worker thread)
+
+        Args:
+            loop_thread_id: ident of the event-loop thread (named event-loop)
+            loop_only: sample only the event-loop thread
+            route_codes: endpoint code object -> route template (enables route tags)
+        """
+        if not self._session.acquire(blocking=False):
+            raise ProfilerBusy("A profiling session is already running in this worker")
+        try:
+            self.sessions += 1
+            seconds = min(max(seconds, 0.0), self.max_seconds)
+            interval = max(interval_ms, PROFILER_MIN_INTERVAL_MS) / 1000
+            profile = Profile(interval, tag_routes=route_codes is not None)
+            self._run(profile, seconds, loop_thread_id, loop_only, route_codes or {})
+            return profile
+        finally:
+            self._session.release()
+
+    def _run(self, profile: Profile, seconds: float, loop_thread_id, loop_only, route_codes):
+        me = threading.get_ident()
+        names: Dict[int, str] = {}
+        names_at = 0.0
+        start = time.perf_counter()
+        deadline = start + seconds
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now - names_at > 1.0:  # threads come and go (executor growth)
+                names = {t.ident: t.name for t in threading.enumerate()}
+                names_at = now
+
+            for ident, frame in sys._current_frames().items():
+                if ident == me or (loop_only and ident != loop_thread_id):
+                    continue
+                group = EVENT_LOOP_THREAD if ident == loop_thread_id else thread_group(names.get(ident, "thread"))
+                profile.stacks[self._stack(group, frame, route_codes)] += 1
+            profile.samples += 1
+
+            spent = time.perf_counter() - now
+            profile.sampler_seconds += spent
+            time.sleep(max(profile.interval - spent, spent * OVERHEAD_FACTOR))
+
+        profile.duration = time.perf_counter() - start
+
+    @staticmethod
+    def _stack(group: str, frame, route_codes: Dict) -> Stack:
+        codes = []
+        route = None
+        while frame is not None and len(codes) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            codes.append(code)
+            if route is None and route_codes:
+                route = route_codes.get(code)
+            frame = frame.f_back
+        codes.reverse()
+        return group, route, tuple(codes)
+
+
+def route_code_map(routes: Iterable) -> Dict:
+    """Endpoint code object -> route path, for route-tagged samples"""
+    codes = {}
+    for route in routes:
+        endpoint = getattr(route, "endpoint", None)
+        code = getattr(endpoint, "__code__", None)
+        if code is not None and getattr(route, "path", None):
+            codes.setdefault(code, route.path)
+    return codes
+
+
+# One profiler per worker process
+profiler = SamplingProfiler()
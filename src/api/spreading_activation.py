@@ -7,11 +7,18 @@ and activation spreading, reducing retrieval latency and improving context coher
 Based on: Collins & Loftus (1975) Spreading Activation Theory
 """
 
+import os
+import json
+import math
+import heapq
 import time
-from typing import List, Dict, Tuple, Optional, Set
+import threading
+from typing import Any, List, Dict, Tuple, Optional, Set, Sequence
 from dataclasses import dataclass, field
-from collections import OrderedDict
+from collections.abc import Mapping
 import numpy as np
+
+from cache_backends import CacheBackend, LocalCache
 from datetime import datetime, timedelta
 
 
@@ -35,53 +42,382 @@ class PrimedEpisode:
     primed_at: float
     source_uuid: str  # Episode that triggered priming
 
+    def to_cache_value(self) -> Dict[str, Any]:
+        """Compact form for cache backends (embedding as float32 bytes)"""
+        return {
+            "uuid": self.uuid,
+            "content": self.content,
+            "embedding": np.asarray(self.embedding, dtype=np.float32).tobytes(),
+            "activation": self.activation,
+            "primed_at": self.primed_at,
+            "source_uuid": self.source_uuid,
+        }
+
+    @classmethod
+    def from_cache_value(cls, value: Dict[str, Any]) -> "PrimedEpisode":
+        return cls(**{**value, "embedding": np.frombuffer(value["embedding"], dtype=np.float32)})
+
+
+class _EmbeddingView(Mapping):
+    """Read-only uuid -> normalized embedding view over the graph matrix"""
+
+    def __init__(self, graph: "SimilarityGraph"):
+        self._graph = graph
+
+    def __getitem__(self, uuid: str) -> np.ndarray:
+        return self._graph._matrix[self._graph._index[uuid]]
+
+    def __contains__(self, uuid) -> bool:
+        return uuid in self._graph._index
+
+    def __iter__(self):
+        return iter(self._graph._ids)
+
+    def __len__(self) -> int:
+        return len(self._graph._ids)
+
 
 class SimilarityGraph:
     """
     Builds and maintains semantic similarity network between episodes.
-    Uses embeddings to compute cosine similarity.
+
+    Embeddings live in one preallocated, L2-normalized float32 matrix that
+    grows by doubling, so adding an episode is a single matrix-vector
+    product (cosine similarity = dot product of normalized rows) plus an
+    argpartition top-k instead of a Python loop over every episode.
+
+    Neighbor lists are kept sorted by similarity (descending) and capped
+    at max_neighbors, so get_related is a slice.
+
+    to_csr exports the top-k adjacency as CSR arrays (cached until the
+    graph changes) for vectorized spreading activation.
+
+    Snapshots (save_snapshot / load_snapshot) store the matrix and padded
+    neighbor arrays as .npy files. Loading memory-maps them copy-on-write,
+    so every worker loading the same snapshot shares the pages, and
+    neighbor lists are only turned into Python lists when first touched.
+
+    The graph is shared between request handlers and the background sync
+    thread: public methods hold `lock` (reentrant), and callers that read
+    several pieces of state together (ids, index, CSR arrays) should hold
+    it for the whole read.
     """
 
-    def __init__(self, similarity_threshold: float = 0.7):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.7,
+        max_neighbors: int = 32,
+        initial_capacity: int = 1024
+    ):
         self.similarity_threshold = similarity_threshold
+        self.max_neighbors = max_neighbors
         self.graph: Dict[str, List[Tuple[str, float]]] = {}
-        self.embeddings: Dict[str, np.ndarray] = {}
+
+        self._capacity = max(initial_capacity, 1)
+        self._matrix: Optional[np.ndarray] = None  # (capacity, dim) float32, allocated on first add
+        self._floor: Optional[np.ndarray] = None   # per-row min similarity to enter its neighbor list
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.embeddings = _EmbeddingView(self)
+
+        # (neighbor rows, similarities) from a loaded snapshot, -1 padded
+        self._snapshot_neighbors: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.snapshot_meta: Dict[str, Any] = {}
+
+        # Bumped on every mutation; invalidates the cached CSR export
+        self._version = 0
+        self._csr_cache: Optional[Tuple[int, int, np.ndarray, np.ndarray, np.ndarray]] = None
+
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def ids(self) -> List[str]:
+        """Episode uuid per matrix row (read-only)"""
+        return self._ids
 
     def add_episode(self, uuid: str, embedding: np.ndarray):
-        """Add new episode and compute similarities with existing ones"""
-        self.embeddings[uuid] = embedding
-        self.graph[uuid] = []
+        """Add new episode and link it to its most similar existing episodes"""
+        vector = self._normalize(embedding)
+        with self.lock:
+            self._add_episode(uuid, vector)
+
+    def _add_episode(self, uuid: str, vector: np.ndarray):
+        self._version += 1
+
+        if uuid in self._index:
+            row = self._index[uuid]
+            if np.allclose(self._matrix[row], vector, atol=1e-6):
+                return
+            # Embedding changed: drop stale edges, then re-link
+            self._unlink(uuid)
+            self._matrix[row] = vector
+        else:
+            row = self._append_row(uuid, vector)
 
-        # Compute similarities with all existing episodes
-        for other_uuid, other_embedding in self.embeddings.items():
-            if other_uuid == uuid:
-                continue
+        size = len(self._ids)
+        sims = self._matrix[:size] @ vector
+        sims[row] = -np.inf  # no self-edge
 
-            similarity = self._cosine_similarity(embedding, other_embedding)
+        # Own neighbor list: top-k above threshold, presorted
+        self.graph[uuid] = self._top_k(sims, self.max_neighbors)
+        full = len(self.graph[uuid]) >= self.max_neighbors
+        self._floor[row] = self.graph[uuid][-1][1] if full else -np.inf
 
-            if similarity >= self.similarity_threshold:
-                # Add bidirectional edge
-                self.graph[uuid].append((other_uuid, similarity))
-                self.graph[other_uuid].append((uuid, similarity))
+        # Reverse edges: only rows where the new episode beats their current floor
+        candidates = np.nonzero(sims >= np.maximum(self._floor[:size], self.similarity_threshold))[0]
+        for other_row in candidates:
+            self._insert_neighbor(self._ids[other_row], uuid, float(sims[other_row]))
 
-    def get_related(self, uuid: str, top_k: int = 5) -> List[Tuple[str, float]]:
-        """Get top-K most similar episodes"""
-        if uuid not in self.graph:
-            return []
+    def add_embeddings(self, uuids: Sequence[str], embeddings: np.ndarray):
+        """
+        Bulk-load embeddings without linking (bootstrap path).
 
-        # Sort by similarity descending
-        related = sorted(self.graph[uuid], key=lambda x: x[1], reverse=True)
-        return related[:top_k]
+        Neighbor lists are expected to come from set_neighbors, e.g. with
+        kNN results computed by pgvector.
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(uuids), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        with self.lock:
+            self._version += 1
+            for uuid, vector in zip(uuids, matrix):
+                if uuid in self._index:
+                    self._matrix[self._index[uuid]] = vector
+                else:
+                    self._append_row(uuid, vector)
+
+    def set_neighbors(self, uuid: str, neighbors: Sequence[Tuple[str, float]]):
+        """Replace an episode's neighbor list (unknown ids and self-edges are dropped)"""
+        with self.lock:
+            if uuid not in self._index:
+                return
+            self._version += 1
+            kept = sorted(
+                (
+                    (other, float(similarity)) for other, similarity in neighbors
+                    if other != uuid and other in self._index and similarity >= self.similarity_threshold
+                ),
+                key=lambda edge: -edge[1]
+            )[:self.max_neighbors]
+            self.graph[uuid] = kept
+            full = len(kept) >= self.max_neighbors
+            self._floor[self._index[uuid]] = kept[-1][1] if full else -np.inf
+
+    def get_related(self, uuid: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """Get top-K most similar episodes (lists are kept presorted)"""
+        with self.lock:
+            return list(self._neighbors(uuid)[:top_k])
 
     def get_similarity(self, uuid1: str, uuid2: str) -> float:
         """Get similarity between two episodes"""
-        if uuid1 not in self.embeddings or uuid2 not in self.embeddings:
-            return 0.0
+        with self.lock:
+            if uuid1 not in self._index or uuid2 not in self._index:
+                return 0.0
+
+            return float(self._matrix[self._index[uuid1]] @ self._matrix[self._index[uuid2]])
+
+    def most_similar(self, embedding: np.ndarray, top_k: int = 5) -> List[Tuple[str, float]]:
+        """Top-K stored episodes for an arbitrary query embedding"""
+        vector = self._normalize(embedding)
+        with self.lock:
+            if not self._ids:
+                return []
+            sims = self._matrix[:len(self._ids)] @ vector
+            return self._top_k(sims, top_k)
+
+    def to_csr(self, top_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Top-k adjacency as CSR arrays (indptr, indices, data) over matrix rows.
+
+        Row i holds the best top_k neighbors of ids[i], sorted by similarity.
+        """
+        with self.lock:
+            return self._to_csr(min(top_k or self.max_neighbors, self.max_neighbors))
+
+    def _to_csr(self, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        cached = self._csr_cache
+        if cached is not None and cached[0] == self._version and cached[1] == k:
+            return cached[2], cached[3], cached[4]
+
+        size = len(self._ids)
+        rows = np.full((size, k), -1, dtype=np.int32)
+        sims = np.zeros((size, k), dtype=np.float32)
+        if self._snapshot_neighbors is not None:
+            snapshot_rows, snapshot_sims = self._snapshot_neighbors
+            n, width = min(size, snapshot_rows.shape[0]), min(k, snapshot_rows.shape[1])
+            rows[:n, :width] = snapshot_rows[:n, :width]
+            sims[:n, :width] = snapshot_sims[:n, :width]
+
+        # Materialized lists override the snapshot rows
+        for uuid, neighbors in self.graph.items():
+            row = self._index[uuid]
+            top = neighbors[:k]
+            rows[row] = -1
+            rows[row, :len(top)] = [self._index[other] for other, _ in top]
+            sims[row, :len(top)] = [similarity for _, similarity in top]
+
+        valid = rows >= 0
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(valid.sum(axis=1), out=indptr[1:])
+        indices, data = rows[valid], sims[valid]
+
+        self._csr_cache = (self._version, k, indptr, indices, data)
+        return indptr, indices, data
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def save_snapshot(self, path: str, headroom: int = 1024, meta: Optional[Dict[str, Any]] = None):
+        """
+        Write the graph to a snapshot directory.
+
+        The matrix is written with `headroom` spare zero rows so a worker
+        that loaded the snapshot can append new episodes in place (only the
+        touched pages become private) instead of copying the whole matrix.
 
-        return self._cosine_similarity(
-            self.embeddings[uuid1],
-            self.embeddings[uuid2]
+        The arrays are copied under the lock; files are written after it
+        is released.
+        """
+        os.makedirs(path, exist_ok=True)
+        with self.lock:
+            size = len(self._ids)
+            dim = self._matrix.shape[1] if self._matrix is not None else 0
+            ids = list(self._ids)
+
+            matrix = np.zeros((size + headroom, dim), dtype=np.float32)
+            floor = np.full(size + headroom, -np.inf, dtype=np.float32)
+            neighbor_rows = np.full((size, self.max_neighbors), -1, dtype=np.int32)
+            neighbor_sims = np.zeros((size, self.max_neighbors), dtype=np.float32)
+            if size:
+                matrix[:size] = self._matrix[:size]
+                floor[:size] = self._floor[:size]
+                for row, uuid in enumerate(ids):
+                    neighbors = self._neighbors(uuid)
+                    neighbor_rows[row, :len(neighbors)] = [self._index[other] for other, _ in neighbors]
+                    neighbor_sims[row, :len(neighbors)] = [similarity for _, similarity in neighbors]
+
+        np.save(os.path.join(path, "embeddings.npy"), matrix)
+        np.save(os.path.join(path, "floor.npy"), floor)
+        np.save(os.path.join(path, "neighbor_rows.npy"), neighbor_rows)
+        np.save(os.path.join(path, "neighbor_sims.npy"), neighbor_sims)
+        with open(os.path.join(path, "ids.json"), "w") as f:
+            json.dump(ids, f)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({
+                **(meta or {}),
+                "size": size,
+                "dim": dim,
+                "similarity_threshold": self.similarity_threshold,
+                "max_neighbors": self.max_neighbors,
+            }, f)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "SimilarityGraph":
+        """Memory-map a snapshot written by save_snapshot (copy-on-write)"""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "ids.json")) as f:
+            ids = json.load(f)
+
+        graph = cls(meta["similarity_threshold"], meta["max_neighbors"])
+        graph.snapshot_meta = meta
+        if not ids:
+            return graph
+
+        graph._matrix = np.load(os.path.join(path, "embeddings.npy"), mmap_mode="c")
+        graph._floor = np.load(os.path.join(path, "floor.npy"), mmap_mode="c")
+        graph._capacity = graph._matrix.shape[0]
+        graph._ids = ids
+        graph._index = {uuid: row for row, uuid in enumerate(ids)}
+        graph._snapshot_neighbors = (
+            np.load(os.path.join(path, "neighbor_rows.npy"), mmap_mode="r"),
+            np.load(os.path.join(path, "neighbor_sims.npy"), mmap_mode="r"),
         )
+        return graph
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _neighbors(self, uuid: str) -> List[Tuple[str, float]]:
+        """Neighbor list, materialized from the snapshot arrays on first use"""
+        neighbors = self.graph.get(uuid)
+        if neighbors is not None:
+            return neighbors
+        row = self._index.get(uuid)
+        if row is None:
+            return []
+
+        neighbors = []
+        if self._snapshot_neighbors is not None and row < self._snapshot_neighbors[0].shape[0]:
+            rows, sims = self._snapshot_neighbors
+            neighbors = [
+                (self._ids[other], float(similarity))
+                for other, similarity in zip(rows[row], sims[row]) if other >= 0
+            ]
+        self.graph[uuid] = neighbors
+        return neighbors
+
+    def _normalize(self, embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _append_row(self, uuid: str, vector: np.ndarray) -> int:
+        if self._matrix is None:
+            self._matrix = np.zeros((self._capacity, vector.shape[0]), dtype=np.float32)
+            self._floor = np.full(self._capacity, -np.inf, dtype=np.float32)
+        elif len(self._ids) == self._capacity:
+            # Grow by doubling (amortized O(1) appends)
+            self._capacity *= 2
+            matrix = np.zeros((self._capacity, self._matrix.shape[1]), dtype=np.float32)
+            matrix[:len(self._ids)] = self._matrix[:len(self._ids)]
+            floor = np.full(self._capacity, -np.inf, dtype=np.float32)
+            floor[:len(self._ids)] = self._floor[:len(self._ids)]
+            self._matrix, self._floor = matrix, floor
+
+        row = len(self._ids)
+        self._matrix[row] = vector
+        self._floor[row] = -np.inf
+        self._ids.append(uuid)
+        self._index[uuid] = row
+        return row
+
+    def _top_k(self, sims: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Rows with sim >= threshold, best k, sorted descending"""
+        above = np.nonzero(sims >= self.similarity_threshold)[0]
+        if above.size > k:
+            above = above[np.argpartition(sims[above], -k)[-k:]]
+        ordered = above[np.argsort(-sims[above], kind="stable")]
+        return [(self._ids[i], float(sims[i])) for i in ordered]
+
+    def _insert_neighbor(self, uuid: str, neighbor: str, similarity: float):
+        """Insert into a presorted, capped neighbor list"""
+        neighbors = self._neighbors(uuid)
+        position = len(neighbors)
+        while position > 0 and neighbors[position - 1][1] < similarity:
+            position -= 1
+        neighbors.insert(position, (neighbor, similarity))
+        if len(neighbors) > self.max_neighbors:
+            neighbors.pop()
+        if len(neighbors) >= self.max_neighbors:
+            self._floor[self._index[uuid]] = neighbors[-1][1]
+
+    def _unlink(self, uuid: str):
+        """Remove every edge pointing at uuid (rare: re-embedding)"""
+        self._version += 1
+        for other in self._ids:
+            if other == uuid:
+                continue
+            neighbors = self._neighbors(other)
+            filtered = [edge for edge in neighbors if edge[0] != uuid]
+            if len(filtered) != len(neighbors):
+                self.graph[other] = filtered
+                self._floor[self._index[other]] = -np.inf
 
     @staticmethod
     def _cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
@@ -100,45 +436,59 @@ class ActivationManager:
     """
     Manages activation levels for all episodes with time-based decay.
     Implements spreading activation through the similarity network.
+
+    Decay is lazy: each state stores its level at t0 (last_accessed) and is
+    decayed on read. Expiry uses a min-heap keyed on
+    log2(level) + t0 / half_life, which orders states by when they cross
+    ANY threshold, so cleanup pops only the expired entries instead of
+    recomputing every activation.
+
+    Spreading is multi-source and vectorized over the graph's CSR export:
+    each hop is one sparse (max, x) matrix-vector product over the frontier.
     """
 
+    HOP_DECAY = 0.7             # 70% each hop
+    SPREAD_THRESHOLD = 0.2      # Threshold to continue spreading
+
     def __init__(self, decay_half_life: float = 30.0):
         self.decay_half_life = decay_half_life  # seconds
         self.activations: Dict[str, ActivationState] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
 
     def activate(self, uuid: str, level: float = 1.0, source: Optional[str] = None):
-        """Set activation level for an episode"""
+        """Set activation level for an episode (never lowers the decayed level)"""
         now = time.time()
 
         if uuid in self.activations:
             state = self.activations[uuid]
-            state.activation_level = max(state.activation_level, level)
+            state.activation_level = max(self._decayed(state, now), level)
             state.last_accessed = now
             state.access_count += 1
             if source:
                 state.source_episodes.add(source)
         else:
             sources = {source} if source else set()
-            self.activations[uuid] = ActivationState(
+            state = ActivationState(
                 episode_uuid=uuid,
                 activation_level=level,
                 last_accessed=now,
                 access_count=1,
                 source_episodes=sources
             )
+            self.activations[uuid] = state
+
+        # Older heap entries for uuid become stale and are skipped on pop
+        heapq.heappush(self._expiry_heap, (self._decay_key(state), uuid))
+        if len(self._expiry_heap) > 2 * len(self.activations) + 64:
+            self._expiry_heap = [(self._decay_key(st), key) for key, st in self.activations.items()]
+            heapq.heapify(self._expiry_heap)
 
     def get_activation(self, uuid: str) -> float:
         """Get current activation level with decay applied"""
         if uuid not in self.activations:
             return 0.0
 
-        state = self.activations[uuid]
-        elapsed = time.time() - state.last_accessed
-
-        # Exponential decay: A(t) = A₀ * (0.5)^(t/half_life)
-        decayed = state.activation_level * (0.5 ** (elapsed / self.decay_half_life))
-
-        return decayed
+        return self._decayed(self.activations[uuid], time.time())
 
     def spread_activation(
         self,
@@ -151,87 +501,147 @@ class ActivationManager:
         Spread activation from source episode through similarity network.
         Returns list of (uuid, activation_level) tuples.
         """
-        activated = []
-        visited = {source_uuid}
-
-        # Initialize with direct neighbors
-        queue = [(source_uuid, 1.0, 0)]  # (uuid, activation, hop_count)
+        return self.spread_activation_batch([source_uuid], similarity_graph, top_k, max_hops)
 
-        while queue:
-            current_uuid, current_activation, hops = queue.pop(0)
-
-            if hops >= max_hops:
-                continue
-
-            # Get related episodes
-            related = similarity_graph.get_related(current_uuid, top_k=top_k)
-
-            for related_uuid, similarity in related:
-                if related_uuid in visited:
-                    continue
+    def spread_activation_batch(
+        self,
+        source_uuids: List[str],
+        similarity_graph: SimilarityGraph,
+        top_k: int = 5,
+        max_hops: int = 2
+    ) -> List[Tuple[str, float]]:
+        """
+        Spread activation from many sources at once (each at level 1.0).
 
-                visited.add(related_uuid)
+        A node reached from several parents in the same hop keeps the
+        strongest path. Returns (uuid, activation_level) per activated
+        episode, hop by hop, strongest first within a hop.
+        """
+        return [
+            (uuid, level) for uuid, level, _ in
+            self._spread(source_uuids, similarity_graph, top_k, max_hops)
+        ]
 
-                # Activation diminishes with distance and similarity
-                new_activation = current_activation * similarity * 0.7  # 70% each hop
+    def _spread(
+        self,
+        source_uuids: List[str],
+        similarity_graph: SimilarityGraph,
+        top_k: int,
+        max_hops: int
+    ) -> List[Tuple[str, float, str]]:
+        """spread_activation_batch plus the source each activation came from"""
+        with similarity_graph.lock:
+            # ids is appended to in place; the CSR arrays only cover the rows that exist now
+            ids = list(similarity_graph.ids)
+            source_rows = np.unique(np.array(
+                [similarity_graph._index[uuid] for uuid in source_uuids if uuid in similarity_graph._index],
+                dtype=np.int64
+            ))
+            if source_rows.size == 0:
+                return []
+
+            indptr, indices, data = similarity_graph.to_csr(top_k)
+        visited = np.zeros(len(ids), dtype=bool)
+        visited[source_rows] = True
+
+        frontier_rows = source_rows
+        frontier_levels = np.ones(source_rows.size, dtype=np.float32)
+        frontier_seeds = source_rows
+        activated = []
 
-                if new_activation >= 0.2:  # Threshold to continue spreading
-                    self.activate(related_uuid, new_activation, source=current_uuid)
-                    activated.append((related_uuid, new_activation))
-                    queue.append((related_uuid, new_activation, hops + 1))
+        for _ in range(max_hops):
+            starts = indptr[frontier_rows]
+            counts = indptr[frontier_rows + 1] - starts
+            total = int(counts.sum())
+            if total == 0:
+                break
+
+            # Gather every outgoing edge of the frontier (CSR row slices)
+            edge_offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+            targets = indices[edge_offsets]
+            levels = np.repeat(frontier_levels, counts) * data[edge_offsets] * self.HOP_DECAY
+            parents = np.repeat(frontier_rows, counts)
+            seeds = np.repeat(frontier_seeds, counts)
+
+            keep = ~visited[targets] & (levels >= self.SPREAD_THRESHOLD)
+            if not keep.any():
+                break
+
+            # Max over parents per target: sort by (target, -level), keep first
+            order = np.lexsort((-levels[keep], targets[keep]))
+            targets, levels = targets[keep][order], levels[keep][order]
+            parents, seeds = parents[keep][order], seeds[keep][order]
+            first = np.ones(targets.size, dtype=bool)
+            first[1:] = targets[1:] != targets[:-1]
+            targets, levels, parents, seeds = targets[first], levels[first], parents[first], seeds[first]
+
+            strongest = np.argsort(-levels, kind="stable")
+            for i in strongest:
+                self.activate(ids[targets[i]], float(levels[i]), source=ids[parents[i]])
+                activated.append((ids[targets[i]], float(levels[i]), ids[seeds[i]]))
+
+            visited[targets] = True
+            frontier_rows, frontier_levels, frontier_seeds = targets, levels, seeds
 
         return activated
 
     def cleanup(self, threshold: float = 0.1):
         """Remove episodes with activation below threshold"""
-        to_remove = [
-            uuid for uuid, state in self.activations.items()
-            if self.get_activation(uuid) < threshold
-        ]
-
-        for uuid in to_remove:
-            del self.activations[uuid]
+        if threshold <= 0:
+            return 0
+
+        # Decayed level < threshold  <=>  key < log2(threshold) + now / half_life
+        cutoff = math.log2(threshold) + time.time() / self.decay_half_life
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] < cutoff:
+            key, uuid = heapq.heappop(self._expiry_heap)
+            state = self.activations.get(uuid)
+            if state is not None and self._decay_key(state) == key:
+                del self.activations[uuid]
+                removed += 1
+
+        return removed
+
+    def _decayed(self, state: ActivationState, now: float) -> float:
+        # Exponential decay: A(t) = A₀ * (0.5)^(t/half_life)
+        elapsed = now - state.last_accessed
+        return state.activation_level * (0.5 ** (elapsed / self.decay_half_life))
 
-        return len(to_remove)
+    def _decay_key(self, state: ActivationState) -> float:
+        if state.activation_level <= 0:
+            return -math.inf
+        return math.log2(state.activation_level) + state.last_accessed / self.decay_half_life
 
 
 class PrimingCache:
     """
-    Fast in-memory cache for primed episodes.
-    Uses LRU eviction policy when cache is full.
+    Fast cache for primed episodes.
+
+    Storage is a pluggable backend (cache_backends): in-process by default,
+    Redis or local+Redis when several workers must share primed episodes.
+    When full, the entry with the lowest activation x recency is evicted.
     """
 
-    def __init__(self, max_size: int = 50):
+    def __init__(self, max_size: int = 50, backend: Optional[CacheBackend] = None):
         self.max_size = max_size
-        self.cache: OrderedDict[str, PrimedEpisode] = OrderedDict()
-        self.hits = 0
-        self.misses = 0
+        self.backend = backend if backend is not None else LocalCache(max_size)
 
-    def add(self, primed_episode: PrimedEpisode):
-        """Add episode to cache, evicting LRU if needed"""
-        if primed_episode.uuid in self.cache:
-            # Move to end (most recently used)
-            self.cache.move_to_end(primed_episode.uuid)
-            # Update activation
-            self.cache[primed_episode.uuid].activation = primed_episode.activation
-        else:
-            # Add new entry
-            if len(self.cache) >= self.max_size:
-                # Evict LRU
-                self.cache.popitem(last=False)
+    @property
+    def hits(self) -> int:
+        return self.backend.hits
 
-            self.cache[primed_episode.uuid] = primed_episode
+    @property
+    def misses(self) -> int:
+        return self.backend.misses
+
+    def add(self, primed_episode: PrimedEpisode):
+        """Add (or refresh) an episode; activation is its eviction weight"""
+        self.backend.set(primed_episode.uuid, primed_episode.to_cache_value(), primed_episode.activation)
 
     def get(self, uuid: str) -> Optional[PrimedEpisode]:
         """Retrieve episode from cache"""
-        if uuid in self.cache:
-            self.hits += 1
-            # Move to end (most recently used)
-            self.cache.move_to_end(uuid)
-            return self.cache[uuid]
-        else:
-            self.misses += 1
-            return None
+        entry = self.backend.get(uuid)
+        return PrimedEpisode.from_cache_value(entry.value) if entry is not None else None
 
     def get_hit_rate(self) -> float:
         """Calculate cache hit rate"""
@@ -242,17 +652,16 @@ class PrimingCache:
 
     def clear(self):
         """Clear all cache entries"""
-        self.cache.clear()
+        self.backend.clear()
 
     def get_stats(self) -> Dict:
-        """Get cache statistics"""
+        """Get cache statistics (per-tier for layered backends)"""
+        weights = self.backend.weights()
         return {
-            "size": len(self.cache),
+            **self.backend.get_stats(),
             "max_size": self.max_size,
-            "hits": self.hits,
-            "misses": self.misses,
             "hit_rate": self.get_hit_rate(),
-            "avg_activation": np.mean([e.activation for e in self.cache.values()]) if self.cache else 0.0
+            "avg_activation": float(np.mean(weights)) if weights else 0.0
         }
 
 
@@ -260,6 +669,10 @@ class SpreadingActivationEngine:
     """
     Main LAB_005 engine integrating all components.
     Coordinates similarity graph, activation spreading, and priming cache.
+
+    Priming writes to the cache backend, which may be Redis, so async
+    handlers call the engine through asyncio.to_thread. `lock` serializes
+    those calls over the activation state.
     """
 
     def __init__(
@@ -268,11 +681,12 @@ class SpreadingActivationEngine:
         decay_half_life: float = 30.0,
         cache_size: int = 50,
         top_k_related: int = 5,
-        max_hops: int = 2
+        max_hops: int = 2,
+        cache_backend: Optional[CacheBackend] = None
     ):
         self.similarity_graph = SimilarityGraph(similarity_threshold)
         self.activation_manager = ActivationManager(decay_half_life)
-        self.priming_cache = PrimingCache(cache_size)
+        self.priming_cache = PrimingCache(cache_size, cache_backend)
 
         self.top_k_related = top_k_related
         self.max_hops = max_hops
@@ -282,6 +696,8 @@ class SpreadingActivationEngine:
         self.primed_accesses = 0
         self.avg_retrieval_time = 0.0
 
+        self.lock = threading.RLock()
+
     def add_episode(self, uuid: str, content: str, embedding: np.ndarray):
         """Add new episode to the system"""
         self.similarity_graph.add_episode(uuid, embedding)
@@ -292,56 +708,88 @@ class SpreadingActivationEngine:
         Returns primed episodes that should be loaded.
         """
         start_time = time.time()
+        with self.lock:
+            primed_uuids, activation_count = self._prime([uuid])
+
+            # Update statistics
+            self.total_accesses += 1
+            elapsed = (time.time() - start_time) * 1000  # ms
+            self.avg_retrieval_time = (
+                (self.avg_retrieval_time * (self.total_accesses - 1) + elapsed) /
+                self.total_accesses
+            )
+
+        return {
+            "uuid": uuid,
+            "primed_episodes": primed_uuids,
+            "activation_count": activation_count,
+            "processing_time_ms": elapsed,
+        }
+
+    def prime_batch(self, uuids: List[str]) -> Dict:
+        """
+        Prime many seeds in one spread (e.g. the whole working-memory set).
+        Seeds that are not in the similarity graph are skipped.
+        """
+        start_time = time.time()
+        seeds = [uuid for uuid in dict.fromkeys(uuids) if uuid in self.similarity_graph.embeddings]
+        with self.lock:
+            primed_uuids, activation_count = self._prime(seeds) if seeds else ([], 0)
 
-        # Activate the accessed episode
-        self.activation_manager.activate(uuid, level=1.0)
+        return {
+            "seeds": seeds,
+            "primed_episodes": primed_uuids,
+            "activation_count": activation_count,
+            "processing_time_ms": (time.time() - start_time) * 1000,
+        }
+
+    def _prime(self, seeds: List[str]) -> Tuple[List[str], int]:
+        """Activate seeds, spread, and load activated episodes into the cache"""
+        for seed in seeds:
+            self.activation_manager.activate(seed, level=1.0)
 
         # Spread activation through network
-        activated = self.activation_manager.spread_activation(
-            source_uuid=uuid,
-            similarity_graph=self.similarity_graph,
+        graph = self.similarity_graph
+        activated = self.activation_manager._spread(
+            seeds,
+            graph,
             top_k=self.top_k_related,
             max_hops=self.max_hops
         )
 
+        # Copy the rows out under the lock; the sync thread may re-embed them
+        with graph.lock:
+            embeddings = {
+                activated_uuid: np.array(graph.embeddings[activated_uuid])
+                for activated_uuid, _, _ in activated if activated_uuid in graph.embeddings
+            }
+
         # Load activated episodes into priming cache
         primed_uuids = []
-        for activated_uuid, activation_level in activated:
+        for activated_uuid, activation_level, seed in activated:
             # Check if we have the episode data (in real system, fetch from DB)
-            if activated_uuid in self.similarity_graph.embeddings:
+            if activated_uuid in embeddings:
                 primed_episode = PrimedEpisode(
                     uuid=activated_uuid,
                     content=f"[Content for {activated_uuid}]",  # Placeholder
-                    embedding=self.similarity_graph.embeddings[activated_uuid],
+                    embedding=embeddings[activated_uuid],
                     activation=activation_level,
                     primed_at=time.time(),
-                    source_uuid=uuid
+                    source_uuid=seed
                 )
 
                 self.priming_cache.add(primed_episode)
                 primed_uuids.append(activated_uuid)
 
-        # Update statistics
-        self.total_accesses += 1
-        elapsed = (time.time() - start_time) * 1000  # ms
-        self.avg_retrieval_time = (
-            (self.avg_retrieval_time * (self.total_accesses - 1) + elapsed) /
-            self.total_accesses
-        )
-
-        return {
-            "uuid": uuid,
-            "primed_episodes": primed_uuids,
-            "activation_count": len(activated),
-            "processing_time_ms": elapsed,
-        }
+        return primed_uuids, len(activated)
 
     def try_primed_access(self, uuid: str) -> Optional[PrimedEpisode]:
         """Try to retrieve episode from priming cache"""
         result = self.priming_cache.get(uuid)
 
         if result:
-            self.primed_accesses += 1
+            with self.lock:
+                self.primed_accesses += 1
 
         return result
 
@@ -357,12 +805,13 @@ class SpreadingActivationEngine:
             "avg_retrieval_time_ms": self.avg_retrieval_time,
             "cache_stats": self.priming_cache.get_stats(),
             "active_episodes": len(self.activation_manager.activations),
-            "similarity_graph_size": len(self.similarity_graph.graph),
+            "similarity_graph_size": len(self.similarity_graph),
         }
 
     def cleanup(self):
         """Perform maintenance: decay cleanup"""
-        removed = self.activation_manager.cleanup(threshold=0.1)
+        with self.lock:
+            removed = self.activation_manager.cleanup(threshold=0.1)
         return {"removed_activations": removed}
 
 
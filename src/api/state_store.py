@@ -0,0 +1,559 @@
+"""
+Shared State Store for cognitive LAB singletons
+
+main.py and labs_advanced_endpoints.py keep process-global LAB systems
+(dopamine, serotonin, working memory, metacognition, ...). With several
+uvicorn workers each worker mutates its own copy and the brain state
+diverges. The registry here makes those globals coherent:
+
+    dopamine_system = state_registry.register("dopamine", DopamineSystem(...))
+
+returns a proxy. Endpoints keep calling dopamine_system.process_event(...)
+unchanged.
+
+State that is naturally partitioned (one working-memory buffer per
+session) is registered as a keyed family instead, so every key is its
+own versioned blob and requests on different keys never conflict:
+
+    sessions = state_registry.register_keyed("wm_session", WorkingMemoryBuffer, ttl_seconds=86400)
+    sessions.get(session_id).add(...)
+
+Family members are not kept in the per-process payload cache, and with
+ttl_seconds their Redis keys expire after the last write.
+
+Backends:
+- InProcessStateStore (default, NEXUS_STATE_BACKEND=memory): single-worker
+  mode. Proxies call the registered object directly, zero overhead.
+- RedisStateStore (NEXUS_STATE_BACKEND=redis): every system is a versioned
+  hash (pickled __dict__ + version). Reads and compare-and-set writes are
+  Lua scripts, so a request's writes land atomically or not at all.
+
+Per request (async_request_scope, opened by middleware in main.py):
+- each system touched is loaded once, into a request-private instance
+  (the script only ships the payload when the version changed)
+- method calls are recorded
+- at the end, every system whose state changed is written in ONE CAS
+  script. On a version conflict the conflicting systems are reloaded and
+  the recorded calls replayed on the fresh state (bounded retries).
+
+Loads happen on first use inside the (synchronous) LAB calls, one script
+round trip each. The closing write re-pickles every touched system and
+may reload and replay on conflicts, so async_request_scope runs it in a
+worker thread instead of on the event loop.
+
+"Changed" compares the instance against its own re-pickle taken right
+after loading, not against the stored bytes: a set unpickled by a worker
+with another PYTHONHASHSEED pickles in a different order, so comparing
+with the payload would turn read-only requests into writes.
+
+A replay only re-applies the recorded calls to the stored state. The
+response was already built from the first run and is not recomputed, so
+a request that lost a conflict may return values computed on the state
+it first loaded.
+
+Store errors (Redis down mid-request, script failures) never fail the
+request: they are counted in store_errors, a system that cannot be
+loaded is served from this worker's local object, and changes that
+cannot be written are kept in that local object instead.
+
+Outside a request scope (background tasks) each method call is its own
+load -> call -> CAS transaction.
+
+Payloads are pickles of LAB state read back only by this API; Redis is an
+internal service with the same trust level as the API process.
+
+Date: October 2025
+"""
+
+import os
+import copy
+import asyncio
+import pickle
+import threading
+import contextvars
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+STATE_BACKEND = os.getenv("NEXUS_STATE_BACKEND", "memory")  # memory | redis
+MAX_CAS_RETRIES = 3
+
+# Hash tag keeps every system in one cluster slot (multi-key scripts)
+KEY_PREFIX = "nexus:state:{brain}:"
+
+
+# ============================================================================
+# Stores
+# ============================================================================
+
+class StateStore:
+    """
+    Versioned blobs with batched load and all-or-nothing compare-and-set.
+
+    Version 0 means "never written".
+    """
+
+    shared = False
+
+    def available(self) -> bool:
+        return True
+
+    def load(self, names: List[str], known: Dict[str, int]) -> Dict[str, Tuple[int, Optional[bytes]]]:
+        """
+        Returns:
+            name -> (version, payload); payload is None when the version
+            equals known[name] (caller's copy is current) or nothing is stored
+        """
+        raise NotImplementedError
+
+    def compare_and_set(
+        self,
+        updates: Dict[str, Tuple[int, bytes]],
+        ttls: Optional[Dict[str, int]] = None
+    ) -> Optional[Dict[str, int]]:
+        """
+        Write every payload iff every stored version equals the expected one.
+
+        ttls: name -> seconds until the written key expires (stores without
+        expiry ignore it)
+
+        Returns:
+            name -> new version, or None on conflict (nothing written)
+        """
+        raise NotImplementedError
+
+
+class InProcessStateStore(StateStore):
+    """
+    Dict-backed store.
+
+    shared=False (default): registries bypass it and use the live objects.
+    shared=True: registries in the same process behave like separate
+    workers on a shared store (used by tests and tooling).
+    """
+
+    def __init__(self, shared: bool = False):
+        self.shared = shared
+        self._data: Dict[str, Tuple[int, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, names, known):
+        with self._lock:
+            result = {}
+            for name in names:
+                version, payload = self._data.get(name, (0, None))
+                result[name] = (version, None if version == known.get(name) else payload)
+            return result
+
+    def compare_and_set(self, updates, ttls=None):
+        with self._lock:
+            if any(self._data.get(name, (0, None))[0] != expected for name, (expected, _) in updates.items()):
+                return None
+            new_versions = {}
+            for name, (expected, payload) in updates.items():
+                self._data[name] = (expected + 1, payload)
+                new_versions[name] = expected + 1
+            return new_versions
+
+
+LOAD_SCRIPT = """
+local out = {}
+for i, key in ipairs(KEYS) do
+    local version = redis.call('HGET', key, 'v')
+    if not version then
+        out[#out + 1] = '0'
+        out[#out + 1] = ''
+    elseif version == ARGV[i] then
+        out[#out + 1] = version
+        out[#out + 1] = ''
+    else
+        out[#out + 1] = version
+        out[#out + 1] = redis.call('HGET', key, 'p')
+    end
+end
+return out
+"""
+
+CAS_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    local version = redis.call('HGET', key, 'v') or '0'
+    if version ~= ARGV[3 * i - 2] then
+        return {0, i}
+    end
+end
+local out = {1}
+for i, key in ipairs(KEYS) do
+    redis.call('HSET', key, 'p', ARGV[3 * i - 1])
+    out[#out + 1] = redis.call('HINCRBY', key, 'v', 1)
+    local ttl = tonumber(ARGV[3 * i])
+    if ttl > 0 then
+        redis.call('EXPIRE', key, ttl)
+    end
+end
+return out
+"""
+
+
+class RedisStateStore(StateStore):
+    """
+    Redis hashes {v: version, p: payload} under nexus:state:{brain}:<name>.
+
+    get_client returns a redis.Redis with decode_responses=False (or None
+    while Redis is unavailable, in which case the registry falls back to
+    the in-process objects).
+    """
+
+    shared = True
+
+    def __init__(self, get_client: Callable[[], Any]):
+        self.get_client = get_client
+        self._scripts: Dict[int, Tuple[Any, Any]] = {}
+
+    def available(self) -> bool:
+        return self.get_client() is not None
+
+    def _registered(self, client):
+        scripts = self._scripts.get(id(client))
+        if scripts is None:
+            scripts = (client.register_script(LOAD_SCRIPT), client.register_script(CAS_SCRIPT))
+            self._scripts[id(client)] = scripts
+        return scripts
+
+    def load(self, names, known):
+        client = self.get_client()
+        load_script, _ = self._registered(client)
+        reply = load_script(
+            keys=[KEY_PREFIX + name for name in names],
+            args=[str(known.get(name, -1)) for name in names]
+        )
+        result = {}
+        for i, name in enumerate(names):
+            version, payload = int(reply[2 * i]), reply[2 * i + 1]
+            result[name] = (version, payload or None)
+        return result
+
+    def compare_and_set(self, updates, ttls=None):
+        client = self.get_client()
+        _, cas_script = self._registered(client)
+        names = list(updates)
+        args = []
+        for name in names:
+            expected, payload = updates[name]
+            args.extend([str(expected), payload, str((ttls or {}).get(name, 0))])
+        reply = cas_script(keys=[KEY_PREFIX + name for name in names], args=args)
+        if int(reply[0]) == 0:
+            return None
+        return {name: int(version) for name, version in zip(names, reply[1:])}
+
+
+def make_state_store(kind: str = STATE_BACKEND, get_redis_client: Optional[Callable[[], Any]] = None) -> StateStore:
+    if kind == "redis" and get_redis_client is not None:
+        return RedisStateStore(get_redis_client)
+    return InProcessStateStore()
+
+
+# ============================================================================
+# Registry + proxies
+# ============================================================================
+
+@dataclass
+class _RequestScope:
+    instances: Dict[str, Any] = field(default_factory=dict)
+    loaded: Dict[str, Tuple[int, bytes]] = field(default_factory=dict)
+    baseline: Dict[str, bytes] = field(default_factory=dict)  # re-pickled right after loading
+    local: set = field(default_factory=set)                   # served from the template (store error)
+    calls: Dict[str, List[Tuple[str, tuple, dict]]] = field(default_factory=dict)
+
+
+class SharedSystem:
+    """Proxy for a registered LAB system (see module docstring)"""
+
+    def __init__(self, registry: "SharedStateRegistry", name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr: str):
+        registry, name = self._registry, self._name
+        if not registry.is_shared():
+            return getattr(registry.template(name), attr)
+
+        scope = registry.current_scope.get()
+        if scope is None:
+            # One-shot transaction per call (background tasks, scripts)
+            if callable(getattr(registry._prototype(name), attr, None)):
+                def transaction(*args, **kwargs):
+                    with registry.request_scope():
+                        return getattr(self, attr)(*args, **kwargs)
+                return transaction
+            with registry.request_scope():
+                return getattr(self, attr)
+
+        value = getattr(registry.instance(scope, name), attr)
+        if not callable(value):
+            return value
+
+        def recorded(*args, **kwargs):
+            scope.calls.setdefault(name, []).append((attr, args, kwargs))
+            return value(*args, **kwargs)
+        return recorded
+
+    def __setattr__(self, attr: str, value):
+        raise AttributeError(f"Shared LAB state '{self._name}' can only be changed through its methods")
+
+
+class SharedSystemFamily:
+    """One shared system per key (see register_keyed)"""
+
+    def __init__(self, registry: "SharedStateRegistry", name: str):
+        self._registry = registry
+        self._name = name
+
+    def get(self, key: str) -> SharedSystem:
+        """Proxy for the member stored under key"""
+        return SharedSystem(self._registry, f"{self._name}:{key}")
+
+    def active(self) -> bool:
+        """Whether members are currently shared (False: callers use their own local state)"""
+        return self._registry.is_shared()
+
+
+class SharedStateRegistry:
+    """Registered LAB systems + the store that keeps them coherent across workers"""
+
+    def __init__(self, store: Optional[StateStore] = None):
+        self.store = store if store is not None else InProcessStateStore()
+        self.templates: Dict[str, Any] = {}
+        self.factories: Dict[str, Callable[[], Any]] = {}  # built into templates on first use
+        # Keyed families: name -> (member factory, ttl seconds); members are "<name>:<key>"
+        self.families: Dict[str, Tuple[Callable[[], Any], Optional[int]]] = {}
+        self._prototypes: Dict[str, Any] = {}  # one pristine member per family
+        self._build_lock = threading.RLock()
+        self._cache: Dict[str, Tuple[int, bytes]] = {}  # last seen version/payload
+        self.conflicts = 0
+        self.dropped_writes = 0
+        self.store_errors = 0
+        # Per registry, so registries on one store act as independent workers
+        self.current_scope: contextvars.ContextVar[Optional[_RequestScope]] = contextvars.ContextVar(
+            f"nexus_state_scope_{id(self)}", default=None
+        )
+
+    def configure(self, store: StateStore):
+        self.store = store
+        self._cache.clear()
+
+    def register(self, name: str, system: Any = None, factory: Optional[Callable[[], Any]] = None) -> SharedSystem:
+        """
+        Register a LAB system; its current state is the initial shared state
+
+        With factory= the system is built on first use instead (lab_registry.py).
+        """
+        if factory is not None:
+            self.factories[name] = factory
+        else:
+            self.templates[name] = system
+        return SharedSystem(self, name)
+
+    def register_keyed(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        ttl_seconds: Optional[int] = None
+    ) -> SharedSystemFamily:
+        """
+        Register a family of systems with one shared state per key
+
+        Each member starts as a fresh factory() and is loaded, written and
+        conflict-checked on its own. ttl_seconds expires idle members.
+        """
+        self.families[name] = (factory, ttl_seconds)
+        return SharedSystemFamily(self, name)
+
+    def template(self, name: str) -> Any:
+        """The registered object (built from its factory on first use)"""
+        template = self.templates.get(name)
+        if template is not None:
+            return template
+        with self._build_lock:
+            if name not in self.templates:
+                family = self._family(name)
+                if family is not None:
+                    # Family members only get a local object when served locally
+                    self.templates[name] = family[0]()
+                else:
+                    self.templates[name] = self.factories[name]()
+                    del self.factories[name]
+            return self.templates[name]
+
+    def is_constructed(self, name: str) -> bool:
+        return name in self.templates
+
+    def is_shared(self) -> bool:
+        return self.store.shared and self.store.available()
+
+    @contextmanager
+    def request_scope(self, prefetch: Optional[List[str]] = None):
+        """Load each touched system once; write all changes in one CAS on exit"""
+        if not self.is_shared() or self.current_scope.get() is not None:
+            yield
+            return
+
+        scope = _RequestScope()
+        token = self.current_scope.set(scope)
+        try:
+            if prefetch:
+                self._load_or_fall_back(scope, prefetch)
+            yield scope
+            self._close(scope)
+        finally:
+            self.current_scope.reset(token)
+
+    @asynccontextmanager
+    async def async_request_scope(self, prefetch: Optional[List[str]] = None):
+        """request_scope for async callers: the closing CAS runs in a worker thread"""
+        if not self.is_shared() or self.current_scope.get() is not None:
+            yield
+            return
+
+        scope = _RequestScope()
+        token = self.current_scope.set(scope)
+        try:
+            if prefetch:
+                self._load_or_fall_back(scope, prefetch)
+            yield scope
+            await asyncio.to_thread(self._close, scope)
+        finally:
+            self.current_scope.reset(token)
+
+    def instance(self, scope: _RequestScope, name: str) -> Any:
+        if name not in scope.instances:
+            self._load_or_fall_back(scope, [name])
+        return scope.instances[name]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.store).__name__,
+            "shared": self.is_shared(),
+            "systems": sorted(name for name in [*self.templates, *self.factories] if self._family(name) is None),
+            "families": sorted(self.families),
+            "conflicts": self.conflicts,
+            "dropped_writes": self.dropped_writes,
+            "store_errors": self.store_errors,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _load_or_fall_back(self, scope: _RequestScope, names: List[str]):
+        try:
+            self._load_into(scope, names)
+        except Exception as e:
+            self._store_error("load", e)
+            for name in names:
+                if name not in scope.instances:
+                    scope.instances[name] = self.template(name)
+                    scope.local.add(name)
+
+    def _close(self, scope: _RequestScope):
+        """Write the scope's changes; on a store error keep them locally"""
+        try:
+            self._flush(scope)
+        except Exception as e:
+            self._store_error("write", e)
+            self._keep_locally(scope)
+
+    def _store_error(self, operation: str, error: Exception):
+        self.store_errors += 1
+        print(f"⚠ Shared state {operation} failed, using local state: {error}")
+
+    def _keep_locally(self, scope: _RequestScope):
+        """Unwritten changes go to this worker's local objects"""
+        for name, instance in scope.instances.items():
+            if name not in scope.local and self._changed(scope, name, instance):
+                self.template(name).__dict__ = instance.__dict__
+
+    def _changed(self, scope: _RequestScope, name: str, instance: Any) -> Optional[bytes]:
+        """New payload if the instance differs from how it was loaded, else None"""
+        payload = pickle.dumps(instance.__dict__)
+        return payload if payload != scope.baseline[name] else None
+
+    def _family(self, name: str) -> Optional[Tuple[Callable[[], Any], Optional[int]]]:
+        family, separator, _ = name.partition(":")
+        return self.families.get(family) if separator else None
+
+    def _prototype(self, name: str) -> Any:
+        """Initial state and shell for instances: the template, or a pristine family member"""
+        family = self._family(name)
+        if family is None:
+            return self.template(name)
+        family_name = name.partition(":")[0]
+        with self._build_lock:
+            if family_name not in self._prototypes:
+                self._prototypes[family_name] = family[0]()
+            return self._prototypes[family_name]
+
+    def _load_into(self, scope: _RequestScope, names: List[str]):
+        names = [name for name in names if name not in scope.instances]
+        if not names:
+            return
+        known = {name: self._cache[name][0] for name in names if name in self._cache}
+        for name, (version, payload) in self.store.load(names, known).items():
+            if payload is None:
+                if version and self._cache.get(name, (None,))[0] == version:
+                    payload = self._cache[name][1]
+                else:
+                    # Never written (or expired): start from the registered object's state
+                    version, payload = 0, pickle.dumps(self._prototype(name).__dict__)
+            # Families can have a key per session: their payloads are not cached
+            if self._family(name) is None:
+                self._cache[name] = (version, payload)
+            scope.loaded[name] = (version, payload)
+            scope.instances[name] = self._materialize(name, payload)
+            scope.baseline[name] = pickle.dumps(scope.instances[name].__dict__)
+
+    def _materialize(self, name: str, payload: bytes) -> Any:
+        instance = copy.copy(self._prototype(name))
+        instance.__dict__ = pickle.loads(payload)
+        return instance
+
+    def _flush(self, scope: _RequestScope):
+        for _ in range(MAX_CAS_RETRIES):
+            updates = {}
+            for name, instance in scope.instances.items():
+                if name in scope.local:
+                    continue
+                payload = self._changed(scope, name, instance)
+                if payload is not None:
+                    updates[name] = (scope.loaded[name][0], payload)
+            if not updates:
+                return
+
+            ttls = {}
+            for name in updates:
+                family = self._family(name)
+                if family is not None and family[1]:
+                    ttls[name] = family[1]
+            new_versions = self.store.compare_and_set(updates, ttls)
+            if new_versions is not None:
+                for name, version in new_versions.items():
+                    if self._family(name) is None:
+                        self._cache[name] = (version, updates[name][1])
+                return
+
+            # Another worker wrote first: replay this request's calls on fresh state
+            self.conflicts += 1
+            for name in updates:
+                del scope.instances[name]
+                self._cache.pop(name, None)
+            self._load_into(scope, list(updates))
+            for name in updates:
+                for attr, args, kwargs in scope.calls.get(name, []):
+                    getattr(scope.instances[name], attr)(*args, **kwargs)
+
+        self.dropped_writes += 1
+        print(f"⚠ Shared state write dropped after {MAX_CAS_RETRIES} conflicts")
+
+
+# Process-wide registry (configured by main.py)
+state_registry = SharedStateRegistry()
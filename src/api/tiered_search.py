@@ -0,0 +1,196 @@
+"""
+Tiered Search Planner for NEXUS Episodic Memory
+
+Episodic memory is range-partitioned by created_at (monthly). Recent
+partitions (HOT tier) carry an HNSW index; older ones (COLD tier) do not.
+Recent memories dominate our queries, so the planner:
+
+1. Searches the hot tier first (created_at >= hot cutoff -> partition
+   pruning keeps the scan on the small per-partition HNSW indexes).
+   HNSW applies the WHERE clause after the index scan, so the query
+   raises hnsw.ef_search (transaction-local) above the limit; otherwise
+   the similarity / created_at filters can leave fewer than `limit` rows
+   although enough matches exist
+2. Falls back to the cold tier only when the hot tier returned fewer
+   than `limit` hits above min_similarity. Cold partitions have no
+   vector index (exact scan), so the fallback only reaches back
+   cold_months monthly partitions beyond the hot tier
+3. Merges both tiers by similarity
+
+The hot cutoff is aligned to the start of a month so it matches partition
+boundaries exactly. On an unpartitioned table the same queries are still
+correct (the created_at filter is just a regular predicate).
+
+Schema: database/migrations/episodic_partitioning.sql
+
+Date: October 2025
+"""
+
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+
+# Number of monthly partitions (incl. current month) in the hot tier
+DEFAULT_HOT_MONTHS = int(os.getenv("EPISODIC_HOT_MONTHS", "3"))
+
+# Monthly partitions before the hot tier that the cold fallback may scan
+DEFAULT_COLD_MONTHS = int(os.getenv("EPISODIC_COLD_MONTHS", "12"))
+
+# HNSW candidate list for the hot tier: at least this, and at least
+# HNSW_EF_SEARCH_PER_RESULT x limit (pgvector caps ef_search at 1000)
+HNSW_EF_SEARCH = int(os.getenv("EPISODIC_HNSW_EF_SEARCH", "100"))
+HNSW_EF_SEARCH_PER_RESULT = 4
+HNSW_EF_SEARCH_MAX = 1000
+
+# Transaction-local, so pooled connections keep the server default
+SET_EF_SEARCH_QUERY = "SELECT set_config('hnsw.ef_search', %(ef_search)s, true)"
+
+TIER_QUERY = """
+    SELECT
+        episode_id,
+        content,
+        importance_score,
+        tags,
+        created_at,
+        1 - (embedding <=> %(embedding)s::vector) as similarity_score,
+        salience_score,
+        novelty_score
+    FROM nexus_memory.zep_episodic_memory
+    WHERE embedding IS NOT NULL
+        AND {tier_predicate}
+        AND 1 - (embedding <=> %(embedding)s::vector) >= %(min_similarity)s
+    ORDER BY embedding <=> %(embedding)s::vector
+    LIMIT %(limit)s
+"""
+
+HOT_PREDICATE = "created_at >= %(hot_cutoff)s"
+COLD_PREDICATE = "created_at < %(hot_cutoff)s AND created_at >= %(cold_cutoff)s"
+
+
+@dataclass
+class TieredSearchResult:
+    """
+    Rows plus per-tier counts
+
+    Row shape: (episode_id, content, importance_score, tags, created_at,
+    similarity_score, salience_score, novelty_score). The last two are
+    precomputed by the enrichment worker (NULL until it ran).
+    """
+    rows: List[Tuple] = field(default_factory=list)
+    hot_count: int = 0
+    cold_count: int = 0
+    hot_cutoff: Optional[datetime] = None
+    cold_cutoff: Optional[datetime] = None
+
+    @property
+    def used_cold_tier(self) -> bool:
+        return self.cold_count > 0
+
+
+def hot_cutoff_for(now: datetime, hot_months: int) -> datetime:
+    """
+    First instant of the oldest hot partition
+
+    Args:
+        now: Current time (timezone-aware)
+        hot_months: Number of monthly partitions in the hot tier (>= 1)
+
+    Returns:
+        Start of month (hot_months - 1) months before now
+    """
+    months_back = max(hot_months, 1) - 1
+    month_index = now.year * 12 + (now.month - 1) - months_back
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=now.tzinfo or timezone.utc)
+
+
+class TieredSearchPlanner:
+    """
+    Hot-first vector search over time-partitioned episodic memory
+
+    Usage:
+        planner = TieredSearchPlanner(hot_months=3)
+        with conn.cursor() as cur:
+            result = planner.search(cur, query_embedding, limit=10, min_similarity=0.5)
+        rows = result.rows
+    """
+
+    def __init__(
+        self,
+        hot_months: int = DEFAULT_HOT_MONTHS,
+        cold_months: int = DEFAULT_COLD_MONTHS,
+        ef_search: int = HNSW_EF_SEARCH
+    ):
+        """
+        Initialize planner
+
+        Args:
+            hot_months: Monthly partitions (incl. current) searched first
+            cold_months: Monthly partitions before the hot tier the cold
+                fallback may scan (older episodes are never searched)
+            ef_search: Minimum hnsw.ef_search for the hot tier query
+        """
+        self.hot_months = max(hot_months, 1)
+        self.cold_months = max(cold_months, 0)
+        self.ef_search = ef_search
+
+    def ef_search_for(self, limit: int) -> int:
+        """hnsw.ef_search for a hot tier query returning `limit` rows"""
+        return min(max(self.ef_search, limit * HNSW_EF_SEARCH_PER_RESULT), HNSW_EF_SEARCH_MAX)
+
+    def search(
+        self,
+        cur,
+        query_embedding,
+        limit: int,
+        min_similarity: float,
+        include_cold: bool = True,
+        now: Optional[datetime] = None
+    ) -> TieredSearchResult:
+        """
+        Search hot tier, then cold tier if there are too few hits
+
+        Args:
+            cur: Open psycopg cursor
+            query_embedding: Query vector (list or pgvector literal)
+            limit: Maximum number of results
+            min_similarity: Minimum cosine similarity
+            include_cold: Allow fallback to cold partitions
+            now: Override current time (testing)
+
+        Returns:
+            TieredSearchResult with rows ordered by similarity desc
+        """
+        now = now or datetime.now(timezone.utc)
+        hot_cutoff = hot_cutoff_for(now, self.hot_months)
+        cold_cutoff = hot_cutoff_for(now, self.hot_months + self.cold_months)
+        params = {
+            "embedding": query_embedding,
+            "min_similarity": min_similarity,
+            "hot_cutoff": hot_cutoff,
+            "cold_cutoff": cold_cutoff,
+            "limit": limit
+        }
+
+        cur.execute(SET_EF_SEARCH_QUERY, {"ef_search": str(self.ef_search_for(limit))})
+        cur.execute(TIER_QUERY.format(tier_predicate=HOT_PREDICATE), params)
+        hot_rows = cur.fetchall()
+
+        result = TieredSearchResult(
+            rows=list(hot_rows),
+            hot_count=len(hot_rows),
+            hot_cutoff=hot_cutoff,
+            cold_cutoff=cold_cutoff
+        )
+
+        if not include_cold or self.cold_months == 0 or len(hot_rows) >= limit:
+            return result
+
+        params["limit"] = limit - len(hot_rows)
+        cur.execute(TIER_QUERY.format(tier_predicate=COLD_PREDICATE), params)
+        cold_rows = cur.fetchall()
+
+        result.cold_count = len(cold_rows)
+        result.rows = sorted(hot_rows + cold_rows, key=lambda row: row[5], reverse=True)
+        return result
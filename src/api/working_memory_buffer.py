@@ -7,15 +7,31 @@ Inspired by human working memory (dlPFC): ~7 items, fast access, smart eviction.
 Based on neuroscience: Prefrontal cortex active maintenance, Miller's Law (7±2),
 and AI KV cache mechanisms (2024-2025 research).
 
+Structure:
+- WorkingMemoryBuffer: items by episode_id in least-recently-accessed
+  order, plus a heap of eviction keys. add/get/remove are O(1) or
+  O(log n); eviction never scans the buffer
+- SessionWorkingMemory: one buffer per session/agent (LRU-bounded), so
+  concurrent agents do not evict each other's items. With several workers
+  each session's buffer is its own shared-state key (state_store keyed
+  family), so agents on different sessions never conflict
+- WorkingMemoryStore: optional write-behind of changed sessions to
+  nexus_memory.zep_working_memory
+
 Author: NEXUS (Autonomous)
 Date: October 28, 2025
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from enum import Enum
+import heapq
 import time
+import uuid
+
+from psycopg.types.json import Json
 
 
 # ============================================================================
@@ -47,6 +63,29 @@ class WorkingMemoryItem:
         self.last_accessed = datetime.now()
         self.rehearsal_count += 1
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'episode_id': self.episode_id,
+            'attention_weight': self.attention_weight,
+            'added_at': self.added_at.isoformat(),
+            'last_accessed': self.last_accessed.isoformat(),
+            'access_count': self.access_count,
+            'rehearsal_count': self.rehearsal_count,
+            'tags': self.tags
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkingMemoryItem":
+        return cls(
+            episode_id=data['episode_id'],
+            attention_weight=data['attention_weight'],
+            added_at=datetime.fromisoformat(data['added_at']),
+            last_accessed=datetime.fromisoformat(data['last_accessed']),
+            access_count=data.get('access_count', 0),
+            rehearsal_count=data.get('rehearsal_count', 0),
+            tags=data.get('tags') or []
+        )
+
 
 class EvictionStrategy(Enum):
     """Eviction policy strategies"""
@@ -67,106 +106,75 @@ class EvictionPolicy:
     - LRU: Remove least recently accessed
     - Attention: Remove lowest attention weight
     - Hybrid: Weighted combination of LRU + attention
+
+    Every strategy is a per-item priority (highest is evicted first) that
+    only changes when the item is accessed or rehearsed, so the buffer
+    can keep victims in a heap instead of rescoring everything on add.
     """
 
-    def __init__(self, strategy: EvictionStrategy = EvictionStrategy.HYBRID):
+    def __init__(
+        self,
+        strategy: EvictionStrategy = EvictionStrategy.HYBRID,
+        decay_threshold_seconds: float = 60.0
+    ):
         self.strategy = strategy
+        self.decay_threshold_seconds = decay_threshold_seconds
 
-    def select_victim(
-        self,
-        buffer: List[WorkingMemoryItem],
-        new_item: WorkingMemoryItem
-    ) -> int:
+    def priority(self, item: WorkingMemoryItem) -> float:
         """
-        Select index of item to evict.
+        Eviction priority (highest is evicted first).
 
-        Args:
-            buffer: Current buffer contents
-            new_item: Item trying to enter buffer
+        Hybrid: score = (1 - attention_weight) + age / decay_threshold - rehearsal_bonus
 
-        Returns:
-            Index of item to evict (or -1 if new_item shouldn't enter)
+        Age is normalized by the decay threshold (items older than that
+        decay anyway), so every item's score grows at the same rate and
+        the ordering is fixed between accesses (lazy decay). The priority
+        drops the shared "now" term: score - now / decay_threshold.
         """
-        if not buffer:
-            return -1
-
         if self.strategy == EvictionStrategy.LRU:
-            return self._lru_victim(buffer)
-        elif self.strategy == EvictionStrategy.ATTENTION:
-            return self._attention_victim(buffer, new_item)
-        else:  # HYBRID
-            return self._hybrid_victim(buffer, new_item)
-
-    def _lru_victim(self, buffer: List[WorkingMemoryItem]) -> int:
-        """Least Recently Used - evict oldest last_accessed"""
-        oldest_idx = 0
-        oldest_time = buffer[0].last_accessed
+            return -item.last_accessed.timestamp()
+        if self.strategy == EvictionStrategy.ATTENTION:
+            return -item.attention_weight
 
-        for i, item in enumerate(buffer):
-            if item.last_accessed < oldest_time:
-                oldest_time = item.last_accessed
-                oldest_idx = i
+        # Rehearsed items get bonus (lower score)
+        rehearsal_bonus = 0.2 * min(item.rehearsal_count, 3)  # Max 0.6 bonus
+        return ((1 - item.attention_weight) - rehearsal_bonus
+                - item.last_accessed.timestamp() / self.decay_threshold_seconds)
 
-        return oldest_idx
-
-    def _attention_victim(
-        self,
-        buffer: List[WorkingMemoryItem],
-        new_item: WorkingMemoryItem
-    ) -> int:
+    def admits(self, new_item: WorkingMemoryItem, victim_priority: float) -> bool:
         """
-        Attention-based - evict lowest attention weight.
+        Whether new_item may replace the current victim.
 
-        If new_item has lower attention than all buffered items,
-        don't admit it (return -1).
+        LRU always admits; otherwise a new item that would itself be the
+        next victim (lower attention / higher hybrid score) is rejected.
         """
-        # Find item with minimum attention
-        min_attention = min(item.attention_weight for item in buffer)
-
-        # If new item has lower attention, don't admit it
-        if new_item.attention_weight < min_attention:
-            return -1
-
-        # Otherwise evict item with lowest attention
-        for i, item in enumerate(buffer):
-            if item.attention_weight == min_attention:
-                return i
-
-        return 0  # Fallback
+        if self.strategy == EvictionStrategy.LRU:
+            return True
+        return self.priority(new_item) <= victim_priority
 
-    def _hybrid_victim(
+    def select_victim(
         self,
         buffer: List[WorkingMemoryItem],
         new_item: WorkingMemoryItem
     ) -> int:
         """
-        Hybrid: Score = (1 - attention_weight) + age_normalized
-
-        Evict item with highest score (low attention + old).
-        """
-        # Compute hybrid scores
-        max_age = max(item.age_seconds() for item in buffer)
-
-        scores = []
-        for item in buffer:
-            # Normalize age to 0-1
-            age_normalized = item.age_seconds() / max_age if max_age > 0 else 0
-
-            # Score: low attention + old → high score (bad)
-            # Rehearsed items get bonus (lower score)
-            rehearsal_bonus = 0.2 * min(item.rehearsal_count, 3)  # Max 0.6 bonus
-
-            score = (1 - item.attention_weight) + age_normalized - rehearsal_bonus
-            scores.append(score)
+        Select index of item to evict.
 
-        # Evict highest score (unless new_item would score higher)
-        max_score = max(scores)
-        new_item_score = (1 - new_item.attention_weight)  # No age for new item
+        Args:
+            buffer: Current buffer contents
+            new_item: Item trying to enter buffer
 
-        if new_item_score > max_score:
-            return -1  # Don't admit new item
+        Returns:
+            Index of item to evict (or -1 if new_item shouldn't enter)
+        """
+        if not buffer:
+            return -1
 
-        return scores.index(max_score)
+        priorities = [self.priority(item) for item in buffer]
+        victim = max(range(len(buffer)), key=priorities.__getitem__)
+        if not self.admits(new_item, priorities[victim]):
+            return -1
+        return victim
 
 
 # ============================================================================
@@ -180,7 +188,7 @@ class WorkingMemoryBuffer:
     Inspired by human working memory (dlPFC):
     - Capacity: 7±2 items (Miller's Law)
     - Fast access: O(1) lookup
-    - Smart eviction: Attention-based + LRU
+    - Smart eviction: Attention-based + LRU, O(log n) via a heap
     - Temporal decay: Unused items removed
     """
 
@@ -197,14 +205,22 @@ class WorkingMemoryBuffer:
             decay_threshold_seconds: Auto-remove items older than this
         """
         self.capacity = capacity
-        self.eviction_policy = EvictionPolicy(eviction_strategy)
+        self.eviction_policy = EvictionPolicy(eviction_strategy, decay_threshold_seconds)
         self.decay_threshold_seconds = decay_threshold_seconds
 
-        # Buffer storage
-        self.buffer: List[WorkingMemoryItem] = []
+        # episode_id -> item, least recently accessed first
+        self._items: "OrderedDict[str, WorkingMemoryItem]" = OrderedDict()
+
+        # (-priority, seq, episode_id); an entry is live while _entries[episode_id] == seq,
+        # stale ones are skipped when they reach the top
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, int] = {}
+        self._seq = 0
 
-        # Fast lookup (episode_id -> buffer index)
-        self._index: Dict[str, int] = {}
+    @property
+    def buffer(self) -> List[WorkingMemoryItem]:
+        """Buffered items, least recently accessed first (a copy)"""
+        return list(self._items.values())
 
     def add(
         self,
@@ -226,35 +242,28 @@ class WorkingMemoryBuffer:
             True if added, False if rejected
         """
         # If already in buffer, refresh it
-        if episode_id in self._index:
+        if episode_id in self._items:
             self.refresh(episode_id)
             return True
 
         # Create new item
+        now = datetime.now()
         new_item = WorkingMemoryItem(
             episode_id=episode_id,
             attention_weight=attention_weight,
-            added_at=datetime.now(),
-            last_accessed=datetime.now(),
+            added_at=now,
+            last_accessed=now,
             tags=tags or []
         )
 
-        # If buffer has space, add directly
-        if len(self.buffer) < self.capacity:
-            self.buffer.append(new_item)
-            self._rebuild_index()
-            return True
-
-        # Buffer full - evict victim
-        victim_idx = self.eviction_policy.select_victim(self.buffer, new_item)
+        # Buffer full - evict victim (unless the new item is not worthy of admission)
+        if len(self._items) >= self.capacity:
+            victim_id, victim_priority = self._victim()
+            if not self.eviction_policy.admits(new_item, victim_priority):
+                return False
+            self._discard(victim_id)
 
-        if victim_idx == -1:
-            # New item not worthy of admission
-            return False
-
-        # Evict victim and add new item
-        self.buffer[victim_idx] = new_item
-        self._rebuild_index()
+        self._insert(new_item)
         return True
 
     def get(self, episode_id: str) -> Optional[WorkingMemoryItem]:
@@ -263,12 +272,12 @@ class WorkingMemoryBuffer:
 
         Automatically updates last_accessed (LRU).
         """
-        if episode_id not in self._index:
+        item = self._items.get(episode_id)
+        if item is None:
             return None
 
-        idx = self._index[episode_id]
-        item = self.buffer[idx]
         item.access()  # Update LRU
+        self._touch(item)
 
         return item
 
@@ -279,11 +288,14 @@ class WorkingMemoryBuffer:
         Returns:
             True if item found and refreshed
         """
-        item = self.get(episode_id)
-        if item:
-            item.rehearse()
-            return True
-        return False
+        item = self._items.get(episode_id)
+        if item is None:
+            return False
+
+        item.access()
+        item.rehearse()
+        self._touch(item)
+        return True
 
     def remove(self, episode_id: str) -> bool:
         """
@@ -292,67 +304,106 @@ class WorkingMemoryBuffer:
         Returns:
             True if item found and removed
         """
-        if episode_id not in self._index:
+        if episode_id not in self._items:
             return False
 
-        idx = self._index[episode_id]
-        self.buffer.pop(idx)
-        self._rebuild_index()
+        self._discard(episode_id)
         return True
 
     def decay_step(self) -> List[str]:
         """
         Remove items older than decay threshold.
 
+        Only looks at the least recently accessed end of the buffer, so
+        the cost is proportional to the number of decayed items.
+
         Returns:
             List of evicted episode IDs
         """
         evicted = []
 
-        # Filter out decayed items
-        new_buffer = []
-        for item in self.buffer:
-            if item.age_seconds() > self.decay_threshold_seconds:
-                evicted.append(item.episode_id)
-            else:
-                new_buffer.append(item)
-
-        self.buffer = new_buffer
-        self._rebuild_index()
+        while self._items:
+            item = next(iter(self._items.values()))
+            if item.age_seconds() <= self.decay_threshold_seconds:
+                break
+            self._discard(item.episode_id)
+            evicted.append(item.episode_id)
 
         return evicted
 
     def get_all(self) -> List[WorkingMemoryItem]:
         """Get all buffered items (sorted by attention weight descending)"""
-        return sorted(self.buffer, key=lambda x: x.attention_weight, reverse=True)
+        return sorted(self._items.values(), key=lambda x: x.attention_weight, reverse=True)
 
     def get_episode_ids(self) -> List[str]:
         """Get all buffered episode IDs"""
-        return [item.episode_id for item in self.buffer]
+        return list(self._items)
 
     def size(self) -> int:
         """Current buffer size"""
-        return len(self.buffer)
+        return len(self._items)
 
     def is_full(self) -> bool:
         """Check if buffer is at capacity"""
-        return len(self.buffer) >= self.capacity
+        return len(self._items) >= self.capacity
 
     def clear(self):
         """Clear entire buffer"""
-        self.buffer.clear()
-        self._index.clear()
-
-    def _rebuild_index(self):
-        """Rebuild episode_id -> index mapping"""
-        self._index = {
-            item.episode_id: i
-            for i, item in enumerate(self.buffer)
-        }
+        self._items.clear()
+        self._heap.clear()
+        self._entries.clear()
+
+    def restore(self, items: Iterable[WorkingMemoryItem]):
+        """Load items (e.g. from WorkingMemoryStore), keeping at most capacity"""
+        for item in sorted(items, key=lambda x: x.last_accessed):
+            if item.episode_id in self._items:
+                self._discard(item.episode_id)
+            self._insert(item)
+        while len(self._items) > self.capacity:
+            self._discard(self._victim()[0])
+
+    def _insert(self, item: WorkingMemoryItem):
+        self._items[item.episode_id] = item
+        self._push(item)
+
+    def _discard(self, episode_id: str):
+        del self._items[episode_id]
+        self._entries.pop(episode_id, None)
+
+    def _touch(self, item: WorkingMemoryItem):
+        """Item was accessed: move to the recent end and re-key it"""
+        self._items.move_to_end(item.episode_id)
+        if self.eviction_policy.strategy == EvictionStrategy.HYBRID:
+            self._push(item)
+
+    def _push(self, item: WorkingMemoryItem):
+        if self.eviction_policy.strategy == EvictionStrategy.LRU:
+            return  # the victim is the first item in _items
+
+        self._seq += 1
+        self._entries[item.episode_id] = self._seq
+        heapq.heappush(self._heap, (-self.eviction_policy.priority(item), self._seq, item.episode_id))
+
+        # Drop stale entries once they outnumber live ones
+        if len(self._heap) > 2 * len(self._items) + 16:
+            self._heap = [entry for entry in self._heap if self._entries.get(entry[2]) == entry[1]]
+            heapq.heapify(self._heap)
+
+    def _victim(self) -> Tuple[str, float]:
+        """Next item to evict and its priority (buffer must not be empty)"""
+        if self.eviction_policy.strategy == EvictionStrategy.LRU:
+            item = next(iter(self._items.values()))
+            return item.episode_id, self.eviction_policy.priority(item)
+
+        while True:
+            neg_priority, seq, episode_id = self._heap[0]
+            if self._entries.get(episode_id) == seq:
+                return episode_id, -neg_priority
+            heapq.heappop(self._heap)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get buffer statistics"""
-        if not self.buffer:
+        if not self._items:
             return {
                 'size': 0,
                 'capacity': self.capacity,
@@ -361,17 +412,293 @@ class WorkingMemoryBuffer:
                 'avg_age_seconds': 0.0
             }
 
+        items = self._items.values()
         return {
-            'size': len(self.buffer),
+            'size': len(items),
             'capacity': self.capacity,
-            'utilization': len(self.buffer) / self.capacity,
-            'avg_attention': sum(item.attention_weight for item in self.buffer) / len(self.buffer),
-            'avg_age_seconds': sum(item.age_seconds() for item in self.buffer) / len(self.buffer),
-            'total_accesses': sum(item.access_count for item in self.buffer),
-            'total_rehearsals': sum(item.rehearsal_count for item in self.buffer)
+            'utilization': len(items) / self.capacity,
+            'avg_attention': sum(item.attention_weight for item in items) / len(items),
+            'avg_age_seconds': sum(item.age_seconds() for item in items) / len(items),
+            'total_accesses': sum(item.access_count for item in items),
+            'total_rehearsals': sum(item.rehearsal_count for item in items)
         }
 
 
+# ============================================================================
+# Per-Session Buffers
+# ============================================================================
+
+DEFAULT_SESSION = "default"
+
+
+class SessionWorkingMemory:
+    """
+    One WorkingMemoryBuffer per session/agent.
+
+    - Isolated: an agent's adds only evict items from its own buffer
+    - Bounded: sessions are kept in LRU order; past max_sessions the least
+      recently written session is dropped
+    - Write-behind: changed sessions are marked dirty; take_dirty() hands
+      their snapshots to WorkingMemoryStore.write (main.py flush loop)
+    - Shared: with shared_sessions (a state_store keyed family of
+      WorkingMemoryBuffer) and a shared backend, each session is loaded
+      and written on its own key. The LRU bound and decay_step then only
+      cover the local sessions; shared keys expire by the family's TTL.
+      Dirty tracking stays per worker (each writes behind what it changed).
+
+    Reads (items, ids, stats) never create sessions or change their order.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 7,
+        eviction_strategy: EvictionStrategy = EvictionStrategy.HYBRID,
+        decay_threshold_seconds: float = 60.0,
+        max_sessions: int = 1024,
+        shared_sessions=None
+    ):
+        self.capacity = capacity
+        self.eviction_strategy = eviction_strategy
+        self.decay_threshold_seconds = decay_threshold_seconds
+        self.max_sessions = max_sessions
+        self.shared_sessions = shared_sessions
+
+        # session_id -> buffer, least recently written first
+        self.sessions: "OrderedDict[str, WorkingMemoryBuffer]" = OrderedDict()
+        self.dirty: set = set()
+        self.evicted_sessions = 0
+
+        # Last snapshot of dirty sessions dropped by the LRU bound, not yet written
+        self.pending: Dict[str, List[Dict[str, Any]]] = {}
+
+    def session(self, session_id: Optional[str] = None, create: bool = False) -> Optional[WorkingMemoryBuffer]:
+        """Buffer of a session; create=True also marks it most recently used"""
+        session_id = session_id or DEFAULT_SESSION
+        if self.is_shared():
+            # An empty shared buffer reads exactly like a missing session
+            buffer = self.shared_sessions.get(session_id)
+            return buffer if create or buffer.size() else None
+
+        buffer = self.sessions.get(session_id)
+        if not create:
+            return buffer
+
+        if buffer is None:
+            buffer = self.new_buffer()
+            self.sessions[session_id] = buffer
+            while len(self.sessions) > self.max_sessions:
+                evicted_id, evicted = self.sessions.popitem(last=False)
+                if evicted_id in self.dirty:
+                    self.dirty.discard(evicted_id)
+                    self.pending[evicted_id] = [item.to_dict() for item in evicted.buffer]
+                self.evicted_sessions += 1
+        else:
+            self.sessions.move_to_end(session_id)
+        return buffer
+
+    def is_shared(self) -> bool:
+        return self.shared_sessions is not None and self.shared_sessions.active()
+
+    def new_buffer(self) -> WorkingMemoryBuffer:
+        """Empty buffer with this collection's settings (also the shared family's factory)"""
+        return WorkingMemoryBuffer(self.capacity, self.eviction_strategy, self.decay_threshold_seconds)
+
+    def add(
+        self,
+        episode_id: str,
+        attention_weight: float = 1.0,
+        tags: Optional[List[str]] = None,
+        session_id: Optional[str] = None
+    ) -> bool:
+        """Add an episode to a session's buffer (see WorkingMemoryBuffer.add)"""
+        added = self.session(session_id, create=True).add(episode_id, attention_weight, tags)
+        self.dirty.add(session_id or DEFAULT_SESSION)
+        return added
+
+    def get(self, episode_id: str, session_id: Optional[str] = None) -> Optional[WorkingMemoryItem]:
+        buffer = self.session(session_id)
+        return buffer.get(episode_id) if buffer is not None else None
+
+    def refresh(self, episode_id: str, session_id: Optional[str] = None) -> bool:
+        buffer = self.session(session_id)
+        if buffer is None or not buffer.refresh(episode_id):
+            return False
+        self.dirty.add(session_id or DEFAULT_SESSION)
+        return True
+
+    def remove(self, episode_id: str, session_id: Optional[str] = None) -> bool:
+        buffer = self.session(session_id)
+        if buffer is None or not buffer.remove(episode_id):
+            return False
+        self.dirty.add(session_id or DEFAULT_SESSION)
+        return True
+
+    def get_items(self, session_id: Optional[str] = None) -> List[WorkingMemoryItem]:
+        """Items of a session, least recently accessed first"""
+        buffer = self.session(session_id)
+        return buffer.buffer if buffer is not None else []
+
+    def get_episode_ids(self, session_id: Optional[str] = None) -> List[str]:
+        buffer = self.session(session_id)
+        return buffer.get_episode_ids() if buffer is not None else []
+
+    def size(self, session_id: Optional[str] = None) -> int:
+        buffer = self.session(session_id)
+        return buffer.size() if buffer is not None else 0
+
+    def clear(self, session_id: Optional[str] = None) -> int:
+        """Drop a session's buffer; returns how many items it held"""
+        session_id = session_id or DEFAULT_SESSION
+        self.pending.pop(session_id, None)
+        self.dirty.add(session_id)
+        if self.is_shared():
+            buffer = self.shared_sessions.get(session_id)
+            cleared = buffer.size()
+            if cleared:
+                buffer.clear()
+            return cleared
+        buffer = self.sessions.pop(session_id, None)
+        return buffer.size() if buffer is not None else 0
+
+    def decay_step(self) -> Dict[str, List[str]]:
+        """Decay every local session; empty sessions are dropped"""
+        evicted = {}
+        for session_id, buffer in list(self.sessions.items()):
+            decayed = buffer.decay_step()
+            if decayed:
+                evicted[session_id] = decayed
+                self.dirty.add(session_id)
+            if not buffer.size():
+                del self.sessions[session_id]
+        return evicted
+
+    def take_dirty(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Snapshots of the sessions changed since the last call.
+
+        A session that no longer exists (cleared, decayed away) maps to an
+        empty list. Sessions dropped by the LRU bound keep their last
+        snapshot, so the store still has them until they expire.
+        """
+        snapshots, self.pending = self.pending, {}
+        for session_id in self.dirty:
+            snapshots[session_id] = [item.to_dict() for item in self.get_items(session_id)]
+        self.dirty = set()
+        return snapshots
+
+    def requeue(self, snapshots: Dict[str, List[Dict[str, Any]]]):
+        """Put back snapshots whose write-behind failed (newer changes win)"""
+        for session_id, items in snapshots.items():
+            if self.session(session_id) is not None or not items:
+                self.dirty.add(session_id)
+            else:
+                self.pending.setdefault(session_id, items)
+
+    def restore(self, snapshots: Dict[str, List[Dict[str, Any]]]) -> int:
+        """Load persisted sessions that are not in memory yet; returns how many"""
+        restored = 0
+        for session_id, items in snapshots.items():
+            if self.session(session_id) is not None or not items:
+                continue
+            # A list, not a generator: shared-state calls are replayed on conflict
+            self.session(session_id, create=True).restore([WorkingMemoryItem.from_dict(item) for item in items])
+            restored += 1
+        return restored
+
+    def get_stats(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Buffer statistics for one session, plus session counts (None: shared, not counted)"""
+        buffer = self.session(session_id)
+        stats = buffer.get_stats() if buffer is not None else WorkingMemoryBuffer(self.capacity).get_stats()
+        return {
+            **stats,
+            'session_id': session_id or DEFAULT_SESSION,
+            'shared': self.is_shared(),
+            'sessions': None if self.is_shared() else len(self.sessions),
+            'max_sessions': self.max_sessions,
+            'evicted_sessions': self.evicted_sessions,
+            'dirty_sessions': len(self.dirty)
+        }
+
+
+# ============================================================================
+# Write-behind Persistence
+# ============================================================================
+
+WORKING_MEMORY_CONTEXT_TYPE = "lab_011_session"
+
+# Stable working_id per session, so writes are plain primary-key upserts
+WORKING_MEMORY_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "nexus://lab_011/working_memory")
+
+UPSERT_SESSIONS_QUERY = """
+    INSERT INTO nexus_memory.zep_working_memory
+        (working_id, context_type, active_content, ttl_seconds, expires_at)
+    SELECT v.working_id, %(context_type)s, v.active_content, %(ttl)s,
+           NOW() + make_interval(secs => %(ttl)s)
+    FROM unnest(%(ids)s::uuid[], %(contents)s::jsonb[]) AS v(working_id, active_content)
+    ON CONFLICT (working_id) DO UPDATE
+    SET active_content = EXCLUDED.active_content,
+        ttl_seconds = EXCLUDED.ttl_seconds,
+        expires_at = EXCLUDED.expires_at
+"""
+
+DELETE_SESSIONS_QUERY = """
+    DELETE FROM nexus_memory.zep_working_memory
+    WHERE working_id = ANY(%s::uuid[])
+       OR (context_type = %s AND expires_at < NOW())
+"""
+
+LOAD_SESSIONS_QUERY = """
+    SELECT active_content
+    FROM nexus_memory.zep_working_memory
+    WHERE context_type = %s
+      AND expires_at > NOW()
+    ORDER BY expires_at DESC
+    LIMIT %s
+"""
+
+
+class WorkingMemoryStore:
+    """
+    Write-behind copy of SessionWorkingMemory in nexus_memory.zep_working_memory
+
+    One row per session (context_type 'lab_011_session', working_id derived
+    from the session id, active_content = {"session_id", "items"}). Rows
+    expire ttl_seconds after their last write.
+    """
+
+    def __init__(self, pool, ttl_seconds: int = 86400):
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def working_id(session_id: str) -> str:
+        return str(uuid.uuid5(WORKING_MEMORY_NAMESPACE, session_id))
+
+    def write(self, snapshots: Dict[str, List[Dict[str, Any]]]):
+        """Upsert changed sessions and delete emptied ones in one transaction"""
+        live = {sid: items for sid, items in snapshots.items() if items}
+        emptied = [self.working_id(sid) for sid, items in snapshots.items() if not items]
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                if live:
+                    cur.execute(UPSERT_SESSIONS_QUERY, {
+                        "context_type": WORKING_MEMORY_CONTEXT_TYPE,
+                        "ttl": self.ttl_seconds,
+                        "ids": [self.working_id(sid) for sid in live],
+                        "contents": [Json({"session_id": sid, "items": items}) for sid, items in live.items()]
+                    })
+                cur.execute(DELETE_SESSIONS_QUERY, (emptied, WORKING_MEMORY_CONTEXT_TYPE))
+
+    def load(self, limit: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Most recently written unexpired sessions"""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(LOAD_SESSIONS_QUERY, (WORKING_MEMORY_CONTEXT_TYPE, limit))
+                rows = cur.fetchall()
+        return {content["session_id"]: content["items"] for (content,) in rows}
+
+
 # ============================================================================
 # Rehearsal Manager
 # ============================================================================
@@ -5,13 +5,20 @@ DÍA 5 FASE 4 - Base Implementation
 """
 
 import os
+import sys
 import time
 import logging
 from datetime import datetime
 import psycopg
-from sentence_transformers import SentenceTransformer
 from prometheus_client import Counter, Histogram, Gauge, start_http_server
 
+# Shared embedding server client lives in src/api (imported flat, as main.py does)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from embedding_server import (
+    EMBEDDING_SERVER_FALLBACK, EMBEDDING_SERVER_SOCKET, EmbeddingClient, SharedEmbeddingModel
+)
+
 # ============================================
 # Configuration
 # ============================================
@@ -34,6 +41,7 @@ BATCH_SIZE = int(os.getenv("BATCH_SIZE", "10"))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "5"))
 EMBEDDINGS_MODEL = os.getenv("EMBEDDINGS_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
 EMBEDDING_VERSION = "miniLM-384-chunked@v2"
+MAX_TEXT_CHARS = 4000  # matches trigger checksum
 
 # Database connection string
 DB_CONN_STRING = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
@@ -80,6 +88,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger("embeddings_worker")
 
+# ============================================
+# Embeddings Model
+# ============================================
+def load_model():
+    """In-process model (also the fallback when the embedding server is down)"""
+    from sentence_transformers import SentenceTransformer
+
+    logger.info(f"Loading embeddings model: {EMBEDDINGS_MODEL}")
+    return SentenceTransformer(EMBEDDINGS_MODEL)
+
 # ============================================
 # Embeddings Worker Class
 # ============================================
@@ -92,9 +110,17 @@ class EmbeddingsWorker:
     def initialize(self):
         """Initialize model and database connection"""
         try:
-            logger.info(f"Loading embeddings model: {EMBEDDINGS_MODEL}")
-            self.model = SentenceTransformer(EMBEDDINGS_MODEL)
-            logger.info("✓ Model loaded successfully")
+            if EMBEDDING_SERVER_SOCKET:
+                logger.info(f"Using shared embedding server: {EMBEDDING_SERVER_SOCKET}")
+                self.model = SharedEmbeddingModel(
+                    EmbeddingClient(EMBEDDING_SERVER_SOCKET),
+                    load_local=load_model if EMBEDDING_SERVER_FALLBACK else None
+                )
+                if self.model.wait_for_server():
+                    logger.info("✓ Embedding server connected")
+            else:
+                self.model = load_model()
+                logger.info("✓ Model loaded successfully")
 
             logger.info("Connecting to database...")
             self.conn = psycopg.connect(DB_CONN_STRING)
@@ -151,7 +177,7 @@ class EmbeddingsWorker:
         """Generate embedding for text"""
         try:
             # Truncate to 4000 chars (matches trigger checksum)
-            text_truncated = text[:4000] if len(text) > 4000 else text
+            text_truncated = text[:MAX_TEXT_CHARS] if len(text) > MAX_TEXT_CHARS else text
 
             # Generate embedding
             embedding = self.model.encode(text_truncated)
@@ -162,13 +188,23 @@ class EmbeddingsWorker:
             logger.error(f"Error generating embedding: {e}")
             return None
 
-    def process_item(self, episode_id, content):
-        """Process single item"""
+    def generate_embeddings(self, texts):
+        """Embeddings for a whole batch in one model call (None each on failure)"""
+        try:
+            embeddings = self.model.encode([text[:MAX_TEXT_CHARS] for text in texts])
+            return [embedding.tolist() for embedding in embeddings]
+        except Exception as e:
+            logger.error(f"Error generating batch embeddings: {e}")
+            return [None] * len(texts)
+
+    def process_item(self, episode_id, content, embedding=None):
+        """Process single item (embedding precomputed by the batch, or generated here)"""
         start_time = time.time()
 
         try:
             # Generate embedding
-            embedding = self.generate_embedding(content)
+            if embedding is None:
+                embedding = self.generate_embedding(content)
 
             if embedding is None:
                 raise Exception("Embedding generation failed")
@@ -276,8 +312,9 @@ class EmbeddingsWorker:
 
                     logger.info(f"Processing {len(items)} items...")
 
-                    for episode_id, content in items:
-                        self.process_item(episode_id, content)
+                    embeddings = self.generate_embeddings([content for _, content in items])
+                    for (episode_id, content), embedding in zip(items, embeddings):
+                        self.process_item(episode_id, content, embedding)
 
                     logger.info(f"✓ Batch processed ({len(items)} items)")
                 else:
@@ -0,0 +1,477 @@
+"""
+NEXUS Cerebro - Enrichment Worker
+Background worker that scores new episodes once, at ingest time:
+
+- LAB_004 novelty (needs the embedding -> runs after the embeddings worker)
+- LAB_001 emotional salience (one context query per batch)
+- Fact extraction (metadata.facts + nexus_memory.episode_facts)
+
+Fed by memory_system.enrichment_queue, which a trigger fills when the
+embeddings worker marks an episode 'done'. The same trigger NOTIFYs
+'episode_enrichment'; the worker LISTENs and falls back to polling.
+
+Each batch is written set-based in one transaction (UPDATE ... FROM
+unnest for the columns and metadata, COPY for facts, queue rows marked
+done). Search and the orchestrator read the stored scores instead of
+recomputing them per request.
+
+Schema: database/migrations/episode_enrichment.sql
+"""
+
+import os
+import sys
+import time
+import select
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import psycopg
+from psycopg.types.json import Json
+from prometheus_client import Counter, Histogram, Gauge, start_http_server
+
+# LAB modules live in src/api (imported flat, as main.py does)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from novelty_detector import (
+    NoveltyDetector, Episode, NOVELTY_BASELINE_PATH, episode_from_row, fetch_training_episodes
+)
+from emotional_salience_scorer import EmotionalSalienceScorer
+from fact_extractor import extract_facts_from_content
+import fact_store
+
+# ============================================
+# Configuration
+# ============================================
+POSTGRES_HOST = os.getenv("POSTGRES_HOST", "nexus_postgresql")
+POSTGRES_PORT = int(os.getenv("POSTGRES_PORT", "5432"))
+POSTGRES_DB = os.getenv("POSTGRES_DB", "nexus_memory")
+POSTGRES_USER = os.getenv("POSTGRES_USER", "nexus_worker")
+
+# Read password from Docker Secret
+POSTGRES_PASSWORD_FILE = os.getenv("POSTGRES_PASSWORD_FILE", "/run/secrets/pg_worker_password")
+try:
+    with open(POSTGRES_PASSWORD_FILE, 'r') as f:
+        POSTGRES_PASSWORD = f.read().strip()
+except FileNotFoundError:
+    POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "default_password")
+
+# Worker configuration
+POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "5"))  # seconds (fallback when no NOTIFY arrives)
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "100"))
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "5"))
+HISTORY_WINDOW_HOURS = int(os.getenv("ENRICHMENT_HISTORY_HOURS", "6"))
+HISTORY_LIMIT = int(os.getenv("ENRICHMENT_HISTORY_LIMIT", "50"))
+BASELINE_SAVE_INTERVAL = int(os.getenv("ENRICHMENT_BASELINE_SAVE_INTERVAL", "300"))  # seconds
+ENRICHMENT_VERSION = "salience-novelty-facts@v1"
+NOTIFY_CHANNEL = "episode_enrichment"
+
+# Database connection string
+DB_CONN_STRING = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+# Prometheus metrics port
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9092"))
+
+# ============================================
+# Queries
+# ============================================
+CLAIM_QUERY = """
+    UPDATE memory_system.enrichment_queue
+    SET state = 'processing'
+    WHERE episode_id IN (
+        SELECT episode_id
+        FROM memory_system.enrichment_queue
+        WHERE state = 'pending'
+        ORDER BY enqueued_at ASC
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING episode_id
+"""
+
+EPISODES_QUERY = """
+    SELECT episode_id, content, embedding::text, created_at, metadata, tags
+    FROM nexus_memory.zep_episodic_memory
+    WHERE episode_id = ANY(%s::uuid[])
+    ORDER BY created_at ASC
+"""
+
+HISTORY_QUERY = """
+    SELECT episode_id, content, embedding::text, created_at, metadata
+    FROM nexus_memory.zep_episodic_memory
+    WHERE created_at < %(before)s
+        AND created_at >= %(since)s
+        AND NOT (episode_id = ANY(%(exclude)s::uuid[]))
+    ORDER BY created_at DESC
+    LIMIT %(limit)s
+"""
+
+WRITE_SCORES_QUERY = """
+    UPDATE nexus_memory.zep_episodic_memory e
+    SET novelty_score = v.novelty_score,
+        salience_score = v.salience_score,
+        metadata = COALESCE(e.metadata, '{}'::jsonb) || v.enrichment,
+        enriched_at = NOW(),
+        enrichment_version = %s
+    FROM unnest(%s::uuid[], %s::real[], %s::real[], %s::jsonb[])
+        AS v(episode_id, novelty_score, salience_score, enrichment)
+    WHERE e.episode_id = v.episode_id
+"""
+
+MARK_DONE_QUERY = """
+    UPDATE memory_system.enrichment_queue
+    SET state = 'done',
+        processed_at = NOW(),
+        last_error = NULL
+    WHERE episode_id = ANY(%s::uuid[])
+"""
+
+MARK_FAILED_QUERY = """
+    UPDATE memory_system.enrichment_queue
+    SET state = CASE
+            WHEN retry_count + 1 >= %s THEN 'dead'
+            ELSE 'pending'
+        END,
+        retry_count = retry_count + 1,
+        last_error = %s
+    WHERE episode_id = %s
+    RETURNING state = 'dead'
+"""
+
+# ============================================
+# Prometheus Metrics
+# ============================================
+enrichment_processed_total = Counter(
+    'nexus_enrichment_processed_total',
+    'Total episodes enriched successfully'
+)
+
+enrichment_failed_total = Counter(
+    'nexus_enrichment_failed_total',
+    'Total episode enrichments that failed'
+)
+
+enrichment_dead_total = Counter(
+    'nexus_enrichment_dead_total',
+    'Total episodes moved to the enrichment dead letter state'
+)
+
+enrichment_batch_duration_seconds = Histogram(
+    'nexus_enrichment_batch_duration_seconds',
+    'Time taken to enrich and write one batch'
+)
+
+enrichment_batch_size = Gauge(
+    'nexus_enrichment_batch_size',
+    'Current batch size being processed'
+)
+
+# ============================================
+# Logging Setup
+# ============================================
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("enrichment_worker")
+
+
+@dataclass
+class Enrichment:
+    """Scores computed for one episode"""
+    episode: Episode
+    tags: List[str] = field(default_factory=list)
+    novelty_score: Optional[float] = None
+    novelty_breakdown: Optional[Dict[str, float]] = None
+    salience_score: Optional[float] = None
+    facts: Dict[str, Any] = field(default_factory=dict)
+
+    def metadata_patch(self) -> Dict[str, Any]:
+        patch: Dict[str, Any] = {}
+        if self.novelty_breakdown is not None:
+            patch['novelty_breakdown'] = self.novelty_breakdown
+        if self.salience_score is not None:
+            patch['salience_score'] = self.salience_score
+        if self.facts:
+            patch['facts'] = self.facts
+        return patch
+
+
+# ============================================
+# Enrichment Worker Class
+# ============================================
+class EnrichmentWorker:
+    def __init__(
+        self,
+        conn_string: str = DB_CONN_STRING,
+        detector: Optional[NoveltyDetector] = None,
+        scorer: Optional[EmotionalSalienceScorer] = None
+    ):
+        self.conn_string = conn_string
+        self.detector = detector if detector is not None else NoveltyDetector(baseline_path=NOVELTY_BASELINE_PATH)
+        self.scorer = scorer if scorer is not None else EmotionalSalienceScorer()
+        self.conn = None
+        self.listen_conn = None
+        self.running = True
+        self.last_baseline_save = time.time()
+
+    def initialize(self):
+        """Connect, LISTEN for new work and make sure novelty baselines exist"""
+        try:
+            logger.info("Connecting to database...")
+            self.conn = psycopg.connect(self.conn_string)
+            logger.info("✓ Database connected")
+
+            try:
+                self.listen_conn = psycopg.connect(self.conn_string, autocommit=True)
+                self.listen_conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                logger.info(f"✓ Listening on '{NOTIFY_CHANNEL}'")
+            except Exception as e:
+                self.listen_conn = None
+                logger.warning(f"LISTEN unavailable, polling every {POLL_INTERVAL}s: {e}")
+
+            if self.detector.baseline_models is None:
+                logger.info("No novelty baselines on disk, fitting from recent episodes...")
+                episodes = fetch_training_episodes(self.conn)
+                self.conn.commit()
+                if episodes:
+                    self.detector.build_baseline_models(episodes)
+                    self.detector.save_if_leader()
+
+            return True
+        except Exception as e:
+            logger.error(f"Initialization failed: {e}")
+            return False
+
+    def wait_for_work(self, timeout: float) -> bool:
+        """
+        Block until a NOTIFY arrives or timeout passes
+
+        Returns:
+            True if notified (the queue is still the source of truth)
+        """
+        if self.listen_conn is None:
+            time.sleep(timeout)
+            return False
+        ready, _, _ = select.select([self.listen_conn.fileno()], [], [], timeout)
+        if not ready:
+            return False
+        # Consume the pending notifications (payloads are not needed)
+        self.listen_conn.execute("SELECT 1")
+        return True
+
+    def claim_batch(self) -> List:
+        """Atomically claim pending episode ids (SKIP LOCKED)"""
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(CLAIM_QUERY, (BATCH_SIZE,))
+                episode_ids = [row[0] for row in cur.fetchall()]
+            self.conn.commit()
+            return episode_ids
+        except Exception as e:
+            logger.error(f"Error claiming enrichment batch: {e}")
+            self.conn.rollback()
+            return []
+
+    def load_episodes(self, cur, episode_ids: List) -> List[Enrichment]:
+        """Claimed episodes, oldest first (novelty scores them in order)"""
+        cur.execute(EPISODES_QUERY, (list(episode_ids),))
+        return [
+            Enrichment(episode=episode_from_row(episode_id, content, embedding, created_at, metadata), tags=tags or [])
+            for episode_id, content, embedding, created_at, metadata, tags in cur.fetchall()
+        ]
+
+    def load_history(self, cur, enrichments: List[Enrichment]) -> List[Episode]:
+        """Episodes just before the batch (recent history for novelty)"""
+        before = enrichments[0].episode.created_at
+        cur.execute(HISTORY_QUERY, {
+            "before": before,
+            "since": before - timedelta(hours=HISTORY_WINDOW_HOURS),
+            "exclude": [e.episode.episode_id for e in enrichments],
+            "limit": HISTORY_LIMIT,
+        })
+        return [episode_from_row(*row) for row in reversed(cur.fetchall())]
+
+    def enrich(self, cur, enrichments: List[Enrichment]) -> List[Enrichment]:
+        """Compute novelty, salience and facts for a loaded batch"""
+        episodes = [e.episode for e in enrichments]
+
+        # LAB_004: score against the baselines as they were before this batch
+        if self.detector.baseline_models is not None:
+            scored = self.detector.score_episodes(episodes, self.load_history(cur, enrichments))
+            for enrichment, (score, breakdown) in zip(enrichments, scored):
+                enrichment.novelty_score = float(score)
+                enrichment.novelty_breakdown = {
+                    'semantic_novelty': float(breakdown.semantic_novelty),
+                    'emotional_surprise': float(breakdown.emotional_surprise),
+                    'pattern_violation': float(breakdown.pattern_violation),
+                    'contextual_mismatch': float(breakdown.contextual_mismatch),
+                }
+
+        # LAB_001: one context query for the whole batch
+        saliences = self.scorer.batch_calculate_salience(
+            [{'episode_id': ep.episode_id, 'timestamp': ep.created_at} for ep in episodes],
+            cursor=cur
+        )
+        for enrichment in enrichments:
+            salience = saliences.get(enrichment.episode.episode_id)
+            enrichment.salience_score = float(salience.total_score) if salience is not None else None
+
+        for enrichment in enrichments:
+            enrichment.facts = extract_facts_from_content(enrichment.episode.content, enrichment.tags) or {}
+
+        return enrichments
+
+    def write_results(self, cur, enrichments: List[Enrichment]) -> int:
+        """
+        Set-based writes for one batch (caller owns the transaction)
+
+        Returns:
+            Number of fact rows written
+        """
+        ids = [e.episode.episode_id for e in enrichments]
+        cur.execute(WRITE_SCORES_QUERY, (
+            ENRICHMENT_VERSION,
+            ids,
+            [e.novelty_score for e in enrichments],
+            [e.salience_score for e in enrichments],
+            [Json(e.metadata_patch()) for e in enrichments],
+        ))
+
+        rows = []
+        for e in enrichments:
+            rows.extend(fact_store.fact_rows(e.episode.episode_id, e.facts, e.episode.created_at))
+        fact_store.delete_facts(cur, ids)
+        if rows:
+            with cur.copy("""
+                COPY nexus_memory.episode_facts
+                    (episode_id, fact_type, value_text, value_num, confidence, created_at)
+                FROM STDIN
+            """) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        return len(rows)
+
+    def process_batch(self, episode_ids: List) -> int:
+        """
+        Enrich and write a claimed batch in one transaction
+
+        A failing batch is retried one episode at a time, so a single bad
+        episode does not hold back (or dead-letter) the rest.
+
+        Returns:
+            Number of episodes enriched
+        """
+        start_time = time.time()
+        try:
+            with self.conn.cursor() as cur:
+                enrichments = self.load_episodes(cur, episode_ids)
+                if enrichments:
+                    self.enrich(cur, enrichments)
+                    self.write_results(cur, enrichments)
+                # Ids without a row (episode deleted meanwhile) are done too
+                cur.execute(MARK_DONE_QUERY, (list(episode_ids),))
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            if len(episode_ids) > 1:
+                logger.warning(f"Batch of {len(episode_ids)} failed ({e}), retrying one by one")
+                return sum(self.process_batch([episode_id]) for episode_id in episode_ids)
+            self.mark_failed(episode_ids[0], e)
+            return 0
+
+        # Fold the batch into the baselines only once it is committed
+        self.detector.update_baselines([e.episode for e in enrichments])
+
+        enrichment_batch_duration_seconds.observe(time.time() - start_time)
+        enrichment_processed_total.inc(len(enrichments))
+        return len(enrichments)
+
+    def mark_failed(self, episode_id, error: Exception):
+        """Back to pending (or dead after MAX_RETRIES)"""
+        logger.error(f"Error enriching episode {episode_id}: {error}")
+        enrichment_failed_total.inc()
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(MARK_FAILED_QUERY, (MAX_RETRIES, str(error), episode_id))
+                result = cur.fetchone()
+            self.conn.commit()
+            if result and result[0]:
+                enrichment_dead_total.inc()
+        except Exception as retry_error:
+            logger.error(f"Error updating retry count: {retry_error}")
+            self.conn.rollback()
+
+    def maintain_baselines(self):
+        """Pick up weekly refits from the API; persist online updates periodically"""
+        try:
+            self.detector.sync_baselines()
+            if time.time() - self.last_baseline_save >= BASELINE_SAVE_INTERVAL:
+                if self.detector.save_if_leader():
+                    self.last_baseline_save = time.time()
+        except Exception as e:
+            logger.warning(f"Novelty baseline maintenance failed: {e}")
+
+    def run(self):
+        """Main worker loop"""
+        logger.info("=" * 60)
+        logger.info("NEXUS Enrichment Worker - Starting")
+        logger.info("=" * 60)
+
+        if not self.initialize():
+            logger.error("Worker initialization failed. Exiting.")
+            return
+
+        # Start Prometheus metrics server
+        try:
+            start_http_server(METRICS_PORT)
+            logger.info(f"✓ Prometheus metrics server started on port {METRICS_PORT}")
+        except Exception as e:
+            logger.warning(f"Could not start metrics server: {e}")
+
+        logger.info(f"Worker configuration:")
+        logger.info(f"  - Poll interval: {POLL_INTERVAL}s")
+        logger.info(f"  - Batch size: {BATCH_SIZE}")
+        logger.info(f"  - Max retries: {MAX_RETRIES}")
+        logger.info(f"  - Novelty baselines: {self.detector.baseline_path}")
+        logger.info(f"  - Metrics port: {METRICS_PORT}")
+        logger.info("=" * 60)
+        logger.info("Worker ready. Waiting for episodes...")
+
+        while self.running:
+            try:
+                self.maintain_baselines()
+                episode_ids = self.claim_batch()
+
+                if episode_ids:
+                    enrichment_batch_size.set(len(episode_ids))
+                    enriched = self.process_batch(episode_ids)
+                    logger.info(f"✓ Batch enriched ({enriched}/{len(episode_ids)} episodes)")
+                else:
+                    enrichment_batch_size.set(0)
+                    self.wait_for_work(POLL_INTERVAL)
+
+            except KeyboardInterrupt:
+                logger.info("Shutdown signal received")
+                self.running = False
+            except Exception as e:
+                logger.error(f"Worker error: {e}")
+                time.sleep(POLL_INTERVAL * 2)  # Back off on error
+
+        # Persist what was folded in since the last save
+        self.detector.save_if_leader()
+
+        # Cleanup
+        for conn in (self.listen_conn, self.conn):
+            if conn:
+                conn.close()
+
+        logger.info("Worker stopped")
+
+# ============================================
+# Main
+# ============================================
+if __name__ == "__main__":
+    worker = EnrichmentWorker()
+    worker.run()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Consolidation Chain Tracing Benchmark for NEXUS (LAB_003)
+Compares the vectorized backward chain tracing (DayIndex: time-sorted
+arrays, binary-searched windows, one similarity product per block of
+breakthroughs, tag bitsets) against the previous per-candidate scan
+(list filter + sort + one cosine_similarity call per candidate).
+
+Day:
+- synthetic, --episodes over 16 waking hours (default 50,000)
+- 384-d embeddings around topic centroids, 0-4 tags from a small vocabulary
+
+The legacy scan is O(breakthroughs x episodes) in Python and takes hours
+on a 50k day, so it runs on --legacy-sample breakthroughs and is
+extrapolated. Both implementations must return identical chains for
+that sample.
+
+Note: on a day this dense the 1-hour proximity rule links almost every
+episode in a breakthrough's 12h window, so chain sizes (reported below)
+grow with breakthroughs x window. --breakthroughs caps how many of the
+top breakthroughs are traced.
+
+Usage:
+    python consolidation_benchmark.py
+    python consolidation_benchmark.py --episodes 20000 --breakthroughs 4000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+
+# Add src/api to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "src", "api"))
+
+from consolidation_engine import ConsolidationEngine, Episode
+
+
+DAY = datetime(2025, 10, 27)
+DIM = 384
+TOPICS = 64
+TAGS = ["lab_001", "lab_002", "lab_003", "lab_005", "lab_007", "api", "worker", "bug",
+        "benchmark", "deploy", "refactor", "search", "memory", "docs", "review", "ops"]
+
+
+def synthetic_day(size: int, seed: int = 42) -> List[Episode]:
+    """One busy day: waking-hours timestamps, topical embeddings, sparse tags"""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(TOPICS, DIM)).astype(np.float32)
+    seconds = np.sort(rng.uniform(7 * 3600, 23 * 3600, size=size))
+    topics = rng.integers(0, TOPICS, size=size)
+    embeddings = centroids[topics] + rng.normal(scale=0.8, size=(size, DIM)).astype(np.float32)
+
+    episodes = []
+    for i in range(size):
+        episodes.append(Episode(
+            episode_id=f"episode-{i}",
+            content=f"synthetic episode {i}",
+            embedding=embeddings[i],
+            created_at=DAY + timedelta(seconds=float(seconds[i])),
+            session_id=None,
+            tags=list(rng.choice(TAGS, size=rng.integers(0, 5), replace=False)),
+            importance_score=float(rng.uniform()),
+            salience_score=float(rng.uniform()),
+            emotional_8d={"joy": float(rng.uniform()), "trust": float(rng.uniform())},
+            somatic_7d={"valence": float(rng.uniform(-1, 1))}
+        ))
+    return episodes
+
+
+def legacy_trace(engine: ConsolidationEngine, breakthroughs: List[Episode],
+                 all_episodes: List[Episode]) -> List[List[Episode]]:
+    """Previous implementation: filter, sort and cosine_similarity per candidate"""
+    chains = []
+    for breakthrough in breakthroughs:
+        chain = [breakthrough]
+        current_time = breakthrough.created_at
+        window_start = current_time - timedelta(hours=12)
+        candidates = [e for e in all_episodes if window_start <= e.created_at < current_time]
+        candidates.sort(key=lambda x: x.created_at, reverse=True)
+
+        for candidate in candidates:
+            is_related = False
+            if (candidate.session_id and breakthrough.session_id and
+                    candidate.session_id == breakthrough.session_id):
+                is_related = True
+            if len(candidate.embedding) and len(breakthrough.embedding):
+                if engine.cosine_similarity(candidate.embedding, breakthrough.embedding) > 0.65:
+                    is_related = True
+            if len(set(candidate.tags) & set(breakthrough.tags)) >= 2:
+                is_related = True
+            if (current_time - candidate.created_at).total_seconds() < 3600:
+                is_related = True
+            if is_related:
+                chain.insert(0, candidate)
+                current_time = candidate.created_at
+
+        if len(chain) >= 2:
+            chains.append(chain)
+    return chains
+
+
+def chain_ids(chains: List[List[Episode]]) -> List[List[str]]:
+    return [[e.episode_id for e in chain] for chain in chains]
+
+
+def best_of(fn, repeats: int):
+    """Best-of-N wall time in seconds, plus the last result"""
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consolidation chain tracing benchmark")
+    parser.add_argument("--episodes", type=int, default=50000, help="Episodes in the synthetic day")
+    parser.add_argument("--breakthroughs", type=int, default=1000, help="Top breakthroughs to trace")
+    parser.add_argument("--legacy-sample", type=int, default=5, help="Breakthroughs timed with the legacy scan")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = ConsolidationEngine()
+    episodes = synthetic_day(args.episodes, args.seed)
+    breakthroughs = engine.identify_breakthroughs(episodes)[:args.breakthroughs]
+    sample = breakthroughs[:args.legacy_sample]
+
+    print("=" * 70)
+    print("Consolidation Chain Tracing Benchmark (synthetic day)")
+    print(f"Episodes: {len(episodes):,}   Breakthroughs traced: {len(breakthroughs):,}")
+    print("=" * 70)
+
+    # Correctness first (on the legacy sample)
+    legacy_s, legacy_chains = best_of(lambda: legacy_trace(engine, sample, episodes), 1)
+    vector_sample = engine.trace_breakthrough_chains(sample, episodes)
+    identical = chain_ids(legacy_chains) == chain_ids(vector_sample)
+    print(f"Identical chains on {len(sample)} sampled breakthroughs: {identical}")
+    if not identical:
+        print("❌ Vectorized chains differ from the legacy scan")
+
+    vector_s, chains = best_of(lambda: engine.trace_breakthrough_chains(breakthroughs, episodes), args.repeats)
+    lengths = [len(chain) for chain in chains]
+    legacy_estimate_s = legacy_s / max(1, len(sample)) * len(breakthroughs)
+
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "episodes": len(episodes),
+        "breakthroughs": len(breakthroughs),
+        "chains": len(chains),
+        "mean_chain_length": round(float(np.mean(lengths)), 1) if lengths else 0,
+        "identical": identical,
+        "legacy_sample": len(sample),
+        "legacy_ms_per_breakthrough": round(legacy_s / max(1, len(sample)) * 1000, 1),
+        "vectorized_ms_per_breakthrough": round(vector_s / max(1, len(breakthroughs)) * 1000, 3),
+        "legacy_estimated_s": round(legacy_estimate_s, 1),
+        "vectorized_s": round(vector_s, 2),
+        "speedup": round(legacy_estimate_s / vector_s, 1),
+    }
+
+    print(f"Legacy:     {results['legacy_estimated_s']:>10} s (extrapolated)")
+    print(f"Vectorized: {results['vectorized_s']:>10} s")
+    print(f"Speedup:    {results['speedup']}x")
+    print(json.dumps(results, indent=2))
+
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Fact Extraction Benchmark for NEXUS
+Compares the compiled single-pass extraction engine (fact_extractor)
+against the previous per-pattern implementation (re.search on raw
+pattern strings for every fact type).
+
+Corpus:
+- --from-db: real episode content from nexus_memory.zep_episodic_memory
+- default:   synthetic corpus built from episode-like templates
+
+Also verifies that both implementations produce identical facts on
+every document, so the speedup is not bought with behaviour changes.
+
+Usage:
+    python fact_extraction_benchmark.py
+    python fact_extraction_benchmark.py --from-db --limit 20000
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List
+
+# Add src/api to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "src", "api"))
+
+from fact_extractor import (
+    FACT_PATTERNS,
+    extract_raw_facts,
+    extract_numeric,
+    extract_integer,
+    normalize_status,
+)
+
+# Configuration
+DB_CONFIG = {
+    "host": os.getenv("POSTGRES_HOST", "localhost"),
+    "port": int(os.getenv("POSTGRES_PORT", "5437")),
+    "dbname": os.getenv("POSTGRES_DB", "nexus_memory"),
+    "user": os.getenv("POSTGRES_USER", "nexus_superuser"),
+    "password": os.getenv("POSTGRES_PASSWORD", ""),
+}
+
+TEMPLATES = [
+    "FASE_8_UPGRADE Session {session} COMPLETE - {feature} Feature\nVersion: NEXUS V{major}.{minor}.{patch}\n"
+    "Status: COMPLETE\nDMR Accuracy: {acc}% ({q}/{q} queries)\nLatency: {lat}ms avg\nTotal Episodes: {eps}\n"
+    "Implementation Time: {hours} hours\nLines of Code: {loc} lines\nBugs Found: {bugs}\nCommit: {commit}",
+    "Debugging session: {errors} errors in the embeddings worker, retry queue drained. "
+    "Phase {phase} pending review. decay_score: 0.{decay}",
+    "User asked about the project timeline. We discussed priorities for next week and "
+    "agreed to revisit the roadmap after the demo.",
+    "Benchmark: LongMemEval run finished. Score: {acc} vs {base}% baseline (Zep SOTA {base}%). "
+    "{tests} tests passed.",
+    "Reflection on today's work: consolidation felt slow, memory pressure was fine, nothing notable.",
+]
+
+WORDS = ["Temporal", "Reasoning", "Hybrid", "Memory", "Attention", "Priming", "Decay", "Graph"]
+
+
+def legacy_extract(content: str) -> Dict[str, Any]:
+    """Previous implementation: re.search per raw pattern string, no prefilter"""
+
+    def search(patterns: List[str]):
+        for pattern in patterns:
+            match = re.search(pattern, content, re.IGNORECASE)
+            if match:
+                return match.group(1).strip()
+        return None
+
+    converters = {
+        "nexus_version": lambda v: v,
+        "accuracy_percent": extract_numeric,
+        "latency_ms": extract_numeric,
+        "episode_count": extract_integer,
+        "query_count": extract_integer,
+        "test_count": extract_integer,
+        "status": normalize_status,
+        "phase_number": extract_integer,
+        "session_number": extract_integer,
+        "feature_name": lambda v: v.rstrip(".:,;"),
+        "implementation_time_hours": extract_numeric,
+        "lines_of_code": extract_integer,
+        "benchmark_name": lambda v: v,
+        "benchmark_score": extract_numeric,
+        "baseline_score": extract_numeric,
+        "bug_count": extract_integer,
+        "error_count": extract_integer,
+        "commit_hash": lambda v: v,
+        "decay_score": extract_numeric,
+    }
+
+    facts = {}
+    for fact_type, converter in converters.items():
+        value = search(FACT_PATTERNS[fact_type])
+        if value:
+            facts[fact_type] = converter(value)
+    return facts
+
+
+def synthetic_corpus(size: int, seed: int = 42) -> List[str]:
+    """Episode-like documents with a realistic mix of fact-bearing and plain text"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        template = rng.choice(TEMPLATES)
+        corpus.append(template.format(
+            session=rng.randint(1, 20),
+            feature=" ".join(rng.sample(WORDS, 2)),
+            major=rng.randint(1, 3), minor=rng.randint(0, 9), patch=rng.randint(0, 9),
+            acc=round(rng.uniform(80, 100), 1),
+            q=rng.randint(10, 500),
+            lat=round(rng.uniform(1, 200), 2),
+            eps=rng.randint(100, 100000),
+            hours=round(rng.uniform(0.5, 12), 1),
+            loc=rng.randint(50, 5000),
+            bugs=rng.randint(0, 10),
+            commit="%040x" % rng.getrandbits(160),
+            errors=rng.randint(0, 50),
+            phase=rng.randint(1, 9),
+            decay=rng.randint(10, 99),
+            base=round(rng.uniform(80, 95), 1),
+            tests=rng.randint(1, 300),
+        ) + "\n" + " ".join(rng.choice(WORDS).lower() for _ in range(rng.randint(20, 200))))
+    return corpus
+
+
+def db_corpus(limit: int) -> List[str]:
+    """Episode content from PostgreSQL"""
+    import psycopg
+
+    with psycopg.connect(**DB_CONFIG) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT content FROM nexus_memory.zep_episodic_memory
+                ORDER BY created_at DESC
+                LIMIT %s
+            """, (limit,))
+            return [row[0] for row in cur.fetchall()]
+
+
+def time_extractor(fn, corpus: List[str], repeats: int) -> float:
+    """Best-of-N wall time in seconds for one pass over the corpus"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for content in corpus:
+            fn(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fact extraction benchmark")
+    parser.add_argument("--from-db", action="store_true", help="Use real episodes from PostgreSQL")
+    parser.add_argument("--limit", type=int, default=10000, help="Corpus size")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = db_corpus(args.limit) if args.from_db else synthetic_corpus(args.limit)
+    total_chars = sum(len(c) for c in corpus)
+
+    print("=" * 70)
+    print(f"Fact Extraction Benchmark ({'database' if args.from_db else 'synthetic'} corpus)")
+    print(f"Documents: {len(corpus)}   Characters: {total_chars:,}")
+    print("=" * 70)
+
+    # Correctness first
+    mismatches = [i for i, c in enumerate(corpus) if legacy_extract(c) != extract_raw_facts(c)]
+    print(f"Identical output: {len(corpus) - len(mismatches)}/{len(corpus)}")
+    if mismatches:
+        print(f"❌ First mismatch at document {mismatches[0]}")
+
+    legacy_s = time_extractor(legacy_extract, corpus, args.repeats)
+    compiled_s = time_extractor(extract_raw_facts, corpus, args.repeats)
+
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "corpus": "database" if args.from_db else "synthetic",
+        "documents": len(corpus),
+        "characters": total_chars,
+        "mismatches": len(mismatches),
+        "legacy_docs_per_sec": round(len(corpus) / legacy_s, 1),
+        "compiled_docs_per_sec": round(len(corpus) / compiled_s, 1),
+        "speedup": round(legacy_s / compiled_s, 2),
+    }
+
+    print(f"Legacy:   {results['legacy_docs_per_sec']:>10} docs/s")
+    print(f"Compiled: {results['compiled_docs_per_sec']:>10} docs/s")
+    print(f"Speedup:  {results['speedup']}x")
+    print(json.dumps(results, indent=2))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
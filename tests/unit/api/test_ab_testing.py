@@ -0,0 +1,267 @@
+"""
+Tests for the A/B testing write-behind recorder
+
+Tests:
+- Recording is buffered (no database round trip per sample)
+- Batches are written with one COPY; failed batches are kept and bounded
+- Aggregates come from one SQL summary query per call
+- Each batch is rolled up per minute/hour in the same transaction; time series read the rollups
+- Retention drops old raw samples and rollups
+"""
+
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from datetime import datetime
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import ab_testing
+from ab_testing import ABTestManager
+from ab_testing import TestVariant as Variant
+
+
+class FakeCopy:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+
+class FakeCursor:
+    def __init__(self):
+        self.statements = []
+        self.copied = []
+        self.result = []
+        self.fail_copy = False
+        self.results = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        self.statements.append((query, params))
+
+    def fetchone(self):
+        return (False,)
+
+    def fetchall(self):
+        query = self.statements[-1][0]
+        return self.results.get(query, self.result)
+
+    @contextmanager
+    def copy(self, statement):
+        if self.fail_copy:
+            raise RuntimeError("database unavailable")
+        self.statements.append((statement, None))
+        yield FakeCopy(self.copied)
+
+
+class FakePool:
+    def __init__(self):
+        self.cur = FakeCursor()
+        self.borrowed = 0
+
+    @contextmanager
+    def connection(self):
+        self.borrowed += 1
+        yield self
+
+    def cursor(self):
+        return self.cur
+
+    def commit(self):
+        pass
+
+
+def make_manager(**kwargs):
+    pool = FakePool()
+    manager = ABTestManager("dbname=unused", pool=pool, **kwargs)
+    pool.cur.statements.clear()
+    pool.borrowed = 0
+    return manager, pool
+
+
+def record(manager, variant=Variant.TREATMENT, ms=10.0):
+    return manager.record_retrieval(variant, ms, cache_hit=True, num_results=5, primed_count=2)
+
+
+class TestWriteBehind:
+    """Samples are buffered and copied in batches"""
+
+    def test_record_does_not_touch_database(self):
+        """Should only buffer the sample"""
+        manager, pool = make_manager()
+        for _ in range(100):
+            record(manager)
+        assert pool.borrowed == 0
+        assert manager.get_buffer_stats()["pending"] == 100
+
+    def test_batch_full_signalled(self):
+        """Should report when the buffer holds a full batch"""
+        manager, _ = make_manager(flush_batch=3)
+        assert [record(manager) for _ in range(3)] == [False, False, True]
+
+    def test_flush_uses_one_copy(self):
+        """Should write every buffered sample with a single COPY"""
+        manager, pool = make_manager()
+        for i in range(250):
+            record(manager, ms=float(i))
+
+        assert manager.flush() == 250
+        assert pool.borrowed == 1
+        assert [query for query, _ in pool.cur.statements][0] == ab_testing.COPY_METRICS_QUERY
+        assert len(pool.cur.copied) == 250
+        variant, ms, hit, results, coherence, primed, query_id, ts = pool.cur.copied[0]
+        assert (variant, ms, hit, primed) == ("treatment", 0.0, True, 2)
+        assert isinstance(ts, datetime)
+        assert manager.flush() == 0
+
+    def test_failed_flush_keeps_batch_bounded(self):
+        """Should keep unwritten samples for the next flush, dropping the oldest past the cap"""
+        manager, pool = make_manager(max_pending=5)
+        for i in range(4):
+            record(manager, ms=float(i))
+        pool.cur.fail_copy = True
+        with pytest.raises(RuntimeError):
+            manager.flush()
+        for i in range(4, 7):
+            record(manager, ms=float(i))
+
+        pool.cur.fail_copy = False
+        assert manager.flush() == 5
+        assert [row[1] for row in pool.cur.copied] == [2.0, 3.0, 4.0, 5.0, 6.0]
+        assert manager.get_buffer_stats()["dropped"] == 2
+
+    def test_clear_drops_buffered_samples(self):
+        """Should not resurrect cleared samples on the next flush"""
+        manager, _ = make_manager()
+        record(manager, Variant.CONTROL)
+        record(manager, Variant.TREATMENT)
+        manager.clear_test_data(Variant.CONTROL)
+        assert [m.variant for m in manager.pending] == [Variant.TREATMENT]
+
+
+class TestSQLAggregation:
+    """Summary rows instead of raw samples"""
+
+    def test_compare_is_one_query(self):
+        """Should flush, then aggregate both variants in one grouped query"""
+        manager, pool = make_manager()
+        record(manager)
+        pool.cur.result = [
+            ("control", 40, 50.0, 48.0, 90.0, 0.25, 0.6, 0.0, 3600.0),
+            ("treatment", 40, 20.0, 18.0, 35.0, 0.75, 0.8, 3.0, 3600.0),
+        ]
+
+        comparison = manager.compare_variants(hours_back=24)
+
+        queries = [query for query, _ in pool.cur.statements]
+        assert queries[0] == ab_testing.COPY_METRICS_QUERY
+        assert queries[-1] == ab_testing.AGGREGATE_METRICS_QUERY
+        assert comparison["treatment"]["p95_retrieval_time_ms"] == 35.0
+        assert comparison["improvements"]["latency_reduction_percent"] == 60.0
+
+    def test_missing_variant(self):
+        """Should return None for a variant with no samples in the window"""
+        manager, pool = make_manager()
+        pool.cur.result = []
+        assert manager.get_aggregated_metrics(Variant.CONTROL) is None
+
+    def test_percentiles_in_sql(self):
+        """Should compute percentiles and rates in PostgreSQL"""
+        query = ab_testing.AGGREGATE_METRICS_QUERY
+        assert "percentile_cont(0.95) WITHIN GROUP (ORDER BY retrieval_time_ms)" in query
+        assert "COUNT(*) FILTER (WHERE cache_hit)" in query
+
+
+class TestRollups:
+    """Per-minute and per-hour totals maintained at flush time"""
+
+    def test_flush_upserts_both_rollups(self):
+        """Should upsert minute and hour rollups after the COPY"""
+        manager, pool = make_manager()
+        record(manager)
+        manager.flush()
+
+        queries = [query for query, _ in pool.cur.statements]
+        assert len(queries) == 3
+        assert "ab_test_rollup_minute" in queries[1]
+        assert "ab_test_rollup_hour" in queries[2]
+
+    def test_rollup_rows_from_batch(self):
+        """Should sum each (variant, bucket) and count latencies into histogram slots"""
+        manager, _ = make_manager()
+        for ms in (1.0, 2.0, 30.0):
+            record(manager, Variant.CONTROL, ms=ms)
+        record(manager, Variant.TREATMENT, ms=5.0)
+        now = datetime.now()
+        for m in manager.pending:
+            m.timestamp = now.replace(minute=10, second=5).timestamp()
+        manager.pending[0].timestamp = now.replace(minute=50).timestamp()
+
+        minute = ab_testing.rollup_rows(manager.pending, "minute")
+        hour = ab_testing.rollup_rows(manager.pending, "hour")
+        variant, bucket, count, total, low, high, hits, _, _, primed, histogram = [c[0] for c in hour]
+
+        assert sorted(zip(minute[0], minute[2])) == [("control", 1), ("control", 2), ("treatment", 1)]
+        assert (variant, count, total, low, high, hits, primed) == ("control", 3, 33.0, 1.0, 30.0, 3, 6)
+        assert bucket == now.replace(minute=0, second=0, microsecond=0)
+        slots = [int(n) for n in histogram.strip("{}").split(",")]
+        assert len(slots) == ab_testing.LATENCY_SLOTS and sum(slots) == 3
+        assert slots[ab_testing.latency_slot(30.0)] == 1
+
+    def test_histogram_percentile(self):
+        """Should estimate percentiles within one histogram slot (25%) of the exact value"""
+        latencies = [float(ms) for ms in range(1, 1001)]
+        histogram = [0] * ab_testing.LATENCY_SLOTS
+        for ms in latencies:
+            histogram[ab_testing.latency_slot(ms)] += 1
+
+        assert ab_testing.histogram_percentile(histogram, 50) == pytest.approx(500, rel=0.25)
+        assert ab_testing.histogram_percentile(histogram, 95) == pytest.approx(950, rel=0.25)
+        assert ab_testing.histogram_percentile([0] * ab_testing.LATENCY_SLOTS, 50) == 0.0
+
+    @pytest.mark.parametrize("bucket_minutes,table", [(60, "ab_test_rollup_hour"), (5, "ab_test_rollup_minute")])
+    def test_time_series_reads_rollups(self, bucket_minutes, table):
+        """Should read the rollup matching the bucket size, not raw samples"""
+        manager, pool = make_manager()
+        bucket = datetime(2025, 10, 1, 12)
+        pool.cur.result = [(bucket, 12.5, 0.5, 40)]
+
+        series = manager.get_time_series(Variant.TREATMENT, hours_back=24, bucket_minutes=bucket_minutes)
+
+        query, params = pool.cur.statements[-1]
+        assert table in query and "ab_test_metrics" not in query
+        assert params["minutes"] == bucket_minutes
+        assert [point["sample_count"] for point in series] == [40]
+
+    def test_long_window_uses_hour_rollup(self):
+        """Should aggregate windows past raw retention from the hourly rollup"""
+        manager, pool = make_manager()
+        pool.cur.results = {
+            ab_testing.ROLLUP_AGGREGATE_QUERY: [("control", 100, 20.0, 0.5, 0.7, 2.0, 86400.0)],
+            ab_testing.ROLLUP_HISTOGRAM_QUERY: [("control", ab_testing.latency_slot(20.0), 100)],
+        }
+
+        metrics = manager.get_aggregated_metrics(Variant.CONTROL, hours_back=24 * 30)
+
+        assert metrics.sample_count == 100
+        assert metrics.p50_retrieval_time_ms == pytest.approx(20.0, rel=0.25)
+        assert all("ab_test_metrics" not in query for query, _ in pool.cur.statements)
+
+    def test_retention_runs_hourly(self):
+        """Should prune raw samples and both rollups at most once per interval"""
+        manager, pool = make_manager()
+        assert manager.apply_retention_if_due()
+        assert not manager.apply_retention_if_due()
+
+        tables = [query.split()[2] for query, _ in pool.cur.statements]
+        assert tables == ["ab_test_metrics", "ab_test_rollup_minute", "ab_test_rollup_hour"]
@@ -0,0 +1,128 @@
+"""
+Tests for the parallel fact backfill
+
+Tests:
+- Progress line (throughput / ETA)
+- Range planning: fresh, resumed, and re-planned after a finished run
+
+Note: Range processing against PostgreSQL is covered by the smoke test
+"""
+
+import pytest
+import sys
+import os
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from backfill_facts import format_progress, pending_ranges, plan_ranges
+
+
+class FakeRangeTable:
+    """memory_system.fact_backfill_ranges: run_name -> {range_no: status}"""
+
+    def __init__(self, missing=10):
+        self.runs = {}
+        self.missing = missing  # episodes the ntile() planning query would find
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, table):
+        self.table = table
+        self.rows = []
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchall(self):
+        return self.rows
+
+    def execute(self, query, params):
+        runs = self.table.runs
+        if "COUNT(*) FILTER" in query:
+            ranges = runs.get(params[0], {})
+            self.rows = [(len(ranges), sum(1 for s in ranges.values() if s == 'done'))]
+        elif query.lstrip().startswith("DELETE"):
+            runs.pop(params[0], None)
+        elif "INSERT INTO memory_system.fact_backfill_ranges" in query:
+            run_name, num_ranges = params
+            count = min(num_ranges, self.table.missing)
+            runs[run_name] = {range_no: 'pending' for range_no in range(1, count + 1)}
+            self.rowcount = count
+        elif "status <> 'done'" in query:
+            ranges = runs.get(params[0], {})
+            self.rows = [(n,) for n, s in sorted(ranges.items()) if s != 'done']
+
+
+class TestFormatProgress:
+    """Throughput and ETA reporting"""
+
+    def test_rate_and_eta(self):
+        """Should report rate of this run and ETA for the remainder"""
+        line = format_progress(
+            total=1000, processed=600, facts_written=900, done_ranges=2,
+            ranges=4, processed_this_run=200, elapsed=10.0
+        )
+        assert "600/1000 episodes (60.0%)" in line
+        assert "20 episodes/s" in line
+        assert "ETA 20s" in line
+
+    def test_no_progress_yet(self):
+        """Should not divide by zero before the first batch"""
+        line = format_progress(
+            total=0, processed=0, facts_written=0, done_ranges=0,
+            ranges=0, processed_this_run=0, elapsed=0.0
+        )
+        assert "ETA --" in line
+
+
+class TestPlanRanges:
+    """Planning and resuming runs"""
+
+    def test_fresh_run_planned(self):
+        """Should plan ranges for a new run"""
+        table = FakeRangeTable()
+        assert plan_ranges(table, "default", num_ranges=4, only_missing=True) == 4
+        assert pending_ranges(table, "default") == [1, 2, 3, 4]
+
+    def test_unfinished_run_resumed(self):
+        """Should keep the ranges of an unfinished run and only return those not done"""
+        table = FakeRangeTable()
+        plan_ranges(table, "default", num_ranges=4, only_missing=True)
+        table.runs["default"].update({1: 'done', 2: 'done'})
+
+        assert plan_ranges(table, "default", num_ranges=8, only_missing=True) == 4
+        assert pending_ranges(table, "default") == [3, 4]
+
+    def test_finished_run_planned_again(self):
+        """Should plan a new pass when the default run finished (new episodes)"""
+        table = FakeRangeTable()
+        plan_ranges(table, "default", num_ranges=4, only_missing=True)
+        table.runs["default"] = {n: 'done' for n in table.runs["default"]}
+        table.missing = 2
+
+        assert plan_ranges(table, "default", num_ranges=4, only_missing=True) == 2
+        assert pending_ranges(table, "default") == [1, 2]
+
+    def test_finished_full_run_kept(self):
+        """Should not silently re-extract everything for a finished --all run"""
+        table = FakeRangeTable()
+        plan_ranges(table, "v3", num_ranges=2, only_missing=False)
+        table.runs["v3"] = {n: 'done' for n in table.runs["v3"]}
+
+        assert plan_ranges(table, "v3", num_ranges=2, only_missing=False) == 2
+        assert pending_ranges(table, "v3") == []
@@ -0,0 +1,235 @@
+"""
+Tests for the cross-worker cache backends (LAB_005 / LAB_007)
+
+Tests:
+- Serialization round trip (msgpack or JSON fallback); unsupported types raise
+- LocalCache eviction by weight x recency and TTL
+- RedisCache shared between two "workers" (fake client)
+- TwoTierCache read-through and per-tier stats
+- PrimingCache / PreloadingScheduler on a shared backend
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import numpy as np
+from datetime import datetime
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import cache_backends
+from cache_backends import LocalCache, RedisCache, TwoTierCache, pack, unpack, make_cache_backend
+from spreading_activation import PrimingCache, PrimedEpisode
+from predictive_preloading import PreloadingScheduler, Prediction
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return record
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """The subset of redis.Redis (decode_responses=False) the backend uses"""
+
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def exists(self, key):
+        return int(key in self.values)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.zsets.pop(key, None)
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update({m.encode(): s for m, s in mapping.items()})
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member.encode(), None)
+
+    def zrange(self, key, start, end):
+        return sorted(self.zsets.get(key, {}), key=self.zsets[key].get) if key in self.zsets else []
+
+    def zpopmin(self, key, count):
+        ordered = self.zrange(key, 0, -1)[:count]
+        return [(member, self.zsets[key].pop(member)) for member in ordered]
+
+
+def episode(uuid, activation=0.8):
+    return PrimedEpisode(
+        uuid=uuid, content=f"content {uuid}", embedding=np.arange(4, dtype=np.float32),
+        activation=activation, primed_at=1.0, source_uuid="src"
+    )
+
+
+class TestSerialization:
+    """Values survive the wire format"""
+
+    def test_round_trip_with_bytes(self):
+        """Should keep bytes and plain values"""
+        value = {"a": 1, "b": "x", "emb": b"\x00\x01"}
+        assert unpack(pack(value)) == value
+
+    def test_json_fallback(self, monkeypatch):
+        """Should work without msgpack installed"""
+        monkeypatch.setattr(cache_backends, "msgpack", None)
+        value = {"emb": np.ones(3, dtype=np.float32).tobytes(), "n": 2.5}
+        assert unpack(pack(value)) == value
+
+    @pytest.mark.parametrize("use_msgpack", [True, False])
+    def test_unsupported_type_raises(self, monkeypatch, use_msgpack):
+        """Should refuse values it would otherwise store as their str()"""
+        if not use_msgpack:
+            monkeypatch.setattr(cache_backends, "msgpack", None)
+        with pytest.raises(TypeError):
+            pack({"created_at": datetime(2025, 10, 1)})
+
+
+class TestLocalCache:
+    """In-process tier"""
+
+    def test_evicts_lowest_weight(self):
+        """Should evict the weakest entry, not the oldest"""
+        cache = LocalCache(max_size=2)
+        cache.set("strong", {}, 0.9)
+        cache.set("weak", {}, 0.1)
+        assert cache.set("new", {}, 0.5) == 1
+        assert cache.contains("strong") and not cache.contains("weak")
+
+    def test_ttl(self, monkeypatch):
+        """Should expire entries after ttl"""
+        clock = [100.0]
+        monkeypatch.setattr(cache_backends.time, "time", lambda: clock[0])
+        cache = LocalCache(max_size=2, ttl=5)
+        cache.set("a", {"x": 1}, 1.0)
+        clock[0] += 6
+        assert cache.get("a") is None
+        assert cache.misses == 1
+
+
+class TestRedisCache:
+    """Shared tier"""
+
+    def test_shared_between_workers(self):
+        """Should hit on a worker that did not write the entry"""
+        client = FakeRedis()
+        worker_a = RedisCache(lambda: client, "priming")
+        worker_b = RedisCache(lambda: client, "priming")
+        worker_a.set("ep1", {"content": "hello"}, 0.7)
+
+        entry = worker_b.get("ep1")
+        assert entry.value == {"content": "hello"}
+        assert entry.weight == pytest.approx(0.7)
+        assert worker_b.hits == 1
+
+    def test_evicts_lowest_score_beyond_max_size(self):
+        """Should drop the lowest activation x recency member"""
+        client = FakeRedis()
+        cache = RedisCache(lambda: client, "priming", max_size=2)
+        cache.set("a", {}, 0.9)
+        cache.set("b", {}, 0.05)
+        assert cache.set("c", {}, 0.5) == 1
+        assert not cache.contains("b")
+        assert cache.size() == 2
+
+    def test_unserializable_value_raises(self):
+        """Should surface a TypeError instead of caching a stringified value"""
+        client = FakeRedis()
+        cache = RedisCache(lambda: client, "preload")
+        with pytest.raises(TypeError):
+            cache.set("ep1", {"created_at": datetime(2025, 10, 1)}, 0.5)
+        assert cache.get("ep1") is None
+
+    def test_unavailable_redis_is_a_miss(self):
+        """Should not raise without a client"""
+        cache = RedisCache(lambda: None, "priming")
+        assert cache.set("a", {}, 1.0) == 0
+        assert cache.get("a") is None
+
+
+class TestTwoTierCache:
+    """Local in front of Redis"""
+
+    def test_remote_hit_fills_local(self):
+        """Should serve the second read from the local tier"""
+        client = FakeRedis()
+        writer = make_cache_backend("priming", 10, lambda: client, kind="two_tier")
+        reader = make_cache_backend("priming", 10, lambda: client, kind="two_tier")
+        writer.set("ep1", {"v": 1}, 0.5)
+
+        assert reader.get("ep1").value == {"v": 1}
+        assert reader.get("ep1").value == {"v": 1}
+        stats = reader.get_stats()
+        assert stats["tiers"]["redis"]["hits"] == 1
+        assert stats["tiers"]["local"]["hits"] == 1
+        assert stats["hit_rate"] == 1.0
+
+    def test_local_only_without_client_getter(self):
+        """Should fall back to LocalCache"""
+        assert isinstance(make_cache_backend("priming", 10, None), LocalCache)
+
+
+class TestCacheUsers:
+    """LAB_005 / LAB_007 caches on a shared backend"""
+
+    def test_primed_on_one_worker_hit_on_other(self):
+        """/memory/primed fast path works regardless of the priming worker"""
+        client = FakeRedis()
+        worker_a = PrimingCache(50, RedisCache(lambda: client, "priming"))
+        worker_b = PrimingCache(50, RedisCache(lambda: client, "priming"))
+        worker_a.add(episode("ep1"))
+
+        primed = worker_b.get("ep1")
+        assert primed.content == "content ep1"
+        assert primed.embedding.tolist() == [0.0, 1.0, 2.0, 3.0]
+        assert worker_b.get_hit_rate() == 1.0
+
+    def test_priming_cache_stats_fields(self):
+        """Should keep the stats fields the API returns"""
+        cache = PrimingCache(max_size=2)
+        cache.add(episode("a", 0.4))
+        cache.add(episode("b", 0.8))
+        stats = cache.get_stats()
+        assert stats["size"] == 2 and stats["max_size"] == 2
+        assert stats["avg_activation"] == pytest.approx(0.6)
+
+    def test_preload_scheduler_counts_evictions_as_waste(self):
+        """Should evict by confidence x recency through the backend"""
+        scheduler = PreloadingScheduler(max_cache_size=1)
+
+        async def fetch(episode_id):
+            return {"episode_id": episode_id}
+
+        predictions = [Prediction("a", 0.9, ["pattern"]), Prediction("b", 0.6, ["pattern"])]
+        asyncio.run(scheduler.preload_predictions(predictions, fetch))
+        assert scheduler.metrics["preload_success"] == 2
+        assert scheduler.metrics["preload_wasted"] == 1
+        assert scheduler.get_cached("b") == {"episode_id": "b"}
+        assert scheduler.get_cache_stats()["cache_size"] == 1
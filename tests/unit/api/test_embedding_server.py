@@ -0,0 +1,177 @@
+"""
+Tests for the shared embedding server
+
+Tests:
+- Vectors round-trip over the Unix socket unchanged
+- Concurrent requests from separate connections share model calls
+- Server errors reach the client; the connection stays usable
+- Clients reconnect after a server restart
+- SharedEmbeddingModel falls back in-process while the server is down
+  and releases that model once the server is back
+"""
+
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from embedding_server import (
+    EmbeddingBatcher, EmbeddingClient, EmbeddingServer, EmbeddingServerError,
+    EmbeddingServerUnavailable, SharedEmbeddingModel
+)
+
+
+DIMENSION = 8
+
+
+def fake_vector(text: str) -> np.ndarray:
+    rng = np.random.default_rng(sum(text.encode()))
+    return rng.standard_normal(DIMENSION).astype(np.float32)
+
+
+class FakeModel:
+    """Deterministic stand-in for SentenceTransformer; records each call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, sentences, **kwargs):
+        if isinstance(sentences, str):
+            return fake_vector(sentences)
+        self.calls.append(list(sentences))
+        if any(text == "boom" for text in sentences):
+            raise ValueError("boom")
+        return np.stack([fake_vector(text) for text in sentences])
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 bytes; pytest's tmp_path can be longer
+    directory = tempfile.mkdtemp(prefix="emb-")
+    yield os.path.join(directory, "embeddings.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def start_server(socket_path, model, max_wait_ms=2.0):
+    batcher = EmbeddingBatcher(model.encode, max_batch=64, max_wait_ms=max_wait_ms)
+    server = EmbeddingServer(socket_path, batcher, model_name="fake")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def stop_server(server):
+    server.shutdown()
+    server.server_close()
+    server.batcher.close()
+
+
+class TestServer:
+    """Protocol and batching"""
+
+    def test_round_trip(self, socket_path):
+        """Should return the model's vectors exactly, in request order"""
+        server = start_server(socket_path, FakeModel())
+        try:
+            client = EmbeddingClient(socket_path, timeout=5)
+            texts = ["alpha", "beta", "gamma"]
+            vectors = client.encode(texts)
+
+            assert vectors.shape == (3, DIMENSION) and vectors.dtype == np.float32
+            assert np.array_equal(vectors, np.stack([fake_vector(t) for t in texts]))
+            assert client.encode([]).shape[0] == 0
+
+            info = client.ping()
+            assert info["model"] == "fake" and info["dimension"] == DIMENSION
+            assert info["stats"]["texts"] == 3
+        finally:
+            stop_server(server)
+
+    def test_batches_across_connections(self, socket_path):
+        """Should merge concurrent requests from different clients into fewer model calls"""
+        model = FakeModel()
+        server = start_server(socket_path, model, max_wait_ms=100)
+        results = {}
+        barrier = threading.Barrier(8)
+
+        def request(i):
+            client = EmbeddingClient(socket_path, timeout=5)  # one connection per "worker"
+            barrier.wait()
+            results[i] = client.encode([f"text-{i}"])
+            client.close()
+
+        try:
+            threads = [threading.Thread(target=request, args=(i,)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            stop_server(server)
+
+        assert len(model.calls) < 8
+        assert sum(len(call) for call in model.calls) == 8
+        for i in range(8):
+            assert np.array_equal(results[i][0], fake_vector(f"text-{i}"))
+
+    def test_error_reaches_client(self, socket_path):
+        """Should raise the server's error and keep serving the same connection"""
+        server = start_server(socket_path, FakeModel())
+        try:
+            client = EmbeddingClient(socket_path, timeout=5)
+            with pytest.raises(EmbeddingServerError):
+                client.encode(["boom"])
+            assert client.encode(["fine"]).shape == (1, DIMENSION)
+        finally:
+            stop_server(server)
+
+    def test_reconnects_after_restart(self, socket_path):
+        """Should retry on a fresh connection when the old one was closed"""
+        client = EmbeddingClient(socket_path, timeout=5)
+        server = start_server(socket_path, FakeModel())
+        client.encode(["before"])
+        stop_server(server)
+
+        server = start_server(socket_path, FakeModel())
+        try:
+            assert np.array_equal(client.encode(["after"])[0], fake_vector("after"))
+        finally:
+            stop_server(server)
+
+
+class TestFallback:
+    """In-process model while the server is down"""
+
+    def test_falls_back_and_returns_to_server(self, socket_path):
+        """Should encode in-process while unreachable, then use the server again"""
+        local = FakeModel()
+        model = SharedEmbeddingModel(EmbeddingClient(socket_path, timeout=1), load_local=lambda: local, retry_seconds=0)
+
+        assert not model.wait_for_server(timeout=0)
+        assert np.array_equal(model.encode("query"), fake_vector("query"))
+        assert model.local_model is local
+
+        remote = FakeModel()
+        server = start_server(socket_path, remote)
+        try:
+            vector = model.encode("query")
+            assert np.array_equal(vector, fake_vector("query"))
+            assert remote.calls == [["query"]]
+            assert model.backend == "server"
+            assert model.local_model is None
+        finally:
+            stop_server(server)
+
+    def test_no_fallback_raises(self, socket_path):
+        """Should raise when the server is down and no in-process model is allowed"""
+        model = SharedEmbeddingModel(EmbeddingClient(socket_path, timeout=1))
+        with pytest.raises(EmbeddingServerUnavailable):
+            model.encode("query")
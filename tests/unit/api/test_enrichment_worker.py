@@ -0,0 +1,252 @@
+"""
+Tests for the ingest-time enrichment worker
+
+Tests:
+- Batch context query for LAB_001 salience (one query, neutral without context)
+- Set-based batch writes (scores, metadata, facts COPY, queue done)
+- Novelty scored against the pre-batch baselines, folded in after commit
+- Failing batch retried one episode at a time
+
+Note: LISTEN/NOTIFY and the queue trigger are covered by the smoke test
+"""
+
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Add src/api and src/workers to path
+src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src")
+sys.path.insert(0, os.path.join(src_path, "api"))
+sys.path.insert(0, os.path.join(src_path, "workers"))
+
+import enrichment_worker
+from enrichment_worker import EnrichmentWorker
+from emotional_salience_scorer import (
+    EmotionalSalienceScorer, EmotionalState, SomaticMarker, CONTEXT_BATCH_QUERY
+)
+from novelty_detector import NoveltyDetector, Episode
+
+
+NOW = datetime(2025, 10, 27, 12, 0, tzinfo=timezone.utc)
+
+
+def embedding_text(seed: int) -> str:
+    vector = np.random.default_rng(seed).normal(size=8)
+    return "[" + ",".join(f"{v:.6f}" for v in vector) + "]"
+
+
+class FakeDB:
+    """Episodes + emotional context served to FakeCursor; records writes"""
+
+    def __init__(self, episodes, contexts=None, fail_on=None):
+        self.episodes = episodes          # id -> (content, embedding, created_at, metadata, tags)
+        self.contexts = contexts or {}    # id -> context row tail (15 values)
+        self.fail_on = fail_on
+        self.queries = []
+        self.score_writes = []
+        self.copied = []
+        self.done = []
+        self.failed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+
+class FakeCopy:
+    def __init__(self, db):
+        self.db = db
+
+    def write_row(self, row):
+        self.db.copied.append(row)
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        db = self.db
+        db.queries.append(query)
+        self.result = []
+        if query is enrichment_worker.EPISODES_QUERY:
+            ids = [str(i) for i in params[0]]
+            rows = [(i, *db.episodes[i]) for i in ids if i in db.episodes]
+            self.result = sorted(rows, key=lambda row: row[3])
+        elif query is CONTEXT_BATCH_QUERY:
+            self.result = [
+                (i, *db.contexts.get(i, (None,) * 15)) for i in params[0]
+            ]
+        elif query is enrichment_worker.WRITE_SCORES_QUERY:
+            if db.fail_on is not None and db.fail_on in params[1]:
+                raise RuntimeError("bad episode")
+            db.score_writes.append(params)
+        elif query is enrichment_worker.MARK_DONE_QUERY:
+            db.done.extend(str(i) for i in params[0])
+        elif query is enrichment_worker.MARK_FAILED_QUERY:
+            db.failed.append(str(params[2]))
+            self.result = [(False,)]
+
+    def fetchall(self):
+        return self.result
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    @contextmanager
+    def copy(self, statement):
+        yield FakeCopy(self.db)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        self.db.commits += 1
+
+    def rollback(self):
+        self.db.rollbacks += 1
+
+
+def make_db(n=3, **kwargs):
+    episodes = {}
+    for i in range(n):
+        episode_id = f"00000000-0000-0000-0000-00000000000{i}"
+        content = "Version: NEXUS V2.0.0\nStatus: COMPLETE" if i == 0 else f"plain note {i}"
+        episodes[episode_id] = (content, embedding_text(i), NOW + timedelta(minutes=i), {}, ["test"])
+    return FakeDB(episodes, **kwargs)
+
+
+def make_worker(db, detector=None):
+    worker = EnrichmentWorker(conn_string="unused", detector=detector or NoveltyDetector(), scorer=EmotionalSalienceScorer())
+    worker.conn = FakeConnection(db)
+    return worker
+
+
+def fitted_detector():
+    detector = NoveltyDetector()
+    history = [
+        Episode(
+            episode_id=f"h{i}", content="history", created_at=NOW - timedelta(hours=i),
+            embedding=np.random.default_rng(100 + i).normal(size=8).astype(np.float32),
+            somatic_7d={}
+        )
+        for i in range(20)
+    ]
+    detector.build_baseline_models(history)
+    return detector
+
+
+# ============================================================================
+# LAB_001 batch context
+# ============================================================================
+
+class TestBatchSalience:
+    """One context query per batch"""
+
+    def test_one_query_for_whole_batch(self):
+        """Should score every episode from a single context query"""
+        emotional = (0.9, 0.7, 0.1, 0.2, 0.1, 0.0, 0.0, 0.9, 0.5, NOW)
+        somatic = ("breakthrough", 0.8, 0.7, 0.9, NOW)
+        db = make_db(contexts={"a": emotional + somatic})
+        cur = FakeCursor(db)
+        scorer = EmotionalSalienceScorer()
+
+        scores = scorer.batch_calculate_salience(
+            [{"episode_id": "a", "timestamp": NOW}, {"episode_id": "b", "timestamp": NOW}],
+            cursor=cur
+        )
+
+        assert db.queries == [CONTEXT_BATCH_QUERY]
+        expected = scorer.score_context(
+            EmotionalState(*emotional[:9], created_at=NOW),
+            SomaticMarker("breakthrough", 0.8, 0.7, 0.9, NOW)
+        )
+        assert scores["a"].total_score == pytest.approx(expected.total_score)
+        assert scores["a"].breakthrough_bonus == 0.3
+
+    def test_neutral_without_context(self):
+        """Should return the neutral 0.5 when no emotional state precedes the episode"""
+        cur = FakeCursor(make_db())
+        scores = EmotionalSalienceScorer().batch_calculate_salience(
+            [{"episode_id": "b", "timestamp": NOW}], cursor=cur
+        )
+        assert scores["b"].total_score == 0.5
+        assert not scores["b"].has_emotional_context
+
+
+# ============================================================================
+# Batch processing
+# ============================================================================
+
+class TestProcessBatch:
+    """Set-based writes, one transaction per batch"""
+
+    def test_writes_whole_batch_set_based(self):
+        """Should issue one score UPDATE, one facts COPY and one queue update"""
+        db = make_db(n=3)
+        worker = make_worker(db)
+
+        enriched = worker.process_batch(list(db.episodes))
+
+        assert enriched == 3
+        assert len(db.score_writes) == 1
+        version, ids, novelty, salience, patches = db.score_writes[0]
+        assert version == enrichment_worker.ENRICHMENT_VERSION
+        assert ids == sorted(db.episodes)
+        assert salience == [0.5, 0.5, 0.5]
+        assert patches[0].obj["facts"]["nexus_version"] == "2.0.0"
+        assert "facts" not in patches[1].obj
+        assert {row[1] for row in db.copied} >= {"nexus_version", "status"}
+        assert sorted(db.done) == sorted(db.episodes)
+        assert db.commits == 1
+
+    def test_query_count_independent_of_batch_size(self):
+        """Should not issue per-episode queries"""
+        small, large = make_db(n=2), make_db(n=9)
+        make_worker(small).process_batch(list(small.episodes))
+        make_worker(large).process_batch(list(large.episodes))
+        assert len(small.queries) == len(large.queries)
+
+    def test_novelty_scored_before_baseline_update(self):
+        """Should score against the old baselines and fold the batch in after commit"""
+        db = make_db(n=3)
+        detector = fitted_detector()
+        trained = detector.baseline_models.episodes_trained
+        worker = make_worker(db, detector)
+
+        worker.process_batch(list(db.episodes))
+
+        _, _, novelty, _, patches = db.score_writes[0]
+        assert all(0.0 <= score <= 1.0 for score in novelty)
+        assert set(patches[0].obj["novelty_breakdown"]) == {
+            "semantic_novelty", "emotional_surprise", "pattern_violation", "contextual_mismatch"
+        }
+        assert detector.baseline_models.episodes_trained == trained + 3
+        assert detector.online_updates == 1
+
+    def test_failing_batch_retried_one_by_one(self):
+        """Should enrich the good episodes and mark only the bad one failed"""
+        bad = "00000000-0000-0000-0000-000000000001"
+        db = make_db(n=3, fail_on=bad)
+        worker = make_worker(db)
+
+        enriched = worker.process_batch(list(db.episodes))
+
+        assert enriched == 2
+        assert db.failed == [bad]
+        assert bad not in db.done
+        assert db.rollbacks == 2  # the batch, then the single bad episode
@@ -0,0 +1,147 @@
+"""
+Tests for the LAB_007 async episode fetcher
+
+Tests:
+- Concurrent fetch() calls share one ANY(...) query
+- Missing episodes raise LookupError
+- The coalescing flush task is strongly referenced while in flight
+- Pool is created once, lazily
+- Predictive preloading end-to-end through the fetcher
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import uuid
+from datetime import datetime
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from episode_fetcher import EpisodeFetcher
+from predictive_preloading import PredictivePreloadingEngine
+
+
+def make_episode_row(episode_id):
+    return {
+        "episode_id": uuid.UUID(episode_id),
+        "content": f"content {episode_id[:8]}",
+        "importance_score": 0.5,
+        "tags": ["test"],
+        "created_at": datetime(2025, 10, 1),
+    }
+
+
+class FakePool:
+    """asyncpg pool stand-in holding a fixed set of episodes"""
+
+    def __init__(self, episode_ids):
+        self.rows = {episode_id: make_episode_row(episode_id) for episode_id in episode_ids}
+        self.queries = []
+
+    async def fetch(self, query, ids):
+        self.queries.append(list(ids))
+        return [self.rows[i] for i in ids if i in self.rows]
+
+    async def execute(self, query, *args):
+        self.queries.append(list(args))
+
+    async def close(self):
+        pass
+
+
+def make_fetcher(pool):
+    created = []
+
+    async def factory(dsn, min_size, max_size):
+        created.append(dsn)
+        return pool
+
+    return EpisodeFetcher("postgresql://test", pool_factory=factory), created
+
+
+IDS = [str(uuid.UUID(int=i + 1)) for i in range(5)]
+
+
+class TestEpisodeFetcher:
+    """Batching and error handling"""
+
+    def test_concurrent_fetches_coalesce(self):
+        """Should load gathered fetches with one query"""
+        pool = FakePool(IDS)
+        fetcher, created = make_fetcher(pool)
+
+        async def run():
+            return await asyncio.gather(*[fetcher.fetch(i) for i in IDS[:3]])
+
+        episodes = asyncio.run(run())
+        assert [e["episode_id"] for e in episodes] == IDS[:3]
+        assert pool.queries == [IDS[:3]]
+        assert created == ["postgresql://test"]
+        assert fetcher.get_stats()["episodes_per_query"] == 3
+
+    def test_flush_task_referenced_until_done(self):
+        """Should hold the flush task while it runs and drop it afterwards"""
+        pool = FakePool(IDS)
+        fetcher, _ = make_fetcher(pool)
+
+        async def run():
+            fetch = asyncio.ensure_future(fetcher.fetch(IDS[0]))
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            in_flight = len(fetcher._flush_tasks)
+            await fetch
+            await asyncio.sleep(0)
+            return in_flight, len(fetcher._flush_tasks)
+
+        assert asyncio.run(run()) == (1, 0)
+
+    def test_missing_episode(self):
+        """Should raise LookupError only for the missing id"""
+        pool = FakePool(IDS[:1])
+        fetcher, _ = make_fetcher(pool)
+
+        async def run():
+            return await asyncio.gather(fetcher.fetch(IDS[0]), fetcher.fetch(IDS[1]), return_exceptions=True)
+
+        found, missing = asyncio.run(run())
+        assert found["content"].startswith("content")
+        assert isinstance(missing, LookupError)
+
+    def test_fetch_many_deduplicates(self):
+        """Should query each id once"""
+        pool = FakePool(IDS)
+        fetcher, _ = make_fetcher(pool)
+        episodes = asyncio.run(fetcher.fetch_many([IDS[0], IDS[0], IDS[1]]))
+        assert set(episodes) == {IDS[0], IDS[1]}
+        assert pool.queries == [[IDS[0], IDS[1]]]
+
+    def test_record_is_json_ready(self):
+        """Should return strings for ids and timestamps"""
+        fetcher, _ = make_fetcher(FakePool(IDS))
+        episode = asyncio.run(fetcher.fetch(IDS[0]))
+        assert episode["created_at"] == "2025-10-01T00:00:00"
+        assert episode["tags"] == ["test"]
+
+
+class TestPreloadingThroughFetcher:
+    """Learned sequences are preloaded with batched fetches"""
+
+    def test_learned_successor_is_preloaded(self):
+        """Should serve the predicted next episode from the cache"""
+        pool = FakePool(IDS)
+        fetcher, _ = make_fetcher(pool)
+        engine = PredictivePreloadingEngine(min_confidence=0.5)
+
+        async def run():
+            # a -> b twice, then a again: b is predicted and preloaded
+            for episode_id in [IDS[0], IDS[1], IDS[0], IDS[1], IDS[0]]:
+                await engine.on_episode_access(episode_id, set(), None, None, fetcher.fetch)
+
+        asyncio.run(run())
+        assert engine.get_cached(IDS[1])["episode_id"] == IDS[1]
+        stats = engine.get_stats()["preload_scheduler"]
+        assert stats["preload_used"] == 1
+        assert stats["preload_used_rate"] > 0
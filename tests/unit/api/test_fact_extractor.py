@@ -0,0 +1,69 @@
+"""
+Tests for the compiled fact extraction engine
+
+Tests:
+- Compiled + prefiltered engine matches per-pattern re.search results
+- Extraction metadata on non-empty results
+"""
+
+import pytest
+import re
+import sys
+import os
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from fact_extractor import FACT_PATTERNS, extract_raw_facts, extract_facts_from_content
+
+
+SAMPLES = [
+    "Version: NEXUS V2.0.0\nStatus: COMPLETE\nDMR Accuracy: 100.0% (50/50 queries)\nLatency: 10.63ms avg",
+    "Phase 4 pending. Session 12: 3 bugs, 2 errors, 539 lines. decay_score: 0.42",
+    "Benchmark: LongMemEval. Score: 91.2 vs 94.8% (Zep SOTA)",
+    "commit: abc123def456 - Implementing: Priming Cache.",
+    "Just a plain note about the weekend, nothing measurable here.",
+    "",
+]
+
+
+def raw_first_match(content, fact_type):
+    """Reference: first matching raw pattern, as the original extractor did"""
+    for pattern in FACT_PATTERNS[fact_type]:
+        match = re.search(pattern, content, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+class TestCompiledEngine:
+    """Prefilter must never hide a match"""
+
+    @pytest.mark.parametrize("content", SAMPLES)
+    def test_same_fact_types_as_reference(self, content):
+        """Should extract exactly the fact types the raw patterns match"""
+        expected = {ft for ft in FACT_PATTERNS if raw_first_match(content, ft)}
+        assert set(extract_raw_facts(content)) == expected
+
+    def test_typed_values(self):
+        """Should convert values per fact type"""
+        facts = extract_raw_facts(SAMPLES[0])
+        assert facts["nexus_version"] == "2.0.0"
+        assert facts["accuracy_percent"] == 100.0
+        assert facts["status"] == "COMPLETE"
+        assert facts["query_count"] == 50
+
+
+class TestExtractFactsFromContent:
+    """Public API"""
+
+    def test_adds_extraction_metadata(self):
+        """Should add method and confidence when facts were found"""
+        facts = extract_facts_from_content(SAMPLES[1])
+        assert facts["extraction_method"] == "auto"
+        assert 0.0 < facts["extraction_confidence"] <= 1.0
+
+    def test_empty_when_no_facts(self):
+        """Should return empty dict without metadata"""
+        assert extract_facts_from_content("") == {}
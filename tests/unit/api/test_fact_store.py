@@ -0,0 +1,96 @@
+"""
+Tests for the typed fact store
+
+Tests:
+- Typed value split / round-trip
+- Extractor output -> episode_facts rows
+- Parameterized query composition
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import fact_store
+
+
+class FakeCursor:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+class TestTypedValues:
+    """value_text / value_num round-trip"""
+
+    @pytest.mark.parametrize("value", [553, 10.63, 100.0, "2.0.0", "COMPLETE"])
+    def test_round_trip(self, value):
+        """Should return the same value and type"""
+        restored = fact_store.fact_value(*fact_store.split_value(value))
+        assert restored == value
+        assert type(restored) is type(value)
+
+    def test_numeric_has_value_num(self):
+        """Should fill value_num for numbers only"""
+        assert fact_store.split_value(12)[1] == 12.0
+        assert fact_store.split_value("2.0.0")[1] is None
+
+
+class TestFactRows:
+    """Extractor output -> rows"""
+
+    def test_skips_bookkeeping_keys(self):
+        """Should not store extraction metadata as facts"""
+        created_at = datetime(2025, 10, 1, tzinfo=timezone.utc)
+        facts = {
+            "nexus_version": "2.0.0",
+            "episode_count": 553,
+            "extraction_method": "auto",
+            "extraction_confidence": 0.6,
+            "last_updated": "2025-10-01T00:00:00"
+        }
+        rows = fact_store.fact_rows("ep-1", facts, created_at)
+
+        assert {r[1] for r in rows} == {"nexus_version", "episode_count"}
+        assert all(r[4] == 0.6 for r in rows)
+        assert all(r[5] == created_at for r in rows)
+
+    def test_empty_facts(self):
+        """Should produce no rows"""
+        assert fact_store.fact_rows("ep-1", {}, datetime.now()) == []
+
+
+class TestQueryFacts:
+    """Query composition"""
+
+    def test_fact_type_is_parameterized(self):
+        """Should never interpolate fact_type into SQL"""
+        cur = FakeCursor()
+        fact_store.query_facts(cur, "nexus_version'; DROP TABLE x; --")
+        query, params = cur.executed[0]
+
+        assert "DROP TABLE" not in query
+        assert params["fact_type"].startswith("nexus_version'")
+        assert "JOIN" not in query
+
+    def test_tags_join_and_order(self):
+        """Should join episodes only when filtering by tags"""
+        cur = FakeCursor([("ep-1", "553", 553.0, 0.7, None)])
+        facts = fact_store.query_facts(cur, "episode_count", filter_tags=["milestone"], order="asc", limit=5)
+        query, params = cur.executed[0]
+
+        assert "JOIN nexus_memory.zep_episodic_memory" in query
+        assert "ORDER BY f.created_at ASC" in query
+        assert params["limit"] == 5
+        assert facts[0].value == 553
@@ -0,0 +1,434 @@
+"""
+Tests for the background job runner
+
+Tests:
+- Job lifecycle persisted in the store (running -> succeeded / failed)
+- Per-type concurrency limit
+- Cancellation (pending immediately, running at the next checkpoint)
+- Multi-day fan-out (parent job aggregates its children)
+- Startup recovery of jobs left running by a dead worker
+- Job context crosses the process boundary without the pool
+- Job functions connect with the job's conninfo
+
+Note: job functions run on a thread pool here; production uses a spawned process pool
+"""
+
+import pytest
+import sys
+import os
+import time
+import pickle
+import asyncio
+import threading
+import uuid
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import job_runner
+from job_runner import JobRunner, JobStore, JobContext, JobStatus
+
+
+class FakeJobStore:
+    """In-memory memory_system.jobs with the JobStore interface"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.conninfo = None
+
+    def create(self, job_type, params, parent_job_id=None, status='pending'):
+        job_id = str(uuid.uuid4())
+        with self.lock:
+            self.jobs[job_id] = JobStatus(
+                job_id=job_id, job_type=job_type, status=status, params=params,
+                progress=0.0, parent_job_id=parent_job_id, created_at=datetime.now()
+            )
+        return job_id
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            children = [j for j in self.jobs.values() if j.parent_job_id == job_id]
+        return JobStatus(**{**job.__dict__, "children": children})
+
+    def claim(self, job_id, job_type, max_concurrency):
+        with self.lock:
+            running = sum(1 for j in self.jobs.values() if j.job_type == job_type and j.status == 'running')
+            job = self.jobs[job_id]
+            if job.status == 'pending' and not job.cancel_requested and running < max_concurrency:
+                job.status = 'running'
+                job.heartbeat_at = datetime.now()
+            return job.status
+
+    def heartbeat(self, job_id):
+        with self.lock:
+            self.jobs[job_id].heartbeat_at = datetime.now()
+
+    def progress(self, job_id, progress, message=None):
+        with self.lock:
+            job = self.jobs[job_id]
+            job.progress, job.progress_message = progress, message
+            return job.cancel_requested
+
+    def finish(self, job_id, status, result=None, error=None):
+        with self.lock:
+            job = self.jobs[job_id]
+            job.status, job.result, job.last_error = status, result, error
+            if status == 'succeeded':
+                job.progress = 1.0
+
+    def request_cancel(self, job_id):
+        with self.lock:
+            for job in self.jobs.values():
+                if (job.job_id == job_id or job.parent_job_id == job_id) and job.status in ('pending', 'running'):
+                    job.cancel_requested = True
+                    if job.status == 'pending':
+                        job.status = 'cancelled'
+
+    def interrupt_stale(self, stale_seconds):
+        cutoff = datetime.now() - timedelta(seconds=stale_seconds)
+        with self.lock:
+            stale = [j.job_id for j in self.jobs.values()
+                     if j.status == 'running' and (j.heartbeat_at or j.created_at) < cutoff]
+            orphans = [j.job_id for j in self.jobs.values()
+                       if j.status == 'pending' and j.parent_job_id in stale]
+            for job_id in stale + orphans:
+                self.jobs[job_id].status = 'interrupted'
+        return stale + orphans
+
+    def interrupt(self, job_ids):
+        with self.lock:
+            for job_id in job_ids:
+                if self.jobs[job_id].status in ('pending', 'running'):
+                    self.jobs[job_id].status = 'interrupted'
+
+
+# Job functions: fn(ctx, **params)
+
+ACTIVE = {"now": 0, "peak": 0}
+ACTIVE_LOCK = threading.Lock()
+
+
+def add(ctx, a, b):
+    return {"sum": a + b}
+
+
+def boom(ctx):
+    raise RuntimeError("bad day")
+
+
+def slow(ctx, steps=10, delay=0.01):
+    with ACTIVE_LOCK:
+        ACTIVE["now"] += 1
+        ACTIVE["peak"] = max(ACTIVE["peak"], ACTIVE["now"])
+    try:
+        for i in range(steps):
+            ctx.checkpoint(i / steps, f"step {i}", force=True)
+            time.sleep(delay)
+        return {"steps": steps}
+    finally:
+        with ACTIVE_LOCK:
+            ACTIVE["now"] -= 1
+
+
+def day_job(ctx, date):
+    if date == "2025-10-02":
+        raise RuntimeError("no such day")
+    return {"date": date}
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(job_runner, "JOB_SLOT_POLL_SECONDS", 0.005)
+    ACTIVE.update(now=0, peak=0)
+
+
+def make_runner(**limits):
+    store = FakeJobStore()
+    runner = JobRunner(store, executor=ThreadPoolExecutor(max_workers=8))
+    runner.register("add", add)
+    runner.register("boom", boom)
+    runner.register("slow", slow, max_concurrency=limits.get("slow", 1))
+    runner.register("day", day_job, max_concurrency=limits.get("day", 2))
+    return runner, store
+
+
+async def wait_finished(runner, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = await runner.get(job_id)
+        if job.finished:
+            return job
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+async def wait_status(runner, job_id, status, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if (await runner.get(job_id)).status == status:
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+# ============================================================================
+# Lifecycle
+# ============================================================================
+
+class TestLifecycle:
+    """Outcome persisted in the job store"""
+
+    def test_success_records_result(self):
+        """Should run the job and store its result with full progress"""
+        async def run():
+            runner, _ = make_runner()
+            job_id = await runner.submit("add", {"a": 2, "b": 3})
+            return await wait_finished(runner, job_id)
+
+        job = asyncio.run(run())
+        assert job.status == 'succeeded'
+        assert job.result == {"sum": 5}
+        assert job.progress == 1.0
+
+    def test_failure_records_error(self):
+        """Should mark the job failed with the exception message"""
+        async def run():
+            runner, _ = make_runner()
+            job_id = await runner.submit("boom")
+            return await wait_finished(runner, job_id)
+
+        job = asyncio.run(run())
+        assert job.status == 'failed'
+        assert job.last_error == "bad day"
+
+    def test_wait_returns_final_status(self):
+        """Should wait for a local job and return None for unknown ones"""
+        async def run():
+            runner, _ = make_runner()
+            job_id = await runner.submit("slow", {"steps": 3})
+            return await runner.wait(job_id), await runner.wait("elsewhere")
+
+        assert asyncio.run(run()) == ('succeeded', None)
+
+    def test_unknown_type_rejected(self):
+        """Should refuse job types that are not registered"""
+        runner, store = make_runner()
+        with pytest.raises(ValueError):
+            asyncio.run(runner.submit("nope"))
+        assert store.jobs == {}
+
+
+# ============================================================================
+# Concurrency
+# ============================================================================
+
+class TestConcurrencyLimit:
+    """Per-type limits"""
+
+    def test_limit_caps_parallel_jobs(self):
+        """Should never run more jobs of a type than its limit"""
+        async def run():
+            runner, _ = make_runner(slow=2)
+            ids = [await runner.submit("slow", {"steps": 5}) for _ in range(6)]
+            return [await wait_finished(runner, job_id) for job_id in ids]
+
+        jobs = asyncio.run(run())
+        assert all(job.status == 'succeeded' for job in jobs)
+        assert ACTIVE["peak"] == 2
+
+
+# ============================================================================
+# Cancellation
+# ============================================================================
+
+class TestCancellation:
+    """Pending jobs never start; running ones stop at a checkpoint"""
+
+    def test_cancel_pending_job(self):
+        """Should cancel a job still waiting for a slot without running it"""
+        async def run():
+            runner, store = make_runner(slow=1)
+            first = await runner.submit("slow", {"steps": 20})
+            await wait_status(runner, first, 'running')
+            second = await runner.submit("slow", {"steps": 20})
+            await runner.cancel(second)
+            return await wait_finished(runner, first), await wait_finished(runner, second)
+
+        first, second = asyncio.run(run())
+        assert first.status == 'succeeded'
+        assert second.status == 'cancelled'
+        assert second.progress == 0.0
+
+    def test_cancel_running_job(self):
+        """Should stop a running job at its next checkpoint"""
+        async def run():
+            runner, _ = make_runner()
+            job_id = await runner.submit("slow", {"steps": 500})
+            await wait_status(runner, job_id, 'running')
+            await asyncio.sleep(0.05)
+            await runner.cancel(job_id)
+            return await wait_finished(runner, job_id)
+
+        job = asyncio.run(run())
+        assert job.status == 'cancelled'
+        assert 0.0 < job.progress < 1.0
+
+
+# ============================================================================
+# Fan-out
+# ============================================================================
+
+class TestFanOut:
+    """Parent job over one child job per day"""
+
+    def test_parent_aggregates_children(self):
+        """Should finish the parent once all children succeeded"""
+        async def run():
+            runner, _ = make_runner()
+            dates = ["2025-10-0%d" % d for d in (3, 4, 5)]
+            parent = await runner.submit_fanout("day_range", "day", [{"date": d} for d in dates])
+            return await wait_finished(runner, parent)
+
+        parent = asyncio.run(run())
+        assert parent.status == 'succeeded'
+        assert len(parent.children) == 3
+        assert all(child.status == 'succeeded' for child in parent.children)
+        assert set(parent.result["jobs"].values()) == {'succeeded'}
+        assert parent.progress == 1.0
+
+    def test_failed_child_fails_parent(self):
+        """Should fail the parent but still run the other days"""
+        async def run():
+            runner, _ = make_runner()
+            parent = await runner.submit_fanout(
+                "day_range", "day", [{"date": d} for d in ("2025-10-01", "2025-10-02", "2025-10-03")]
+            )
+            return await wait_finished(runner, parent)
+
+        parent = asyncio.run(run())
+        assert parent.status == 'failed'
+        assert parent.last_error == "1 of 3 jobs failed"
+        assert sorted(child.status for child in parent.children) == ['failed', 'succeeded', 'succeeded']
+
+    def test_cancel_parent_cancels_children(self):
+        """Should cancel the children of a cancelled parent"""
+        async def run():
+            runner, _ = make_runner(slow=1)
+            parent = await runner.submit_fanout("slow_range", "slow", [{"steps": 300}] * 3)
+            await asyncio.sleep(0.05)
+            await runner.cancel(parent)
+            return await wait_finished(runner, parent)
+
+        parent = asyncio.run(run())
+        assert parent.status == 'cancelled'
+        assert {child.status for child in parent.children} == {'cancelled'}
+
+
+# ============================================================================
+# Recovery
+# ============================================================================
+
+class TestRecovery:
+    """Jobs orphaned by a dead worker"""
+
+    def test_stale_running_jobs_interrupted(self):
+        """Should interrupt running jobs without a recent heartbeat and their pending children"""
+        runner, store = make_runner()
+        old = datetime.now() - timedelta(seconds=job_runner.STALE_HEARTBEAT_SECONDS + 60)
+        dead = store.create("slow", {}, status='running')
+        store.jobs[dead].heartbeat_at = old
+        child = store.create("slow", {}, parent_job_id=dead)
+        alive = store.create("slow", {}, status='running')
+        store.jobs[alive].heartbeat_at = datetime.now()
+
+        recovered = asyncio.run(runner.recover_stale())
+
+        assert sorted(recovered) == sorted([dead, child])
+        assert store.jobs[dead].status == 'interrupted'
+        assert store.jobs[child].status == 'interrupted'
+        assert store.jobs[alive].status == 'running'
+
+    def test_recovery_failure_does_not_raise(self):
+        """Should log and return nothing when the store is unreachable"""
+        runner, store = make_runner()
+        store.interrupt_stale = lambda stale_seconds: (_ for _ in ()).throw(ConnectionError("down"))
+        assert asyncio.run(runner.recover_stale()) == []
+
+    def test_fanout_parent_heartbeats(self, monkeypatch):
+        """Should keep the running parent's heartbeat fresh while children run"""
+        monkeypatch.setattr(job_runner, "JOB_HEARTBEAT_SECONDS", 0.01)
+
+        async def run():
+            runner, store = make_runner(slow=1)
+            parent = await runner.submit_fanout("slow_range", "slow", [{"steps": 10}] * 2)
+            created = store.jobs[parent].heartbeat_at
+            await wait_finished(runner, parent)
+            return created, store.jobs[parent].heartbeat_at
+
+        created, last = asyncio.run(run())
+        assert last is not None and (created is None or last > created)
+
+
+# ============================================================================
+# Process boundary
+# ============================================================================
+
+class TestJobContext:
+    """What job processes receive"""
+
+    def test_context_pickles_without_pool(self):
+        """Should drop the pool and keep the conninfo when sent to a job process"""
+        ctx = JobContext("job-1", JobStore(pool=threading.Lock(), conninfo="dbname=nexus_memory"))
+        copy = pickle.loads(pickle.dumps(ctx))
+        assert copy.store.pool is None
+        assert copy.conninfo == "dbname=nexus_memory"
+
+    def test_checkpoint_throttled(self):
+        """Should write progress at most once per interval unless forced"""
+        store = FakeJobStore()
+        job_id = store.create("add", {})
+        writes = []
+        store.progress = lambda *args: writes.append(args) or False
+        ctx = JobContext(job_id, store, interval=60)
+
+        for i in range(10):
+            ctx.checkpoint(i / 10)
+        ctx.checkpoint(1.0, "done", force=True)
+
+        assert len(writes) == 2
+
+
+# ============================================================================
+# Job functions
+# ============================================================================
+
+class TestJobFunctions:
+    """Job functions use the conninfo handed over in their context"""
+
+    def test_fact_backfill_ranges_use_job_conninfo(self, monkeypatch):
+        """Should pass ctx.conninfo to every range, not the module default"""
+        import backfill_facts
+
+        calls = []
+        monkeypatch.setattr(job_runner.psycopg, "connect", lambda conninfo: nullcontext(conninfo))
+        monkeypatch.setattr(backfill_facts, "plan_ranges", lambda *args, **kwargs: 2)
+        monkeypatch.setattr(backfill_facts, "pending_ranges", lambda conn, run_name: [1, 2])
+        monkeypatch.setattr(backfill_facts, "read_progress", lambda conn, run_name: (10, 10, 4, 2, 2))
+        monkeypatch.setattr(backfill_facts, "process_range", lambda *args: calls.append(args))
+
+        store = FakeJobStore()
+        store.conninfo = "dbname=nexus_memory password=from-secret-file"
+        ctx = JobContext(store.create("fact_backfill", {}), store)
+        result = job_runner.run_fact_backfill(ctx, run_name="v3")
+
+        assert [call[1] for call in calls] == [1, 2]
+        assert {call[-1] for call in calls} == {store.conninfo}
+        assert result["ranges_done"] == 2
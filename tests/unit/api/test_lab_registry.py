@@ -0,0 +1,173 @@
+"""
+Tests for lazy LAB construction and startup imports
+
+Tests:
+- LAB systems are built once, on first use, also under concurrent first use
+- Shared systems build their template on first use and keep cross-worker state
+- warm() builds pending systems and reports failures
+- Import-time report: API modules import without the heavy libraries
+  (sklearn, scipy, sentence_transformers, torch, neo4j) and within budget
+"""
+
+import pytest
+import sys
+import os
+import json
+import time
+import threading
+import importlib.util
+import subprocess
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from lab_registry import LabRegistry, LazyLab
+from state_store import SharedStateRegistry, InProcessStateStore
+
+
+HEAVY_MODULES = ("sklearn", "scipy", "sentence_transformers", "torch", "transformers", "neo4j")
+
+# Own import time (self, not cumulative) of this repo's modules
+REPO_IMPORT_BUDGET_SECONDS = 1.0
+
+
+class Slow:
+    """LAB-like system with a costly constructor"""
+
+    built = 0
+
+    def __init__(self):
+        time.sleep(0.02)
+        Slow.built += 1
+        self.value = 0
+
+    def bump(self):
+        self.value += 1
+        return self.value
+
+
+def import_report(module: str):
+    """python -X importtime for one module: (modules imported, {module: self seconds})"""
+    code = (
+        f"import sys, json; import {module}; "
+        "print(json.dumps(sorted(m.split('.')[0] for m in sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=api_path, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    self_seconds = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        self_seconds[name.strip()] = int(own) / 1e6
+    return set(json.loads(result.stdout.splitlines()[-1])), self_seconds
+
+
+def repo_seconds(self_seconds):
+    repo_modules = {name[:-3] for name in os.listdir(api_path) if name.endswith(".py")}
+    return sum(seconds for name, seconds in self_seconds.items() if name in repo_modules)
+
+
+def slowest(self_seconds, n=10):
+    return sorted(self_seconds.items(), key=lambda item: -item[1])[:n]
+
+
+# ============================================================================
+# Lazy construction
+# ============================================================================
+
+class TestLazyConstruction:
+    """Built on first use, exactly once"""
+
+    def setup_method(self):
+        Slow.built = 0
+
+    def test_not_built_until_used(self):
+        """Should only build the system on first attribute access"""
+        registry = LabRegistry(SharedStateRegistry())
+        lab = registry.register("slow", Slow)
+        assert Slow.built == 0 and registry.pending() == ["slow"]
+
+        assert lab.bump() == 1
+        assert lab.bump() == 2
+        assert Slow.built == 1
+        assert registry.get_stats()["constructed"] == ["slow"]
+
+    def test_concurrent_first_use_builds_once(self):
+        """Should share one instance between threads racing on first use"""
+        registry = LabRegistry(SharedStateRegistry())
+        lab = registry.register("slow", Slow)
+        threads = [threading.Thread(target=lab.bump) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert Slow.built == 1
+        assert lab.value == 8
+
+    def test_setattr_reaches_system(self):
+        """Should set attributes on the built system, not on the proxy"""
+        lab = LazyLab("slow", Slow)
+        lab.value = 41
+        assert lab.bump() == 42
+
+    def test_shared_system_built_on_first_use(self):
+        """Should build the template lazily and keep state shared between workers"""
+        store = InProcessStateStore(shared=True)
+        worker_a, worker_b = SharedStateRegistry(store), SharedStateRegistry(store)
+        lab_a = LabRegistry(worker_a).register("slow", Slow, shared=True)
+        lab_b = LabRegistry(worker_b).register("slow", Slow, shared=True)
+        assert not worker_a.is_constructed("slow")
+
+        lab_a.bump()
+        assert lab_b.bump() == 2
+        assert worker_a.get_stats()["systems"] == ["slow"]
+
+    def test_warm_reports_failures(self):
+        """Should build what it can and report the rest"""
+        registry = LabRegistry(SharedStateRegistry())
+        registry.register("slow", Slow)
+        registry.register("broken", lambda: 1 / 0)
+        results = registry.warm()
+
+        assert results["slow"] == "ok"
+        assert results["broken"].startswith("error:")
+        assert registry.pending() == ["broken"]
+
+    def test_duplicate_name_rejected(self):
+        """Should refuse to register a name twice"""
+        registry = LabRegistry(SharedStateRegistry())
+        registry.register("slow", Slow)
+        with pytest.raises(ValueError):
+            registry.register("slow", Slow, shared=True)
+
+
+# ============================================================================
+# Import-time report
+# ============================================================================
+
+class TestStartupImports:
+    """Regression guard for API cold start"""
+
+    @pytest.mark.parametrize("module", ["labs_advanced_endpoints", "novelty_detector", "neo4j_sync"])
+    def test_no_heavy_imports(self, module):
+        """Should import without pulling in ML/graph libraries"""
+        modules, self_seconds = import_report(module)
+        assert not modules & set(HEAVY_MODULES), slowest(self_seconds)
+        assert repo_seconds(self_seconds) < REPO_IMPORT_BUDGET_SECONDS, slowest(self_seconds)
+
+    @pytest.mark.skipif(
+        any(importlib.util.find_spec(name) is None for name in ("psycopg_pool", "asyncpg", "redis")),
+        reason="main.py dependencies not installed"
+    )
+    def test_main_import(self):
+        """Should import main without loading the model or ML/graph libraries"""
+        modules, self_seconds = import_report("main")
+        assert not modules & set(HEAVY_MODULES), slowest(self_seconds)
+        assert repo_seconds(self_seconds) < REPO_IMPORT_BUDGET_SECONDS, slowest(self_seconds)
@@ -0,0 +1,225 @@
+"""
+Tests for the priming graph store (LAB_005 persistence)
+
+Tests:
+- pgvector text parsing
+- Bootstrap from kNN rows (fake connection)
+- Snapshot save / load / freshness
+- Incremental sync from embeddings_queue (keyset paging)
+- Graph lock held by sync against concurrent priming
+
+Note: The HNSW kNN query itself runs against PostgreSQL in the smoke test
+"""
+
+import pytest
+import sys
+import os
+import threading
+import numpy as np
+from datetime import datetime, timezone, timedelta
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import priming_graph_store
+from priming_graph_store import PrimingGraphStore, parse_vector, SEED_QUERY, KNN_QUERY, SYNC_QUERY
+
+
+def vec_text(vector):
+    return "[" + ",".join(str(x) for x in vector) + "]"
+
+
+EMBEDDINGS = {
+    "a": [1.0, 0.0, 0.0],
+    "b": [0.9, 0.1, 0.0],
+    "c": [0.0, 1.0, 0.0],
+    "d": [0.1, 0.95, 0.0],
+}
+WATERMARK = datetime(2025, 10, 1, tzinfo=timezone.utc)
+
+
+def cosine(a, b):
+    a, b = np.array(a), np.array(b)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+class FakeCursor:
+    """Answers the store's queries from EMBEDDINGS"""
+
+    def __init__(self, queue_rows=()):
+        self.queue_rows = list(queue_rows)
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        if query == SEED_QUERY:
+            self.result = [(k, vec_text(v)) for k, v in EMBEDDINGS.items()]
+        elif query == KNN_QUERY:
+            self.result = []
+            for source in params["ids"]:
+                ranked = sorted(EMBEDDINGS, key=lambda other: -cosine(EMBEDDINGS[source], EMBEDDINGS[other]))
+                self.result += [(source, other, cosine(EMBEDDINGS[source], EMBEDDINGS[other]))
+                                for other in ranked[:params["k"]]]
+        elif query == SYNC_QUERY:
+            self.result = [
+                row for row in sorted(self.queue_rows, key=lambda row: (row[1], row[0]))
+                if (row[1], row[0]) > (params["since"], params["after_id"])
+            ][:params["limit"]]
+        else:  # MAX(processed_at)
+            self.result = [(WATERMARK,)]
+
+    def fetchall(self):
+        return self.result
+
+    def fetchone(self):
+        return self.result[0]
+
+
+class FakeConnection:
+    def __init__(self, queue_rows=()):
+        self.queue_rows = queue_rows
+
+    def cursor(self):
+        return FakeCursor(self.queue_rows)
+
+
+def make_store(tmp_path, **kwargs):
+    return PrimingGraphStore(
+        "postgresql://unused", snapshot_dir=str(tmp_path), similarity_threshold=0.5, max_neighbors=2, **kwargs
+    )
+
+
+class TestParseVector:
+    """pgvector values arrive as text without the adapter"""
+
+    def test_text(self):
+        """Should parse '[..]' text"""
+        assert parse_vector("[1,2.5,-3]").tolist() == [1.0, 2.5, -3.0]
+
+    def test_none_and_sequence(self):
+        """Should pass through None and sequences"""
+        assert parse_vector(None) is None
+        assert parse_vector([1, 2]).dtype == np.float32
+
+
+class TestBootstrap:
+    """Seeding from kNN rows"""
+
+    def test_neighbors_from_knn(self, tmp_path):
+        """Should link seeds by kNN similarity, without self-edges"""
+        graph, watermark = make_store(tmp_path).bootstrap(FakeConnection())
+        assert len(graph) == 4
+        assert watermark == WATERMARK
+        assert [uuid for uuid, _ in graph.get_related("a")] == ["b"]
+        assert [uuid for uuid, _ in graph.get_related("c")] == ["d"]
+
+
+class TestSnapshots:
+    """Snapshot directory management"""
+
+    def test_save_then_load(self, tmp_path):
+        """Should load the graph and watermark another worker saved"""
+        writer = make_store(tmp_path)
+        graph, writer.synced_until = writer.bootstrap(FakeConnection())
+        path = writer.save(graph)
+        assert os.path.realpath(writer.current_path) == path
+
+        reader = make_store(tmp_path)
+        loaded = reader._load_if_fresh()
+        assert len(loaded) == 4
+        assert reader.synced_until == WATERMARK
+        (loaded_id, loaded_sim), = loaded.get_related("a")
+        (bootstrap_id, bootstrap_sim), = graph.get_related("a")
+        assert loaded_id == bootstrap_id
+        assert loaded_sim == pytest.approx(bootstrap_sim, rel=1e-6)
+
+    def test_replaces_previous_snapshot(self, tmp_path):
+        """Should keep only the current snapshot directory"""
+        store = make_store(tmp_path)
+        graph, _ = store.bootstrap(FakeConnection())
+        store.save(graph)
+        second = store.save(graph)
+        snapshots = [e for e in os.listdir(tmp_path) if e.startswith("snapshot-")]
+        assert snapshots == [os.path.basename(second)]
+
+    def test_stale_snapshot_ignored(self, tmp_path):
+        """Should not load snapshots older than max age"""
+        store = make_store(tmp_path, max_age_seconds=-1)
+        graph, _ = store.bootstrap(FakeConnection())
+        store.save(graph)
+        assert store._load_if_fresh() is None
+
+
+class TestSync:
+    """Incremental updates from embeddings_queue"""
+
+    def test_applies_new_embeddings(self, tmp_path):
+        """Should add episodes processed after the watermark and advance it"""
+        store = make_store(tmp_path)
+        graph, store.synced_until = store.bootstrap(FakeConnection())
+        later = WATERMARK + timedelta(minutes=5)
+        rows = [
+            ("before", WATERMARK, vec_text([0.0, 0.0, 1.0])),
+            ("e", later, vec_text([0.95, 0.05, 0.0])),
+        ]
+
+        assert store.sync(graph, FakeConnection(rows)) == 1
+        assert "e" in graph.embeddings and "before" not in graph.embeddings
+        assert store.synced_until == later
+        assert store.pending_changes == 1
+
+    def test_without_watermark_starts_at_queue_head(self, tmp_path):
+        """Should not replay the whole table when bootstrap never ran"""
+        store = make_store(tmp_path)
+        rows = [("e", WATERMARK + timedelta(minutes=5), vec_text([1.0, 0.0, 0.0]))]
+        graph, _ = store.bootstrap(FakeConnection())
+
+        assert store.sync(graph, FakeConnection(rows)) == 0
+        assert store.synced_until == WATERMARK
+
+    def test_pages_through_shared_timestamp(self, tmp_path, monkeypatch):
+        """Should not skip rows sharing processed_at across a page boundary"""
+        monkeypatch.setattr(priming_graph_store, "SYNC_BATCH_SIZE", 2)
+        store = make_store(tmp_path)
+        graph, store.synced_until = store.bootstrap(FakeConnection())
+        later = WATERMARK + timedelta(minutes=5)
+        rows = [(f"e{i}", later, vec_text([1.0, 0.1 * i, 0.0])) for i in range(5)]
+
+        assert store.sync(graph, FakeConnection(rows)) == 5
+        assert all(f"e{i}" in graph.embeddings for i in range(5))
+        assert (store.synced_until, store.synced_after_id) == (later, "e4")
+
+    def test_watermark_id_survives_snapshot(self, tmp_path):
+        """Should resume from the saved (processed_at, episode_id) position"""
+        writer = make_store(tmp_path)
+        graph, writer.synced_until = writer.bootstrap(FakeConnection())
+        later = WATERMARK + timedelta(minutes=5)
+        rows = [("e1", later, vec_text([1.0, 0.1, 0.0])), ("e2", later, vec_text([1.0, 0.2, 0.0]))]
+        writer.sync(graph, FakeConnection(rows[:1]))
+        writer.save(graph)
+
+        reader = make_store(tmp_path)
+        loaded = reader._load_if_fresh()
+        assert reader.synced_after_id == "e1"
+        assert reader.sync(loaded, FakeConnection(rows)) == 1
+        assert "e2" in loaded.embeddings
+
+    def test_sync_holds_graph_lock(self, tmp_path):
+        """Should wait for a reader holding the graph lock before adding"""
+        store = make_store(tmp_path)
+        graph, store.synced_until = store.bootstrap(FakeConnection())
+        rows = [("e", WATERMARK + timedelta(minutes=5), vec_text([0.95, 0.05, 0.0]))]
+
+        with graph.lock:
+            thread = threading.Thread(target=store.sync, args=(graph, FakeConnection(rows)))
+            thread.start()
+            thread.join(timeout=0.1)
+            assert thread.is_alive() and "e" not in graph.embeddings
+        thread.join(timeout=5)
+        assert "e" in graph.embeddings
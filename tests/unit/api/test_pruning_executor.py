@@ -0,0 +1,382 @@
+"""
+Tests for the batched pruning executor
+
+Tests:
+- Safety predicate shared by dry-run and execution
+- Rate limiting between batches
+- Run status serialization
+- Batched execution, resume and exhaustion against a fake database
+- Remaining is counted from the hot table, not derived from the target
+- Re-archiving replaces the archived copy; restore moves rows back and
+  skips episodes already in the hot table
+- Failed Neo4j deletions are kept on the run and retried
+
+Note: the SQL itself against PostgreSQL is covered by the smoke test
+"""
+
+import pytest
+import sys
+import os
+import uuid
+from datetime import datetime
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import pruning_executor
+from pruning_executor import PruningExecutor, PruningRunStatus, PRUNABLE_PREDICATE
+
+
+class FakeDatabase:
+    """Hot table, archive and pruning_runs, driven by the executor's SQL"""
+
+    def __init__(self):
+        self.hot = {}
+        self.archive = {}
+        self.runs = {}
+        self.queries = []
+
+    def add_episode(self, episode_id, content):
+        self.hot[episode_id] = {"content": content, "created_at": datetime(2025, 1, 1), "metadata": {}}
+
+    def connect(self, conninfo):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def executemany(self, query, rows):
+        self.db.queries.append(query)
+
+    def execute(self, query, params=None):
+        db = self.db
+        db.queries.append(query)
+        self.rows = []
+
+        if "INSERT INTO memory_system.pruning_runs" in query:
+            run_id = str(uuid.uuid4())
+            threshold, age, target, batch_size, rate = params
+            db.runs[run_id] = {
+                "status": "pending", "target": target, "archived": 0, "batches": 0,
+                "neo4j": 0, "seconds": 0.0, "threshold": threshold, "age": age,
+                "batch_size": batch_size, "rate": rate, "error": None, "pending": []
+            }
+            self.rows = [(run_id,)]
+        elif "SELECT neo4j_pending_ids" in query:
+            self.rows = [(list(db.runs[params[0]]["pending"]),)]
+        elif "FROM memory_system.pruning_runs" in query:
+            run = db.runs.get(params[0])
+            if run:
+                self.rows = [(
+                    params[0], run["status"], run["target"], run["archived"], run["batches"],
+                    run["neo4j"], run["seconds"], run["threshold"], run["age"],
+                    run["batch_size"], run["rate"], run["error"], None, None, len(run["pending"])
+                )]
+        elif "SELECT COUNT(*)" in query:
+            cap = params["cap"]
+            self.rows = [(len(db.hot) if cap is None else min(len(db.hot), cap),)]
+        elif "SELECT e.episode_id" in query:
+            self.rows = [(episode_id,) for episode_id in sorted(db.hot)[:params["limit"]]]
+        elif "WITH moved AS" in query:
+            for episode_id in params["episode_ids"]:
+                row = db.hot.pop(episode_id)
+                if episode_id in db.archive and "DO UPDATE" not in query:
+                    continue
+                db.archive[episode_id] = {**row, "run_id": params["run_id"]}
+        elif "WITH selected AS" in query:
+            if "pruning_run_id" in query:
+                ids = [e for e, row in db.archive.items() if row["run_id"] == params[0]]
+            else:
+                ids = [e for e in params[0] if e in db.archive]
+            for episode_id in ids:
+                if episode_id in db.hot:
+                    self.rows.append((episode_id, None, None, None, None, None, False))
+                    continue
+                row = db.archive.pop(episode_id)
+                db.hot[episode_id] = {k: v for k, v in row.items() if k != "run_id"}
+                self.rows.append((episode_id, row["content"], 0.1, ["t"], row["created_at"], row["metadata"], True))
+        elif "SET archived_count" in query:
+            count, run_id = params
+            db.runs[run_id]["archived"] += count
+            db.runs[run_id]["batches"] += 1
+        elif "SET neo4j_deleted_count" in query and "EXCEPT" in query:
+            deleted, retried, run_id = params
+            db.runs[run_id]["neo4j"] += deleted
+            db.runs[run_id]["pending"] = [e for e in db.runs[run_id]["pending"] if e not in retried]
+        elif "SET neo4j_deleted_count" in query:
+            deleted, seconds, failed, run_id = params
+            db.runs[run_id]["neo4j"] += deleted
+            db.runs[run_id]["seconds"] += seconds
+            db.runs[run_id]["pending"] += failed
+        elif "SET status" in query:
+            status, error, _, run_id = params
+            db.runs[run_id]["status"] = status
+            db.runs[run_id]["error"] = error or db.runs[run_id]["error"]
+
+
+class FakeGraph:
+    def __init__(self):
+        self.deleted = []
+        self.synced = []
+        self.down = False
+
+    def delete_episodes(self, episode_ids):
+        if self.down:
+            raise ConnectionError("neo4j unavailable")
+        self.deleted.extend(episode_ids)
+        return len(episode_ids)
+
+    def sync_episode(self, episode_id, **kwargs):
+        self.synced.append(episode_id)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(pruning_executor.psycopg, "connect", database.connect)
+    return database
+
+
+def start(executor, target, batch_size):
+    return executor.start_run(min_score_threshold=0.2, min_age_days=90,
+                              target_count=target, batch_size=batch_size)
+
+
+class TestPrunablePredicate:
+    """Safety rules must match /memory/pruning/preview"""
+
+    def test_protects_high_importance(self):
+        """Should never prune importance above 0.8"""
+        assert "e.importance_score <= 0.8" in PRUNABLE_PREDICATE
+
+    def test_protects_recent_access(self):
+        """Should skip episodes accessed in the last 7 days"""
+        assert "INTERVAL '7 days'" in PRUNABLE_PREDICATE
+
+    def test_uses_named_parameters(self):
+        """Should be parameterized, not formatted with request values"""
+        for name in ("min_age_days", "protected_tags", "min_score_threshold"):
+            assert f"%({name})s" in PRUNABLE_PREDICATE
+
+    def test_predicate_params_default_tags(self):
+        """Should pass the default protected tags"""
+        executor = PruningExecutor("postgresql://unused")
+        params = executor._predicate_params(0.2, 90)
+        assert params["protected_tags"] == pruning_executor.PROTECTED_TAGS
+        assert params["min_age_days"] == 90
+        assert params["min_score_threshold"] == 0.2
+
+
+class TestThrottle:
+    """Rate limiting between batches"""
+
+    def test_no_limit_does_not_sleep(self, monkeypatch):
+        """Should not sleep without max_rows_per_second"""
+        sleeps = []
+        monkeypatch.setattr(pruning_executor.time, "sleep", sleeps.append)
+        PruningExecutor._throttle(100, 0.01, None)
+        assert sleeps == []
+
+    def test_sleeps_remaining_budget(self, monkeypatch):
+        """Should sleep so that rows/batch_time <= limit"""
+        sleeps = []
+        monkeypatch.setattr(pruning_executor.time, "sleep", sleeps.append)
+        PruningExecutor._throttle(50, 0.25, 100.0)
+        assert sleeps == [pytest.approx(0.25)]
+
+    def test_slow_batch_does_not_sleep(self, monkeypatch):
+        """Should not sleep when the batch was already slower than the limit"""
+        sleeps = []
+        monkeypatch.setattr(pruning_executor.time, "sleep", sleeps.append)
+        PruningExecutor._throttle(50, 2.0, 100.0)
+        assert sleeps == []
+
+
+class TestRunStatus:
+    """Run status snapshot"""
+
+    def test_to_dict(self):
+        """Should serialize all progress fields"""
+        run = PruningRunStatus(
+            run_id="r1", status="interrupted", target_count=100,
+            archived_count=40, remaining=60, batch_count=4,
+            neo4j_deleted_count=40, rows_per_second=120.0,
+            active_seconds=0.33, min_score_threshold=0.2,
+            min_age_days=90, batch_size=10
+        )
+        data = run.to_dict()
+        assert data["remaining"] == 60
+        assert data["status"] == "interrupted"
+        assert data["max_rows_per_second"] is None
+
+
+class TestExecution:
+    """Batched archive-and-delete against the fake database"""
+
+    def test_batches_until_target(self, db):
+        """Should archive target_count episodes in batch_size transactions"""
+        for i in range(25):
+            db.add_episode(f"ep-{i:03d}", f"content {i}")
+        graph = FakeGraph()
+        executor = PruningExecutor("postgresql://unused", graph_sync=graph)
+
+        run = executor.execute(start(executor, target=20, batch_size=8))
+
+        assert run.status == "completed"
+        assert run.archived_count == 20 and run.batch_count == 3
+        assert len(db.hot) == 5 and len(db.archive) == 20
+        assert len(graph.deleted) == 20 and run.neo4j_deleted_count == 20
+
+    def test_resume_after_interruption(self, db):
+        """Should stop after max_batches and continue where it left off"""
+        for i in range(10):
+            db.add_episode(f"ep-{i:03d}", f"content {i}")
+        executor = PruningExecutor("postgresql://unused")
+        run_id = start(executor, target=10, batch_size=4)
+
+        run = executor.execute(run_id, max_batches=1)
+        assert run.status == "interrupted"
+        assert run.archived_count == 4 and run.remaining == 6
+
+        run = executor.execute(run_id)
+        assert run.status == "completed"
+        assert run.archived_count == 10 and not db.hot
+
+    def test_exhausted_candidates_complete_run(self, db):
+        """Should complete below target when no prunable episodes remain"""
+        for i in range(3):
+            db.add_episode(f"ep-{i:03d}", f"content {i}")
+        executor = PruningExecutor("postgresql://unused")
+
+        run = executor.execute(start(executor, target=50, batch_size=10))
+
+        assert run.status == "completed"
+        assert run.archived_count == 3 and run.remaining == 0
+
+    def test_remaining_counts_prunable_rows(self, db):
+        """Should report the prunable rows left, not target minus archived"""
+        for i in range(10):
+            db.add_episode(f"ep-{i:03d}", f"content {i}")
+        executor = PruningExecutor("postgresql://unused")
+
+        run = executor.execute(start(executor, target=50, batch_size=4), max_batches=1)
+
+        assert run.status == "interrupted"
+        assert run.archived_count == 4 and run.remaining == 6
+
+    def test_failed_graph_deletes_retried(self, db):
+        """Should record failed Neo4j deletions and retry them on the next pass"""
+        for i in range(6):
+            db.add_episode(f"ep-{i:03d}", f"content {i}")
+        graph = FakeGraph()
+        executor = PruningExecutor("postgresql://unused", graph_sync=graph)
+        run_id = start(executor, target=6, batch_size=3)
+
+        graph.down = True
+        run = executor.execute(run_id, max_batches=1)
+        assert run.neo4j_deleted_count == 0 and run.neo4j_pending_count == 3
+
+        graph.down = False
+        run = executor.execute(run_id)
+        assert run.status == "completed"
+        assert sorted(graph.deleted) == [f"ep-{i:03d}" for i in range(6)]
+        assert run.neo4j_deleted_count == 6 and run.neo4j_pending_count == 0
+
+    def test_rearchive_replaces_archived_copy(self, db):
+        """Should keep the current content of an episode archived before"""
+        db.add_episode("ep-000", "current content")
+        db.archive["ep-000"] = {"content": "old content", "created_at": None, "metadata": {}, "run_id": "old"}
+        executor = PruningExecutor("postgresql://unused")
+        run_id = start(executor, target=1, batch_size=1)
+
+        executor.execute(run_id)
+
+        assert db.archive["ep-000"]["content"] == "current content"
+        assert db.archive["ep-000"]["run_id"] == run_id
+
+
+class TestRestore:
+    """Archive back into the hot table"""
+
+    def test_restore_by_run(self, db):
+        """Should move a run's episodes back and re-sync them to the graph"""
+        for i in range(4):
+            db.add_episode(f"ep-{i:03d}", f"content {i}")
+        graph = FakeGraph()
+        executor = PruningExecutor("postgresql://unused", graph_sync=graph)
+        run_id = start(executor, target=4, batch_size=2)
+        executor.execute(run_id)
+
+        result = executor.restore(run_id=run_id)
+
+        assert sorted(result.restored_ids) == [f"ep-{i:03d}" for i in range(4)]
+        assert result.skipped_ids == []
+        assert len(db.hot) == 4 and not db.archive
+        assert sorted(graph.synced) == sorted(result.restored_ids)
+
+    def test_restore_by_ids(self, db):
+        """Should restore only the requested episodes"""
+        for i in range(3):
+            db.add_episode(f"ep-{i:03d}", f"content {i}")
+        executor = PruningExecutor("postgresql://unused")
+        executor.execute(start(executor, target=3, batch_size=3))
+
+        assert executor.restore(episode_ids=["ep-001"]).restored_ids == ["ep-001"]
+        assert sorted(db.archive) == ["ep-000", "ep-002"]
+
+    def test_restore_skips_episodes_in_hot_table(self, db):
+        """Should restore the rest and keep conflicting episodes archived"""
+        for i in range(3):
+            db.add_episode(f"ep-{i:03d}", f"content {i}")
+        executor = PruningExecutor("postgresql://unused")
+        run_id = start(executor, target=3, batch_size=3)
+        executor.execute(run_id)
+        db.add_episode("ep-001", "re-created since")
+
+        result = executor.restore(run_id=run_id)
+
+        assert sorted(result.restored_ids) == ["ep-000", "ep-002"]
+        assert result.skipped_ids == ["ep-001"]
+        assert db.hot["ep-001"]["content"] == "re-created since"
+        assert list(db.archive) == ["ep-001"]
+
+    def test_restore_requires_selection(self, db):
+        """Should refuse to restore without ids or run"""
+        with pytest.raises(ValueError):
+            PruningExecutor("postgresql://unused").restore()
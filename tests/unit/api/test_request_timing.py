@@ -0,0 +1,133 @@
+"""
+Tests for per-stage request timing
+
+Tests:
+- Spans add up per stage and are a no-op outside a request
+- Server-Timing header format
+- Metrics are labelled by route template, not by the raw path
+"""
+
+import pytest
+import sys
+import os
+import time
+import asyncio
+
+from fastapi import FastAPI
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from request_timing import (
+    UNMATCHED_ROUTE, RequestTiming, current_timing, request_timing, route_template, span
+)
+
+
+def make_app():
+    """Small app with the same middleware shape as main.py"""
+    app = FastAPI()
+    seen = []
+
+    @app.middleware("http")
+    async def timing_middleware(request, call_next):
+        with request_timing(request.headers.get("x-request-id")) as timing:
+            response = await call_next(request)
+        seen.append((route_template(request.scope), timing))
+        response.headers["Server-Timing"] = timing.server_timing()
+        return response
+
+    @app.get("/memory/prime/{episode_uuid}")
+    async def prime(episode_uuid: str):
+        with span("db"):
+            pass
+        with span("db"):
+            pass
+        return {"episode": episode_uuid}
+
+    return app, seen
+
+
+def get(app, path, headers=None):
+    """One GET through the ASGI app; returns (status, headers)"""
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(k.encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    sent = []
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = sent[0]
+    return start["status"], {k.decode().lower(): v.decode() for k, v in start["headers"]}
+
+
+class TestSpans:
+    """Stage durations collected per request"""
+
+    def test_spans_accumulate_per_stage(self):
+        """Should add repeated stages together and keep first-seen order"""
+        with request_timing("req-1") as timing:
+            with span("embedding"):
+                time.sleep(0.002)
+            for _ in range(3):
+                with span("db"):
+                    pass
+        stages = {stage: (seconds, count) for stage, seconds, count in timing.items()}
+        assert [stage for stage, _, _ in timing.items()] == ["embedding", "db"]
+        assert stages["embedding"][0] >= 0.002
+        assert stages["db"][1] == 3
+        assert current_timing() is None
+
+    def test_span_outside_request_is_noop(self):
+        """Should run the block without recording anything"""
+        with span("db"):
+            value = 1
+        assert value == 1 and current_timing() is None
+
+    def test_invalid_stage_rejected(self):
+        """Should refuse stage names that would break the header or the label set"""
+        with request_timing():
+            with pytest.raises(ValueError):
+                with span("db query"):
+                    pass
+
+    def test_server_timing_header(self):
+        """Should list stages in milliseconds with call counts and a total"""
+        timing = RequestTiming("req-2")
+        timing.add("db", 0.0031)
+        timing.add("db", 0.0010)
+        timing.add("embedding", 0.0124)
+        assert timing.server_timing(0.0198) == \
+            'db;dur=4.1;desc="2 calls", embedding;dur=12.4, total;dur=19.8'
+
+
+class TestRouteTemplates:
+    """Bounded label values"""
+
+    def test_ids_collapse_to_template(self):
+        """Should label every episode id with the same route template"""
+        app, seen = make_app()
+        for i in range(5):
+            status_code, headers = get(app, f"/memory/prime/{i:08d}-uuid", {"x-request-id": f"r{i}"})
+            assert status_code == 200
+
+        assert {route for route, _ in seen} == {"/memory/prime/{episode_uuid}"}
+        assert seen[0][1].request_id == "r0"
+        assert seen[0][1].stages["db"][1] == 2
+        assert headers["server-timing"].startswith('db;dur=')
+
+    def test_unmatched_and_docs(self):
+        """Should label 404s as unmatched and Starlette routes by their path"""
+        app, seen = make_app()
+        assert get(app, "/no/such/path/123")[0] == 404
+        assert get(app, "/openapi.json")[0] == 200
+        assert [route for route, _ in seen] == [UNMATCHED_ROUTE, "/openapi.json"]
@@ -0,0 +1,140 @@
+"""
+Tests for the on-demand sampling profiler
+
+Tests:
+- Samples every thread, grouped by name without the pool number
+- Folded stacks and speedscope output
+- Route tags from endpoint frames on the stack
+- One session at a time; bounded duration
+"""
+
+import pytest
+import sys
+import os
+import json
+import time
+import threading
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from sampling_profiler import (
+    EVENT_LOOP_THREAD, ProfilerBusy, SamplingProfiler, route_code_map, thread_group
+)
+
+
+def busy_leaf(stop):
+    total = 0
+    while not stop.is_set():
+        total += sum(range(200))
+    return total
+
+
+def search_endpoint(stop):
+    """Stands in for a route's endpoint function"""
+    return busy_leaf(stop)
+
+
+class Route:
+    def __init__(self, path, endpoint):
+        self.path = path
+        self.endpoint = endpoint
+
+
+def run_busy(target, name):
+    stop = threading.Event()
+    thread = threading.Thread(target=target, args=(stop,), name=name, daemon=True)
+    thread.start()
+    return stop, thread
+
+
+class TestSampling:
+    """What ends up in a profile"""
+
+    def test_samples_other_threads(self):
+        """Should see the busy worker thread's function, grouped by thread name"""
+        stop, thread = run_busy(busy_leaf, "ThreadPoolExecutor-0_3")
+        try:
+            profile = SamplingProfiler().profile(0.3, interval_ms=2)
+        finally:
+            stop.set()
+            thread.join()
+
+        folded = profile.folded()
+        assert any(line.startswith("ThreadPoolExecutor;") and "busy_leaf" in line for line in folded.splitlines())
+        assert profile.samples > 10
+        assert profile.summary()["sampler_overhead"] < 0.5
+
+    def test_event_loop_thread_named(self):
+        """Should name the given loop thread event-loop and honour loop_only"""
+        stop, thread = run_busy(busy_leaf, "inference")
+        try:
+            profile = SamplingProfiler().profile(0.1, interval_ms=2, loop_thread_id=thread.ident, loop_only=True)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert {stack[0] for stack in profile.stacks} == {EVENT_LOOP_THREAD}
+
+    def test_route_tags(self):
+        """Should prefix samples under an endpoint with its route template"""
+        stop, thread = run_busy(search_endpoint, "AnyIO worker thread")
+        try:
+            routes = route_code_map([Route("/memory/search", search_endpoint)])
+            profile = SamplingProfiler().profile(0.2, interval_ms=2, route_codes=routes)
+        finally:
+            stop.set()
+            thread.join()
+
+        lines = profile.folded().splitlines()
+        assert any(line.startswith("AnyIO worker thread;route:/memory/search;") for line in lines)
+
+    def test_speedscope_format(self):
+        """Should emit one sampled profile per thread group over shared frames"""
+        stop, thread = run_busy(busy_leaf, "worker-1")
+        try:
+            profile = SamplingProfiler().profile(0.1, interval_ms=2)
+        finally:
+            stop.set()
+            thread.join()
+
+        document = json.loads(json.dumps(profile.speedscope()))
+        frames = document["shared"]["frames"]
+        worker = next(p for p in document["profiles"] if p["name"] == "worker")
+        assert worker["type"] == "sampled"
+        assert len(worker["samples"]) == len(worker["weights"])
+        assert all(0 <= i < len(frames) for sample in worker["samples"] for i in sample)
+        assert any("busy_leaf" in frames[sample[-1]]["name"] for sample in worker["samples"])
+
+    def test_thread_group(self):
+        """Should drop pool/worker numbers from thread names"""
+        assert thread_group("ThreadPoolExecutor-0_12") == "ThreadPoolExecutor"
+        assert thread_group("asyncio_3") == "asyncio"
+        assert thread_group("MainThread") == "MainThread"
+
+
+class TestSafety:
+    """Bounded and exclusive"""
+
+    def test_single_session(self):
+        """Should refuse a second concurrent session"""
+        profiler = SamplingProfiler()
+        thread = threading.Thread(target=profiler.profile, args=(0.3,))
+        thread.start()
+        time.sleep(0.05)
+        try:
+            assert profiler.active
+            with pytest.raises(ProfilerBusy):
+                profiler.profile(0.1)
+        finally:
+            thread.join()
+        assert not profiler.active
+        assert profiler.profile(0.01).samples >= 1
+
+    def test_duration_capped(self):
+        """Should never sample longer than max_seconds"""
+        started = time.perf_counter()
+        profile = SamplingProfiler(max_seconds=0.1).profile(30)
+        assert time.perf_counter() - started < 1.0
+        assert profile.duration < 0.5
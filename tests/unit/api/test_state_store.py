@@ -0,0 +1,268 @@
+"""
+Tests for the shared LAB state store
+
+Tests:
+- Single-worker mode passes through to the live object
+- Two registries on one shared store see one coherent state
+- One CAS write per request scope, skipped when nothing changed
+- Async request scope writes from a worker thread
+- Conflicts replay the request's calls on fresh state
+- Read-only requests stay read-only whatever order sets were pickled in
+- Store errors fall back to local state instead of failing the request
+- Keyed families: one independent key per member, with a TTL
+"""
+
+import pytest
+import sys
+import os
+import pickle
+import asyncio
+import threading
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from state_store import SharedStateRegistry, InProcessStateStore
+from working_memory_buffer import WorkingMemoryBuffer
+
+
+class Counter:
+    """Minimal LAB-like system"""
+
+    def __init__(self, step=1):
+        self.step = step
+        self.value = 0
+        self.history = []
+
+    def bump(self, label="x"):
+        self.value += self.step
+        self.history.append(label)
+        return self.value
+
+    def get_state(self):
+        return {"value": self.value, "history": list(self.history)}
+
+
+class CountingStore(InProcessStateStore):
+    """Shared in-process store that counts round trips"""
+
+    def __init__(self):
+        super().__init__(shared=True)
+        self.loads = 0
+        self.writes = 0
+        self.ttls = None
+
+    def load(self, names, known):
+        self.loads += 1
+        return super().load(names, known)
+
+    def compare_and_set(self, updates, ttls=None):
+        self.writes += 1
+        self.ttls = ttls
+        return super().compare_and_set(updates, ttls)
+
+
+class Tags:
+    """LAB-like system holding a set (pickle order depends on PYTHONHASHSEED)"""
+
+    def __init__(self):
+        self.tags = set()
+
+    def add(self, tag):
+        self.tags.add(tag)
+
+    def get_tags(self):
+        return sorted(self.tags)
+
+
+class ReorderedSet:
+    """Pickles as a set whose elements come in the given order, like another worker's pickle"""
+
+    def __init__(self, items):
+        self.items = items
+
+    def __reduce__(self):
+        return (set, (self.items,))
+
+
+class FailingStore(CountingStore):
+    """Shared store whose round trips can be made to fail"""
+
+    def __init__(self):
+        super().__init__()
+        self.fail_load = False
+        self.fail_write = False
+
+    def load(self, names, known):
+        if self.fail_load:
+            raise ConnectionError("redis down")
+        return super().load(names, known)
+
+    def compare_and_set(self, updates, ttls=None):
+        if self.fail_write:
+            raise ConnectionError("redis down")
+        return super().compare_and_set(updates, ttls)
+
+
+def two_workers(store):
+    worker_a, worker_b = SharedStateRegistry(store), SharedStateRegistry(store)
+    return worker_a.register("counter", Counter()), worker_b.register("counter", Counter()), worker_a, worker_b
+
+
+class TestSingleWorker:
+    """Default in-process mode"""
+
+    def test_passthrough(self):
+        """Should call the registered object directly"""
+        system = Counter()
+        proxy = SharedStateRegistry().register("counter", system)
+        proxy.bump()
+        assert system.value == 1
+        assert proxy.value == 1
+
+    def test_attribute_assignment_rejected(self):
+        """Should only change through methods"""
+        proxy = SharedStateRegistry().register("counter", Counter())
+        with pytest.raises(AttributeError):
+            proxy.value = 5
+
+
+class TestSharedState:
+    """Registries on one store behave like workers sharing Redis"""
+
+    def test_workers_see_each_others_updates(self):
+        """Should be one coherent state across workers"""
+        counter_a, counter_b, _, _ = two_workers(CountingStore())
+        counter_a.bump("a")
+        counter_b.bump("b")
+        assert counter_a.get_state() == {"value": 2, "history": ["a", "b"]}
+
+    def test_real_lab_system(self):
+        """Should share a working-memory buffer"""
+        store = CountingStore()
+        wm_a = SharedStateRegistry(store).register("wm", WorkingMemoryBuffer(capacity=7))
+        wm_b = SharedStateRegistry(store).register("wm", WorkingMemoryBuffer(capacity=7))
+        wm_a.add("ep1", 0.9, [])
+        assert wm_b.get_episode_ids() == ["ep1"]
+
+    def test_one_load_and_one_write_per_request(self):
+        """Should batch a request's calls into a single CAS"""
+        store = CountingStore()
+        counter, _, registry, _ = two_workers(store)
+        with registry.request_scope():
+            counter.bump()
+            counter.bump()
+            counter.get_state()
+        assert (store.loads, store.writes) == (1, 1)
+
+    def test_async_scope_writes_off_the_event_loop(self):
+        """Should batch like request_scope, with the CAS in a worker thread"""
+        store = CountingStore()
+        write_threads = []
+        compare_and_set = store.compare_and_set
+
+        def recording_cas(updates, ttls=None):
+            write_threads.append(threading.current_thread())
+            return compare_and_set(updates, ttls)
+        store.compare_and_set = recording_cas
+
+        counter, other, registry, _ = two_workers(store)
+
+        async def request():
+            async with registry.async_request_scope():
+                counter.bump()
+                counter.bump()
+            return threading.current_thread()
+
+        loop_thread = asyncio.run(request())
+        assert (store.loads, store.writes) == (1, 1)
+        assert write_threads and write_threads[0] is not loop_thread
+        assert other.get_state()["value"] == 2
+
+    def test_read_only_request_does_not_write(self):
+        """Should skip the CAS when state is unchanged"""
+        store = CountingStore()
+        counter, _, registry, _ = two_workers(store)
+        with registry.request_scope():
+            counter.get_state()
+        assert store.writes == 0
+
+    def test_conflict_replays_calls(self):
+        """Should apply both workers' requests on a conflict"""
+        store = CountingStore()
+        counter_a, counter_b, registry_a, registry_b = two_workers(store)
+        with registry_a.request_scope():
+            counter_a.bump("a")
+            # Worker B commits in between
+            with registry_b.request_scope():
+                counter_b.bump("b")
+        assert registry_a.conflicts == 1
+        assert counter_b.get_state() == {"value": 2, "history": ["b", "a"]}
+
+    def test_foreign_set_order_is_not_a_change(self):
+        """Should not write back a set just because this worker pickles it in another order"""
+        store = CountingStore()
+        tags = [f"tag-{i}" for i in range(40)]
+        local_order = list(set(tags))
+        store._data["tags"] = (1, pickle.dumps({"tags": ReorderedSet(local_order[::-1])}))
+        assert store._data["tags"][1] != pickle.dumps({"tags": set(tags)})
+
+        registry = SharedStateRegistry(store)
+        proxy = registry.register("tags", Tags())
+        with registry.request_scope():
+            assert proxy.get_tags() == sorted(tags)
+        assert store.writes == 0
+
+        with registry.request_scope():
+            proxy.add("new")
+        assert store.writes == 1
+
+
+class TestKeyedFamily:
+    """One shared state per key"""
+
+    def test_members_are_independent_keys(self):
+        """Should start each member fresh, write it with the family TTL, and not cache it"""
+        store = CountingStore()
+        registry_a, registry_b = SharedStateRegistry(store), SharedStateRegistry(store)
+        counters_a = registry_a.register_keyed("counter", Counter, ttl_seconds=30)
+        counters_b = registry_b.register_keyed("counter", Counter, ttl_seconds=30)
+
+        counters_a.get("x").bump("a")
+        assert store.ttls == {"counter:x": 30}
+        assert counters_b.get("x").get_state() == {"value": 1, "history": ["a"]}
+        assert counters_b.get("y").get_state() == {"value": 0, "history": []}
+        assert registry_a._cache == {} and registry_b.templates == {}
+        assert registry_a.get_stats()["families"] == ["counter"]
+
+
+class TestStoreErrors:
+    """A failing store degrades to local state"""
+
+    def test_load_failure_uses_local_state(self):
+        """Should serve the worker's local object and count the error"""
+        store = FailingStore()
+        registry = SharedStateRegistry(store)
+        template = Counter()
+        counter = registry.register("counter", template)
+        store.fail_load = True
+
+        with registry.request_scope():
+            assert counter.bump() == 1
+        assert template.value == 1
+        assert registry.store_errors == 1
+        assert store.writes == 0
+
+    def test_write_failure_keeps_changes_locally(self):
+        """Should not raise when the CAS fails; the change stays in the local object"""
+        store = FailingStore()
+        registry = SharedStateRegistry(store)
+        template = Counter()
+        counter = registry.register("counter", template)
+        store.fail_write = True
+
+        with registry.request_scope():
+            counter.bump("a")
+        assert registry.store_errors == 1
+        assert template.get_state() == {"value": 1, "history": ["a"]}
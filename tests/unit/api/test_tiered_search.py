@@ -0,0 +1,113 @@
+"""
+Tests for the hot/cold tiered search planner
+
+Tests:
+- Hot cutoff aligned to monthly partition boundaries
+- Cold tier only queried when the hot tier has too few hits, and only
+  back to the cold cutoff
+- hnsw.ef_search raised above the limit for the hot tier
+- Merged ordering by similarity
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from tiered_search import HNSW_EF_SEARCH_MAX, TieredSearchPlanner, hot_cutoff_for
+
+
+class FakeCursor:
+    """Returns one canned result set per search query"""
+
+    def __init__(self, *result_sets):
+        self.result_sets = list(result_sets)
+        self.queries = []
+        self.settings = []
+
+    def execute(self, query, params):
+        if "set_config" in query:
+            self.settings.append(params["ef_search"])
+            return
+        self.queries.append((query, dict(params)))
+
+    def fetchall(self):
+        return self.result_sets.pop(0)
+
+
+def row(episode_id, similarity):
+    return (episode_id, "content", 0.5, [], datetime.now(timezone.utc), similarity)
+
+
+NOW = datetime(2025, 10, 15, 12, 0, tzinfo=timezone.utc)
+
+
+class TestHotCutoff:
+    """Cutoff must match partition boundaries"""
+
+    def test_single_hot_month(self):
+        """Should start at the current month"""
+        assert hot_cutoff_for(NOW, 1) == datetime(2025, 10, 1, tzinfo=timezone.utc)
+
+    def test_crosses_year_boundary(self):
+        """Should wrap into the previous year"""
+        now = datetime(2025, 2, 3, tzinfo=timezone.utc)
+        assert hot_cutoff_for(now, 3) == datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+
+class TestTieredSearchPlanner:
+    """Hot-first search with cold fallback"""
+
+    def test_enough_hot_hits_skips_cold(self):
+        """Should not touch cold partitions when hot tier fills the limit"""
+        cur = FakeCursor([row("a", 0.9), row("b", 0.8)])
+        result = TieredSearchPlanner(hot_months=3).search(cur, [0.1], limit=2, min_similarity=0.5, now=NOW)
+
+        assert len(cur.queries) == 1
+        assert "created_at >= %(hot_cutoff)s" in cur.queries[0][0]
+        assert result.hot_count == 2
+        assert not result.used_cold_tier
+
+    def test_falls_back_to_cold_for_remaining(self):
+        """Should query cold tier only for the missing results"""
+        cur = FakeCursor([row("a", 0.7)], [row("old", 0.95), row("older", 0.6)])
+        result = TieredSearchPlanner(hot_months=3).search(cur, [0.1], limit=3, min_similarity=0.5, now=NOW)
+
+        assert len(cur.queries) == 2
+        cold_query, cold_params = cur.queries[1]
+        assert "created_at < %(hot_cutoff)s" in cold_query
+        assert "created_at >= %(cold_cutoff)s" in cold_query
+        assert cold_params["limit"] == 2
+        assert cold_params["cold_cutoff"] == datetime(2024, 8, 1, tzinfo=timezone.utc)
+        assert [r[0] for r in result.rows] == ["old", "a", "older"]
+        assert result.cold_count == 2
+
+    def test_include_cold_false(self):
+        """Should never query cold tier when disabled"""
+        cur = FakeCursor([row("a", 0.7)])
+        result = TieredSearchPlanner().search(cur, [0.1], limit=5, min_similarity=0.5, include_cold=False, now=NOW)
+
+        assert len(cur.queries) == 1
+        assert result.hot_count == 1
+
+    def test_cold_months_zero_disables_fallback(self):
+        """Should not scan cold partitions when none are allowed"""
+        cur = FakeCursor([row("a", 0.7)])
+        result = TieredSearchPlanner(cold_months=0).search(cur, [0.1], limit=5, min_similarity=0.5, now=NOW)
+
+        assert len(cur.queries) == 1
+        assert not result.used_cold_tier
+
+    def test_ef_search_above_limit(self):
+        """Should raise hnsw.ef_search for the hot tier, within pgvector's cap"""
+        planner = TieredSearchPlanner(ef_search=100)
+        cur = FakeCursor([row("a", 0.9)])
+        planner.search(cur, [0.1], limit=1, min_similarity=0.5, now=NOW)
+
+        assert cur.settings == ["100"]
+        assert planner.ef_search_for(50) == 200
+        assert planner.ef_search_for(5000) == HNSW_EF_SEARCH_MAX
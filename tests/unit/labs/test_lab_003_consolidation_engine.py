@@ -0,0 +1,291 @@
+"""
+LAB_003: Sleep Consolidation - ConsolidationEngine Test Suite
+
+Test Phases:
+- Phase 1: Set-based writes (one score UPDATE, one trace COPY)
+- Phase 2: One pooled connection and one transaction per run
+- Phase 3: Vectorized chain tracing matches the per-candidate scan
+"""
+
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import consolidation_engine
+from consolidation_engine import ConsolidationEngine, Episode
+
+
+DAY = datetime(2025, 10, 27)
+
+
+def episode_row(i: int, minutes: int, importance: float = 0.5):
+    vector = np.random.default_rng(i).normal(size=8)
+    return {
+        "episode_id": f"00000000-0000-0000-0000-{i:012d}",
+        "content": f"episode {i}",
+        "embedding": "[" + ",".join(f"{v:.5f}" for v in vector) + "]",
+        "created_at": DAY + timedelta(hours=9, minutes=minutes),
+        "tags": ["lab_003", "test"],
+        "importance_score": importance,
+        "metadata": {"salience_score": 0.5 + i * 0.01},
+    }
+
+
+class FakeCopy:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+
+class FakeCursor:
+    def __init__(self, episodes):
+        self.episodes = episodes
+        self.statements = []
+        self.copied = []
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        self.statements.append((query, params))
+        if query is consolidation_engine.EPISODES_FROM_DATE_QUERY:
+            self.result = list(self.episodes)
+        else:
+            self.result = []
+
+    def fetchall(self):
+        return self.result
+
+    @contextmanager
+    def copy(self, statement):
+        self.statements.append((statement, None))
+        yield FakeCopy(self.copied)
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.transactions = 0
+
+    @contextmanager
+    def transaction(self):
+        self.transactions += 1
+        yield
+
+    def cursor(self, **kwargs):
+        return self._cursor
+
+
+class FakePool:
+    def __init__(self, connection):
+        self._connection = connection
+        self.borrowed = 0
+
+    @contextmanager
+    def connection(self):
+        self.borrowed += 1
+        yield self._connection
+
+
+def busy_day(n: int):
+    # One episode every 5 minutes: every breakthrough has a chain of precursors
+    return [episode_row(i, minutes=5 * i, importance=0.3 + (i % 7) * 0.1) for i in range(n)]
+
+
+# ============================================================================
+# PHASE 1: Set-based writes
+# ============================================================================
+
+class TestSetBasedWrites:
+    """Statement count does not grow with the number of episodes"""
+
+    def test_constant_statement_count(self):
+        """Should issue the same statements for 10 or 60 episodes"""
+        counts = []
+        for n in (10, 60):
+            cur = FakeCursor(busy_day(n))
+            report = ConsolidationEngine().run(cur, DAY)
+            assert report.trace_count > 0
+            counts.append(len(cur.statements))
+        assert counts[0] == counts[1]
+
+    def test_scores_written_in_one_update(self):
+        """Should send every boosted episode once, in one UPDATE ... FROM unnest"""
+        cur = FakeCursor(busy_day(30))
+        report = ConsolidationEngine().run(cur, DAY)
+
+        updates = [params for query, params in cur.statements if query is consolidation_engine.UPDATE_SCORES_QUERY]
+        assert len(updates) == 1
+        _, ids, consolidated, breakthrough, importance = updates[0]
+        assert len(ids) == len(set(ids)) == report.episodes_boosted
+        assert len(consolidated) == len(breakthrough) == len(importance) == len(ids)
+        assert all(0.0 <= score <= 1.0 for score in consolidated)
+
+    def test_traces_copied(self):
+        """Should COPY every trace into nexus_memory.memory_traces"""
+        cur = FakeCursor(busy_day(30))
+        report = ConsolidationEngine().run(cur, DAY)
+
+        assert len(cur.copied) == report.trace_count
+        source, target, trace_type, strength, narrative_id, _ = cur.copied[0]
+        assert trace_type == "initiator"
+        assert 0.0 < strength <= 1.0
+        assert narrative_id.startswith("chain_")
+        assert not any("information_schema" in query for query, _ in cur.statements)
+
+    def test_importance_clamped_in_sql(self):
+        """Should clamp boosted importance to the column's CHECK range"""
+        assert "LEAST(v.importance_score, 1.0)" in consolidation_engine.UPDATE_SCORES_QUERY
+
+    def test_no_writes_for_empty_day(self):
+        """Should only read when there is nothing to consolidate"""
+        cur = FakeCursor([])
+        report = ConsolidationEngine().run(cur, DAY)
+        assert report.episodes_processed == 0
+        assert len(cur.statements) == 1
+
+
+# ============================================================================
+# PHASE 2: Pooled connection, single transaction
+# ============================================================================
+
+class TestPooledRun:
+    """One borrowed connection and one transaction per run"""
+
+    def test_single_transaction(self):
+        """Should borrow one pooled connection and open one transaction"""
+        cur = FakeCursor(busy_day(20))
+        conn = FakeConnection(cur)
+        pool = FakePool(conn)
+
+        report = ConsolidationEngine(pool=pool).consolidate_daily_memories(DAY)
+
+        assert pool.borrowed == 1
+        assert conn.transactions == 1
+        assert report.episodes_processed == 20
+
+    def test_embeddings_parsed_from_text(self):
+        """Should parse pgvector text into vectors for chain tracing"""
+        cur = FakeCursor(busy_day(3))
+        episodes = ConsolidationEngine().fetch_episodes_from_date(cur, DAY)
+        assert episodes[0].embedding.shape == (8,)
+        assert episodes[0].salience_score == pytest.approx(0.5)
+
+
+# ============================================================================
+# PHASE 3: Vectorized chain tracing
+# ============================================================================
+
+def reference_chains(breakthroughs, all_episodes):
+    """The original per-candidate scan, kept as the behavioural reference"""
+    engine = ConsolidationEngine()
+    chains = []
+    for breakthrough in breakthroughs:
+        chain = [breakthrough]
+        current_time = breakthrough.created_at
+        window_start = current_time - timedelta(hours=12)
+        candidates = [e for e in all_episodes if window_start <= e.created_at < current_time]
+        candidates.sort(key=lambda x: x.created_at, reverse=True)
+        for candidate in candidates:
+            related = bool(candidate.session_id and candidate.session_id == breakthrough.session_id)
+            if len(candidate.embedding) and len(breakthrough.embedding):
+                related |= engine.cosine_similarity(candidate.embedding, breakthrough.embedding) > 0.65
+            related |= len(set(candidate.tags) & set(breakthrough.tags)) >= 2
+            related |= (current_time - candidate.created_at).total_seconds() < 3600
+            if related:
+                chain.insert(0, candidate)
+                current_time = candidate.created_at
+        if len(chain) >= 2:
+            chains.append(chain)
+    return chains
+
+
+def random_day(seed: int, n: int, spread_hours: float = 24.0):
+    """Sparse day with topic clusters, tag overlap, ties and missing embeddings"""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(4, 16))
+    minutes = np.sort(rng.uniform(0, spread_hours * 60, size=n)).round()  # rounding creates ties
+    episodes = []
+    for i in range(n):
+        embedding = topics[i % 4] + rng.normal(scale=0.9, size=16)
+        episodes.append(Episode(
+            episode_id=f"e{i}",
+            content=f"episode {i}",
+            embedding=[] if i % 9 == 0 else embedding.astype(np.float32),
+            created_at=DAY + timedelta(minutes=float(minutes[i])),
+            session_id=f"s{i % 5}" if i % 3 == 0 else None,
+            tags=list(rng.choice(["a", "b", "c", "d", "e", "f"], size=rng.integers(0, 4), replace=False)),
+            importance_score=float(rng.uniform()),
+            salience_score=float(rng.uniform()),
+            emotional_8d={},
+            somatic_7d={}
+        ))
+    return episodes
+
+
+def chain_ids(chains):
+    return [[e.episode_id for e in chain] for chain in chains]
+
+
+class TestVectorizedChains:
+    """Same chains as the per-candidate scan"""
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_matches_reference(self, seed):
+        """Should return identical chains (membership and order) on random sparse days"""
+        episodes = random_day(seed, n=60)
+        engine = ConsolidationEngine()
+        breakthroughs = engine.identify_breakthroughs(episodes)
+
+        assert chain_ids(engine.trace_breakthrough_chains(breakthroughs, episodes)) == \
+            chain_ids(reference_chains(breakthroughs, episodes))
+
+    def test_proximity_follows_last_added_episode(self):
+        """Should extend the 1-hour rule from the last added episode, not the breakthrough"""
+        episodes = random_day(7, n=40, spread_hours=30)
+        for e in episodes:
+            e.embedding, e.tags, e.session_id = [], [], None
+        breakthrough = episodes[-1]
+
+        chains = ConsolidationEngine().trace_breakthrough_chains([breakthrough], episodes)
+
+        assert chain_ids(chains) == chain_ids(reference_chains([breakthrough], episodes))
+        assert chains and len(chains[0]) > 2
+
+    def test_anchor_bridges_a_long_gap(self):
+        """Should keep a similar episode beyond a gap and resume proximity from it"""
+        base = random_day(8, n=4)
+        for e in base:
+            e.tags, e.session_id = [], None
+            e.embedding = np.array([0.0, 1.0], dtype=np.float32)
+        similar, near_similar, filler, breakthrough = base
+        breakthrough.embedding = similar.embedding = np.array([1.0, 0.0], dtype=np.float32)
+        similar.created_at = DAY + timedelta(hours=5)
+        near_similar.created_at = DAY + timedelta(hours=4, minutes=30)
+        filler.created_at = DAY + timedelta(hours=2)
+        breakthrough.created_at = DAY + timedelta(hours=8)
+
+        chains = ConsolidationEngine().trace_breakthrough_chains([breakthrough], base)
+
+        assert chain_ids(chains) == [[near_similar.episode_id, similar.episode_id, breakthrough.episode_id]]
+        assert chain_ids(chains) == chain_ids(reference_chains([breakthrough], base))
+
+    def test_no_precursors(self):
+        """Should drop breakthroughs with nothing in their window"""
+        episodes = random_day(9, n=5)
+        assert ConsolidationEngine().trace_breakthrough_chains([episodes[0]], episodes[:1]) == []
+        assert ConsolidationEngine().trace_breakthrough_chains([], episodes) == []
@@ -0,0 +1,223 @@
+"""
+LAB_004: Curiosity-Driven Memory - NoveltyDetector Test Suite
+
+Test Phases:
+- Phase 1: Vectorized scoring matches the per-centroid definitions
+- Phase 2: Online baseline updates match full rebuilds
+- Phase 3: Persistence, background refits and refit backoff
+"""
+
+import pytest
+import sys
+import os
+import time
+import numpy as np
+from datetime import datetime, timedelta
+from scipy.spatial.distance import cosine
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from novelty_detector import (
+    Episode,
+    NoveltyDetector,
+    REFIT_RETRY_SECONDS,
+    OnlineCentroids,
+    build_emotional_baseline,
+    build_sequence_model,
+    calculate_contextual_mismatch,
+    calculate_semantic_novelty,
+    semantic_novelty_batch,
+    update_emotional_baseline,
+    update_sequence_model,
+)
+
+CONTENTS = ["Fixed a bug", "Implemented feature code", "Team meeting", "Wrote docs", "Ran pytest"]
+
+
+def make_episodes(n: int, dim: int = 16, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(3, dim))
+    start = datetime(2025, 10, 1)
+    return [
+        Episode(
+            episode_id=f"ep_{i}",
+            content=CONTENTS[i % len(CONTENTS)],
+            embedding=(centers[i % 3] + 0.1 * rng.normal(size=dim)).tolist(),
+            created_at=start + timedelta(minutes=i),
+            somatic_7d={'valence': float(rng.uniform(-1, 1)), 'arousal': float(rng.uniform(0, 1))},
+            metadata={'context': 'work' if i % 2 else 'home'}
+        )
+        for i in range(n)
+    ]
+
+
+# ============================================================================
+# PHASE 1: VECTORIZED SCORING
+# ============================================================================
+
+class TestVectorizedScoring:
+    """Matrix scoring equals the scipy loop it replaced"""
+
+    def test_semantic_batch_matches_scipy(self):
+        """Should use the nearest centroid's cosine distance"""
+        rng = np.random.default_rng(1)
+        centroids = rng.normal(size=(5, 16))
+        embeddings = rng.normal(size=(20, 16))
+        expected = [min(min(cosine(e, c) for c in centroids) / 0.5, 1.0) for e in embeddings]
+        assert semantic_novelty_batch(embeddings, centroids) == pytest.approx(expected, abs=1e-5)
+        assert calculate_semantic_novelty(embeddings[0].tolist(), centroids.tolist()) == pytest.approx(expected[0], abs=1e-5)
+
+    def test_no_baseline_defaults(self):
+        """Should keep the neutral defaults without data"""
+        assert calculate_semantic_novelty([], [[1.0, 0.0]]) == 0.5
+        assert calculate_semantic_novelty([1.0, 0.0], []) == 0.5
+        assert calculate_contextual_mismatch([1.0, 0.0], "unknown", {"work": [[1.0, 0.0]]}) == 0.0
+
+    def test_contextual_mismatch_vectorized(self):
+        """Should use the best-matching context centroid"""
+        profiles = {"work": [[1.0, 0.0], [0.0, 1.0]]}
+        assert calculate_contextual_mismatch([1.0, 0.0], "work", profiles) == pytest.approx(0.0, abs=1e-6)
+        assert calculate_contextual_mismatch([1.0, 1.0], "work", profiles) == pytest.approx(1 - 0.7071, abs=1e-3)
+
+    def test_score_episodes_matches_single(self):
+        """Should give the same scores as scoring one by one"""
+        history = make_episodes(60)
+        detector = NoveltyDetector()
+        detector.build_baseline_models(history)
+        batch = make_episodes(10, seed=7)
+
+        batch_scores = [score for score, _ in detector.score_episodes(batch, history[-5:])]
+        single = []
+        recent = history[-5:]
+        for episode in batch:
+            single.append(detector.score_episode(episode, recent)[0])
+            recent = recent + [episode]
+        assert batch_scores == pytest.approx(single, abs=1e-5)
+
+
+# ============================================================================
+# PHASE 2: ONLINE UPDATES
+# ============================================================================
+
+class TestOnlineUpdates:
+    """Incremental baselines without refitting"""
+
+    def test_partial_fit_is_running_mean(self):
+        """Should move a centroid to the mean of its points"""
+        centroids = OnlineCentroids([[1.0, 0.0]], counts=[1])
+        centroids.partial_fit([[1.0, 0.2], [1.0, -0.2], [1.0, 0.6]])
+        assert centroids.centroids[0] == pytest.approx([1.0, 0.15])
+        assert centroids.counts[0] == 4
+
+    def test_count_cap_tracks_drift(self):
+        """Should keep moving once a centroid is saturated"""
+        centroids = OnlineCentroids([[1.0, 0.0]], counts=[10], max_count=10)
+        for _ in range(50):
+            centroids.partial_fit([[1.0, 1.0]])
+        assert centroids.centroids[0][1] > 0.9
+
+    def test_emotional_merge_matches_full(self):
+        """Should equal statistics computed over all episodes"""
+        episodes = make_episodes(40)
+        stats = build_emotional_baseline(episodes[:25])
+        update_emotional_baseline(stats, episodes[25:])
+        full = build_emotional_baseline(episodes)
+        for key in ('valence_mean', 'valence_std', 'arousal_mean', 'arousal_std'):
+            assert stats[key] == pytest.approx(full[key])
+
+    def test_sequence_update_matches_full(self):
+        """Should continue the sequence across batches"""
+        episodes = make_episodes(30)
+        model = build_sequence_model(episodes[:12])
+        update_sequence_model(model, episodes[12:])
+        assert model['transitions'] == pytest.approx(build_sequence_model(episodes)['transitions'])
+
+    def test_update_baselines(self):
+        """Should fold batches into every model"""
+        episodes = make_episodes(60)
+        detector = NoveltyDetector()
+        detector.build_baseline_models(episodes[:40])
+        detector.update_baselines(episodes[40:])
+        models = detector.baseline_models
+        assert models.episodes_trained == 60
+        assert models.semantic_clusters['trained_on_episodes'] == 60
+        assert detector.get_stats()['online_updates'] == 1
+
+
+# ============================================================================
+# PHASE 3: PERSISTENCE
+# ============================================================================
+
+class TestPersistence:
+    """Baselines survive restarts; refits run off-process"""
+
+    def test_save_and_load(self, tmp_path):
+        """Should score identically after a reload"""
+        path = str(tmp_path / "baselines.npz")
+        history = make_episodes(60)
+        detector = NoveltyDetector(baseline_path=path)
+        detector.build_baseline_models(history)
+        detector.save_baselines(path)
+
+        restored = NoveltyDetector(baseline_path=path)
+        batch = make_episodes(5, seed=3)
+        assert [s for s, _ in restored.score_episodes(batch, history[-3:])] == pytest.approx(
+            [s for s, _ in detector.score_episodes(batch, history[-3:])]
+        )
+        assert restored.baseline_models.sequence_patterns['last_type'] == detector.baseline_models.sequence_patterns['last_type']
+
+    def test_sync_picks_up_newer_file(self, tmp_path):
+        """Should reload baselines saved by another worker"""
+        path = str(tmp_path / "baselines.npz")
+        writer = NoveltyDetector(baseline_path=path)
+        writer.build_baseline_models(make_episodes(30))
+        writer.save_baselines(path)
+
+        reader = NoveltyDetector(baseline_path=path)
+        assert reader.sync_baselines() is False
+        writer.update_baselines(make_episodes(10, seed=5))
+        writer.save_baselines(path)
+        os.utime(path, (reader.loaded_at + 1, reader.loaded_at + 1))
+        assert reader.sync_baselines() is True
+        assert reader.baseline_models.episodes_trained == 40
+
+    def test_background_refit_replays_updates(self, tmp_path):
+        """Should install the refit and replay batches folded in meanwhile"""
+        path = str(tmp_path / "baselines.npz")
+        detector = NoveltyDetector(baseline_path=path)
+        detector.build_baseline_models(make_episodes(20))
+
+        future = detector.refit_if_leader(lambda: make_episodes(50))
+        detector.update_baselines(make_episodes(5, seed=9))
+        future.result(timeout=120)
+        # The install callback runs right after the result is set
+        deadline = time.time() + 10
+        while detector.get_stats()['refit_running'] and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert detector.get_stats()['refits'] == 1
+        assert detector.baseline_models.episodes_trained == 55
+        assert os.path.exists(path)
+
+    def test_failed_refit_backs_off(self, tmp_path):
+        """Should not retry a failed refit on every sync, and back off longer each time"""
+        detector = NoveltyDetector(baseline_path=str(tmp_path / "baselines.npz"))
+        assert detector.refit_due(3600)
+
+        def broken_load():
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            detector.refit_if_leader(broken_load)
+        assert detector.refit_failures == 1
+        assert not detector.refit_due(3600)
+
+        # Retry window passed: due again, and a second failure waits longer
+        detector._refit_retry_at = datetime.now() - timedelta(seconds=1)
+        assert detector.refit_due(3600)
+        with pytest.raises(RuntimeError):
+            detector.refit_if_leader(broken_load)
+        assert detector.refit_failures == 2
+        assert detector._refit_retry_at - datetime.now() > timedelta(seconds=REFIT_RETRY_SECONDS * 1.5)
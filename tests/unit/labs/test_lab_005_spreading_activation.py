@@ -0,0 +1,297 @@
+"""
+LAB_005: Spreading Activation - SimilarityGraph Test Suite
+
+Test Phases:
+- Phase 1: Matrix-backed graph matches brute-force cosine similarity
+- Phase 2: Capped, presorted neighbor lists and matrix growth
+- Phase 3: Memory-mapped snapshots and bulk loading
+- Phase 4: CSR spreading activation, lazy decay and batch priming
+"""
+
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import spreading_activation
+from spreading_activation import SimilarityGraph, SpreadingActivationEngine, ActivationManager
+
+
+def clustered_embeddings(n: int, dim: int = 32, clusters: int = 4, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return [centers[i % clusters] + 0.2 * rng.normal(size=dim) for i in range(n)]
+
+
+def brute_force_neighbors(embeddings, threshold):
+    normed = [e / np.linalg.norm(e) for e in embeddings]
+    result = {}
+    for i, a in enumerate(normed):
+        sims = [(f"ep_{j}", float(a @ b)) for j, b in enumerate(normed) if j != i and float(a @ b) >= threshold]
+        result[f"ep_{i}"] = sorted(sims, key=lambda x: x[1], reverse=True)
+    return result
+
+
+# ============================================================================
+# PHASE 1: CORRECTNESS
+# ============================================================================
+
+class TestMatrixSimilarityGraph:
+    """Matrix graph must agree with pairwise cosine similarity"""
+
+    def test_neighbors_match_brute_force(self):
+        """Top-k neighbors equal the brute-force top-k (incl. reverse edges)"""
+        embeddings = clustered_embeddings(60)
+        graph = SimilarityGraph(similarity_threshold=0.7, max_neighbors=5, initial_capacity=8)
+        for i, e in enumerate(embeddings):
+            graph.add_episode(f"ep_{i}", e)
+
+        expected = brute_force_neighbors(embeddings, 0.7)
+        for uuid, neighbors in expected.items():
+            got = graph.get_related(uuid, top_k=5)
+            assert [n for n, _ in got] == [n for n, _ in neighbors[:5]]
+            for (_, s_got), (_, s_exp) in zip(got, neighbors):
+                assert s_got == pytest.approx(s_exp, abs=1e-5)
+
+    def test_get_similarity_is_cosine(self):
+        """Stored rows are L2-normalized"""
+        graph = SimilarityGraph()
+        graph.add_episode("a", np.array([3.0, 4.0]))
+        graph.add_episode("b", np.array([4.0, 3.0]))
+        assert graph.get_similarity("a", "b") == pytest.approx(24 / 25, abs=1e-6)
+        assert graph.get_similarity("a", "missing") == 0.0
+
+    def test_embeddings_view(self):
+        """Embeddings mapping supports membership and lookup"""
+        graph = SimilarityGraph()
+        graph.add_episode("a", np.array([0.0, 2.0]))
+        assert "a" in graph.embeddings
+        assert np.allclose(graph.embeddings["a"], [0.0, 1.0])
+        assert len(graph.embeddings) == 1
+
+
+# ============================================================================
+# PHASE 2: STRUCTURE
+# ============================================================================
+
+class TestNeighborLists:
+    """Presorted, capped lists and doubling growth"""
+
+    def test_lists_sorted_and_capped(self):
+        """Every list is descending and at most max_neighbors long"""
+        graph = SimilarityGraph(similarity_threshold=0.0, max_neighbors=3, initial_capacity=2)
+        for i, e in enumerate(clustered_embeddings(40, clusters=1)):
+            graph.add_episode(f"ep_{i}", e)
+
+        assert len(graph) == 40
+        for neighbors in graph.graph.values():
+            sims = [s for _, s in neighbors]
+            assert len(neighbors) <= 3
+            assert sims == sorted(sims, reverse=True)
+
+    def test_readd_changed_embedding(self):
+        """Re-adding with a new embedding drops stale edges"""
+        graph = SimilarityGraph(similarity_threshold=0.9)
+        graph.add_episode("a", np.array([1.0, 0.0]))
+        graph.add_episode("b", np.array([1.0, 0.01]))
+        assert graph.get_related("a")[0][0] == "b"
+
+        graph.add_episode("b", np.array([0.0, 1.0]))
+        assert graph.get_related("a") == []
+        assert graph.get_related("b") == []
+
+    def test_engine_priming_uses_graph(self):
+        """Engine primes neighbors found through the matrix graph"""
+        engine = SpreadingActivationEngine(similarity_threshold=0.7)
+        embeddings = clustered_embeddings(20)
+        for i, e in enumerate(embeddings):
+            engine.add_episode(f"ep_{i}", "", e)
+
+        result = engine.access_episode("ep_0", "", embeddings[0])
+        assert result["activation_count"] > 0
+        assert all(uuid in engine.similarity_graph.embeddings for uuid in result["primed_episodes"])
+
+
+# ============================================================================
+# PHASE 3: SNAPSHOTS
+# ============================================================================
+
+class TestSnapshots:
+    """save_snapshot / load_snapshot round trip"""
+
+    def test_round_trip_preserves_graph(self, tmp_path):
+        """Should reload identical neighbor lists and embeddings"""
+        graph = SimilarityGraph(similarity_threshold=0.5, max_neighbors=4)
+        for i, emb in enumerate(clustered_embeddings(30)):
+            graph.add_episode(f"ep_{i}", emb)
+        graph.save_snapshot(str(tmp_path / "snap"), headroom=8)
+
+        loaded = SimilarityGraph.load_snapshot(str(tmp_path / "snap"))
+        assert len(loaded) == 30
+        for i in range(30):
+            uuid = f"ep_{i}"
+            assert loaded.get_related(uuid, top_k=4) == pytest.approx(graph.get_related(uuid, top_k=4))
+            assert np.allclose(loaded.embeddings[uuid], graph.embeddings[uuid])
+
+    def test_loaded_graph_is_memory_mapped_and_lazy(self, tmp_path):
+        """Should mmap the matrix and materialize neighbor lists on demand"""
+        graph = SimilarityGraph(similarity_threshold=0.5, max_neighbors=4)
+        for i, emb in enumerate(clustered_embeddings(10)):
+            graph.add_episode(f"ep_{i}", emb)
+        graph.save_snapshot(str(tmp_path / "snap"))
+
+        loaded = SimilarityGraph.load_snapshot(str(tmp_path / "snap"))
+        assert isinstance(loaded._matrix, np.memmap)
+        assert loaded.graph == {}
+        loaded.get_related("ep_0")
+        assert list(loaded.graph) == ["ep_0"]
+
+    def test_append_after_load_uses_headroom(self, tmp_path):
+        """Should add episodes in place and link them both ways"""
+        embeddings = clustered_embeddings(12)
+        graph = SimilarityGraph(similarity_threshold=0.5, max_neighbors=4)
+        for i, emb in enumerate(embeddings[:10]):
+            graph.add_episode(f"ep_{i}", emb)
+        graph.save_snapshot(str(tmp_path / "snap"), headroom=4)
+
+        loaded = SimilarityGraph.load_snapshot(str(tmp_path / "snap"))
+        capacity = loaded._matrix.shape[0]
+        loaded.add_episode("ep_10", embeddings[10])
+        graph.add_episode("ep_10", embeddings[10])
+
+        assert loaded._matrix.shape[0] == capacity
+        assert loaded.get_related("ep_10", 4) == pytest.approx(graph.get_related("ep_10", 4))
+        assert loaded.get_related("ep_2", 4) == pytest.approx(graph.get_related("ep_2", 4))
+
+    def test_bulk_load_with_external_neighbors(self):
+        """Should accept precomputed kNN lists, dropping unknown ids and self-edges"""
+        graph = SimilarityGraph(similarity_threshold=0.5, max_neighbors=2)
+        graph.add_embeddings(["a", "b", "c"], np.eye(3, 4) + 0.1)
+        graph.set_neighbors("a", [("a", 1.0), ("x", 0.99), ("c", 0.6), ("b", 0.9), ("b2", 0.4)])
+        assert graph.get_related("a") == [("b", 0.9), ("c", 0.6)]
+
+
+# ============================================================================
+# PHASE 4: CSR SPREADING + LAZY DECAY
+# ============================================================================
+
+def reference_spread(graph, source, top_k=5, max_hops=2):
+    """Original queue-based BFS (first path wins)"""
+    activated, visited, queue = {}, {source}, [(source, 1.0, 0)]
+    while queue:
+        current, level, hops = queue.pop(0)
+        if hops >= max_hops:
+            continue
+        for related, similarity in graph.get_related(current, top_k=top_k):
+            if related in visited:
+                continue
+            visited.add(related)
+            new_level = level * similarity * 0.7
+            if new_level >= 0.2:
+                activated[related] = new_level
+                queue.append((related, new_level, hops + 1))
+    return activated
+
+
+class TestCsrSpreading:
+    """Vectorized spreading over the CSR export"""
+
+    def test_csr_matches_neighbor_lists(self):
+        """Should hold exactly the top-k neighbor lists"""
+        graph = SimilarityGraph(similarity_threshold=0.5, max_neighbors=6)
+        for i, emb in enumerate(clustered_embeddings(25)):
+            graph.add_episode(f"ep_{i}", emb)
+        indptr, indices, data = graph.to_csr(top_k=3)
+        for row, uuid in enumerate(graph.ids):
+            csr_row = [(graph.ids[j], pytest.approx(s)) for j, s in
+                       zip(indices[indptr[row]:indptr[row + 1]], data[indptr[row]:indptr[row + 1]])]
+            assert csr_row == graph.get_related(uuid, top_k=3)
+
+    def test_csr_cache_invalidated_on_add(self):
+        """Should rebuild after the graph changes"""
+        graph = SimilarityGraph(similarity_threshold=0.5)
+        graph.add_episode("a", np.array([1.0, 0.0]))
+        assert graph.to_csr()[1].size == 0
+        graph.add_episode("b", np.array([1.0, 0.1]))
+        assert graph.to_csr()[1].size == 2
+
+    def test_single_source_matches_bfs_on_chain(self):
+        """Should match the original BFS where paths are unique"""
+        graph = SimilarityGraph(similarity_threshold=0.5)
+        angles = np.radians([0, 20, 40, 60])
+        for i, angle in enumerate(angles):
+            graph.add_episode(f"n{i}", np.array([np.cos(angle), np.sin(angle)]))
+
+        manager = ActivationManager()
+        result = dict(manager.spread_activation("n0", graph, top_k=1, max_hops=3))
+        expected = reference_spread(graph, "n0", top_k=1, max_hops=3)
+        assert result == pytest.approx(expected)
+
+    def test_batch_keeps_strongest_path(self):
+        """Should activate each node once, with its best source"""
+        graph = SimilarityGraph(similarity_threshold=0.5)
+        graph.add_embeddings(["a", "b", "t"], np.eye(3))
+        graph.set_neighbors("a", [("t", 0.6)])
+        graph.set_neighbors("b", [("t", 0.9)])
+
+        manager = ActivationManager()
+        activated = manager._spread(["a", "b"], graph, top_k=5, max_hops=2)
+        assert activated == [("t", pytest.approx(0.9 * 0.7), "b")]
+        assert manager.activations["t"].source_episodes == {"b"}
+
+
+class TestLazyDecay:
+    """Heap-based expiry"""
+
+    def test_cleanup_pops_only_expired(self, monkeypatch):
+        """Should remove exactly the states decayed below threshold"""
+        clock = [1000.0]
+        monkeypatch.setattr(spreading_activation.time, "time", lambda: clock[0])
+        manager = ActivationManager(decay_half_life=10.0)
+        manager.activate("strong", 1.0)
+        manager.activate("weak", 0.3)
+
+        clock[0] += 10.0  # one half-life: strong=0.5, weak=0.15
+        assert manager.cleanup(threshold=0.2) == 1
+        assert set(manager.activations) == {"strong"}
+
+    def test_reactivation_refreshes_expiry(self, monkeypatch):
+        """Should ignore stale heap entries after re-activation"""
+        clock = [1000.0]
+        monkeypatch.setattr(spreading_activation.time, "time", lambda: clock[0])
+        manager = ActivationManager(decay_half_life=10.0)
+        manager.activate("ep", 0.3)
+        clock[0] += 10.0
+        manager.activate("ep", 0.3)
+
+        assert manager.cleanup(threshold=0.2) == 0
+        assert manager.get_activation("ep") == pytest.approx(0.3)
+
+    def test_activate_never_lowers_decayed_level(self, monkeypatch):
+        """Should keep the higher of decayed and new level"""
+        clock = [1000.0]
+        monkeypatch.setattr(spreading_activation.time, "time", lambda: clock[0])
+        manager = ActivationManager(decay_half_life=10.0)
+        manager.activate("ep", 1.0)
+        clock[0] += 10.0
+        manager.activate("ep", 0.2)
+        assert manager.get_activation("ep") == pytest.approx(0.5)
+
+
+class TestBatchPriming:
+    """Engine batch API"""
+
+    def test_prime_batch_skips_unknown_seeds(self):
+        """Should prime from known seeds only"""
+        engine = SpreadingActivationEngine(similarity_threshold=0.7)
+        for i, emb in enumerate(clustered_embeddings(20)):
+            engine.add_episode(f"ep_{i}", "", emb)
+
+        result = engine.prime_batch(["ep_0", "ep_1", "missing", "ep_0"])
+        assert result["seeds"] == ["ep_0", "ep_1"]
+        assert result["activation_count"] > 0
+        assert engine.priming_cache.get(result["primed_episodes"][0]) is not None
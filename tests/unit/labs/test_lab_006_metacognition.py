@@ -0,0 +1,152 @@
+"""
+LAB_006: Metacognition Logger - Test Suite
+
+Test Phases:
+- Phase 1: Streaming calibration matches the list-based CalibrationAnalyzer
+- Phase 2: Corrected outcomes and per-type breakdowns
+- Phase 3: Bounded raw action retention
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import metacognition_logger
+from metacognition_logger import CalibrationAnalyzer, ErrorDetector, MetacognitionLogger
+
+
+def random_run(seed: int, n: int, max_actions: int = 100000):
+    """Logger with n actions, most completed; confidences include bin edges"""
+    rng = np.random.default_rng(seed)
+    logger = MetacognitionLogger(max_actions=max_actions)
+    edges = [0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 1.0]
+    for i in range(n):
+        confidence = float(rng.choice(edges)) if i % 4 == 0 else float(rng.uniform())
+        logger.log_action(f"a{i}", f"type{i % 3}", confidence)
+        if i % 5:
+            success = bool(rng.uniform() < confidence)
+            logger.log_outcome(f"a{i}", success, None if success else f"err{i % 2}")
+    return logger
+
+
+# ============================================================================
+# PHASE 1: Streaming calibration
+# ============================================================================
+
+class TestStreamingCalibration:
+    """Running totals give the same numbers as rescanning every action"""
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_matches_list_analysis(self, seed):
+        """Should match ECE, Brier score, bands and error analysis over the full action list"""
+        logger = random_run(seed, n=400)
+        actions = list(logger.confidence_tracker.actions.values())
+        stats = logger.get_comprehensive_stats()
+        expected = CalibrationAnalyzer().get_calibration_stats(actions)
+
+        assert stats['calibration']['ece'] == pytest.approx(expected['ece'])
+        assert stats['calibration']['brier_score'] == pytest.approx(expected['brier_score'])
+        for band, values in expected['by_confidence_band'].items():
+            for key, value in values.items():
+                assert stats['calibration']['by_confidence_band'][band][key] == pytest.approx(value)
+
+        errors = ErrorDetector().analyze_errors(actions)
+        assert stats['errors']['confidence_mismatches'] == errors['confidence_mismatches']
+        assert stats['errors']['mismatch_rate'] == pytest.approx(errors['mismatch_rate'])
+        assert stats['confidence']['std_confidence'] == pytest.approx(np.std([a.confidence for a in actions]))
+
+    def test_calibration_curve(self):
+        """Should report one bin per decile with counts summing to the sample"""
+        logger = random_run(5, n=200)
+        curve = logger.get_calibration_curve()
+        assert len(curve['bins']) == 10
+        assert sum(b['count'] for b in curve['bins']) == curve['total_actions'] == 160
+        assert curve['ece'] == pytest.approx(logger.get_comprehensive_stats()['calibration']['ece'])
+
+    def test_empty(self):
+        """Should report zeros before any outcome"""
+        stats = MetacognitionLogger().get_comprehensive_stats()
+        assert stats['calibration']['ece'] == 0.0
+        assert stats['outcomes']['completed_actions'] == 0
+
+
+# ============================================================================
+# PHASE 2: Corrections and breakdowns
+# ============================================================================
+
+class TestCorrectionsAndBreakdowns:
+    """Outcome corrections and per-type totals"""
+
+    def test_corrected_outcome_replaces_previous(self):
+        """Should count an action once, with its latest outcome"""
+        logger = MetacognitionLogger()
+        logger.log_action("a", "search", 0.95)
+        logger.log_outcome("a", False, "timeout")
+        logger.log_outcome("a", True)
+
+        stats = logger.get_comprehensive_stats()
+        assert stats['outcomes']['completed_actions'] == 1
+        assert stats['outcomes']['successes'] == 1
+        assert stats['outcomes']['error_types'] == {}
+        assert stats['errors']['confidence_mismatches'] == 0
+        assert stats['errors']['mismatch_actions'] == []
+
+    def test_by_action_type(self):
+        """Should break calibration down by action type"""
+        logger = MetacognitionLogger()
+        for i in range(4):
+            logger.log_action(f"s{i}", "search", 0.8)
+            logger.log_outcome(f"s{i}", i < 3)
+        logger.log_action("c", "consolidation", 0.6)
+        logger.log_outcome("c", False)
+
+        by_type = logger.get_comprehensive_stats()['calibration']['by_action_type']
+        assert by_type['search']['count'] == 4
+        assert by_type['search']['success_rate'] == 0.75
+        assert by_type['consolidation']['brier_score'] == pytest.approx(0.36)
+
+    def test_action_types_capped(self, monkeypatch):
+        """Should fold action types past the cap into 'other'"""
+        monkeypatch.setattr(metacognition_logger, "MAX_ACTION_TYPES", 2)
+        logger = MetacognitionLogger()
+        for i in range(5):
+            logger.log_action(f"a{i}", f"type{i}", 0.5)
+            logger.log_outcome(f"a{i}", True)
+
+        by_type = logger.get_comprehensive_stats()['calibration']['by_action_type']
+        assert set(by_type) == {"type0", "type1", "other"}
+        assert by_type['other']['count'] == 3
+
+
+# ============================================================================
+# PHASE 3: Bounded retention
+# ============================================================================
+
+class TestBoundedRetention:
+    """Raw actions kept in a ring; totals cover every action"""
+
+    def test_ring_keeps_latest_actions(self):
+        """Should retain only max_actions raw actions but count all of them"""
+        logger = random_run(6, n=1000, max_actions=50)
+        stats = logger.get_comprehensive_stats()
+
+        assert len(logger.confidence_tracker.actions) == 50
+        assert list(logger.confidence_tracker.actions)[-1] == "a999"
+        assert stats['confidence']['total_actions'] == 1000
+        assert stats['outcomes']['completed_actions'] == 800
+        assert stats['outcomes']['pending_actions'] == 10
+
+    def test_outcome_for_dropped_action(self):
+        """Should not find actions that have left the ring"""
+        logger = MetacognitionLogger(max_actions=2)
+        for action_id in ("a", "b", "c"):
+            logger.log_action(action_id, "test", 0.5)
+        assert not logger.log_outcome("a", True)
+        assert logger.log_outcome("c", True)
+        assert logger.get_comprehensive_stats()['outcomes']['pending_actions'] == 1
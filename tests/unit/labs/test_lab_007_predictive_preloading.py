@@ -0,0 +1,158 @@
+"""
+LAB_007: Predictive Preloading - TemporalPatternLearner Test Suite
+
+Test Phases:
+- Phase 1: Source-indexed bigram/trigram predictions
+- Phase 2: Lazy epoch decay and expiry
+- Phase 3: Count-min pruning keeps memory bounded
+"""
+
+import pytest
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+from predictive_preloading import TemporalPatternLearner, TransitionIndex, CountMinSketch, day_epoch
+
+
+def learn(learner, sequence, timestamp=None):
+    timestamp = timestamp or datetime.now()
+    for episode_id in sequence:
+        learner.learn_from_access(episode_id, timestamp)
+
+
+# ============================================================================
+# PHASE 1: PREDICTIONS
+# ============================================================================
+
+class TestSuccessors:
+    """Predictions read only the source's own transitions"""
+
+    def test_bigram_probabilities(self):
+        """Should divide counts by the source total"""
+        learner = TemporalPatternLearner()
+        learn(learner, ["a", "b", "a", "b", "a", "c"])
+        successors = learner.get_bigram_successors("a")
+        assert [(t, round(p, 2)) for t, p, _ in successors] == [("b", 0.67), ("c", 0.33)]
+        assert successors[0][2] == pytest.approx(1.0)
+
+    def test_min_confidence_cuts_ranked_list(self):
+        """Should stop at the first target below min_confidence"""
+        learner = TemporalPatternLearner()
+        learn(learner, ["a", "b", "a", "b", "a", "b", "a", "c"])
+        assert [t for t, _, _ in learner.get_bigram_successors("a", min_confidence=0.5)] == ["b"]
+
+    def test_trigram_successors(self):
+        """Should key trigrams by the (prev_prev, prev) pair"""
+        learner = TemporalPatternLearner()
+        learn(learner, ["x", "a", "b", "y", "a", "c"])
+        assert [t for t, _, _ in learner.get_trigram_successors("x", "a")] == ["b"]
+        assert [t for t, _, _ in learner.get_trigram_successors("y", "a")] == ["c"]
+
+    def test_ranking_refreshes_after_writes(self):
+        """Should re-rank a source after new transitions"""
+        learner = TemporalPatternLearner()
+        learn(learner, ["a", "b"])
+        assert learner.get_bigram_successors("a")[0][0] == "b"
+        learn(learner, ["a", "c", "a", "c"])
+        assert learner.get_bigram_successors("a")[0][0] == "c"
+
+    def test_unknown_source(self):
+        """Should return nothing for unseen sources"""
+        assert TemporalPatternLearner().get_bigram_successors("missing") == []
+
+    def test_latency_independent_of_total_patterns(self):
+        """Should not scan unrelated sources"""
+        index = TransitionIndex()
+        for i in range(100_000):
+            index.add(f"src_{i}", f"tgt_{i}", 0)
+        index.add("hot", "x", 0)
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            index.get_successors("hot", 0, 0.1)
+        assert (time.perf_counter() - start) / 1000 < 0.001
+
+
+# ============================================================================
+# PHASE 2: DECAY
+# ============================================================================
+
+class TestLazyDecay:
+    """Weights come from the epoch at read time"""
+
+    def test_weight_decays_with_age(self):
+        """Should weight a 10-day-old transition by exp(-1)"""
+        learner = TemporalPatternLearner()
+        learn(learner, ["a", "b"], datetime.now() - timedelta(days=10))
+        _, _, weight = learner.get_bigram_successors("a")[0]
+        assert weight == pytest.approx(0.3679, abs=1e-3)
+
+    def test_expire_drops_idle_sources(self):
+        """Should remove sources idle past the expiry age"""
+        learner = TemporalPatternLearner()
+        now = datetime.now()
+        learn(learner, ["old", "x"], now - timedelta(days=60))
+        learn(learner, ["new", "y"], now)
+        removed = learner.decay_patterns(now)
+        assert removed >= 1
+        assert learner.get_bigram_successors("old") == []
+        assert learner.get_bigram_successors("new")[0][0] == "y"
+
+    def test_stale_targets_of_live_source(self):
+        """Should drop a live source's stale targets when re-ranking"""
+        index = TransitionIndex()
+        index.add("a", "stale", 0)
+        index.add("a", "fresh", 100)
+        assert [t for t, _, _ in index.get_successors("a", 100, 0.1)] == ["fresh"]
+        assert index.totals["a"] == 1
+        assert index.size == 1
+
+
+# ============================================================================
+# PHASE 3: PRUNING
+# ============================================================================
+
+class TestCountMinPruning:
+    """Rare transitions move to the sketch when the index is full"""
+
+    def test_sketch_never_underestimates(self):
+        """Should return at least the added count"""
+        sketch = CountMinSketch(width=64, depth=4)
+        for i in range(200):
+            sketch.add(("s", str(i)), i % 5 + 1)
+        assert all(sketch.estimate(("s", str(i))) >= i % 5 + 1 for i in range(200))
+
+    def test_size_stays_bounded(self):
+        """Should keep at most max_patterns transitions"""
+        index = TransitionIndex(max_patterns=1000)
+        for i in range(10_000):
+            index.add(f"s{i % 300}", f"t{i}", 0)
+            assert index.size <= 1000
+        assert index.pruned > 0
+
+    def test_frequent_transitions_survive(self):
+        """Should prune the rarest transitions first"""
+        index = TransitionIndex(max_patterns=100)
+        for _ in range(5):
+            index.add("hot", "next", 0)
+        for i in range(500):
+            index.add(f"s{i}", "t", 0)
+        assert index.successors["hot"]["next"][0] == 5
+
+    def test_pruned_transition_resumes_count(self):
+        """Should restore a pruned transition's count from the sketch"""
+        index = TransitionIndex(max_patterns=10)
+        index.add("a", "b", 0)
+        for i in range(20):
+            index.add(f"s{i}", "t", 0)
+        assert "a" not in index.successors
+
+        index.add("a", "b", 0)
+        assert index.successors["a"]["b"][0] >= 2
+        assert index.get_successors("a", 0, 0.1)[0][1] == pytest.approx(1.0)
@@ -0,0 +1,318 @@
+"""
+LAB_011: Working Memory Buffer - Test Suite
+
+Test Phases:
+- Phase 1: Indexed buffer (heap-keyed eviction, O(1) removal, decay from the LRU end)
+- Phase 2: Per-session buffers (isolation, LRU-bounded session count)
+- Phase 3: Write-behind to nexus_memory.zep_working_memory
+- Phase 4: Shared sessions across workers (one state key per session)
+"""
+
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# Add src/api to path
+api_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src", "api")
+sys.path.insert(0, api_path)
+
+import working_memory_buffer
+from working_memory_buffer import (
+    EvictionStrategy,
+    SessionWorkingMemory,
+    WorkingMemoryBuffer,
+    WorkingMemoryItem,
+    WorkingMemoryStore,
+)
+from state_store import InProcessStateStore, SharedStateRegistry
+
+
+def age(buffer: WorkingMemoryBuffer, episode_id: str, seconds: float):
+    """Backdate an item's last access and re-key it, as if it were accessed `seconds` ago"""
+    item = buffer._items[episode_id]
+    item.last_accessed = datetime.now() - timedelta(seconds=seconds)
+    buffer._push(item)
+
+
+# ============================================================================
+# PHASE 1: Indexed buffer
+# ============================================================================
+
+class TestIndexedBuffer:
+    """Same admission/eviction decisions as scoring the whole buffer"""
+
+    @pytest.mark.parametrize("strategy", list(EvictionStrategy))
+    def test_victim_matches_full_scan(self, strategy):
+        """Should evict the item EvictionPolicy.select_victim would pick over the whole buffer"""
+        buffer = WorkingMemoryBuffer(capacity=8, eviction_strategy=strategy)
+        for i in range(8):
+            buffer.add(f"e{i}", attention_weight=((i * 37) % 10) / 10)
+            if strategy != EvictionStrategy.LRU:  # LRU order is access order
+                age(buffer, f"e{i}", seconds=(i * 13) % 50)
+        buffer.refresh("e3")
+        buffer.get("e5")
+
+        for i in range(8, 40):
+            new = WorkingMemoryItem(f"e{i}", ((i * 37) % 10) / 10, datetime.now(), datetime.now())
+            items = buffer.buffer
+            victim = buffer.eviction_policy.select_victim(items, new)
+            expected = set(buffer.get_episode_ids()) if victim == -1 else \
+                (set(buffer.get_episode_ids()) - {items[victim].episode_id}) | {new.episode_id}
+
+            admitted = buffer.add(new.episode_id, new.attention_weight)
+
+            assert admitted == (victim != -1)
+            assert set(buffer.get_episode_ids()) == expected
+            assert buffer.size() == 8
+
+    def test_attention_rejects_weaker_item(self):
+        """Should refuse an item weaker than everything buffered"""
+        buffer = WorkingMemoryBuffer(capacity=2, eviction_strategy=EvictionStrategy.ATTENTION)
+        buffer.add("a", 0.5)
+        buffer.add("b", 0.9)
+        assert not buffer.add("c", 0.1)
+        assert buffer.add("d", 0.7)
+        assert buffer.get_episode_ids() == ["b", "d"]
+
+    def test_lru_order_follows_access(self):
+        """Should evict the least recently accessed item"""
+        buffer = WorkingMemoryBuffer(capacity=3, eviction_strategy=EvictionStrategy.LRU)
+        for episode_id in "abc":
+            buffer.add(episode_id)
+        buffer.get("a")
+        buffer.add("d")
+        assert buffer.get_episode_ids() == ["c", "a", "d"]
+
+    def test_remove_and_heap_compaction(self):
+        """Should drop stale heap entries instead of letting them pile up"""
+        buffer = WorkingMemoryBuffer(capacity=4)
+        for i in range(4):
+            buffer.add(f"e{i}", 0.5)
+        for _ in range(500):
+            buffer.refresh("e0")
+        assert buffer.remove("e1") and not buffer.remove("e1")
+        assert len(buffer._heap) <= 2 * buffer.size() + 17
+        assert buffer.add("x", 0.5) and buffer.add("y", 0.5)
+        assert buffer.size() == 4
+
+    def test_decay_from_lru_end(self):
+        """Should remove only items idle longer than the decay threshold"""
+        buffer = WorkingMemoryBuffer(capacity=5, decay_threshold_seconds=60)
+        for episode_id in "abcd":
+            buffer.add(episode_id)
+        age(buffer, "a", 120)
+        age(buffer, "b", 90)
+        buffer._items.move_to_end("c")
+        buffer._items.move_to_end("d")
+
+        assert buffer.decay_step() == ["a", "b"]
+        assert buffer.get_episode_ids() == ["c", "d"]
+
+    def test_large_capacity(self):
+        """Should stay consistent at capacities far past 7"""
+        buffer = WorkingMemoryBuffer(capacity=5000)
+        for i in range(20000):
+            buffer.add(f"e{i}", (i % 97) / 97)
+        assert buffer.size() == 5000
+        assert len(set(buffer.get_episode_ids())) == 5000
+
+
+# ============================================================================
+# PHASE 2: Per-session buffers
+# ============================================================================
+
+class TestSessions:
+    """One buffer per session/agent"""
+
+    def test_sessions_do_not_evict_each_other(self):
+        """Should keep each agent's items when another agent fills its buffer"""
+        memory = SessionWorkingMemory(capacity=3)
+        memory.add("mine", 0.9, session_id="agent-a")
+        for i in range(10):
+            memory.add(f"theirs-{i}", 1.0, session_id="agent-b")
+
+        assert memory.get_episode_ids("agent-a") == ["mine"]
+        assert memory.size("agent-b") == 3
+
+    def test_default_session(self):
+        """Should use the default session when none is given"""
+        memory = SessionWorkingMemory()
+        memory.add("ep1")
+        assert memory.get_episode_ids() == ["ep1"]
+        assert memory.get_stats()["session_id"] == "default"
+
+    def test_session_count_bounded(self):
+        """Should drop the least recently written session past max_sessions"""
+        memory = SessionWorkingMemory(max_sessions=2)
+        memory.add("x", session_id="s1")
+        memory.add("y", session_id="s2")
+        memory.add("z", session_id="s1")
+        memory.add("w", session_id="s3")
+
+        assert list(memory.sessions) == ["s1", "s3"]
+        assert memory.get_stats()["evicted_sessions"] == 1
+
+    def test_reads_do_not_create_sessions(self):
+        """Should answer reads for unknown sessions without creating them"""
+        memory = SessionWorkingMemory()
+        assert memory.get_items("nobody") == []
+        assert memory.get_stats("nobody")["size"] == 0
+        assert memory.sessions == {}
+
+
+# ============================================================================
+# PHASE 3: Write-behind
+# ============================================================================
+
+class FakeCursor:
+    def __init__(self, rows=None):
+        self.statements = []
+        self.rows = rows or []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        self.statements.append((query, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakePool:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return self._cursor
+
+
+class TestWriteBehind:
+    """Dirty sessions written in one batch"""
+
+    def test_take_dirty_snapshots(self):
+        """Should snapshot changed sessions once, and empty ones as []"""
+        memory = SessionWorkingMemory()
+        memory.add("ep1", session_id="a")
+        memory.add("ep2", session_id="b")
+        memory.clear("b")
+
+        snapshots = memory.take_dirty()
+        assert [item["episode_id"] for item in snapshots["a"]] == ["ep1"]
+        assert snapshots["b"] == []
+        assert memory.take_dirty() == {}
+
+    def test_evicted_session_keeps_snapshot(self):
+        """Should still write a dirty session dropped by the LRU bound"""
+        memory = SessionWorkingMemory(max_sessions=1)
+        memory.add("ep1", session_id="a")
+        memory.add("ep2", session_id="b")
+
+        snapshots = memory.take_dirty()
+        assert [item["episode_id"] for item in snapshots["a"]] == ["ep1"]
+
+    def test_requeue_after_failed_write(self):
+        """Should write the same sessions again after a failed flush"""
+        memory = SessionWorkingMemory(max_sessions=1)
+        memory.add("ep1", session_id="a")
+        memory.add("ep2", session_id="b")
+        failed = memory.take_dirty()
+        memory.requeue(failed)
+        assert memory.take_dirty() == failed
+
+    def test_store_round_trip(self):
+        """Should upsert live sessions, delete emptied ones, and restore from rows"""
+        memory = SessionWorkingMemory()
+        memory.add("ep1", 0.4, ["x"], session_id="a")
+        memory.clear("b")
+        snapshots = memory.take_dirty()
+
+        cur = FakeCursor()
+        WorkingMemoryStore(FakePool(cur)).write(snapshots)
+
+        (upsert, params), (delete, delete_params) = cur.statements
+        assert upsert is working_memory_buffer.UPSERT_SESSIONS_QUERY
+        assert params["ids"] == [WorkingMemoryStore.working_id("a")]
+        assert delete_params[0] == [WorkingMemoryStore.working_id("b")]
+
+        cur.rows = [(params["contents"][0].obj,)]
+        restored = SessionWorkingMemory()
+        assert restored.restore(WorkingMemoryStore(FakePool(cur)).load(10)) == 1
+        item = restored.get_items("a")[0]
+        assert (item.episode_id, item.attention_weight, item.tags) == ("ep1", 0.4, ["x"])
+
+
+# ============================================================================
+# PHASE 4: Shared sessions
+# ============================================================================
+
+class RecordingStore(InProcessStateStore):
+    """Shared in-process store that records which keys each CAS wrote"""
+
+    def __init__(self):
+        super().__init__(shared=True)
+        self.writes = []
+
+    def compare_and_set(self, updates, ttls=None):
+        self.writes.append((sorted(updates), ttls))
+        return super().compare_and_set(updates, ttls)
+
+
+def shared_worker(store, **kwargs):
+    registry = SharedStateRegistry(store)
+    memory = SessionWorkingMemory(**kwargs)
+    memory.shared_sessions = registry.register_keyed("wm_session", memory.new_buffer, ttl_seconds=60)
+    return memory, registry
+
+
+class TestSharedSessions:
+    """Several workers on one store: one key per session"""
+
+    def test_workers_share_a_session(self):
+        """Should see another worker's items for the same session"""
+        store = RecordingStore()
+        worker_a, _ = shared_worker(store)
+        worker_b, _ = shared_worker(store)
+        worker_a.add("ep1", session_id="agent-a")
+
+        assert worker_b.get_episode_ids("agent-a") == ["ep1"]
+        assert worker_b.get_items("nobody") == []
+        assert store.writes == [(["wm_session:agent-a"], {"wm_session:agent-a": 60})]
+
+    def test_different_sessions_do_not_conflict(self):
+        """Should commit overlapping requests on different sessions without a replay"""
+        store = RecordingStore()
+        worker_a, registry_a = shared_worker(store)
+        worker_b, registry_b = shared_worker(store)
+
+        with registry_a.request_scope():
+            worker_a.add("mine", session_id="agent-a")
+            with registry_b.request_scope():
+                worker_b.add("theirs", session_id="agent-b")
+
+        assert registry_a.conflicts == 0 and registry_b.conflicts == 0
+        assert [names for names, _ in store.writes] == [["wm_session:agent-b"], ["wm_session:agent-a"]]
+        assert worker_b.get_episode_ids("agent-a") == ["mine"]
+
+    def test_clear_and_write_behind(self):
+        """Should clear the shared buffer and snapshot what this worker changed"""
+        store = RecordingStore()
+        worker_a, _ = shared_worker(store)
+        worker_b, _ = shared_worker(store)
+        worker_a.add("ep1", session_id="a")
+        worker_a.add("ep2", session_id="b")
+
+        assert worker_b.clear("b") == 1
+        assert worker_a.get_episode_ids("b") == []
+        assert worker_b.get_stats("a")["sessions"] is None
+        assert [item["episode_id"] for item in worker_a.take_dirty()["a"]] == ["ep1"]
+        assert worker_b.take_dirty() == {"b": []}